@@ -7,9 +7,24 @@ from .ai_engine import AIEngine
 # Continuous learning modules
 from .nn_config import NNConfig, NNConfigPresets, load_nn_config
 from .feature_extractor import FeatureExtractor, FeatureConfig
-from .reward_calculator import RewardCalculator, RewardConfig
-from .nn_model import NNModel
-from .training import ContinuousTrainer
+from .reward_calculator import RewardCalculator, RewardConfig, TransitionBatch
+
+# Exports that import torch are resolved on first access, so importing the
+# package (e.g. for AIEngine) does not pay torch's import time
+_LAZY_EXPORTS = {
+    "NNModel": ".nn_model",
+    "ContinuousTrainer": ".training",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
 
 __all__ = [
     "AIEngine",
@@ -21,6 +36,7 @@ __all__ = [
     "FeatureConfig",
     "RewardCalculator",
     "RewardConfig",
+    "TransitionBatch",
     "NNModel",
     "ContinuousTrainer",
 ]
\ No newline at end of file
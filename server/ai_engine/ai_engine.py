@@ -4,17 +4,17 @@ AI Engine - Central coordinator for neural network learning and strategy generat
 Note: Neural network training is handled by MessageHandler's ContinuousTrainer (PyTorch).
 This class coordinates high-level AI components like death analysis, strategy generation,
 and difficulty adjustment.
+
+The queen-death subsystems (see LAZY_COMPONENTS) are imported and constructed on first
+use, so initialize() stays cheap and server startup does not wait for them.
 """
 
 import asyncio
+import importlib
 import logging
+import time
 from typing import Dict, Any, Optional, List
 
-from .death_analyzer import DeathAnalyzer
-from .player_behavior import PlayerBehaviorAnalyzer
-from .strategy_generator import StrategyGenerator
-from .memory_manager import QueenMemoryManager
-from .adaptive_difficulty import AdaptiveDifficultySystem
 from .data_models import QueenDeathData, QueenStrategy
 from .error_recovery import ErrorRecoveryManager
 from .data_validator import DataValidator
@@ -27,13 +27,18 @@ class AIEngine:
     """
     Central AI Engine that coordinates all neural network learning and strategy generation
     """
+
+    # Queen-death subsystems built on first attribute access: attribute -> (module, class)
+    LAZY_COMPONENTS = {
+        'death_analyzer': ('.death_analyzer', 'DeathAnalyzer'),
+        'player_behavior': ('.player_behavior', 'PlayerBehaviorAnalyzer'),
+        'strategy_generator': ('.strategy_generator', 'StrategyGenerator'),
+        'memory_manager': ('.memory_manager', 'QueenMemoryManager'),
+        'adaptive_difficulty': ('.adaptive_difficulty', 'AdaptiveDifficultySystem'),
+    }
     
     def __init__(self):
-        self.death_analyzer: Optional[DeathAnalyzer] = None
-        self.player_behavior: Optional[PlayerBehaviorAnalyzer] = None
-        self.strategy_generator: Optional[StrategyGenerator] = None
-        self.memory_manager: Optional[QueenMemoryManager] = None
-        self.adaptive_difficulty: Optional[AdaptiveDifficultySystem] = None
+        self.component_init_ms: Dict[str, float] = {}  # Construction time per component
         self.error_recovery: Optional[ErrorRecoveryManager] = None
         self.data_validator: Optional[DataValidator] = None
         self.learning_quality_monitor: Optional[LearningQualityMonitor] = None
@@ -45,21 +50,15 @@ class AIEngine:
             logger.info("Initializing AI Engine components...")
             
             # Initialize error recovery and data validation first
-            self.error_recovery = ErrorRecoveryManager()
-            self.data_validator = DataValidator()
+            self.error_recovery = self._timed('error_recovery', ErrorRecoveryManager)
+            self.data_validator = self._timed('data_validator', DataValidator)
             logger.info("Error recovery and data validation initialized")
 
             # Note: Neural network training is handled by MessageHandler's ContinuousTrainer
+            # Analysis components (LAZY_COMPONENTS) are built on first use
 
-            # Initialize analysis components
-            self.death_analyzer = DeathAnalyzer()
-            self.player_behavior = PlayerBehaviorAnalyzer()
-            self.strategy_generator = StrategyGenerator()
-            self.memory_manager = QueenMemoryManager()
-            self.adaptive_difficulty = AdaptiveDifficultySystem()
-            
             # Initialize learning quality monitoring
-            self.learning_quality_monitor = LearningQualityMonitor()
+            self.learning_quality_monitor = self._timed('learning_quality_monitor', LearningQualityMonitor)
             await self.learning_quality_monitor.start_monitoring()
             logger.info("Learning quality monitoring initialized")
             
@@ -82,6 +81,30 @@ class AIEngine:
             else:
                 raise
     
+    def __getattr__(self, name: str) -> Any:
+        """Build a lazy component on first access (only called for missing attributes)"""
+        spec = type(self).LAZY_COMPONENTS.get(name)
+        if spec is None:
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+        module_name, class_name = spec
+        component_class = getattr(importlib.import_module(module_name, __package__), class_name)
+        component = self._timed(name, component_class)
+        setattr(self, name, component)
+        logger.info(f"{class_name} initialized on first use")
+        return component
+
+    def _timed(self, name: str, factory) -> Any:
+        """Construct a component and record how long it took"""
+        start = time.perf_counter()
+        component = factory()
+        self.component_init_ms[name] = (time.perf_counter() - start) * 1000
+        return component
+
+    def is_component_built(self, name: str) -> bool:
+        """Check whether a lazy component exists without building it"""
+        return name in self.__dict__
+
     async def process_queen_death(self, death_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process Queen death data and generate new strategy for next generation
@@ -387,7 +410,7 @@ class AIEngine:
         """Cleanup AI Engine resources"""
         logger.info("Cleaning up AI Engine...")
         
-        if self.memory_manager:
+        if self.is_component_built('memory_manager'):
             await self.memory_manager.cleanup()
         
         if self.learning_quality_monitor:
@@ -0,0 +1,324 @@
+"""
+Backup Writer - Background, rotating backup segments for validated data
+
+Backups are serialized on the caller's thread, queued, and written by a
+single background thread in batches. Each data type appends to gzip
+segment files (one gzip member per batch, one JSON record per line) that
+rotate by size. Retention is enforced from an in-memory segment index, so
+the hot path never scans the backup directory.
+"""
+
+import gzip
+import json
+import logging
+import os
+import queue
+import re
+import threading
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+SEGMENT_PATTERN = re.compile(r'^(?P<data_type>.+)_segment_(?P<created>\d+)\.jsonl\.gz$')
+LEGACY_PATTERN = re.compile(r'^(?P<data_type>.+)_backup_(?P<created>\d+).*\.json\.gz$')
+
+
+def fast_checksum(payload: bytes) -> str:
+    """Non-cryptographic integrity checksum (CRC-32) of serialized data"""
+    return f"{zlib.crc32(payload) & 0xffffffff:08x}"
+
+
+@dataclass
+class BackupSegment:
+    """Index entry for one backup segment file"""
+    path: str
+    data_type: str
+    created: float
+    last_write: float
+    size_bytes: int = 0
+    record_count: int = 0
+    legacy: bool = False  # Single-record <type>_backup_*.json.gz file
+
+
+class BackupWriter:
+    """
+    Asynchronous rotating backup writer.
+
+    enqueue() only serializes and queues a record; a daemon thread started
+    on first use drains the bounded queue, groups records by data type and
+    appends each group to the type's current segment.
+    """
+
+    SEGMENT_MAX_BYTES = 4 * 1024 * 1024  # Rotate segments after this size
+    BATCH_SIZE = 64  # Max records written per batch
+    FLUSH_INTERVAL = 0.5  # Seconds to wait for more records before writing
+    MAX_QUEUE_SIZE = 1024  # Pending records before new backups are dropped
+
+    def __init__(self, backup_directory: str, retention_days: float = 7):
+        self.backup_directory = backup_directory
+        self.retention_days = retention_days
+
+        self._queue: queue.Queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._io_lock = threading.Lock()  # Guards segment files and the index
+        self._segments: Dict[str, Deque[BackupSegment]] = {}
+
+        self.stats = {"queued": 0, "written": 0, "dropped": 0, "batches": 0, "expired_segments": 0}
+
+        os.makedirs(self.backup_directory, exist_ok=True)
+        self._build_index()
+
+    def _build_index(self):
+        """Index existing segments and legacy backups with a single directory scan"""
+        for filename in os.listdir(self.backup_directory):
+            match = SEGMENT_PATTERN.match(filename)
+            legacy = False
+            if not match:
+                match = LEGACY_PATTERN.match(filename)
+                legacy = True
+            if not match:
+                continue
+
+            path = os.path.join(self.backup_directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            segment = BackupSegment(
+                path=path,
+                data_type=match.group('data_type'),
+                created=int(match.group('created')) / (1 if legacy else 1000.0),
+                last_write=stat.st_mtime,
+                size_bytes=stat.st_size,
+                legacy=legacy
+            )
+            self._segments.setdefault(segment.data_type, deque()).append(segment)
+
+        for segments in self._segments.values():
+            ordered = sorted(segments, key=lambda s: (s.created, s.path))
+            segments.clear()
+            segments.extend(ordered)
+
+    def enqueue(self, data: Dict[str, Any], data_type: str, identifier: Optional[str] = None) -> bool:
+        """
+        Queue a backup record.
+
+        The data is serialized immediately so later mutation by the caller
+        cannot change what is written.
+
+        Returns:
+            True if queued, False if the queue is full or the data is not serializable
+        """
+        try:
+            record = json.dumps({
+                'timestamp': time.time(),
+                'identifier': identifier,
+                'data': data
+            }, separators=(',', ':'), default=str)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Backup serialization failed for {data_type}: {e}")
+            return False
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((data_type, record))
+        except queue.Full:
+            self.stats["dropped"] += 1
+            logger.warning(f"Backup queue full, dropped {data_type} backup")
+            return False
+
+        self.stats["queued"] += 1
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="backup-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Writer thread: drain the queue in batches until a stop sentinel arrives"""
+        running = True
+        while running:
+            try:
+                first = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if item is not None]
+            running = len(records) == len(batch)
+            try:
+                if records:
+                    self._write_batch(records)
+            except Exception as e:
+                logger.error(f"Backup batch write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, records: List[tuple]):
+        """Append records to each data type's current segment and apply retention"""
+        grouped: Dict[str, List[str]] = {}
+        for data_type, record in records:
+            grouped.setdefault(data_type, []).append(record)
+
+        with self._io_lock:
+            for data_type, type_records in grouped.items():
+                lines = []
+                for record in type_records:
+                    payload = record.encode()
+                    lines.append(b'{"checksum":"' + fast_checksum(payload).encode() + b'","record":' + payload + b'}\n')
+
+                segment = self._current_segment(data_type)
+                with open(segment.path, 'ab') as f:
+                    # One gzip member per batch; gzip readers concatenate members
+                    f.write(gzip.compress(b''.join(lines), compresslevel=6))
+                    segment.size_bytes = f.tell()
+                segment.last_write = time.time()
+                segment.record_count += len(lines)
+
+                self._expire_segments(data_type)
+
+        self.stats["written"] += len(records)
+        self.stats["batches"] += 1
+
+    def _current_segment(self, data_type: str) -> BackupSegment:
+        """Get the open segment for a data type, rotating when it is full"""
+        segments = self._segments.setdefault(data_type, deque())
+        if segments and not segments[-1].legacy and segments[-1].size_bytes < self.SEGMENT_MAX_BYTES:
+            return segments[-1]
+
+        created_ms = int(time.time() * 1000)
+        if segments and not segments[-1].legacy:
+            created_ms = max(created_ms, int(segments[-1].created * 1000) + 1)
+        segment = BackupSegment(
+            path=os.path.join(self.backup_directory, f"{data_type}_segment_{created_ms}.jsonl.gz"),
+            data_type=data_type,
+            created=created_ms / 1000.0,
+            last_write=time.time()
+        )
+        segments.append(segment)
+        return segment
+
+    def _expire_segments(self, data_type: str):
+        """Remove segments whose newest record is past retention (never the current one)"""
+        cutoff = time.time() - self.retention_days * 24 * 3600
+        segments = self._segments.get(data_type, deque())
+        while len(segments) > 1 and segments[0].last_write < cutoff:
+            expired = segments.popleft()
+            try:
+                os.remove(expired.path)
+                self.stats["expired_segments"] += 1
+                logger.debug(f"Removed expired backup segment: {os.path.basename(expired.path)}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.error(f"Failed to remove backup segment {expired.path}: {e}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued record has been written.
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.unfinished_tasks == 0
+
+        if timeout is None:
+            self._queue.join()
+            return True
+
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def recent_records(self, data_type: str, limit: int = 3) -> List[Dict[str, Any]]:
+        """
+        Get the newest intact backups for a data type, newest first.
+
+        Pending records are flushed first. Records whose checksum does not
+        match are skipped.
+        """
+        self.flush(timeout=5.0)
+        results = []
+
+        with self._io_lock:
+            segments = list(self._segments.get(data_type, ()))
+
+        for segment in reversed(segments):
+            try:
+                if segment.legacy:
+                    with gzip.open(segment.path, 'rt') as f:
+                        results.append(json.load(f))
+                else:
+                    with self._io_lock, gzip.open(segment.path, 'rb') as f:
+                        lines = f.read().splitlines()
+                    for line in reversed(lines):
+                        data = self._decode_line(line)
+                        if data is not None:
+                            results.append(data)
+                            if len(results) >= limit:
+                                break
+            except (OSError, EOFError, ValueError) as e:
+                logger.warning(f"Failed to read backup segment {os.path.basename(segment.path)}: {e}")
+
+            if len(results) >= limit:
+                break
+
+        return results[:limit]
+
+    @staticmethod
+    def _decode_line(line: bytes) -> Optional[Dict[str, Any]]:
+        """Decode one segment line, returning None if it is damaged"""
+        prefix = b'{"checksum":"'
+        if not line.startswith(prefix) or not line.endswith(b'}'):
+            return None
+        checksum = line[len(prefix):len(prefix) + 8].decode(errors='replace')
+        payload = line[len(prefix) + 8 + len(b'","record":'):-1]
+        if fast_checksum(payload) != checksum:
+            return None
+        try:
+            return json.loads(payload)['data']
+        except (ValueError, KeyError):
+            return None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get writer counters and per-type segment index totals"""
+        with self._io_lock:
+            segments = {
+                data_type: {
+                    "segments": len(entries),
+                    "bytes": sum(s.size_bytes for s in entries)
+                }
+                for data_type, entries in self._segments.items()
+            }
+        return {**self.stats, "pending": self._queue.qsize(), "segments": segments}
+
+    def close(self, timeout: float = 10.0):
+        """Write everything still queued and stop the writer thread"""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Backup writer did not stop within timeout")
+        self._thread = None
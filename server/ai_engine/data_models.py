@@ -142,6 +142,20 @@ class PlayerPatterns:
         return asdict(self)
 
 
+@dataclass
+class BehaviorReplayResult:
+    """Outcome of replaying recorded snapshots into a player behavior analyzer"""
+    player_profile: PlayerProfile
+    pattern_confidence: float
+    snapshot_count: int
+    feature_timestamps: List[float]  # Snapshot timestamp for each emitted vector
+    feature_vectors: List[List[float]]  # 15-feature vectors emitted during replay
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary"""
+        return asdict(self)
+
+
 @dataclass
 class QueenStrategy:
     """Complete Queen strategy for a generation"""
@@ -11,9 +11,14 @@ import os
 from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime, timedelta
 import jsonschema
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 import pickle
 import gzip
+import asyncio
+
+from .backup_writer import BackupWriter
 
 logger = logging.getLogger(__name__)
 
@@ -36,15 +41,19 @@ class DataValidator:
     def __init__(self, backup_directory: str = "data_backups"):
         self.backup_directory = backup_directory
         self.validation_schemas = {}
+        self._compiled_validators = {}
         self.data_checksums = {}
         self.backup_retention_days = 7
         self.max_recovery_attempts = 3
         
-        # Initialize backup directory
+        # Initialize backup directory and the background backup writer
         os.makedirs(self.backup_directory, exist_ok=True)
+        self.backup_writer = BackupWriter(self.backup_directory, self.backup_retention_days)
         
-        # Initialize validation schemas
+        # Initialize validation schemas and compile a validator for each
         self._initialize_schemas()
+        for data_type in self.validation_schemas:
+            self._get_validator(data_type)
         
         # Load existing checksums
         self._load_checksums()
@@ -246,6 +255,20 @@ class DataValidator:
             }
         }
     
+    def _get_validator(self, data_type: str):
+        """Get the compiled validator for a data type, recompiling if its schema was replaced"""
+        schema = self.validation_schemas.get(data_type)
+        if not schema:
+            return None
+        
+        validator = self._compiled_validators.get(data_type)
+        if validator is None or validator.schema is not schema:
+            validator_class = validator_for(schema)
+            validator_class.check_schema(schema)
+            validator = validator_class(schema)
+            self._compiled_validators[data_type] = validator
+        return validator
+    
     def validate_data(self, data: Dict[str, Any], data_type: str) -> Tuple[bool, Optional[str]]:
         """
         Validate data against schema
@@ -258,11 +281,13 @@ class DataValidator:
             Tuple of (is_valid, error_message)
         """
         try:
-            schema = self.validation_schemas.get(data_type)
-            if not schema:
+            validator = self._get_validator(data_type)
+            if validator is None:
                 return False, f"No validation schema found for data type: {data_type}"
             
-            validate(instance=data, schema=schema)
+            # Report the same error jsonschema.validate would
+            if not validator.is_valid(data):
+                raise best_match(validator.iter_errors(data))
             return True, None
             
         except ValidationError as e:
@@ -667,30 +692,11 @@ class DataValidator:
     def _recover_from_backup(self, corrupted_data: Dict[str, Any], data_type: str) -> Optional[Dict[str, Any]]:
         """Try to recover data from backup"""
         try:
-            # Look for backup files
-            backup_pattern = f"{data_type}_backup_*.json.gz"
-            backup_files = [f for f in os.listdir(self.backup_directory) if f.startswith(f"{data_type}_backup_")]
-            
-            if not backup_files:
-                return None
-            
-            # Sort by timestamp (newest first)
-            backup_files.sort(reverse=True)
-            
-            for backup_file in backup_files[:3]:  # Try last 3 backups
-                try:
-                    backup_path = os.path.join(self.backup_directory, backup_file)
-                    with gzip.open(backup_path, 'rt') as f:
-                        backup_data = json.load(f)
-                    
-                    # Validate backup data
-                    is_valid, _ = self.validate_data(backup_data, data_type)
-                    if is_valid:
-                        return backup_data
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to load backup {backup_file}: {e}")
-                    continue
+            # Try the last 3 intact backups, newest first
+            for backup_data in self.backup_writer.recent_records(data_type, limit=3):
+                is_valid, _ = self.validate_data(backup_data, data_type)
+                if is_valid:
+                    return backup_data
             
             return None
             
@@ -827,7 +833,10 @@ class DataValidator:
     
     def backup_data(self, data: Dict[str, Any], data_type: str, identifier: str = None) -> bool:
         """
-        Create backup of data
+        Queue a backup of data
+        
+        The record is written to a rotating segment by the background backup
+        writer; retention is applied there as segments are written.
         
         Args:
             data: Data to backup
@@ -835,49 +844,14 @@ class DataValidator:
             identifier: Optional identifier for the backup
             
         Returns:
-            True if backup successful, False otherwise
+            True if the backup was queued, False otherwise
         """
         try:
-            timestamp = int(time.time())
-            identifier_str = f"_{identifier}" if identifier else ""
-            backup_filename = f"{data_type}_backup_{timestamp}{identifier_str}.json.gz"
-            backup_path = os.path.join(self.backup_directory, backup_filename)
-            
-            # Add checksum to data
-            data_with_checksum = data.copy()
-            data_with_checksum['backup_checksum'] = self._calculate_checksum(data)
-            data_with_checksum['backup_timestamp'] = timestamp
-            
-            # Compress and save
-            with gzip.open(backup_path, 'wt') as f:
-                json.dump(data_with_checksum, f, indent=2, default=str)
-            
-            logger.info(f"Data backup created: {backup_filename}")
-            
-            # Clean up old backups
-            self._cleanup_old_backups(data_type)
-            
-            return True
-            
+            return self.backup_writer.enqueue(data, data_type, identifier)
         except Exception as e:
             logger.error(f"Data backup failed: {e}")
             return False
     
-    def _cleanup_old_backups(self, data_type: str):
-        """Clean up old backup files"""
-        try:
-            cutoff_time = time.time() - (self.backup_retention_days * 24 * 3600)
-            
-            for filename in os.listdir(self.backup_directory):
-                if filename.startswith(f"{data_type}_backup_"):
-                    file_path = os.path.join(self.backup_directory, filename)
-                    if os.path.getctime(file_path) < cutoff_time:
-                        os.remove(file_path)
-                        logger.debug(f"Removed old backup: {filename}")
-                        
-        except Exception as e:
-            logger.error(f"Backup cleanup failed: {e}")
-    
     def _calculate_checksum(self, data: Any) -> str:
         """Calculate SHA-256 checksum of data"""
         try:
@@ -916,13 +890,17 @@ class DataValidator:
             "backup_retention_days": self.backup_retention_days,
             "max_recovery_attempts": self.max_recovery_attempts,
             "available_schemas": list(self.validation_schemas.keys()),
-            "checksums_tracked": len(self.data_checksums)
+            "checksums_tracked": len(self.data_checksums),
+            "backups": self.backup_writer.get_statistics()
         }
     
     async def cleanup(self):
         """Cleanup data validator resources"""
         logger.info("Cleaning up data validator...")
         
+        # Write out queued backups
+        await asyncio.get_event_loop().run_in_executor(None, self.backup_writer.close)
+        
         # Save checksums
         self._save_checksums()
         
@@ -10,7 +10,19 @@ from .disruption import calculate_worker_disruption
 from .location import calculate_location_penalty
 from .capacity import validate_spawn_capacity
 from .exploration import ExplorationTracker
-from .gpu_utils import GPUCostFunction, get_gpu_cost_function, get_device, get_device_info
+
+# gpu_utils imports torch, so its exports are resolved on first access
+_GPU_EXPORTS = ('GPUCostFunction', 'get_gpu_cost_function', 'get_device', 'get_device_info')
+
+
+def __getattr__(name):
+    if name not in _GPU_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from . import gpu_utils
+    value = getattr(gpu_utils, name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'chunk_to_coords',
@@ -3,6 +3,11 @@ Dashboard Metrics Collection
 
 Singleton class for collecting and aggregating dashboard metrics.
 Thread-safe for concurrent access from message handler and API endpoint.
+
+Aggregates are maintained as records arrive, so building a snapshot never
+scans the history deques. Every record bumps a version number; full
+snapshots are cached and shared between pollers, and get_delta() returns
+only what changed since a version the client already has.
 """
 
 import time
@@ -12,6 +17,8 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional, Deque, Any
 from collections import deque
 
+from ..rolling_stats import RollingWindow
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +43,45 @@ class GateDecisionRecord:
     timestamp: float
 
 
+class _SeriesVersions:
+    """Version of each entry in a bounded history deque, for delta queries."""
+
+    def __init__(self, maxlen: int):
+        self.versions: Deque[int] = deque(maxlen=maxlen)
+
+    def append(self, version: int) -> None:
+        self.versions.append(version)
+
+    def count_since(self, since: int) -> int:
+        """Number of entries recorded after version since (O(new entries))."""
+        count = 0
+        for version in reversed(self.versions):
+            if version <= since:
+                break
+            count += 1
+        return count
+
+    def clear(self) -> None:
+        self.versions.clear()
+
+
+def _tail(history: Deque, count: int) -> List:
+    """Last count entries of a deque without copying the whole deque."""
+    if count <= 0:
+        return []
+    result = []
+    for item in reversed(history):
+        result.append(item)
+        if len(result) >= count:
+            break
+    result.reverse()
+    return result
+
+
+GATE_REASONS = ('positive_reward', 'negative_reward', 'insufficient_energy')
+GATE_COMPONENTS = ('survival', 'disruption', 'location', 'exploration')
+
+
 class DashboardMetrics:
     """
     Singleton class for collecting and aggregating dashboard metrics.
@@ -44,6 +90,11 @@ class DashboardMetrics:
     _instance: Optional['DashboardMetrics'] = None
     _lock = threading.Lock()
 
+    SNAPSHOT_INTERVAL = 0.5  # Seconds a shared snapshot may be reused by pollers
+    RECENT_DECISIONS_SHOWN = 10  # Recent decisions included in snapshots
+    REWARD_HISTORY_SHOWN = 50  # Gate rewards included in snapshots
+    ENTROPY_HISTORY_SHOWN = 100  # Entropy points included in snapshots
+
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -99,11 +150,51 @@ class DashboardMetrics:
         # Pipeline visualization - stores the most recent decision details
         self.last_pipeline: Optional[Dict] = None
 
+        self._init_aggregates()
+
         self._initialized = True
         self._data_lock = threading.Lock()
+        self._snapshot_lock = threading.Lock()  # Serializes snapshot rebuilds
 
         logger.info("DashboardMetrics singleton initialized")
 
+    def _init_aggregates(self) -> None:
+        """Create running aggregates and version tracking (data lock held or not yet shared)."""
+        # Gate window aggregates, updated on append and eviction
+        self._gate_sent_count = 0
+        self._gate_reason_counts: Dict[str, int] = {reason: 0 for reason in GATE_REASONS}
+        self._gate_component_sums: Dict[str, float] = {comp: 0.0 for comp in GATE_COMPONENTS}
+        self._gate_appends_since_resync = 0
+        self._gate_sequence = 0
+        self._gate_rewards: Deque = deque(maxlen=self.REWARD_HISTORY_SHOWN)  # (sequence, reward)
+
+        # Training averages
+        self._loss_window = RollingWindow(self.loss_history.maxlen)
+        self._simulation_reward_window = RollingWindow(self.simulation_rewards.maxlen)
+        self._real_reward_window = RollingWindow(self.real_rewards.maxlen)
+
+        # Versioning: every record bumps the version
+        self._version = 0
+        self._reset_version = 0
+        self._chunk_versions: List[int] = [0] * 256
+        self._pipeline_version = 0
+        self._game_state_version = 0
+        self._decision_versions = _SeriesVersions(self.recent_decisions.maxlen)
+        self._loss_versions = _SeriesVersions(self.loss_history.maxlen)
+        self._simulation_reward_versions = _SeriesVersions(self.simulation_rewards.maxlen)
+        self._real_reward_versions = _SeriesVersions(self.real_rewards.maxlen)
+        self._entropy_versions = _SeriesVersions(self.entropy_history.maxlen)
+
+        # Shared snapshot cache
+        self._snapshot: Optional[Dict] = None
+        self._snapshot_version = -1
+        self._snapshot_time = 0.0
+
+    @property
+    def version(self) -> int:
+        """Current metrics version (incremented on every record)."""
+        return self._version
+
     def record_nn_decision(
         self,
         chunk: int,
@@ -125,12 +216,14 @@ class DashboardMetrics:
         with self._data_lock:
             # Update chunk frequency (total and sent/skipped)
             # NN outputs chunks 0-255 (256 spawn locations)
+            self._version += 1
             if 0 <= chunk < 256:
                 self.chunk_frequency[chunk] += 1
                 if sent:
                     self.chunk_sent[chunk] += 1
                 else:
                     self.chunk_skipped[chunk] += 1
+                self._chunk_versions[chunk] = self._version
 
             # Add to recent decisions
             decision = NNDecisionRecord(
@@ -142,6 +235,7 @@ class DashboardMetrics:
                 timestamp=time.time()
             )
             self.recent_decisions.append(decision)
+            self._decision_versions.append(self._version)
 
             # Update type counts
             if spawn_type in self.type_counts:
@@ -195,7 +289,8 @@ class DashboardMetrics:
                 components=safe_components,
                 timestamp=time.time()
             )
-            self.gate_decisions.append(record)
+            self._version += 1
+            self._append_gate_record(record)
 
             # Update wait streak
             if decision == 'WAIT':
@@ -213,6 +308,7 @@ class DashboardMetrics:
                     self.missed_opportunities += 1
 
             # Store pipeline data for visualization (use sanitized components)
+            self._pipeline_version = self._version
             self.last_pipeline = {
                 'observation': observation_summary or {},
                 'nn_inference': nn_inference or {},
@@ -235,6 +331,38 @@ class DashboardMetrics:
                 }
             }
 
+    def _add_gate_aggregates(self, record: GateDecisionRecord, sign: int) -> None:
+        if record.decision == 'SEND':
+            self._gate_sent_count += sign
+        if record.reason in self._gate_reason_counts:
+            self._gate_reason_counts[record.reason] += sign
+        for comp in GATE_COMPONENTS:
+            value = record.components.get(comp, 0.0)
+            if isinstance(value, (int, float)):
+                self._gate_component_sums[comp] += sign * value
+
+    def _append_gate_record(self, record: GateDecisionRecord) -> None:
+        """Append a gate decision and update window aggregates (data lock held)."""
+        if len(self.gate_decisions) == self.gate_decisions.maxlen:
+            self._add_gate_aggregates(self.gate_decisions[0], -1)
+        self.gate_decisions.append(record)
+        self._add_gate_aggregates(record, 1)
+
+        self._gate_sequence += 1
+        if record.expected_reward > -999:
+            self._gate_rewards.append((self._gate_sequence, record.expected_reward))
+
+        # Recompute float sums once per window to bound drift
+        self._gate_appends_since_resync += 1
+        if self._gate_appends_since_resync >= self.gate_decisions.maxlen:
+            self._gate_component_sums = {comp: 0.0 for comp in GATE_COMPONENTS}
+            for comp in GATE_COMPONENTS:
+                for d in self.gate_decisions:
+                    value = d.components.get(comp, 0.0)
+                    if isinstance(value, (int, float)):
+                        self._gate_component_sums[comp] += value
+            self._gate_appends_since_resync = 0
+
     def record_training_step(
         self,
         loss: float,
@@ -254,11 +382,18 @@ class DashboardMetrics:
             buffer_size: Current replay buffer size
         """
         with self._data_lock:
+            self._version += 1
             self.loss_history.append(loss)
+            self._loss_window.append(loss)
+            self._loss_versions.append(self._version)
             if is_simulation:
                 self.simulation_rewards.append(reward)
+                self._simulation_reward_window.append(reward)
+                self._simulation_reward_versions.append(self._version)
             else:
                 self.real_rewards.append(reward)
+                self._real_reward_window.append(reward)
+                self._real_reward_versions.append(self._version)
             self.total_training_steps += 1
 
             # Update background training stats
@@ -286,6 +421,8 @@ class DashboardMetrics:
             self.max_entropy = max_entropy
             self.effective_actions = effective_actions
             self.entropy_history.append(entropy)
+            self._version += 1
+            self._entropy_versions.append(self._version)
 
     def update_game_state(self, game_state: Dict) -> None:
         """
@@ -296,122 +433,261 @@ class DashboardMetrics:
         """
         with self._data_lock:
             self.current_game_state = game_state.copy()
+            self._version += 1
+            self._game_state_version = self._version
 
-    def get_snapshot(self) -> Dict:
+    def get_snapshot(self, max_age: Optional[float] = None) -> Dict:
         """
         Get complete metrics snapshot for API response.
 
+        The snapshot is cached and shared between callers, so it must not be
+        modified. It is rebuilt when the metrics version has changed, unless
+        the cached copy is younger than max_age.
+
+        Args:
+            max_age: Seconds a stale cached snapshot may still be returned
+                (None always returns current data)
+
         Returns:
             Dictionary with all dashboard data
         """
-        with self._data_lock:
+        with self._snapshot_lock:
             current_time = time.time()
-
-            # Calculate gate statistics
-            recent_gate = list(self.gate_decisions)
-            total_decisions = len(recent_gate)
-            sent_count = sum(1 for d in recent_gate if d.decision == 'SEND')
-            pass_rate = sent_count / total_decisions if total_decisions > 0 else 0.0
-
-            # Decision reasons breakdown
-            reasons = {
-                'positive_reward': 0,
-                'negative_reward': 0,
-                'insufficient_energy': 0
+            cached = self._snapshot
+            if cached is not None and (
+                self._snapshot_version == self._version
+                or (max_age is not None and current_time - self._snapshot_time < max_age)
+            ):
+                return self._with_times(cached, current_time)
+
+            with self._data_lock:
+                version = self._version
+                state = self._capture_state()
+
+            snapshot = self._build_snapshot(state, version)
+            self._snapshot = snapshot
+            self._snapshot_version = version
+            self._snapshot_time = current_time
+            return self._with_times(snapshot, current_time)
+
+    def _capture_state(self) -> Dict:
+        """Copy everything a full snapshot needs (data lock held, no per-record work)."""
+        sequence_floor = self._gate_sequence - len(self.gate_decisions)
+        return {
+            'start_time': self.start_time,
+            'last_action_time': self.last_action_time,
+            'chunk_frequency': self.chunk_frequency.copy(),
+            'chunk_sent': self.chunk_sent.copy(),
+            'chunk_skipped': self.chunk_skipped.copy(),
+            'recent_decisions': _tail(self.recent_decisions, self.RECENT_DECISIONS_SHOWN),
+            'decision_aggregates': self._capture_decision_aggregates(),
+            'gate_behavior': self._capture_gate_behavior(sequence_floor),
+            'loss_history': list(self.loss_history),
+            'simulation_rewards': list(self.simulation_rewards),
+            'real_rewards': list(self.real_rewards),
+            'training_aggregates': self._capture_training_aggregates(),
+            'entropy_history': _tail(self.entropy_history, self.ENTROPY_HISTORY_SHOWN),
+            'entropy': self._capture_entropy(),
+            'game_state': self.current_game_state.copy(),
+            'pipeline': self.last_pipeline
+        }
+
+    def _capture_decision_aggregates(self) -> Dict:
+        return {
+            'type_counts': self.type_counts.copy(),
+            'confidence_histogram': self.confidence_bins.copy(),
+            'no_spawn_stats': {
+                'total_no_spawn': self.no_spawn_decisions,
+                'correct_no_spawn': self.correct_no_spawn,
+                'missed_opportunities': self.missed_opportunities,
+                'no_spawn_accuracy': round(
+                    self.correct_no_spawn / self.no_spawn_decisions if self.no_spawn_decisions > 0 else 0.0, 3
+                )
             }
-            for d in recent_gate:
-                if d.reason in reasons:
-                    reasons[d.reason] += 1
-
-            # Average components
-            avg_components = {
-                'survival': 0.0,
-                'disruption': 0.0,
-                'location': 0.0,
-                'exploration': 0.0
+        }
+
+    def _capture_gate_behavior(self, sequence_floor: int) -> Dict:
+        total_decisions = len(self.gate_decisions)
+        pass_rate = self._gate_sent_count / total_decisions if total_decisions > 0 else 0.0
+        avg_components = {
+            comp: (total / total_decisions if total_decisions > 0 else 0.0)
+            for comp, total in self._gate_component_sums.items()
+        }
+        # Rewards of gate decisions still in the window, newest last
+        reward_history = [r for seq, r in self._gate_rewards if seq > sequence_floor]
+        return {
+            'pass_rate': round(pass_rate, 3),
+            'decision_reasons': self._gate_reason_counts.copy(),
+            'avg_components': {k: round(v, 3) for k, v in avg_components.items()},
+            'reward_history': [round(r, 3) for r in reward_history],
+            'wait_streak': self.wait_streak
+        }
+
+    def _capture_training_aggregates(self) -> Dict:
+        reward_count = len(self._simulation_reward_window) + len(self._real_reward_window)
+        reward_sum = self._simulation_reward_window.sum() + self._real_reward_window.sum()
+        return {
+            'total_steps': self.total_training_steps,
+            'avg_loss': round(self._loss_window.mean(), 4),
+            'avg_reward': round(reward_sum / reward_count if reward_count else 0.0, 3),
+            'model_version': self.model_version,
+            'buffer_size': self.buffer_size,
+            'stats': {
+                'training_count': self.total_training_steps
             }
-            if recent_gate:
-                for comp in avg_components:
-                    values = [d.components.get(comp, 0.0) for d in recent_gate]
-                    avg_components[comp] = sum(values) / len(values) if values else 0.0
-
-            # Reward history from gate decisions (filter out -inf values)
-            reward_history = [
-                d.expected_reward for d in recent_gate
-                if d.expected_reward > -999
-            ][-50:]
-
-            # Training statistics
-            loss_list = list(self.loss_history)
-            sim_rewards = list(self.simulation_rewards)
-            real_rewards = list(self.real_rewards)
-
-            # Calculate averages
-            avg_loss = sum(loss_list) / len(loss_list) if loss_list else 0.0
-            all_rewards = sim_rewards + real_rewards
-            avg_reward = sum(all_rewards) / len(all_rewards) if all_rewards else 0.0
-
-            return {
-                'timestamp': current_time,
-                'uptime_seconds': current_time - self.start_time,
-                'nn_decisions': {
-                    'chunk_frequency': self.chunk_frequency.copy(),
-                    'chunk_sent': self.chunk_sent.copy(),
-                    'chunk_skipped': self.chunk_skipped.copy(),
-                    'recent_decisions': [
-                        {
-                            'chunk': d.chunk,
-                            'type': d.spawn_type,
-                            'confidence': round(d.confidence, 3),
-                            'sent': d.sent,
-                            'timestamp': d.timestamp
-                        }
-                        for d in list(self.recent_decisions)[-10:]
-                    ],
-                    'type_counts': self.type_counts.copy(),
-                    'confidence_histogram': self.confidence_bins.copy(),
-                    'no_spawn_stats': {
-                        'total_no_spawn': self.no_spawn_decisions,
-                        'correct_no_spawn': self.correct_no_spawn,
-                        'missed_opportunities': self.missed_opportunities,
-                        'no_spawn_accuracy': round(
-                            self.correct_no_spawn / self.no_spawn_decisions if self.no_spawn_decisions > 0 else 0.0, 3
-                        )
-                    }
-                },
-                'gate_behavior': {
-                    'pass_rate': round(pass_rate, 3),
-                    'decision_reasons': reasons,
-                    'avg_components': {k: round(v, 3) for k, v in avg_components.items()},
-                    'reward_history': [round(r, 3) for r in reward_history],
-                    'wait_streak': self.wait_streak,
-                    'time_since_last_action': round(current_time - self.last_action_time, 1)
-                },
-                'training': {
-                    'loss_history': [round(l, 4) for l in loss_list],
-                    'simulation_rewards': [round(r, 3) for r in sim_rewards],
-                    'real_rewards': [round(r, 3) for r in real_rewards],
-                    'total_steps': self.total_training_steps,
-                    'avg_loss': round(avg_loss, 4),
-                    'avg_reward': round(avg_reward, 3),
-                    'model_version': self.model_version,
-                    'buffer_size': self.buffer_size,
-                    'stats': {
-                        'training_count': self.total_training_steps
-                    }
-                },
-                'entropy': {
-                    'current': round(self.current_entropy, 3),
-                    'max': round(self.max_entropy, 3),
-                    'ratio': round(self.current_entropy / self.max_entropy, 3) if self.max_entropy > 0 else 0,
-                    'effective_actions': round(self.effective_actions, 1),
-                    'total_actions': 5,  # 5 chunks (no NO_SPAWN - Gate handles that)
-                    'history': [round(e, 3) for e in list(self.entropy_history)[-100:]],
-                    'health': self._get_entropy_health()
-                },
-                'game_state': self.current_game_state.copy(),
-                'pipeline': self.last_pipeline
+        }
+
+    def _capture_entropy(self) -> Dict:
+        return {
+            'current': round(self.current_entropy, 3),
+            'max': round(self.max_entropy, 3),
+            'ratio': round(self.current_entropy / self.max_entropy, 3) if self.max_entropy > 0 else 0,
+            'effective_actions': round(self.effective_actions, 1),
+            'total_actions': 5,  # 5 chunks (no NO_SPAWN - Gate handles that)
+            'health': self._get_entropy_health()
+        }
+
+    @staticmethod
+    def _format_decision(d: NNDecisionRecord) -> Dict:
+        return {
+            'chunk': d.chunk,
+            'type': d.spawn_type,
+            'confidence': round(d.confidence, 3),
+            'sent': d.sent,
+            'timestamp': d.timestamp
+        }
+
+    def _build_snapshot(self, state: Dict, version: int) -> Dict:
+        """Format a captured state as the full snapshot (runs outside the data lock)."""
+        return {
+            'version': version,
+            'full': True,
+            'start_time': state['start_time'],
+            'last_action_time': state['last_action_time'],
+            'nn_decisions': {
+                'chunk_frequency': state['chunk_frequency'],
+                'chunk_sent': state['chunk_sent'],
+                'chunk_skipped': state['chunk_skipped'],
+                'recent_decisions': [self._format_decision(d) for d in state['recent_decisions']],
+                **state['decision_aggregates']
+            },
+            'gate_behavior': state['gate_behavior'],
+            'training': {
+                'loss_history': [round(l, 4) for l in state['loss_history']],
+                'simulation_rewards': [round(r, 3) for r in state['simulation_rewards']],
+                'real_rewards': [round(r, 3) for r in state['real_rewards']],
+                **state['training_aggregates']
+            },
+            'entropy': {
+                **state['entropy'],
+                'history': [round(e, 3) for e in state['entropy_history']]
+            },
+            'game_state': state['game_state'],
+            'pipeline': state['pipeline']
+        }
+
+    @staticmethod
+    def _with_times(snapshot: Dict, current_time: float) -> Dict:
+        """Shallow copy of a cached snapshot or delta with wall-clock fields filled in."""
+        result = dict(snapshot)
+        result['timestamp'] = current_time
+        result['uptime_seconds'] = current_time - snapshot['start_time']
+        result['gate_behavior'] = {
+            **snapshot['gate_behavior'],
+            'time_since_last_action': round(current_time - snapshot['last_action_time'], 1)
+        }
+        return result
+
+    def get_delta(self, since: int) -> Dict:
+        """
+        Get the changes recorded after a version the client already has.
+
+        New history entries are returned under new_* keys (capped to what a
+        full snapshot shows; clients append them and trim to the same
+        lengths). Changed heatmap cells are returned as
+        [chunk, frequency, sent, skipped] rows. Small aggregates are always
+        included. The pipeline and game state are included only when they
+        changed. If the client's version predates a reset or is unknown,
+        a full snapshot is returned instead ('full': True).
+
+        Args:
+            since: Version from a previous snapshot or delta
+
+        Returns:
+            Delta dictionary with 'version', 'since' and 'full': False
+        """
+        with self._data_lock:
+            version = self._version
+            if since < self._reset_version or since > version:
+                resync = True
+            else:
+                resync = False
+                state = self._capture_delta_state(since)
+
+        if resync:
+            return self.get_snapshot()
+
+        nn_decisions = {
+            'chunk_updates': state['chunk_updates'],
+            'new_decisions': [self._format_decision(d) for d in state['new_decisions']],
+            **state['decision_aggregates']
+        }
+        delta = {
+            'version': version,
+            'since': since,
+            'full': False,
+            'start_time': state['start_time'],
+            'last_action_time': state['last_action_time'],
+            'nn_decisions': nn_decisions,
+            'gate_behavior': state['gate_behavior'],
+            'training': {
+                'new_loss': [round(l, 4) for l in state['new_loss']],
+                'new_simulation_rewards': [round(r, 3) for r in state['new_simulation_rewards']],
+                'new_real_rewards': [round(r, 3) for r in state['new_real_rewards']],
+                **state['training_aggregates']
+            },
+            'entropy': {
+                **state['entropy'],
+                'new_history': [round(e, 3) for e in state['new_entropy']]
             }
+        }
+        if 'game_state' in state:
+            delta['game_state'] = state['game_state']
+        if 'pipeline' in state:
+            delta['pipeline'] = state['pipeline']
+        return self._with_times(delta, time.time())
+
+    def _capture_delta_state(self, since: int) -> Dict:
+        """Copy what changed after version since (data lock held)."""
+        state = {
+            'start_time': self.start_time,
+            'last_action_time': self.last_action_time,
+            'chunk_updates': [
+                [chunk, self.chunk_frequency[chunk], self.chunk_sent[chunk], self.chunk_skipped[chunk]]
+                for chunk, chunk_version in enumerate(self._chunk_versions)
+                if chunk_version > since
+            ],
+            'new_decisions': _tail(self.recent_decisions, min(
+                self._decision_versions.count_since(since), self.RECENT_DECISIONS_SHOWN
+            )),
+            'decision_aggregates': self._capture_decision_aggregates(),
+            'gate_behavior': self._capture_gate_behavior(self._gate_sequence - len(self.gate_decisions)),
+            'new_loss': _tail(self.loss_history, self._loss_versions.count_since(since)),
+            'new_simulation_rewards': _tail(
+                self.simulation_rewards, self._simulation_reward_versions.count_since(since)
+            ),
+            'new_real_rewards': _tail(self.real_rewards, self._real_reward_versions.count_since(since)),
+            'training_aggregates': self._capture_training_aggregates(),
+            'new_entropy': _tail(self.entropy_history, min(
+                self._entropy_versions.count_since(since), self.ENTROPY_HISTORY_SHOWN
+            )),
+            'entropy': self._capture_entropy()
+        }
+        if self._game_state_version > since:
+            state['game_state'] = self.current_game_state.copy()
+        if self._pipeline_version > since:
+            state['pipeline'] = self.last_pipeline
+        return state
 
     def _get_entropy_health(self) -> str:
         """
@@ -467,6 +743,12 @@ class DashboardMetrics:
             self.current_game_state = {}
             self.last_pipeline = None
 
+            # Versions keep increasing across resets so stale clients resync
+            version = self._version + 1
+            self._init_aggregates()
+            self._version = version
+            self._reset_version = version
+
             logger.info("DashboardMetrics reset")
 
 
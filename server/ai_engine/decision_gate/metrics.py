@@ -3,14 +3,21 @@ Gate Metrics Collection
 
 Collects and aggregates statistics for simulation-gated inference.
 Provides rolling windows for time-series analysis.
+
+Rolling statistics are kept in fixed-size NumPy ring arrays with running
+sums, so whole-window queries are O(1) and sub-window queries are a single
+vector reduction.
 """
 
+import math
 import time
 import logging
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from collections import deque
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,6 +40,7 @@ class GateMetrics:
     - Gate pass rate over time
     - Average expected reward
     - Component breakdowns
+    - Current WAIT streak
     """
 
     def __init__(self, window_size: int = 100):
@@ -44,6 +52,7 @@ class GateMetrics:
         """
         self.window_size = window_size
         self.samples: deque = deque(maxlen=window_size)
+        self._init_window()
 
         # Lifetime counters
         self.total_evaluations = 0
@@ -60,6 +69,85 @@ class GateMetrics:
         self.cumulative_expected_reward = 0.0
         self.cumulative_actual_reward = 0.0
 
+    def _init_window(self) -> None:
+        """Create the ring arrays and running sums for the rolling window."""
+        self._head = 0  # Next slot to write
+        self._count = 0
+        self._sent = np.zeros(self.window_size, dtype=bool)
+        self._rewards = np.zeros(self.window_size, dtype=np.float64)
+        self._reward_valid = np.zeros(self.window_size, dtype=bool)  # False for -inf
+
+        # One column per component name, in order of first appearance
+        self._component_index: Dict[str, int] = {}
+        self._component_values = np.zeros((self.window_size, 0), dtype=np.float64)
+        self._component_present = np.zeros((self.window_size, 0), dtype=bool)
+
+        self._window_sends = 0
+        self._window_reward_sum = 0.0
+        self._window_reward_count = 0
+        self._appends_since_resync = 0
+        self._wait_streak = 0
+
+    def _component_column(self, name: str) -> int:
+        """Column for a component name, adding one on first use."""
+        column = self._component_index.get(name)
+        if column is None:
+            column = len(self._component_index)
+            self._component_index[name] = column
+            self._component_values = np.hstack(
+                [self._component_values, np.zeros((self.window_size, 1), dtype=np.float64)]
+            )
+            self._component_present = np.hstack(
+                [self._component_present, np.zeros((self.window_size, 1), dtype=bool)]
+            )
+        return column
+
+    def _append_window(self, decision: str, expected_reward: float, components: Dict[str, float]) -> None:
+        """Write one evaluation into the ring arrays, evicting the oldest when full."""
+        slot = self._head
+        if self._count == self.window_size:
+            # Evict the sample being overwritten from the running sums
+            self._window_sends -= int(self._sent[slot])
+            if self._reward_valid[slot]:
+                self._window_reward_sum -= self._rewards[slot]
+                self._window_reward_count -= 1
+        else:
+            self._count += 1
+
+        sent = decision == 'SEND'
+        reward_valid = expected_reward != float('-inf')
+        self._sent[slot] = sent
+        self._rewards[slot] = expected_reward if reward_valid else 0.0
+        self._reward_valid[slot] = reward_valid
+        self._window_sends += int(sent)
+        if reward_valid:
+            self._window_reward_sum += expected_reward
+            self._window_reward_count += 1
+
+        self._component_present[slot] = False
+        self._component_values[slot] = 0.0
+        for name, value in components.items():
+            column = self._component_column(name)
+            self._component_values[slot, column] = value
+            self._component_present[slot, column] = True
+
+        self._head = (slot + 1) % self.window_size
+
+        # Recompute the float sum once per window (or after inf arithmetic) to bound drift
+        self._appends_since_resync += 1
+        if self._appends_since_resync >= self.window_size or not math.isfinite(self._window_reward_sum):
+            self._window_reward_sum = float(self._rewards[self._reward_valid].sum())
+            self._appends_since_resync = 0
+
+    def _recent(self, array: np.ndarray, n: int) -> np.ndarray:
+        """Rows of a ring array for the n most recent samples (n <= count)."""
+        if n >= self._count:
+            return array[:self._count] if self._count < self.window_size else array
+        start = self._head - n
+        if start >= 0:
+            return array[start:self._head]
+        return np.concatenate([array[start:], array[:self._head]])
+
     def record_evaluation(
         self,
         decision: str,
@@ -89,11 +177,17 @@ class GateMetrics:
             components=components
         )
         self.samples.append(sample)
+        self._append_window(decision, expected_reward, components)
 
         # Update lifetime counters
         self.total_evaluations += 1
         self.last_evaluation_time = now
 
+        if decision == 'WAIT':
+            self._wait_streak += 1
+        else:
+            self._wait_streak = 0
+
         if decision == 'SEND':
             self.total_sends += 1
             self.last_action_time = now
@@ -120,15 +214,13 @@ class GateMetrics:
         Returns:
             Pass rate as fraction [0, 1]
         """
-        samples = list(self.samples)
-        if window:
-            samples = samples[-window:]
-
-        if not samples:
+        if self._count == 0:
             return 0.0
 
-        sends = sum(1 for s in samples if s.decision == 'SEND')
-        return sends / len(samples)
+        if not window or window >= self._count:
+            return self._window_sends / self._count
+
+        return int(np.count_nonzero(self._recent(self._sent, window))) / window
 
     def get_lifetime_pass_rate(self) -> float:
         """Get lifetime gate pass rate."""
@@ -146,17 +238,16 @@ class GateMetrics:
         Returns:
             Average expected reward
         """
-        samples = list(self.samples)
-        if window:
-            samples = samples[-window:]
-
-        valid_rewards = [s.expected_reward for s in samples
-                        if s.expected_reward != float('-inf')]
-
-        if not valid_rewards:
+        if not window or window >= self._count:
+            if self._window_reward_count == 0:
+                return 0.0
+            return self._window_reward_sum / self._window_reward_count
+
+        valid = self._recent(self._reward_valid, window)
+        valid_count = int(np.count_nonzero(valid))
+        if valid_count == 0:
             return 0.0
-
-        return sum(valid_rewards) / len(valid_rewards)
+        return float(self._recent(self._rewards, window).sum()) / valid_count
 
     def get_time_since_last_action(self) -> float:
         """Get seconds since last SEND decision."""
@@ -165,14 +256,8 @@ class GateMetrics:
         return time.time() - self.last_action_time
 
     def get_wait_streak(self) -> int:
-        """Get number of consecutive WAIT decisions."""
-        streak = 0
-        for sample in reversed(list(self.samples)):
-            if sample.decision == 'WAIT':
-                streak += 1
-            else:
-                break
-        return streak
+        """Get number of consecutive WAIT decisions (within the rolling window)."""
+        return min(self._wait_streak, self._count)
 
     def get_average_components(self, window: Optional[int] = None) -> Dict[str, float]:
         """
@@ -184,28 +269,17 @@ class GateMetrics:
         Returns:
             Dict of component name -> average value
         """
-        samples = list(self.samples)
-        if window:
-            samples = samples[-window:]
-
-        if not samples:
+        if self._count == 0:
             return {}
 
-        # Collect all component values
-        component_sums: Dict[str, float] = {}
-        component_counts: Dict[str, int] = {}
-
-        for sample in samples:
-            for name, value in sample.components.items():
-                if name not in component_sums:
-                    component_sums[name] = 0.0
-                    component_counts[name] = 0
-                component_sums[name] += value
-                component_counts[name] += 1
+        n = window if window else self._count
+        component_sums = self._recent(self._component_values, n).sum(axis=0)
+        component_counts = np.count_nonzero(self._recent(self._component_present, n), axis=0)
 
         return {
-            name: component_sums[name] / component_counts[name]
-            for name in component_sums
+            name: float(component_sums[column]) / int(component_counts[column])
+            for name, column in self._component_index.items()
+            if component_counts[column] > 0
         }
 
     def get_statistics(self) -> Dict:
@@ -241,6 +315,7 @@ class GateMetrics:
     def reset(self) -> None:
         """Reset all metrics."""
         self.samples.clear()
+        self._init_window()
         self.total_evaluations = 0
         self.total_sends = 0
         self.total_waits = 0
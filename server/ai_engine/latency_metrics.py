@@ -0,0 +1,243 @@
+"""
+Latency Metrics - Per-stage latency histograms with Prometheus text export
+
+Pipeline stages are timed with the monotonic perf_counter clock and
+recorded into fixed-bucket histograms keyed by (message type, stage). A
+stage costs one clock read and one bisect over the bucket bounds, so the
+timers stay on in production. render_prometheus() writes the histograms
+and any gauges (buffer depth, model version, ...) and counters (messages,
+training steps) in the Prometheus text exposition format for the /metrics
+endpoint.
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Bucket upper bounds in seconds: 1-2.5-5 steps from 10us to 10s
+DEFAULT_BUCKETS: Tuple[float, ...] = tuple(
+    round(base * 10.0 ** exponent, 9)
+    for exponent in range(-5, 1)
+    for base in (1.0, 2.5, 5.0)
+) + (10.0,)
+
+METRIC_PREFIX = "queen_ai"
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    A histogram is written by one thread (the event loop, or the training
+    thread for training stages); reads for export may happen from any thread.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        """Record one duration in seconds"""
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Approximate quantile in seconds (upper bound of the bucket holding it).
+
+        Returns:
+            Bucket bound, the largest finite bound for the +Inf bucket, or 0.0 if empty
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(q * self.count))
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return self.bounds[min(i, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+    def cumulative_counts(self) -> List[int]:
+        """Counts of observations <= each bound, then the total (+Inf)"""
+        cumulative = []
+        running = 0
+        for bucket_count in self.counts:
+            running += bucket_count
+            cumulative.append(running)
+        return cumulative
+
+
+class StageTimer:
+    """
+    Times consecutive stages of one pipeline run.
+
+    Each lap() records the time since the previous lap (or since the timer
+    was created) under the given stage; finish() records the whole run.
+    """
+
+    __slots__ = ("_metrics", "message_type", "_start", "_last")
+
+    def __init__(self, metrics: "LatencyMetrics", message_type: str):
+        self._metrics = metrics
+        self.message_type = message_type
+        self._start = self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        """Record the time since the previous lap under a stage"""
+        now = time.perf_counter()
+        self._metrics.observe(stage, now - self._last, self.message_type)
+        self._last = now
+
+    def finish(self, stage: str = "total") -> None:
+        """Record the time since the timer started"""
+        self._metrics.observe(stage, time.perf_counter() - self._start, self.message_type)
+
+
+class LatencyMetrics:
+    """
+    Registry of per-(message type, stage) latency histograms, gauges and counters.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._gauges: Dict[str, Tuple[float, str]] = {}
+        self._counters: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()  # Guards registration, not observations
+
+    def histogram(self, stage: str, message_type: str) -> LatencyHistogram:
+        """Get (creating if needed) the histogram for a stage of a message type"""
+        key = (message_type, stage)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram(self.buckets))
+        return histogram
+
+    def observe(self, stage: str, seconds: float, message_type: str) -> None:
+        """Record a stage duration in seconds"""
+        self.histogram(stage, message_type).observe(seconds)
+
+    def stage_timer(self, message_type: str) -> StageTimer:
+        """Start timing the stages of one pipeline run"""
+        return StageTimer(self, message_type)
+
+    @contextmanager
+    def time(self, stage: str, message_type: str) -> Iterator[None]:
+        """Time a block as one stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, message_type)
+
+    def set_gauge(self, name: str, value: float, help_text: str = "") -> None:
+        """Set a gauge exported alongside the histograms (name without prefix)"""
+        with self._lock:
+            self._gauges[name] = (float(value), help_text)
+
+    def set_counter(self, name: str, value: float, help_text: str = "") -> None:
+        """
+        Set a counter to a running total kept elsewhere (name without prefix or _total suffix).
+
+        The value must only grow (until a restart) for rate() to be meaningful.
+        """
+        with self._lock:
+            self._counters[name] = (float(value), help_text)
+
+    def _snapshot(self) -> Tuple[List[Tuple[Tuple[str, str], LatencyHistogram]],
+                                 List[Tuple[str, Tuple[float, str]]],
+                                 List[Tuple[str, Tuple[float, str]]]]:
+        """Sorted copies of the registries, so rendering never iterates a dict being registered into"""
+        with self._lock:
+            return (sorted(self._histograms.items()), sorted(self._gauges.items()),
+                    sorted(self._counters.items()))
+
+    def get_summary(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """
+        Get count, mean and approximate percentiles per message type and stage.
+
+        Returns:
+            {message_type: {stage: {count, mean_ms, p50_ms, p90_ms, p99_ms}}}
+        """
+        summary: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        histograms, _, _ = self._snapshot()
+        for (message_type, stage), histogram in histograms:
+            count = histogram.count
+            summary.setdefault(message_type, {})[stage] = {
+                "count": count,
+                "mean_ms": histogram.sum / count * 1000 if count else 0.0,
+                "p50_ms": histogram.quantile(0.5) * 1000,
+                "p90_ms": histogram.quantile(0.9) * 1000,
+                "p99_ms": histogram.quantile(0.99) * 1000
+            }
+        return summary
+
+    def render_prometheus(self) -> str:
+        """Render histograms, gauges and counters in the Prometheus text exposition format"""
+        histograms, gauges, counters = self._snapshot()
+        name = f"{METRIC_PREFIX}_stage_latency_seconds"
+        lines = [
+            f"# HELP {name} Time spent in each processing stage, per message type",
+            f"# TYPE {name} histogram"
+        ]
+        bounds = [_format_value(bound) for bound in self.buckets] + ["+Inf"]
+
+        for (message_type, stage), histogram in histograms:
+            labels = f'message_type="{_escape(message_type)}",stage="{_escape(stage)}"'
+            for bound, cumulative in zip(bounds, histogram.cumulative_counts()):
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"{name}_sum{{{labels}}} {_format_value(histogram.sum)}")
+            lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+        for gauge, (value, help_text) in gauges:
+            gauge_name = f"{METRIC_PREFIX}_{gauge}"
+            if help_text:
+                lines.append(f"# HELP {gauge_name} {help_text}")
+            lines.append(f"# TYPE {gauge_name} gauge")
+            lines.append(f"{gauge_name} {_format_value(value)}")
+
+        for counter, (value, help_text) in counters:
+            counter_name = f"{METRIC_PREFIX}_{counter}_total"
+            if help_text:
+                lines.append(f"# HELP {counter_name} {help_text}")
+            lines.append(f"# TYPE {counter_name} counter")
+            lines.append(f"{counter_name} {_format_value(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Drop all histograms, gauges and counters"""
+        with self._lock:
+            self._histograms.clear()
+            self._gauges.clear()
+            self._counters.clear()
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value))
+
+
+def _escape(label_value: str) -> str:
+    return label_value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+# Global instance
+_latency_metrics: Optional[LatencyMetrics] = None
+
+
+def get_latency_metrics() -> LatencyMetrics:
+    """Get or create the global latency metrics instance"""
+    global _latency_metrics
+    if _latency_metrics is None:
+        _latency_metrics = LatencyMetrics()
+    return _latency_metrics
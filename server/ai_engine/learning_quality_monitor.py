@@ -280,20 +280,39 @@ class LearningQualityValidator:
 class LearningQualityMonitor:
     """
     Comprehensive learning quality monitoring system for neural network optimization
+
+    Metrics are persisted write-behind to an append-only JSONL journal: each
+    stored measurement is one compact line, pending lines are coalesced and
+    flushed off the event loop, and the journal is compacted down to the
+    in-memory window once it grows past a size limit.
     """
+
+    HISTORY_WINDOW = 1000           # In-memory metrics window (and compaction target)
+    FLUSH_DELAY = 2.0               # Seconds to coalesce records before a flush
+    COMPACTION_BYTES = 4 * 1024 * 1024  # Journal size that triggers compaction
+    READ_BLOCK_SIZE = 64 * 1024     # Block size for reading the journal tail
     
-    def __init__(self):
+    def __init__(self, storage_path: str = "data/learning_quality"):
         self.validator = LearningQualityValidator()
-        self.metrics_history = deque(maxlen=1000)  # Keep last 1000 measurements
+        self.metrics_history = deque(maxlen=self.HISTORY_WINDOW)  # Keep last 1000 measurements
         self.generation_metrics = {}  # Track metrics by generation
         self.territory_metrics = {}   # Track metrics by territory
         self.is_monitoring = False
         self.monitoring_callbacks = []
         
         # Storage paths
-        self.storage_path = "data/learning_quality"
-        self.metrics_file = os.path.join(self.storage_path, "quality_metrics.json")
+        self.storage_path = storage_path
+        self.journal_file = os.path.join(self.storage_path, "quality_metrics.jsonl")
+        self.baseline_file = os.path.join(self.storage_path, "baseline_metrics.json")
+        self.metrics_file = os.path.join(self.storage_path, "quality_metrics.json")  # Legacy full snapshot
         self._ensure_storage_directory()
+
+        # Write-behind state
+        self._pending_records: List[str] = []
+        self._baselines_dirty = False
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self._journal_bytes = os.path.getsize(self.journal_file) if os.path.exists(self.journal_file) else 0
     
     def _ensure_storage_directory(self):
         """Ensure storage directory exists"""
@@ -313,6 +332,8 @@ class LearningQualityMonitor:
             return
         
         self.is_monitoring = False
+        if self._flush_task is not None and not self._flush_task.done():
+            self._flush_task.cancel()
         await self._save_metrics_to_disk()
         logger.info("Learning quality monitoring stopped")
     
@@ -359,14 +380,13 @@ class LearningQualityMonitor:
             )
             
             # Store metrics
-            self.metrics_history.append(post_learning_metrics)
-            self._update_generation_metrics(generation, post_learning_metrics)
-            if territory_id:
-                self._update_territory_metrics(territory_id, post_learning_metrics)
+            self._store_metrics(post_learning_metrics)
             
             # Set as baseline if this is the first measurement for this Queen
             if queen_id not in self.validator.baseline_metrics:
                 self.validator.set_baseline_metrics(queen_id, post_learning_metrics)
+                self._baselines_dirty = True
+            self._schedule_flush()
             
             # Trigger callbacks
             for callback in self.monitoring_callbacks:
@@ -461,10 +481,8 @@ class LearningQualityMonitor:
             
             # Store metrics
             for metrics in post_batch_metrics:
-                self.metrics_history.append(metrics)
-                self._update_generation_metrics(metrics.generation, metrics)
-                if metrics.territory_id:
-                    self._update_territory_metrics(metrics.territory_id, metrics)
+                self._store_metrics(metrics)
+            self._schedule_flush()
             
             # Enhance batch result with quality information
             enhanced_result = batch_result.copy() if isinstance(batch_result, dict) else {}
@@ -770,6 +788,15 @@ class LearningQualityMonitor:
             logger.error(f"Error calculating batch consistency: {e}")
             return 0.5
     
+    def _store_metrics(self, metrics: LearningQualityMetrics, journal: bool = True):
+        """Add metrics to the in-memory windows and queue them for the journal"""
+        self.metrics_history.append(metrics)
+        self._update_generation_metrics(metrics.generation, metrics)
+        if metrics.territory_id:
+            self._update_territory_metrics(metrics.territory_id, metrics)
+        if journal:
+            self._pending_records.append(json.dumps(metrics.to_dict(), separators=(',', ':')))
+
     def _update_generation_metrics(self, generation: int, metrics: LearningQualityMetrics):
         """Update generation-based metrics tracking"""
         if generation not in self.generation_metrics:
@@ -963,73 +990,157 @@ class LearningQualityMonitor:
         self.monitoring_callbacks.append(callback)
         logger.info("Quality monitoring callback added")
     
-    async def _save_metrics_to_disk(self):
-        """Save quality metrics to disk"""
+    def _schedule_flush(self):
+        """Schedule a coalesced background flush of pending records"""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        if not self._pending_records and not self._baselines_dirty:
+            return
         try:
-            metrics_data = {
-                'metrics_history': [m.to_dict() for m in self.metrics_history],
-                'generation_metrics': {
-                    str(gen): [m.to_dict() for m in metrics]
-                    for gen, metrics in self.generation_metrics.items()
-                },
-                'territory_metrics': {
-                    territory: [m.to_dict() for m in metrics]
-                    for territory, metrics in self.territory_metrics.items()
-                },
-                'baseline_metrics': {
+            self._flush_task = asyncio.get_running_loop().create_task(self._delayed_flush())
+        except RuntimeError:
+            # No running loop; records stay pending until the next save
+            self._flush_task = None
+
+    async def _delayed_flush(self):
+        """Wait for more records to coalesce, then flush"""
+        try:
+            await asyncio.sleep(self.FLUSH_DELAY)
+        except asyncio.CancelledError:
+            return
+        # A flush that already started must not lose its records to cancellation
+        await asyncio.shield(self._save_metrics_to_disk())
+
+    async def _save_metrics_to_disk(self):
+        """
+        Flush pending metrics records to the journal
+
+        Cost is proportional to the number of new records; the journal is
+        compacted in the same background step once it exceeds COMPACTION_BYTES.
+        """
+        async with self._flush_lock:
+            records = self._pending_records
+            self._pending_records = []
+            baselines = None
+            if self._baselines_dirty:
+                baselines = {
                     queen_id: metrics.to_dict()
                     for queen_id, metrics in self.validator.baseline_metrics.items()
-                },
-                'saved_at': time.time()
-            }
-            
-            with open(self.metrics_file, 'w') as f:
-                json.dump(metrics_data, f, indent=2)
-            
-            logger.info(f"Quality metrics saved to {self.metrics_file}")
-            
-        except Exception as e:
-            logger.error(f"Error saving metrics to disk: {e}")
+                }
+                self._baselines_dirty = False
+
+            if not records and baselines is None:
+                return
+
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self._write_journal, records, baselines)
+                logger.debug(f"Flushed {len(records)} quality metrics records to {self.journal_file}")
+            except Exception as e:
+                logger.error(f"Error saving metrics to disk: {e}")
+                # Keep unwritten records for the next flush
+                self._pending_records = records + self._pending_records
+                if baselines is not None:
+                    self._baselines_dirty = True
+
+    def _write_journal(self, records: List[str], baselines: Optional[Dict[str, Any]]):
+        """Append records to the journal and compact it if needed (runs in executor)"""
+        if records:
+            data = ''.join(record + '\n' for record in records).encode('utf-8')
+            with open(self.journal_file, 'ab') as f:
+                f.write(data)
+            self._journal_bytes += len(data)
+
+        if baselines is not None:
+            self._atomic_write(self.baseline_file, json.dumps(baselines, separators=(',', ':')).encode('utf-8'))
+
+        if self._journal_bytes > self.COMPACTION_BYTES:
+            self._compact_journal()
+
+    def _compact_journal(self):
+        """Rewrite the journal keeping only the records needed for the in-memory window"""
+        tail = self._read_journal_tail(self.HISTORY_WINDOW)
+        data = ''.join(line + '\n' for line in tail).encode('utf-8')
+        self._atomic_write(self.journal_file, data)
+        self._journal_bytes = len(data)
+        logger.info(f"Quality metrics journal compacted to {len(tail)} records")
+
+    def _atomic_write(self, path: str, data: bytes):
+        """Write a file via temp file and rename"""
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _read_journal_tail(self, max_records: int) -> List[str]:
+        """Read the last max_records complete lines of the journal, reading backwards"""
+        if not os.path.exists(self.journal_file):
+            return []
+
+        with open(self.journal_file, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b''
+            # One extra line so a record cut by the block boundary can be dropped
+            while position > 0 and buffer.count(b'\n') <= max_records:
+                read_size = min(self.READ_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                buffer = f.read(read_size) + buffer
+
+        lines = buffer.split(b'\n')
+        if position > 0:
+            lines = lines[1:]  # Partial first line
+        lines = [line.decode('utf-8') for line in lines if line.strip()]
+        return lines[-max_records:]
     
     async def load_metrics_from_disk(self) -> bool:
-        """Load quality metrics from disk"""
+        """Load quality metrics from disk, reading only the tail of the journal"""
         try:
-            if not os.path.exists(self.metrics_file):
+            if not os.path.exists(self.journal_file):
+                if os.path.exists(self.metrics_file):
+                    return await self._load_legacy_metrics()
                 logger.info("No existing quality metrics file found")
                 return False
-            
-            with open(self.metrics_file, 'r') as f:
-                metrics_data = json.load(f)
-            
-            # Load metrics history
-            for metric_dict in metrics_data.get('metrics_history', []):
-                metrics = LearningQualityMetrics(**metric_dict)
-                self.metrics_history.append(metrics)
-            
-            # Load generation metrics
-            for gen_str, metrics_list in metrics_data.get('generation_metrics', {}).items():
-                generation = int(gen_str)
-                self.generation_metrics[generation] = [
-                    LearningQualityMetrics(**m) for m in metrics_list
-                ]
-            
-            # Load territory metrics
-            for territory, metrics_list in metrics_data.get('territory_metrics', {}).items():
-                self.territory_metrics[territory] = [
-                    LearningQualityMetrics(**m) for m in metrics_list
-                ]
-            
-            # Load baseline metrics
-            for queen_id, metric_dict in metrics_data.get('baseline_metrics', {}).items():
-                baseline_metrics = LearningQualityMetrics(**metric_dict)
-                self.validator.set_baseline_metrics(queen_id, baseline_metrics)
-            
+
+            loop = asyncio.get_running_loop()
+            lines = await loop.run_in_executor(None, self._read_journal_tail, self.HISTORY_WINDOW)
+
+            for line in lines:
+                try:
+                    self._store_metrics(LearningQualityMetrics(**json.loads(line)), journal=False)
+                except (ValueError, TypeError) as e:
+                    logger.warning(f"Skipping corrupt quality metrics record: {e}")
+
+            if os.path.exists(self.baseline_file):
+                with open(self.baseline_file, 'r') as f:
+                    for queen_id, metric_dict in json.load(f).items():
+                        self.validator.set_baseline_metrics(queen_id, LearningQualityMetrics(**metric_dict))
+
             logger.info(f"Quality metrics loaded: {len(self.metrics_history)} total measurements")
             return True
-            
+
         except Exception as e:
             logger.error(f"Error loading metrics from disk: {e}")
             return False
+
+    async def _load_legacy_metrics(self) -> bool:
+        """Load a legacy full-snapshot metrics file and migrate it to the journal"""
+        with open(self.metrics_file, 'r') as f:
+            metrics_data = json.load(f)
+
+        # Generation and territory metrics are rebuilt from the history window
+        for metric_dict in metrics_data.get('metrics_history', [])[-self.HISTORY_WINDOW:]:
+            self._store_metrics(LearningQualityMetrics(**metric_dict))
+
+        for queen_id, metric_dict in metrics_data.get('baseline_metrics', {}).items():
+            self.validator.set_baseline_metrics(queen_id, LearningQualityMetrics(**metric_dict))
+        self._baselines_dirty = True
+
+        await self._save_metrics_to_disk()
+        os.replace(self.metrics_file, self.metrics_file + '.migrated')
+        logger.info(f"Legacy quality metrics migrated: {len(self.metrics_history)} total measurements")
+        return True
     
     async def cleanup(self):
         """Cleanup learning quality monitor resources"""
@@ -14,6 +14,8 @@ Total parameters: ~10,530
 import logging
 import os
 import json
+import time
+import warnings
 from typing import Dict, Any, Optional, Tuple, List
 import numpy as np
 
@@ -22,6 +24,8 @@ import torch.nn as nn
 import torch.nn.functional as F
 from torch.optim import Adam
 
+from .numpy_inference import NumpySequentialEngine
+
 logger = logging.getLogger(__name__)
 
 # Constants
@@ -43,6 +47,10 @@ DEFAULT_ENTROPY_COEF = 0.5  # Increased from 0.2 to prevent mode collapse
 # Higher = more uniform targets, less learning signal
 DEFAULT_LABEL_SMOOTHING = 0.2
 
+# Graph mode for the torch forward and loss: eager, script, trace or compile
+COMPILE_MODES = ('eager', 'script', 'trace', 'compile')
+DEFAULT_COMPILE_MODE = os.environ.get("NN_COMPILE_MODE", "eager")
+
 
 def get_device() -> torch.device:
     """Get the best available device (GPU or CPU)."""
@@ -195,6 +203,12 @@ class SequentialQueenNN(nn.Module):
     PLAYER_ENERGY_RATE_INDEX = 27
     PLAYER_MINERAL_RATE_INDEX = 28
 
+    # Scalar indices used in forward(), as TorchScript constants
+    __constants__ = [
+        'QUEEN_ENERGY_CAP_INDEX', 'QUEEN_COMBAT_CAP_INDEX',
+        'PLAYER_ENERGY_RATE_INDEX', 'PLAYER_MINERAL_RATE_INDEX'
+    ]
+
     def __init__(self):
         super().__init__()
 
@@ -246,6 +260,15 @@ class SequentialQueenNN(nn.Module):
             # Softmax applied in forward()
         )
 
+        # Feature gather indices (non-persistent: not part of saved weights)
+        nn1_indices = [i for pair in zip(self.PROTECTOR_INDICES, self.E_PARASITE_INDICES) for i in pair]
+        nn2_indices = [i for pair in zip(self.PROTECTOR_INDICES, self.C_PARASITE_INDICES) for i in pair]
+        self.register_buffer('nn1_indices', torch.tensor(nn1_indices), persistent=False)
+        self.register_buffer('nn2_indices', torch.tensor(nn2_indices), persistent=False)
+        self.register_buffer('worker_indices', torch.tensor(self.WORKER_INDICES), persistent=False)
+        self.register_buffer('e_parasite_indices', torch.tensor(self.E_PARASITE_INDICES), persistent=False)
+        self.register_buffer('c_parasite_indices', torch.tensor(self.C_PARASITE_INDICES), persistent=False)
+
         # Initialize weights
         self._init_weights()
 
@@ -261,29 +284,15 @@ class SequentialQueenNN(nn.Module):
 
     def _extract_nn1_input(self, features: torch.Tensor) -> torch.Tensor:
         """Extract NN1 input: [protector, e_parasite_rate] x 5 chunks."""
-        batch_size = features.shape[0] if features.dim() > 1 else 1
         if features.dim() == 1:
             features = features.unsqueeze(0)
-
-        # Interleave protector and e_parasite for each chunk
-        nn1_input = torch.zeros(batch_size, 10, device=features.device)
-        for i in range(5):
-            nn1_input[:, i*2] = features[:, self.PROTECTOR_INDICES[i]]
-            nn1_input[:, i*2+1] = features[:, self.E_PARASITE_INDICES[i]]
-        return nn1_input
+        return features.index_select(1, self.nn1_indices)
 
     def _extract_nn2_input(self, features: torch.Tensor) -> torch.Tensor:
         """Extract NN2 input: [protector, c_parasite_rate] x 5 chunks."""
-        batch_size = features.shape[0] if features.dim() > 1 else 1
         if features.dim() == 1:
             features = features.unsqueeze(0)
-
-        # Interleave protector and c_parasite for each chunk
-        nn2_input = torch.zeros(batch_size, 10, device=features.device)
-        for i in range(5):
-            nn2_input[:, i*2] = features[:, self.PROTECTOR_INDICES[i]]
-            nn2_input[:, i*2+1] = features[:, self.C_PARASITE_INDICES[i]]
-        return nn2_input
+        return features.index_select(1, self.nn2_indices)
 
     def _extract_nn4_input(
         self,
@@ -301,33 +310,19 @@ class SequentialQueenNN(nn.Module):
             c_suit: Combat suitability from NN2 (batch, 5)
             type_decision: Type decision from NN3 (batch,) - 0=energy, 1=combat
         """
-        batch_size = features.shape[0] if features.dim() > 1 else 1
         if features.dim() == 1:
             features = features.unsqueeze(0)
 
-        nn4_input = torch.zeros(batch_size, 15, device=features.device)
-
-        # Worker densities (indices 0-4)
-        for i in range(5):
-            nn4_input[:, i] = features[:, self.WORKER_INDICES[i]]
-
-        # Suitability for chosen type (indices 5-9)
         # type_decision: 0=energy, 1=combat
-        for b in range(batch_size):
-            if type_decision[b] == 0:  # energy
-                nn4_input[b, 5:10] = e_suit[b]
-            else:  # combat
-                nn4_input[b, 5:10] = c_suit[b]
-
-        # Parasite saturation for chosen type (indices 10-14)
-        for b in range(batch_size):
-            for i in range(5):
-                if type_decision[b] == 0:  # energy
-                    nn4_input[b, 10+i] = features[b, self.E_PARASITE_INDICES[i]]
-                else:  # combat
-                    nn4_input[b, 10+i] = features[b, self.C_PARASITE_INDICES[i]]
-
-        return nn4_input
+        is_energy = (type_decision == 0).unsqueeze(-1)
+        workers = features.index_select(1, self.worker_indices)
+        suitability = torch.where(is_energy, e_suit, c_suit)
+        saturation = torch.where(
+            is_energy,
+            features.index_select(1, self.e_parasite_indices),
+            features.index_select(1, self.c_parasite_indices)
+        )
+        return torch.cat([workers, suitability, saturation], dim=-1)
 
     def _extract_nn5_input(
         self,
@@ -347,42 +342,36 @@ class SequentialQueenNN(nn.Module):
             type_decision: Type decision from NN3 (batch,) - 0=energy, 1=combat
             chunk_decision: Chunk decision from NN4 (batch,) - 0-4
         """
-        batch_size = features.shape[0] if features.dim() > 1 else 1
         if features.dim() == 1:
             features = features.unsqueeze(0)
 
-        nn5_input = torch.zeros(batch_size, 7, device=features.device)
-
-        for b in range(batch_size):
-            chunk_idx = int(chunk_decision[b].item())
-            # Clamp to valid range (0-4)
-            chunk_idx = min(chunk_idx, 4)
-
-            # Selected chunk parasite saturation (index 0)
-            if type_decision[b] == 0:  # energy
-                nn5_input[b, 0] = features[b, self.E_PARASITE_INDICES[chunk_idx]]
-                nn5_input[b, 1] = e_suit[b, chunk_idx]
-            else:  # combat
-                nn5_input[b, 0] = features[b, self.C_PARASITE_INDICES[chunk_idx]]
-                nn5_input[b, 1] = c_suit[b, chunk_idx]
+        is_energy = (type_decision == 0).unsqueeze(-1)
+        # Clamp to valid range (0-4)
+        chunk_idx = torch.clamp(chunk_decision, max=4).unsqueeze(-1)
 
-            # Queen spawn capacity for chosen type (index 2)
-            if type_decision[b] == 0:  # energy
-                nn5_input[b, 2] = features[b, self.QUEEN_ENERGY_CAP_INDEX]
-            else:  # combat
-                nn5_input[b, 2] = features[b, self.QUEEN_COMBAT_CAP_INDEX]
+        # Selected chunk parasite saturation and suitability for chosen type
+        saturation = torch.where(
+            is_energy,
+            features.index_select(1, self.e_parasite_indices).gather(1, chunk_idx),
+            features.index_select(1, self.c_parasite_indices).gather(1, chunk_idx)
+        )
+        suitability = torch.where(is_energy, e_suit.gather(1, chunk_idx), c_suit.gather(1, chunk_idx))
 
-            # Player rates (indices 3-4)
-            nn5_input[b, 3] = features[b, self.PLAYER_ENERGY_RATE_INDEX]
-            nn5_input[b, 4] = features[b, self.PLAYER_MINERAL_RATE_INDEX]
+        # Queen spawn capacity for chosen type
+        queen_cap = torch.where(
+            is_energy,
+            features[:, self.QUEEN_ENERGY_CAP_INDEX:self.QUEEN_ENERGY_CAP_INDEX + 1],
+            features[:, self.QUEEN_COMBAT_CAP_INDEX:self.QUEEN_COMBAT_CAP_INDEX + 1]
+        )
 
-            # Type decision (index 5) - normalized 0 or 1
-            nn5_input[b, 5] = float(type_decision[b])
+        # Player energy and mineral rates
+        player_rates = features[:, self.PLAYER_ENERGY_RATE_INDEX:self.PLAYER_MINERAL_RATE_INDEX + 1]
 
-            # Chunk selection (index 6) - normalized 0-1
-            nn5_input[b, 6] = chunk_idx / 4.0  # 0-4 -> 0-1
+        # Type decision (0 or 1) and chunk selection (0-4 -> 0-1)
+        type_value = type_decision.unsqueeze(-1).to(features.dtype)
+        chunk_value = chunk_idx.to(features.dtype) / 4.0
 
-        return nn5_input
+        return torch.cat([saturation, suitability, queen_cap, player_rates, type_value, chunk_value], dim=-1)
 
     def forward(self, features: torch.Tensor) -> Dict[str, torch.Tensor]:
         """
@@ -453,6 +442,40 @@ class SequentialQueenNN(nn.Module):
         return result
 
 
+def sequential_loss(
+    type_logits: torch.Tensor,
+    type_probs: torch.Tensor,
+    chunk_logits: torch.Tensor,
+    chunk_probs: torch.Tensor,
+    quantity_logits: torch.Tensor,
+    type_target: torch.Tensor,
+    chunk_target: torch.Tensor,
+    quantity_target: torch.Tensor,
+    entropy_coef: float,
+    reward_weight: float
+) -> Tuple[torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor, torch.Tensor]:
+    """
+    Combined loss for NN3-NN5 on a batch (pure tensor function, scriptable).
+
+    Returns:
+        Tuple of (total_loss, type_loss, type_entropy, chunk_loss, chunk_entropy, quantity_loss)
+    """
+    # NN3: Cross-entropy on type decision with entropy regularization (prevents mode collapse)
+    type_entropy = -torch.sum(type_probs * torch.log(type_probs + 1e-8), dim=-1).mean()
+    type_loss = F.cross_entropy(type_logits, type_target) - entropy_coef * type_entropy
+
+    # NN4: Cross-entropy on chunk decision with entropy regularization
+    chunk_entropy = -torch.sum(chunk_probs * torch.log(chunk_probs + 1e-8), dim=-1).mean()
+    chunk_loss = F.cross_entropy(chunk_logits, torch.clamp(chunk_target, 0, 4)) - entropy_coef * chunk_entropy
+
+    # NN5: Cross-entropy on quantity decision
+    quantity_loss = F.cross_entropy(quantity_logits, quantity_target)
+
+    # Combined loss (all NNs trained together - chain responsibility)
+    total_loss = (type_loss + chunk_loss + quantity_loss) * reward_weight
+    return total_loss, type_loss, type_entropy, chunk_loss, chunk_entropy, quantity_loss
+
+
 class NNModel:
     """
     Five-NN Sequential Architecture for Queen spawn decisions.
@@ -471,7 +494,16 @@ class NNModel:
     # Architecture version 3: Five-NN Sequential
     ARCHITECTURE_VERSION = 3
 
-    def __init__(self, model_path: Optional[str] = None):
+    # Serve predict() from a NumPy copy of the weights instead of the torch forward
+    USE_NUMPY_INFERENCE = True
+
+    def __init__(self, model_path: Optional[str] = None, compile_mode: Optional[str] = None):
+        """
+        Args:
+            model_path: Weights file (default models/queen_sequential.pt)
+            compile_mode: Graph mode for the torch forward and loss, one of
+                COMPILE_MODES (default NN_COMPILE_MODE env var, else eager)
+        """
         self.input_size = 29  # Still 29 features from FeatureExtractor
 
         # Use .pt extension for PyTorch
@@ -486,8 +518,15 @@ class NNModel:
         # Entropy coefficient (for training regularization)
         self.entropy_coef = DEFAULT_ENTROPY_COEF
 
-        # Optimizer for all 5 NNs
-        self.optimizer = Adam(self.model.parameters(), lr=0.001)
+        # Optimizer for all 5 NNs (multi-tensor update: ~22 small parameter tensors)
+        self.optimizer = Adam(self.model.parameters(), lr=0.001, foreach=True)
+
+        # NumPy inference engine, re-exported whenever the weights version changes
+        self._weights_version = 0
+        self._inference_engine: Optional[NumpySequentialEngine] = None
+        self._engine_version = -1
+        self._engine_verified = False
+        self._numpy_inference_failed = False
 
         # Try to load existing weights
         weights_loaded = self._load_model_if_exists()
@@ -495,8 +534,118 @@ class NNModel:
         if not weights_loaded and os.path.exists(self.model_path):
             logger.info("Initializing fresh sequential model")
 
+        # Scripted/traced/compiled graphs share parameters with self.model
+        self.compile_mode = 'eager'
+        self._forward = self.model
+        self._loss = sequential_loss
+        self._build_graphs(compile_mode or DEFAULT_COMPILE_MODE)
+
         logger.info(f"NNModel (Sequential) initialized: {self._count_parameters()} parameters on {self.device}")
 
+    def mark_weights_changed(self) -> None:
+        """
+        Invalidate the exported inference engine.
+
+        Called after every in-place weight update (training step, load,
+        reset). Code that modifies self.model directly must call it too.
+        """
+        self._weights_version += 1
+
+    def _get_inference_engine(self) -> Optional[NumpySequentialEngine]:
+        """
+        Get the NumPy engine for the current weights, exporting it if stale.
+
+        The first export is checked against the torch forward; on mismatch
+        NumPy inference is disabled and predict() stays on torch.
+
+        Returns:
+            Engine, or None if NumPy inference is disabled
+        """
+        if not self.USE_NUMPY_INFERENCE or self._numpy_inference_failed:
+            return None
+
+        version = self._weights_version
+        if self._engine_version == version:
+            return self._inference_engine
+
+        engine = NumpySequentialEngine.from_module(self.model)
+        if not self._engine_verified:
+            error = engine.parity_error(self.model)
+            if error > engine.PARITY_TOLERANCE:
+                logger.warning(f"NumPy inference disabled: parity error {error:.2e} vs torch forward")
+                self._numpy_inference_failed = True
+                return None
+            self._engine_verified = True
+
+        # Stamped with the version read before the copy, so an update during
+        # the export is picked up by the next call
+        self._inference_engine = engine
+        self._engine_version = version
+        return engine
+
+    def _build_graphs(self, mode: str) -> None:
+        """
+        Build the forward and loss graphs for a compile mode, falling back to eager.
+
+        script and trace produce TorchScript; trace records the forward on a
+        (batch, 29) example and the loss is scripted. compile uses
+        torch.compile with dynamic shapes, which compiles on first call.
+        """
+        if mode not in COMPILE_MODES:
+            logger.warning(f"Unknown NN compile mode '{mode}', using eager")
+            mode = 'eager'
+
+        try:
+            with warnings.catch_warnings():
+                # torch.jit is deprecated in recent releases but still works
+                warnings.simplefilter("ignore", FutureWarning)
+                if mode == 'script':
+                    forward = torch.jit.script(self.model)
+                    loss = torch.jit.script(sequential_loss)
+                elif mode == 'trace':
+                    example = torch.rand(8, self.input_size, device=self.device)
+                    forward = torch.jit.trace(self.model, example, strict=False, check_trace=False)
+                    loss = torch.jit.script(sequential_loss)
+                elif mode == 'compile':
+                    forward = torch.compile(self.model, dynamic=True)
+                    loss = torch.compile(sequential_loss, dynamic=True)
+                else:
+                    forward, loss = self.model, sequential_loss
+        except Exception as e:
+            logger.warning(f"NN compile mode '{mode}' unavailable, using eager: {e}")
+            mode, forward, loss = 'eager', self.model, sequential_loss
+
+        self.compile_mode = mode
+        self._forward = forward
+        self._loss = loss
+        if mode != 'eager':
+            logger.info(f"NN forward and loss built in {mode} mode")
+
+    def _fall_back_to_eager(self, error: Exception) -> None:
+        """Drop a graph that failed at call time (e.g. torch.compile backend errors)."""
+        logger.warning(f"NN {self.compile_mode} graph failed, falling back to eager: {error}")
+        self.compile_mode = 'eager'
+        self._forward = self.model
+        self._loss = sequential_loss
+
+    def _run_forward(self, x: torch.Tensor) -> Dict[str, torch.Tensor]:
+        """Run the (possibly compiled) forward on a (batch, 29) tensor."""
+        if self._forward is not self.model:
+            try:
+                return self._forward(x)
+            except Exception as e:
+                self._fall_back_to_eager(e)
+        return self.model(x)
+
+    def _run_loss(self, *args) -> Tuple[torch.Tensor, ...]:
+        """Run the (possibly compiled) sequential_loss."""
+        if self._loss is not sequential_loss:
+            try:
+                return self._loss(*args)
+            except Exception as e:
+                self._fall_back_to_eager(e)
+        return sequential_loss(*args)
+
     def _count_parameters(self) -> int:
         """Count total trainable parameters."""
         return sum(p.numel() for p in self.model.parameters() if p.requires_grad)
@@ -587,6 +736,7 @@ class NNModel:
                 # Try to load weights
                 state_dict = torch.load(self.model_path, map_location=self.device, weights_only=True)
                 self.model.load_state_dict(state_dict)
+                self.mark_weights_changed()
                 logger.info(f"Loaded model weights from {self.model_path}")
                 return True
 
@@ -625,6 +775,36 @@ class NNModel:
         except Exception as e:
             logger.warning(f"Failed to backup incompatible model: {e}")
 
+    def build_metadata(self) -> Dict[str, Any]:
+        """Metadata written alongside the model weights."""
+        return {
+            'framework': 'pytorch',
+            'architecture': 'five_nn_sequential',
+            'architecture_version': self.ARCHITECTURE_VERSION,
+            'input_size': self.input_size,
+            'total_parameters': self._count_parameters(),
+            'device': str(self.device),
+            'nn_config': {
+                'nn1_energy_suit': '10->8->5 Sigmoid',
+                'nn2_combat_suit': '10->8->5 Sigmoid',
+                'nn3_type': '10->8->2 Softmax',
+                'nn4_chunk': '15->12->8->5 Softmax',  # No NO_SPAWN
+                'nn5_quantity': '7->8->5 Softmax'
+            },
+            'no_spawn_option': False  # Gate is sole spawn/no-spawn authority
+        }
+
+    def restore_state_dict(self, state_dict: Dict[str, torch.Tensor]) -> None:
+        """
+        Replace the model weights in memory (e.g. to roll back to a checkpoint).
+
+        Optimizer moments belong to the replaced weights, so they are reset.
+        """
+        self.model.load_state_dict(state_dict)
+        self.optimizer.state.clear()
+        self.mark_weights_changed()
+        logger.info("Restored model weights from state dict")
+
     def save_model(self, path: Optional[str] = None) -> bool:
         """Save model weights with metadata."""
         save_path = path or self.model_path
@@ -637,25 +817,8 @@ class NNModel:
 
             # Save metadata
             metadata_path = save_path.replace('.pt', '_metadata.json')
-            metadata = {
-                'framework': 'pytorch',
-                'architecture': 'five_nn_sequential',
-                'architecture_version': self.ARCHITECTURE_VERSION,
-                'input_size': self.input_size,
-                'total_parameters': self._count_parameters(),
-                'device': str(self.device),
-                'nn_config': {
-                    'nn1_energy_suit': '10->8->5 Sigmoid',
-                    'nn2_combat_suit': '10->8->5 Sigmoid',
-                    'nn3_type': '10->8->2 Softmax',
-                    'nn4_chunk': '15->12->8->5 Softmax',  # No NO_SPAWN
-                    'nn5_quantity': '7->8->5 Softmax'
-                },
-                'no_spawn_option': False  # Gate is sole spawn/no-spawn authority
-            }
-
             with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+                json.dump(self.build_metadata(), f, indent=2)
 
             logger.info(f"Saved model weights to {save_path}")
             logger.info(f"Saved model metadata to {metadata_path}")
@@ -682,6 +845,24 @@ class NNModel:
             - quantity_probs: (5,) [P(0), P(1), P(2), P(3), P(4)]
             - quantity_decision: int (0-4)
         """
+        engine = self._get_inference_engine()
+        if engine is not None:
+            result = engine.forward(features)
+        else:
+            result = self._predict_torch(features)
+
+        # Convert scalar decisions to int
+        if 'type_decision' in result:
+            result['type_decision'] = int(result['type_decision'])
+        if 'chunk_decision' in result:
+            result['chunk_decision'] = int(result['chunk_decision'])
+        if 'quantity_decision' in result:
+            result['quantity_decision'] = int(result['quantity_decision'])
+
+        return result
+
+    def _predict_torch(self, features: np.ndarray) -> Dict[str, Any]:
+        """Run the torch forward pass and convert outputs to numpy (predict() fallback)."""
         # Ensure correct shape
         single_input = features.ndim == 1
         if single_input:
@@ -693,7 +874,7 @@ class NNModel:
         # Run inference through sequential pipeline
         self.model.eval()
         with torch.no_grad():
-            outputs = self.model(x)
+            outputs = self._run_forward(x)
 
         # Convert tensors to numpy
         result = {}
@@ -707,14 +888,6 @@ class NNModel:
             else:
                 result[key] = value
 
-        # Convert scalar decisions to int
-        if 'type_decision' in result:
-            result['type_decision'] = int(result['type_decision'])
-        if 'chunk_decision' in result:
-            result['chunk_decision'] = int(result['chunk_decision'])
-        if 'quantity_decision' in result:
-            result['quantity_decision'] = int(result['quantity_decision'])
-
         return result
 
     def get_spawn_decision(self, features: np.ndarray, explore: bool = True) -> Dict[str, Any]:
@@ -829,64 +1002,42 @@ class NNModel:
         Returns:
             Tuple of (total_loss, loss_dict)
         """
-        loss_dict = {}
-
-        # NN3: Cross-entropy on type decision with entropy regularization
-        type_target = targets['type_target']
-        if not isinstance(type_target, torch.Tensor):
-            type_target = torch.tensor([type_target], device=self.device, dtype=torch.long)
-        type_ce_loss = F.cross_entropy(outputs['type_logits'], type_target)
-
-        # Entropy regularization for type (prevents mode collapse to single type)
-        type_probs = outputs['type_probs']
-        if type_probs.dim() == 1:
-            type_probs = type_probs.unsqueeze(0)
-        type_entropy = -torch.sum(type_probs * torch.log(type_probs + 1e-8), dim=-1).mean()
-        type_loss = type_ce_loss - self.entropy_coef * type_entropy
-
-        loss_dict['type_loss'] = float(type_loss.item())
-        loss_dict['type_entropy'] = float(type_entropy.item())
-
-        # NN4: Cross-entropy on chunk decision with entropy regularization
-        chunk_target = targets['chunk_target']
-        if not isinstance(chunk_target, torch.Tensor):
-            chunk_target = torch.tensor([chunk_target], device=self.device, dtype=torch.long)
-        # Clamp to valid range (0-4)
-        chunk_target = torch.clamp(chunk_target, 0, 4)
-        chunk_ce_loss = F.cross_entropy(outputs['chunk_logits'], chunk_target)
-
-        # Entropy regularization for chunk (prevents mode collapse)
-        chunk_probs = outputs['chunk_probs']
-        if chunk_probs.dim() == 1:
-            chunk_probs = chunk_probs.unsqueeze(0)
-        chunk_entropy = -torch.sum(chunk_probs * torch.log(chunk_probs + 1e-8), dim=-1).mean()
-        chunk_loss = chunk_ce_loss - self.entropy_coef * chunk_entropy
-
-        loss_dict['chunk_loss'] = float(chunk_loss.item())
-        loss_dict['chunk_entropy'] = float(chunk_entropy.item())
+        def as_target(value) -> torch.Tensor:
+            if isinstance(value, torch.Tensor):
+                return value
+            return torch.tensor([value], device=self.device, dtype=torch.long)
 
-        # NN5: Cross-entropy on quantity decision (always runs - no NO_SPAWN)
-        quantity_target = targets['quantity_target']
-        if not isinstance(quantity_target, torch.Tensor):
-            quantity_target = torch.tensor([quantity_target], device=self.device, dtype=torch.long)
+        def as_batch(probs: torch.Tensor) -> torch.Tensor:
+            return probs.unsqueeze(0) if probs.dim() == 1 else probs
 
         quantity_logits = outputs.get('quantity_logits')
         if quantity_logits is None:
             # Quantity probs exist, convert back to pseudo-logits
-            quantity_probs = outputs['quantity_probs']
-            if quantity_probs.dim() == 1:
-                quantity_probs = quantity_probs.unsqueeze(0)
-            quantity_logits = torch.log(quantity_probs + 1e-8)
-        quantity_loss = F.cross_entropy(quantity_logits, quantity_target)
-
-        loss_dict['quantity_loss'] = float(quantity_loss.item())
+            quantity_logits = torch.log(as_batch(outputs['quantity_probs']) + 1e-8)
 
-        # Combined loss (all NNs trained together - chain responsibility)
         # Weight by absolute reward - stronger signal for clearer outcomes
         reward_weight = abs(reward)
-        total_loss = (type_loss + chunk_loss + quantity_loss) * reward_weight
+        total_loss, type_loss, type_entropy, chunk_loss, chunk_entropy, quantity_loss = self._run_loss(
+            outputs['type_logits'],
+            as_batch(outputs['type_probs']),
+            outputs['chunk_logits'],
+            as_batch(outputs['chunk_probs']),
+            quantity_logits,
+            as_target(targets['type_target']),
+            as_target(targets['chunk_target']),
+            as_target(targets['quantity_target']),
+            float(self.entropy_coef),
+            float(reward_weight)
+        )
 
-        loss_dict['loss'] = float(total_loss.item())
+        # One device sync for all logged values
+        values = torch.stack([
+            type_loss, type_entropy, chunk_loss, chunk_entropy, quantity_loss, total_loss
+        ]).detach().tolist()
+        loss_dict = dict(zip(
+            ['type_loss', 'type_entropy', 'chunk_loss', 'chunk_entropy', 'quantity_loss', 'loss'],
+            values
+        ))
         loss_dict['reward'] = reward
         loss_dict['reward_weight'] = reward_weight
 
@@ -921,7 +1072,7 @@ class NNModel:
 
         # Forward pass through sequential pipeline
         self.model.train()
-        outputs = self.model(x)
+        outputs = self._run_forward(x)
 
         # Compute combined loss for all 5 NNs
         loss, loss_dict = self._compute_loss(outputs, targets, reward)
@@ -930,6 +1081,7 @@ class NNModel:
         self.optimizer.zero_grad()
         loss.backward()
         self.optimizer.step()
+        self.mark_weights_changed()
 
         return loss_dict
 
@@ -1106,6 +1258,7 @@ class NNModel:
             # Reinitialize weights
             logger.info("Resetting model weights to fresh initialization...")
             self.model._init_weights()
+            self.mark_weights_changed()
 
             # Save the fresh weights
             self.save_model()
@@ -1227,6 +1380,29 @@ class NNModel:
             'effective_actions': float(np.exp(chunk_entropy)),
         }
 
+    def warm_up(self) -> float:
+        """
+        Run one inference through the paths a request uses.
+
+        One-time costs (NumPy engine export and parity check, graph mode
+        first calls, lazy allocations) are paid here at startup instead of
+        by the first observation. Predictions have no side effects, so
+        this does not change model state.
+
+        Returns:
+            Warm-up time in milliseconds
+        """
+        start = time.perf_counter()
+        features = np.zeros(self.input_size, dtype=np.float32)
+        self.get_spawn_decision(features, explore=False)
+        self.get_distribution_stats(features)
+        if self.compile_mode != 'eager':
+            with torch.no_grad():
+                self._run_forward(torch.zeros((1, self.input_size), device=self.device))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        logger.info(f"NNModel warm-up completed in {elapsed_ms:.1f}ms")
+        return elapsed_ms
+
     def get_stats(self) -> Dict[str, Any]:
         """Get model statistics."""
         return {
@@ -1249,6 +1425,8 @@ class NNModel:
             'type_max_entropy': self.get_max_entropy(2),
             'quantity_max_entropy': self.get_max_entropy(5),
             'device': str(self.device),
+            'compile_mode': self.compile_mode,
+            'inference_backend': 'numpy' if self._get_inference_engine() is not None else 'torch',
             'no_spawn_option': False  # Gate is sole spawn/no-spawn authority
         }
 
@@ -1283,6 +1461,7 @@ class NNModel:
 
         # Reinitialize weights
         self.model._init_weights()
+        self.mark_weights_changed()
         logger.info(f"NNModel reset with fresh weights: {self._count_parameters()} parameters")
 
         return {
@@ -0,0 +1,271 @@
+"""
+NumPy Inference - Torch-free forward pass for SequentialQueenNN
+
+The five sub-networks are small enough that PyTorch dispatch (tensor
+creation, device transfer, per-op overhead and the per-row Python loops in
+the input extraction) dominates inference time. NumpySequentialEngine holds
+a float32 copy of the weights and evaluates the same NN1/NN2 → NN3 → NN4 →
+NN5 chain with plain matmuls and index gathers, for one row or a batch.
+NN1 and NN2 share their input layout, so they are fused into one
+block-diagonal network whose output is already NN3's input.
+
+An engine is an immutable snapshot: NNModel exports a new one whenever the
+torch weights change.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Feature layout (see SequentialQueenNN): chunk i has features at i*5 .. i*5+4
+# = [chunk_id, worker_density, protector_density, e_parasite_rate, c_parasite_rate]
+WORKER_INDICES = np.array([1, 6, 11, 16, 21])
+PROTECTOR_INDICES = np.array([2, 7, 12, 17, 22])
+E_PARASITE_INDICES = np.array([3, 8, 13, 18, 23])
+C_PARASITE_INDICES = np.array([4, 9, 14, 19, 24])
+QUEEN_ENERGY_CAP_INDEX = 25
+QUEEN_COMBAT_CAP_INDEX = 26
+PLAYER_ENERGY_RATE_INDEX = 27
+PLAYER_MINERAL_RATE_INDEX = 28
+
+# NN1/NN2 inputs interleave [protector, parasite_rate] per chunk
+NN1_INPUT_INDICES = np.stack([PROTECTOR_INDICES, E_PARASITE_INDICES], axis=1).ravel()
+NN2_INPUT_INDICES = np.stack([PROTECTOR_INDICES, C_PARASITE_INDICES], axis=1).ravel()
+SUITABILITY_INPUT_INDICES = np.concatenate([NN1_INPUT_INDICES, NN2_INPUT_INDICES])
+
+# Sub-network attribute names in SequentialQueenNN, in evaluation order
+SUBNETWORKS = ('nn1_energy_suit', 'nn2_combat_suit', 'nn3_type', 'nn4_chunk', 'nn5_quantity')
+
+Layers = List[Tuple[np.ndarray, np.ndarray]]  # (weight transposed to (in, out), bias) per Linear
+
+
+def _sigmoid_(x: np.ndarray) -> np.ndarray:
+    """In-place sigmoid (tanh form, which does not overflow)"""
+    x *= 0.5
+    np.tanh(x, out=x)
+    x += 1.0
+    x *= 0.5
+    return x
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    e = np.exp(x - x.max(axis=-1, keepdims=True))
+    e /= e.sum(axis=-1, keepdims=True)
+    return e
+
+
+def _mlp(x: np.ndarray, layers: Layers) -> np.ndarray:
+    """Linear layers with ReLU between them; the last layer's output is returned raw"""
+    last = len(layers) - 1
+    for i, (weight, bias) in enumerate(layers):
+        x = x.dot(weight)
+        x += bias
+        if i < last:
+            np.maximum(x, 0.0, out=x)
+    return x
+
+
+def _block_diagonal(first: Layers, second: Layers) -> Layers:
+    """Fuse two same-depth networks into one acting on concatenated inputs and outputs"""
+    fused = []
+    for (w1, b1), (w2, b2) in zip(first, second):
+        weight = np.zeros((w1.shape[0] + w2.shape[0], w1.shape[1] + w2.shape[1]), dtype=np.float32)
+        weight[:w1.shape[0], :w1.shape[1]] = w1
+        weight[w1.shape[0]:, w1.shape[1]:] = w2
+        fused.append((weight, np.concatenate([b1, b2])))
+    return fused
+
+
+class NumpySequentialEngine:
+    """
+    Float32 NumPy evaluation of SequentialQueenNN.
+
+    forward() returns the same keys as SequentialQueenNN.forward, as NumPy
+    arrays: a (29,) input gives per-row arrays and 0-d decisions, a
+    (batch, 29) input gives batched arrays.
+    """
+
+    PARITY_TOLERANCE = 1e-5  # Max abs difference from the torch forward
+
+    def __init__(self, networks: Dict[str, Layers]):
+        """
+        Args:
+            networks: Layers for each name in SUBNETWORKS
+        """
+        nn1, nn2, self.nn3, self.nn4, self.nn5 = (networks[name] for name in SUBNETWORKS)
+        self.suitability = _block_diagonal(nn1, nn2)  # 20 → 16 → 10: [e_suit, c_suit]
+
+    @classmethod
+    def from_module(cls, model) -> "NumpySequentialEngine":
+        """
+        Copy the weights of a SequentialQueenNN into a new engine.
+
+        Args:
+            model: SequentialQueenNN instance (any device)
+
+        Returns:
+            Engine with contiguous float32 copies of every Linear layer
+        """
+        import torch.nn as nn
+
+        networks = {}
+        for name in SUBNETWORKS:
+            layers = []
+            for module in getattr(model, name):
+                if isinstance(module, nn.Linear):
+                    weight = module.weight.detach().cpu().numpy()
+                    bias = module.bias.detach().cpu().numpy()
+                    layers.append((
+                        np.ascontiguousarray(weight.T, dtype=np.float32),
+                        np.array(bias, dtype=np.float32)
+                    ))
+            networks[name] = layers
+        return cls(networks)
+
+    def forward(self, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Sequential forward pass through all 5 NNs.
+
+        Args:
+            features: Array of shape (29,) or (batch, 29)
+
+        Returns:
+            Dictionary with the SequentialQueenNN.forward keys
+        """
+        features = np.asarray(features, dtype=np.float32)
+        if features.ndim == 1:
+            return self._forward_row(features)
+        rows = np.arange(features.shape[0])
+
+        # NN1/NN2: suitability
+        suit = _sigmoid_(_mlp(features[:, SUITABILITY_INPUT_INDICES], self.suitability))
+        e_suit, c_suit = suit[:, :5], suit[:, 5:]
+
+        # NN3: type
+        type_logits = _mlp(suit, self.nn3)
+        type_probs = _softmax(type_logits)
+        type_decision = np.argmax(type_probs, axis=1)
+        is_energy = (type_decision == 0)[:, None]
+
+        # NN4: chunk (suitability and saturation for the chosen type)
+        suitability = np.where(is_energy, e_suit, c_suit)
+        saturation = np.where(is_energy, features[:, E_PARASITE_INDICES], features[:, C_PARASITE_INDICES])
+        nn4_input = np.concatenate([features[:, WORKER_INDICES], suitability, saturation], axis=1)
+        chunk_logits = _mlp(nn4_input, self.nn4)
+        chunk_probs = _softmax(chunk_logits)
+        chunk_decision = np.argmax(chunk_probs, axis=1)
+
+        # NN5: quantity
+        chunk_idx = np.minimum(chunk_decision, 4)
+        is_energy = is_energy[:, 0]
+        nn5_input = np.empty((features.shape[0], 7), dtype=np.float32)
+        nn5_input[:, 0] = saturation[rows, chunk_idx]
+        nn5_input[:, 1] = suitability[rows, chunk_idx]
+        nn5_input[:, 2] = np.where(is_energy, features[:, QUEEN_ENERGY_CAP_INDEX], features[:, QUEEN_COMBAT_CAP_INDEX])
+        nn5_input[:, 3] = features[:, PLAYER_ENERGY_RATE_INDEX]
+        nn5_input[:, 4] = features[:, PLAYER_MINERAL_RATE_INDEX]
+        nn5_input[:, 5] = type_decision
+        nn5_input[:, 6] = chunk_idx / 4.0
+        quantity_logits = _mlp(nn5_input, self.nn5)
+        quantity_probs = _softmax(quantity_logits)
+        quantity_decision = np.argmax(quantity_probs, axis=1)
+
+        return {
+            'e_suitability': e_suit,
+            'c_suitability': c_suit,
+            'type_logits': type_logits,
+            'type_probs': type_probs,
+            'type_decision': type_decision,
+            'chunk_logits': chunk_logits,
+            'chunk_probs': chunk_probs,
+            'chunk_decision': chunk_decision,
+            'quantity_logits': quantity_logits,
+            'quantity_probs': quantity_probs,
+            'quantity_decision': quantity_decision
+        }
+
+    def _forward_row(self, features: np.ndarray) -> Dict[str, np.ndarray]:
+        """forward() for a single (29,) row, branching in Python instead of masking"""
+        suit = _sigmoid_(_mlp(features[SUITABILITY_INPUT_INDICES], self.suitability))
+
+        type_logits = _mlp(suit, self.nn3)
+        type_probs = _softmax(type_logits)
+        type_decision = int(type_probs.argmax())
+        if type_decision == 0:
+            suitability = suit[:5]
+            saturation = features[E_PARASITE_INDICES]
+            queen_cap = features[QUEEN_ENERGY_CAP_INDEX]
+        else:
+            suitability = suit[5:]
+            saturation = features[C_PARASITE_INDICES]
+            queen_cap = features[QUEEN_COMBAT_CAP_INDEX]
+
+        chunk_logits = _mlp(np.concatenate([features[WORKER_INDICES], suitability, saturation]), self.nn4)
+        chunk_probs = _softmax(chunk_logits)
+        chunk_decision = int(chunk_probs.argmax())
+
+        chunk_idx = min(chunk_decision, 4)
+        nn5_input = np.array([
+            saturation[chunk_idx], suitability[chunk_idx], queen_cap,
+            features[PLAYER_ENERGY_RATE_INDEX], features[PLAYER_MINERAL_RATE_INDEX],
+            type_decision, chunk_idx / 4.0
+        ], dtype=np.float32)
+        quantity_logits = _mlp(nn5_input, self.nn5)
+        quantity_probs = _softmax(quantity_logits)
+
+        return {
+            'e_suitability': suit[:5],
+            'c_suitability': suit[5:],
+            'type_logits': type_logits,
+            'type_probs': type_probs,
+            'type_decision': np.int64(type_decision),
+            'chunk_logits': chunk_logits,
+            'chunk_probs': chunk_probs,
+            'chunk_decision': np.int64(chunk_decision),
+            'quantity_logits': quantity_logits,
+            'quantity_probs': quantity_probs,
+            'quantity_decision': np.int64(quantity_probs.argmax())
+        }
+
+    def parity_error(self, model, features: Optional[np.ndarray] = None) -> float:
+        """
+        Compare this engine against the torch forward of a model.
+
+        Args:
+            model: SequentialQueenNN the engine was exported from
+            features: (batch, 29) probe inputs (default: 64 seeded random rows)
+
+        Both the batched and the single-row paths are checked.
+
+        Returns:
+            Max abs difference over all outputs, or inf if any decision differs
+        """
+        import torch
+
+        if features is None:
+            features = np.random.default_rng(0).random((64, 29), dtype=np.float32)
+        features = np.asarray(features, dtype=np.float32)
+
+        was_training = model.training
+        model.eval()
+        try:
+            with torch.no_grad():
+                device = next(model.parameters()).device
+                expected = model(torch.from_numpy(features).to(device))
+        finally:
+            model.train(was_training)
+
+        expected = {key: value.cpu().numpy() for key, value in expected.items()}
+        batched = self.forward(features)
+        single = [self.forward(row) for row in features[:8]]
+
+        max_error = 0.0
+        for key, value in expected.items():
+            actual = [(value, batched[key])] + [(value[i], out[key]) for i, out in enumerate(single)]
+            for want, got in actual:
+                if key.endswith('_decision'):
+                    if not np.array_equal(want, got):
+                        return float('inf')
+                else:
+                    max_error = max(max_error, float(np.max(np.abs(want - got))))
+        return max_error
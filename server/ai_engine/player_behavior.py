@@ -2,12 +2,16 @@
 Player Behavior Analyzer - Learns individual player patterns and preferences
 """
 
+import heapq
 import logging
 import time
 import numpy as np
-from typing import Dict, Any, List, Optional, Tuple
+from pathlib import Path
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 from collections import deque, defaultdict
-from .data_models import GameStateSnapshot, PlayerProfile, PlayerPatterns
+from .data_models import GameStateSnapshot, PlayerProfile, PlayerPatterns, BehaviorReplayResult
+from .rolling_stats import RollingWindow
+from .snapshot_batch import SnapshotBatch, SnapshotFeatures
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +19,14 @@ logger = logging.getLogger(__name__)
 class PlayerBehaviorAnalyzer:
     """
     Analyzes and learns individual player behavior patterns with comprehensive tracking
+
+    Consistency, transition and adaptation metrics are maintained as rolling
+    aggregates at update time, so each update costs the same regardless of
+    how much history has been collected.
     """
+
+    PATTERN_HISTORY_SIZE = 200
+    TRANSITION_WINDOW = 10  # Snapshots per half of the transition comparison
     
     def __init__(self):
         self.mining_patterns = MiningPatternTracker()
@@ -25,7 +36,7 @@ class PlayerBehaviorAnalyzer:
         
         # Player profile and learning
         self.player_profile: Optional[PlayerProfile] = None
-        self.pattern_history: List[Dict] = []
+        self.pattern_history: deque = deque(maxlen=self.PATTERN_HISTORY_SIZE)
         self.learning_confidence = 0.0
         
         # Continuous learning tracking
@@ -41,6 +52,18 @@ class PlayerBehaviorAnalyzer:
         # Meta-learning features
         self.learning_rate_estimates = deque(maxlen=50)
         self.pattern_prediction_accuracy = deque(maxlen=50)
+
+        # Rolling aggregates over pattern history
+        self._pattern_values = {
+            category: RollingWindow(self.TRANSITION_WINDOW * 2)
+            for category in ('mining', 'combat', 'energy')
+        }
+        self._recent_mining_aggression = RollingWindow(10)
+        self._recent_energy_levels = RollingWindow(10)
+        self._recent_style_changes = RollingWindow(9)
+        self._last_combat_style: Optional[str] = None
+        self._consistency_window = RollingWindow(100)
+        self._stability_window = RollingWindow(20)
     
     async def update_patterns(self, game_state: Dict[str, Any]):
         """
@@ -54,40 +77,7 @@ class PlayerBehaviorAnalyzer:
             
             # Convert dict to structured game state
             state_snapshot = GameStateSnapshot.from_dict(game_state)
-            
-            # Update individual pattern trackers
-            await self.mining_patterns.update(state_snapshot)
-            await self.combat_patterns.update(state_snapshot)
-            await self.energy_patterns.update(state_snapshot)
-            await self.exploration_patterns.update(state_snapshot)
-            
-            # Collect comprehensive pattern snapshot
-            pattern_snapshot = {
-                "timestamp": state_snapshot.timestamp,
-                "update_count": self.update_count,
-                "mining": self.mining_patterns.get_current_metrics(),
-                "combat": self.combat_patterns.get_current_metrics(),
-                "energy": self.energy_patterns.get_current_metrics(),
-                "exploration": self.exploration_patterns.get_current_metrics(),
-                "game_phase": self._determine_game_phase(state_snapshot.timestamp)
-            }
-            self.pattern_history.append(pattern_snapshot)
-            
-            # Maintain rolling window of pattern history
-            if len(self.pattern_history) > 200:
-                self.pattern_history = self.pattern_history[-200:]
-            
-            # Continuous pattern analysis and classification
-            await self._perform_continuous_analysis(state_snapshot)
-            
-            # Update player profile classification (with stability checking)
-            if self.update_count % 5 == 0:  # Update classification every 5 updates
-                await self._update_player_classification()
-            
-            # Track learning progress
-            self._update_learning_metrics()
-            
-            self.update_count += 1
+            await self._apply_features(SnapshotFeatures.from_snapshot(state_snapshot))
             
             logger.info(f"Player patterns updated. Profile: {self.player_profile.player_type if self.player_profile else 'unknown'}, "
                        f"Confidence: {self.learning_confidence:.2f}")
@@ -96,7 +86,114 @@ class PlayerBehaviorAnalyzer:
             logger.error(f"Error updating player patterns: {e}")
             raise
     
-    async def _perform_continuous_analysis(self, game_state: GameStateSnapshot):
+    async def replay_snapshots(self, source: Union[str, Path, SnapshotBatch, Iterable[Dict[str, Any]]],
+                               feature_interval: int = 1) -> BehaviorReplayResult:
+        """
+        Replay a recorded snapshot stream to bootstrap the player model offline
+        
+        Snapshot geometry is derived for the whole batch in one vectorized
+        pass and folded through the same tracker updates as the live path,
+        without per-update logging.
+        
+        Args:
+            source: JSONL or columnar .npz file, a SnapshotBatch, or snapshot dicts
+            feature_interval: Emit a feature vector every this many snapshots
+            
+        Returns:
+            BehaviorReplayResult with the final profile and emitted feature vectors
+        """
+        if feature_interval < 1:
+            raise ValueError("feature_interval must be at least 1")
+        
+        if isinstance(source, SnapshotBatch):
+            batch = source
+        elif isinstance(source, (str, Path)):
+            batch = SnapshotBatch.load(source)
+        else:
+            batch = SnapshotBatch.from_snapshots(source)
+        
+        start_time = time.time()
+        feature_timestamps = []
+        feature_vectors = []
+        last_index = len(batch) - 1
+        
+        for index, features in enumerate(batch.iter_features()):
+            await self._apply_features(features)
+            if (index + 1) % feature_interval == 0 or index == last_index:
+                feature_timestamps.append(features.timestamp)
+                feature_vectors.append(self.get_feature_vector())
+        
+        profile = self.player_profile or PlayerProfile('unknown', 0.0)
+        logger.info(f"Replayed {len(batch)} snapshots in {time.time() - start_time:.2f}s. "
+                    f"Profile: {profile.player_type}, Confidence: {self.learning_confidence:.2f}")
+        
+        return BehaviorReplayResult(
+            player_profile=profile,
+            pattern_confidence=self.learning_confidence,
+            snapshot_count=len(batch),
+            feature_timestamps=feature_timestamps,
+            feature_vectors=feature_vectors
+        )
+    
+    async def _apply_features(self, features: SnapshotFeatures):
+        """Fold one snapshot's features into the trackers and the learning state"""
+        # Update individual pattern trackers
+        await self.mining_patterns.update(features)
+        await self.combat_patterns.update(features)
+        await self.energy_patterns.update(features)
+        await self.exploration_patterns.update(features)
+        
+        # Collect comprehensive pattern snapshot
+        pattern_snapshot = {
+            "timestamp": features.timestamp,
+            "update_count": self.update_count,
+            "mining": self.mining_patterns.get_current_metrics(),
+            "combat": self.combat_patterns.get_current_metrics(),
+            "energy": self.energy_patterns.get_current_metrics(),
+            "exploration": self.exploration_patterns.get_current_metrics(),
+            "game_phase": self._determine_game_phase(features.timestamp)
+        }
+        self.pattern_history.append(pattern_snapshot)
+        self._update_rolling_patterns(pattern_snapshot)
+        
+        # Continuous pattern analysis and classification
+        await self._perform_continuous_analysis(features.timestamp)
+        
+        # Update player profile classification (with stability checking)
+        if self.update_count % 5 == 0:  # Update classification every 5 updates
+            await self._update_player_classification()
+        
+        # Track learning progress
+        self._update_learning_metrics()
+        
+        self.update_count += 1
+    
+    def _update_rolling_patterns(self, pattern_snapshot: Dict[str, Any]):
+        """Fold a new pattern snapshot into the rolling aggregates"""
+        for category, window in self._pattern_values.items():
+            window.append(self._pattern_value(pattern_snapshot[category]))
+
+        self._recent_mining_aggression.append(pattern_snapshot['mining'].get('aggression', 0.5))
+        self._recent_energy_levels.append(pattern_snapshot['energy'].get('level', 500))
+
+        combat_style = pattern_snapshot['combat'].get('style', 'balanced')
+        if self._last_combat_style is not None:
+            self._recent_style_changes.append(1.0 if combat_style != self._last_combat_style else 0.0)
+        self._last_combat_style = combat_style
+
+    @staticmethod
+    def _pattern_value(pattern: Dict[str, Any]) -> float:
+        """Mean of the numeric (and category-encoded) values in a pattern snapshot"""
+        values = []
+        for value in pattern.values():
+            if isinstance(value, (int, float)):
+                values.append(value)
+            elif isinstance(value, str):
+                # Convert string categories to numeric
+                values.append(hash(value) % 100 / 100.0)
+        return sum(values) / len(values) if values else 0.0
+
+    async def _perform_continuous_analysis(self, timestamp: float):
         """Perform continuous analysis of player behavior patterns"""
         
         # Detect behavioral transitions
@@ -106,41 +203,27 @@ class PlayerBehaviorAnalyzer:
         # Analyze pattern consistency
         consistency_score = self._calculate_pattern_consistency()
         self.consistency_scores.append(consistency_score)
+        self._consistency_window.append(consistency_score)
         
         # Detect adaptation events
         if len(self.pattern_history) > 20:
             adaptation_detected = await self._detect_player_adaptation()
             if adaptation_detected:
                 self.adaptation_events.append({
-                    'timestamp': game_state.timestamp,
+                    'timestamp': timestamp,
                     'patterns': self._get_current_pattern_summary(),
                     'confidence': self.learning_confidence
                 })
     
     async def _detect_behavioral_transitions(self):
         """Detect significant changes in player behavior patterns"""
-        if len(self.pattern_history) < 20:
+        if len(self.pattern_history) < self.TRANSITION_WINDOW * 2:
             return
         
         # Compare recent patterns with earlier patterns
-        recent_patterns = self.pattern_history[-10:]
-        earlier_patterns = self.pattern_history[-20:-10]
-        
-        # Calculate pattern differences
-        mining_change = self._calculate_pattern_change(
-            [p['mining'] for p in recent_patterns],
-            [p['mining'] for p in earlier_patterns]
-        )
-        
-        combat_change = self._calculate_pattern_change(
-            [p['combat'] for p in recent_patterns],
-            [p['combat'] for p in earlier_patterns]
-        )
-        
-        energy_change = self._calculate_pattern_change(
-            [p['energy'] for p in recent_patterns],
-            [p['energy'] for p in earlier_patterns]
-        )
+        mining_change = self._calculate_pattern_change(self._pattern_values['mining'])
+        combat_change = self._calculate_pattern_change(self._pattern_values['combat'])
+        energy_change = self._calculate_pattern_change(self._pattern_values['energy'])
         
         # Detect significant transitions
         total_change = mining_change + combat_change + energy_change
@@ -155,32 +238,14 @@ class PlayerBehaviorAnalyzer:
             self.behavioral_transitions.append(transition_event)
             logger.info(f"Behavioral transition detected: {total_change:.2f} change magnitude")
     
-    def _calculate_pattern_change(self, recent_patterns: List[Dict], 
-                                earlier_patterns: List[Dict]) -> float:
-        """Calculate magnitude of change between pattern sets"""
-        if not recent_patterns or not earlier_patterns:
-            return 0.0
-        
-        # Extract numeric values for comparison
-        recent_values = []
-        earlier_values = []
-        
-        for pattern_set, values_list in [(recent_patterns, recent_values), 
-                                       (earlier_patterns, earlier_values)]:
-            for pattern in pattern_set:
-                for key, value in pattern.items():
-                    if isinstance(value, (int, float)):
-                        values_list.append(value)
-                    elif isinstance(value, str):
-                        # Convert string categories to numeric
-                        values_list.append(hash(value) % 100 / 100.0)
-        
-        if not recent_values or not earlier_values:
+    def _calculate_pattern_change(self, pattern_values: RollingWindow) -> float:
+        """Calculate magnitude of change between the recent and earlier pattern windows"""
+        if len(pattern_values) < self.TRANSITION_WINDOW * 2:
             return 0.0
         
         # Calculate normalized difference
-        recent_avg = np.mean(recent_values)
-        earlier_avg = np.mean(earlier_values)
+        recent_avg = pattern_values.tail_mean(self.TRANSITION_WINDOW)
+        earlier_avg = pattern_values.tail_mean(self.TRANSITION_WINDOW, skip=self.TRANSITION_WINDOW)
         
         if earlier_avg == 0:
             return 1.0 if recent_avg > 0 else 0.0
@@ -193,8 +258,8 @@ class PlayerBehaviorAnalyzer:
             return False
         
         # Look for patterns that suggest learning/adaptation
-        recent_consistency = np.mean(list(self.consistency_scores)[-10:]) if self.consistency_scores else 0.5
-        earlier_consistency = np.mean(list(self.consistency_scores)[-20:-10]) if len(self.consistency_scores) > 10 else 0.5
+        recent_consistency = self._consistency_window.tail_mean(10) if self._consistency_window else 0.5
+        earlier_consistency = self._consistency_window.tail_mean(10, skip=10) if len(self._consistency_window) > 10 else 0.5
         
         # Adaptation often shows as initial inconsistency followed by new consistency
         consistency_change = recent_consistency - earlier_consistency
@@ -236,9 +301,10 @@ class PlayerBehaviorAnalyzer:
             stability_score = 0.5
         
         self.classification_stability.append(stability_score)
+        self._stability_window.append(stability_score)
         
         # Update profile only if classification is stable or confidence is high
-        stability_avg = np.mean(list(self.classification_stability)) if self.classification_stability else 0.5
+        stability_avg = self._stability_window.mean(default=0.5)
         
         if stability_avg > 0.7 or new_profile.confidence > 0.8:
             self.player_profile = new_profile
@@ -328,7 +394,7 @@ class PlayerBehaviorAnalyzer:
                 classification_scores['adaptive'] += 0.4
             if len(self.behavioral_transitions) > 3:
                 classification_scores['adaptive'] += 0.3
-            if self.consistency_scores and np.var(list(self.consistency_scores)) > 0.1:
+            if self._consistency_window and self._consistency_window.var() > 0.1:
                 classification_scores['adaptive'] += 0.2
             
             # Balanced player (default with moderate scores)
@@ -342,7 +408,7 @@ class PlayerBehaviorAnalyzer:
             
             # Adjust confidence based on data quality
             data_quality = min(1.0, self.update_count / 50.0)  # More data = higher confidence
-            pattern_stability = np.mean(list(self.classification_stability)) if self.classification_stability else 0.5
+            pattern_stability = self._stability_window.mean(default=0.5)
             
             final_confidence = base_confidence * data_quality * pattern_stability
             final_confidence = max(0.1, min(1.0, final_confidence))
@@ -363,35 +429,21 @@ class PlayerBehaviorAnalyzer:
             return "late"
     
     def _calculate_pattern_consistency(self) -> float:
-        """Calculate overall pattern consistency score"""
+        """Calculate overall pattern consistency score over the last 10 snapshots"""
         if len(self.pattern_history) < 10:
             return 0.5
         
-        # Analyze consistency across different pattern types
-        recent_patterns = self.pattern_history[-10:]
-        
-        consistency_scores = []
-        
         # Mining consistency
-        mining_scores = [p['mining'].get('aggression', 0.5) for p in recent_patterns]
-        if mining_scores:
-            mining_consistency = 1.0 / (1.0 + np.var(mining_scores))
-            consistency_scores.append(mining_consistency)
+        mining_consistency = 1.0 / (1.0 + self._recent_mining_aggression.var())
         
         # Combat consistency
-        combat_styles = [p['combat'].get('style', 'balanced') for p in recent_patterns]
-        style_changes = sum(1 for i in range(1, len(combat_styles)) 
-                           if combat_styles[i] != combat_styles[i-1])
-        combat_consistency = 1.0 - (style_changes / max(1, len(combat_styles) - 1))
-        consistency_scores.append(combat_consistency)
+        style_changes = self._recent_style_changes.sum()
+        combat_consistency = 1.0 - (style_changes / max(1, len(self._recent_style_changes)))
         
         # Energy consistency
-        energy_levels = [p['energy'].get('level', 500) for p in recent_patterns]
-        if energy_levels:
-            energy_consistency = 1.0 / (1.0 + np.var(energy_levels) / 10000.0)
-            consistency_scores.append(energy_consistency)
+        energy_consistency = 1.0 / (1.0 + self._recent_energy_levels.var() / 10000.0)
         
-        return np.mean(consistency_scores) if consistency_scores else 0.5
+        return float(np.mean([mining_consistency, combat_consistency, energy_consistency]))
     
     def _update_learning_metrics(self):
         """Update learning progress metrics"""
@@ -460,7 +512,7 @@ class PlayerBehaviorAnalyzer:
             "adaptation_events": len(self.adaptation_events),
             "pattern_consistency": self.consistency_scores[-1] if self.consistency_scores else 0.5,
             "learning_rate": self.learning_rate_estimates[-1] if self.learning_rate_estimates else 0.5,
-            "classification_stability": np.mean(list(self.classification_stability)) if self.classification_stability else 0.5,
+            "classification_stability": self._stability_window.mean(default=0.5),
             "patterns_summary": self._get_current_pattern_summary()
         }
     
@@ -492,7 +544,7 @@ class PlayerBehaviorAnalyzer:
         
         # Factor in multiple confidence indicators
         data_confidence = min(1.0, self.update_count / 100.0)  # More data = higher confidence
-        stability_confidence = np.mean(list(self.classification_stability)) if self.classification_stability else 0.5
+        stability_confidence = self._stability_window.mean(default=0.5)
         consistency_confidence = self.consistency_scores[-1] if self.consistency_scores else 0.5
         
         # Weighted combination
@@ -514,23 +566,27 @@ class MiningPatternTracker:
         self.site_locations = deque(maxlen=200)
         
         # Pattern analysis
-        self.expansion_intervals = []
+        self.expansion_interval_total = 0.0
+        self.expansion_interval_count = 0
         self.site_preferences = defaultdict(int)  # Track preferred mining locations
-        self.worker_efficiency_scores = deque(maxlen=50)
+        self.site_preference_total = 0
+        self.worker_efficiency_scores = RollingWindow(50)
         self.resource_focus_patterns = deque(maxlen=50)
+        self._recent_resource_diversity = RollingWindow(10)
         
         # Timing analysis
         self.last_expansion_time = 0
         self.expansion_count = 0
-        self.early_game_behavior = []  # First 5 minutes
-        self.mid_game_behavior = []    # 5-15 minutes
-        self.late_game_behavior = []   # 15+ minutes
+        self.early_game_behavior = deque(maxlen=100)  # First 5 minutes
+        self.mid_game_behavior = deque(maxlen=100)    # 5-15 minutes
+        self.late_game_behavior = deque(maxlen=100)   # 15+ minutes
+        self.max_early_sites = 0
     
-    async def update(self, game_state: GameStateSnapshot):
+    async def update(self, features: SnapshotFeatures):
         """Update mining patterns with comprehensive analysis"""
-        current_time = game_state.timestamp
-        active_sites = len(game_state.active_mining)
-        worker_count = len(game_state.worker_positions)
+        current_time = features.timestamp
+        active_sites = features.site_count
+        worker_count = features.worker_count
         
         # Track mining site count over time
         self.mining_sites_history.append({
@@ -545,7 +601,8 @@ class MiningPatternTracker:
             if active_sites > prev_sites:
                 expansion_interval = current_time - self.last_expansion_time
                 if self.last_expansion_time > 0:
-                    self.expansion_intervals.append(expansion_interval)
+                    self.expansion_interval_total += expansion_interval
+                    self.expansion_interval_count += 1
                     self.expansion_timing.append({
                         'timestamp': current_time,
                         'interval': expansion_interval,
@@ -554,21 +611,15 @@ class MiningPatternTracker:
                 self.last_expansion_time = current_time
                 self.expansion_count += 1
         
-        # Track mining site locations and preferences
-        for site in game_state.active_mining:
-            location = site.get('location', {})
-            if location:
-                # Discretize location for pattern recognition
-                grid_x = int(location.get('x', 0) // 50)  # 50-unit grid
-                grid_z = int(location.get('z', 0) // 50)
-                location_key = f"{grid_x},{grid_z}"
-                self.site_preferences[location_key] += 1
-                
-                self.site_locations.append({
-                    'timestamp': current_time,
-                    'location': location,
-                    'grid_key': location_key
-                })
+        # Track mining site locations and preferences (keys are 50-unit grid cells)
+        for location, location_key in zip(features.site_locations, features.site_keys):
+            self.site_preferences[location_key] += 1
+            self.site_locations.append({
+                'timestamp': current_time,
+                'location': location,
+                'grid_key': location_key
+            })
+        self.site_preference_total += len(features.site_keys)
         
         # Calculate worker efficiency (workers per mining site)
         if active_sites > 0:
@@ -576,13 +627,13 @@ class MiningPatternTracker:
             self.worker_efficiency_scores.append(efficiency)
         
         # Analyze resource focus patterns
-        resource_diversity = len(set(site.get('resource_type', 'energy') 
-                                   for site in game_state.active_mining))
+        resource_diversity = features.resource_diversity
         self.resource_focus_patterns.append({
             'timestamp': current_time,
             'diversity': resource_diversity,
             'total_sites': active_sites
         })
+        self._recent_resource_diversity.append(resource_diversity)
         
         # Categorize behavior by game phase
         game_duration = current_time
@@ -595,6 +646,7 @@ class MiningPatternTracker:
         
         if game_duration < 300:  # First 5 minutes
             self.early_game_behavior.append(behavior_snapshot)
+            self.max_early_sites = max(self.max_early_sites, active_sites)
         elif game_duration < 900:  # 5-15 minutes
             self.mid_game_behavior.append(behavior_snapshot)
         else:  # 15+ minutes
@@ -602,7 +654,7 @@ class MiningPatternTracker:
     
     def get_aggression_score(self) -> float:
         """Get mining aggression score based on expansion rate and timing"""
-        if not self.expansion_intervals:
+        if self.expansion_interval_count == 0:
             return 0.5
         
         # Calculate expansion rate (sites per minute)
@@ -624,19 +676,16 @@ class MiningPatternTracker:
         # Factor in early expansion behavior
         early_aggression = 0.5
         if self.early_game_behavior:
-            early_sites = [b['sites'] for b in self.early_game_behavior]
-            if early_sites:
-                max_early_sites = max(early_sites)
-                early_aggression = min(1.0, max_early_sites / 5.0)  # 5+ sites in early game = aggressive
+            early_aggression = min(1.0, self.max_early_sites / 5.0)  # 5+ sites in early game = aggressive
         
         return (aggression * 0.7 + early_aggression * 0.3)
     
     def get_expansion_timing_pattern(self) -> str:
         """Analyze expansion timing patterns"""
-        if not self.expansion_intervals:
+        if self.expansion_interval_count == 0:
             return "unknown"
         
-        avg_interval = np.mean(self.expansion_intervals)
+        avg_interval = self.expansion_interval_total / self.expansion_interval_count
         
         if avg_interval < 120:  # Less than 2 minutes
             return "rapid"
@@ -650,14 +699,10 @@ class MiningPatternTracker:
         if not self.site_preferences:
             return {"pattern": "unknown", "diversity": 0.5}
         
-        total_sites = sum(self.site_preferences.values())
-        location_diversity = len(self.site_preferences) / max(1, total_sites)
+        location_diversity = len(self.site_preferences) / max(1, self.site_preference_total)
         
         # Find most preferred locations
-        sorted_prefs = sorted(self.site_preferences.items(), 
-                            key=lambda x: x[1], reverse=True)
-        
-        top_locations = sorted_prefs[:3]  # Top 3 preferred locations
+        top_locations = heapq.nlargest(3, self.site_preferences.items(), key=lambda x: x[1])
         
         return {
             "pattern": "diverse" if location_diversity > 0.7 else "focused",
@@ -671,19 +716,19 @@ class MiningPatternTracker:
         if not self.worker_efficiency_scores:
             return {"trend": 0.0, "average": 2.0, "stability": 0.5}
         
-        scores = list(self.worker_efficiency_scores)
-        avg_efficiency = np.mean(scores)
+        scores = self.worker_efficiency_scores
+        avg_efficiency = scores.mean()
         
         # Calculate trend (positive = improving efficiency)
         if len(scores) > 5:
-            recent_avg = np.mean(scores[-5:])
-            early_avg = np.mean(scores[:5])
+            recent_avg = scores.tail_mean(5)
+            early_avg = scores.head_mean(5)
             trend = (recent_avg - early_avg) / max(0.1, early_avg)
         else:
             trend = 0.0
         
         # Calculate stability (lower variance = more stable)
-        stability = 1.0 / (1.0 + np.var(scores))
+        stability = 1.0 / (1.0 + scores.var())
         
         return {
             "trend": trend,
@@ -740,8 +785,7 @@ class MiningPatternTracker:
         if not self.resource_focus_patterns:
             return {"diversity_score": 0.5, "focus_type": "balanced"}
         
-        recent_patterns = list(self.resource_focus_patterns)[-10:]  # Last 10 snapshots
-        avg_diversity = np.mean([p['diversity'] for p in recent_patterns])
+        avg_diversity = self._recent_resource_diversity.mean()  # Last 10 snapshots
         
         # Determine focus type
         if avg_diversity < 1.5:
@@ -770,22 +814,29 @@ class CombatPatternTracker:
         self.engagement_distances = deque(maxlen=50)
         self.formation_patterns = deque(maxlen=50)
         self.retreat_behaviors = deque(maxlen=30)
-        self.coordination_scores = deque(maxlen=50)
+        self.coordination_scores = RollingWindow(50)
+        self._formation_spreads = RollingWindow(50)
         
         # Tactical analysis
         self.assault_approaches = defaultdict(int)  # Track approach angles/methods
         self.unit_focus_patterns = deque(maxlen=50)  # Protector vs Worker focus
+        self._focus_scores = RollingWindow(50)
         self.timing_preferences = {"early": 0, "mid": 0, "late": 0}
+
+        # Rolling composition aggregates
+        self._recent_protectors = RollingWindow(20)
+        self._recent_protector_ratio = RollingWindow(20)
+        self._latest_protectors = RollingWindow(10)
         
         # Performance tracking
         self.combat_outcomes = deque(maxlen=30)
         self.damage_efficiency = deque(maxlen=50)
     
-    async def update(self, game_state: GameStateSnapshot):
+    async def update(self, features: SnapshotFeatures):
         """Update combat patterns with comprehensive analysis"""
-        current_time = game_state.timestamp
-        protector_count = len(game_state.protector_positions)
-        worker_count = len(game_state.worker_positions)
+        current_time = features.timestamp
+        protector_count = features.protector_count
+        worker_count = features.worker_count
         
         # Track unit composition over time
         composition = {
@@ -796,10 +847,13 @@ class CombatPatternTracker:
             'protector_ratio': protector_count / max(1, protector_count + worker_count)
         }
         self.unit_compositions.append(composition)
+        self._recent_protectors.append(protector_count)
+        self._recent_protector_ratio.append(composition['protector_ratio'])
+        self._latest_protectors.append(protector_count)
         
         # Analyze unit formations and positioning
-        if game_state.protector_positions:
-            formation_analysis = self._analyze_formation(game_state.protector_positions)
+        formation_analysis = features.formation
+        if formation_analysis is not None:
             self.formation_patterns.append({
                 'timestamp': current_time,
                 'spread': formation_analysis['spread'],
@@ -809,6 +863,7 @@ class CombatPatternTracker:
             
             # Track coordination score
             self.coordination_scores.append(formation_analysis['coordination'])
+            self._formation_spreads.append(formation_analysis['spread'])
         
         # Analyze combat timing preferences
         game_phase = self._determine_game_phase(current_time)
@@ -822,41 +877,13 @@ class CombatPatternTracker:
             'focus_score': focus_score,
             'phase': game_phase
         })
+        self._focus_scores.append(focus_score)
         
         # Detect assault patterns based on unit movement
         if len(self.unit_compositions) > 1:
             prev_protectors = self.unit_compositions[-2]['protectors']
             if protector_count > prev_protectors + 2:  # Significant unit increase
-                self._record_assault_buildup(current_time, game_state)
-    
-    def _analyze_formation(self, unit_positions: List[Dict[str, float]]) -> Dict[str, Any]:
-        """Analyze unit formation patterns"""
-        if len(unit_positions) < 2:
-            return {'spread': 0.0, 'center': {'x': 0, 'z': 0}, 'coordination': 0.5}
-        
-        # Calculate formation center
-        center_x = np.mean([pos.get('x', 0) for pos in unit_positions])
-        center_z = np.mean([pos.get('z', 0) for pos in unit_positions])
-        
-        # Calculate formation spread (standard deviation from center)
-        distances = []
-        for pos in unit_positions:
-            dx = pos.get('x', 0) - center_x
-            dz = pos.get('z', 0) - center_z
-            distance = np.sqrt(dx*dx + dz*dz)
-            distances.append(distance)
-        
-        spread = np.std(distances) if distances else 0.0
-        
-        # Calculate coordination score (tighter formations = higher coordination)
-        max_distance = max(distances) if distances else 1.0
-        coordination = 1.0 / (1.0 + spread / max(1.0, max_distance))
-        
-        return {
-            'spread': spread,
-            'center': {'x': center_x, 'z': center_z},
-            'coordination': min(1.0, coordination)
-        }
+                self._record_assault_buildup(current_time, features)
     
     def _determine_game_phase(self, timestamp: float) -> str:
         """Determine current game phase"""
@@ -867,12 +894,12 @@ class CombatPatternTracker:
         else:
             return "late"
     
-    def _record_assault_buildup(self, timestamp: float, game_state: GameStateSnapshot):
+    def _record_assault_buildup(self, timestamp: float, features: SnapshotFeatures):
         """Record assault preparation patterns"""
         assault_data = {
             'timestamp': timestamp,
-            'unit_count': len(game_state.protector_positions),
-            'formation': self._analyze_formation(game_state.protector_positions),
+            'unit_count': features.protector_count,
+            'formation': features.formation,
             'phase': self._determine_game_phase(timestamp)
         }
         self.assault_history.append(assault_data)
@@ -882,10 +909,9 @@ class CombatPatternTracker:
         if not self.unit_compositions:
             return "balanced"
         
-        # Analyze recent unit compositions
-        recent_comps = list(self.unit_compositions)[-20:]  # Last 20 snapshots
-        avg_protectors = np.mean([comp['protectors'] for comp in recent_comps])
-        avg_ratio = np.mean([comp['protector_ratio'] for comp in recent_comps])
+        # Analyze recent unit compositions (last 20 snapshots)
+        avg_protectors = self._recent_protectors.mean()
+        avg_ratio = self._recent_protector_ratio.mean()
         
         # Analyze timing preferences
         total_timing = sum(self.timing_preferences.values())
@@ -912,10 +938,8 @@ class CombatPatternTracker:
         if not self.unit_compositions:
             return 0.5
         
-        recent_comps = list(self.unit_compositions)[-10:]
-        
-        # Factor 1: Unit count aggression
-        avg_protectors = np.mean([comp['protectors'] for comp in recent_comps])
+        # Factor 1: Unit count aggression (last 10 snapshots)
+        avg_protectors = self._latest_protectors.mean()
         unit_aggression = min(1.0, avg_protectors / 20.0)  # 20+ protectors = max aggression
         
         # Factor 2: Timing aggression (early attacks = more aggressive)
@@ -928,7 +952,7 @@ class CombatPatternTracker:
         # Factor 3: Formation coordination (tight formations = more aggressive)
         coord_aggression = 0.5
         if self.coordination_scores:
-            coord_aggression = np.mean(list(self.coordination_scores))
+            coord_aggression = self.coordination_scores.mean()
         
         # Weighted combination
         return (unit_aggression * 0.4 + timing_aggression * 0.3 + coord_aggression * 0.3)
@@ -938,14 +962,14 @@ class CombatPatternTracker:
         if not self.coordination_scores:
             return {"level": 0.5, "consistency": 0.5, "trend": 0.0}
         
-        scores = list(self.coordination_scores)
-        avg_coordination = np.mean(scores)
-        consistency = 1.0 / (1.0 + np.var(scores))  # Lower variance = higher consistency
+        scores = self.coordination_scores
+        avg_coordination = scores.mean()
+        consistency = 1.0 / (1.0 + scores.var())  # Lower variance = higher consistency
         
         # Calculate trend
         if len(scores) > 5:
-            recent_avg = np.mean(scores[-5:])
-            early_avg = np.mean(scores[:5])
+            recent_avg = scores.tail_mean(5)
+            early_avg = scores.head_mean(5)
             trend = (recent_avg - early_avg) / max(0.1, early_avg)
         else:
             trend = 0.0
@@ -972,8 +996,7 @@ class CombatPatternTracker:
         preferred_timing = max(timing_dist.items(), key=lambda x: x[1])[0]
         
         # Analyze unit focus
-        focus_scores = [fp['focus_score'] for fp in self.unit_focus_patterns]
-        avg_focus = np.mean(focus_scores) if focus_scores else 1.0
+        avg_focus = self._focus_scores.mean(default=1.0)
         
         focus_type = "combat" if avg_focus > 1.5 else "economic" if avg_focus < 0.7 else "balanced"
         
@@ -1026,20 +1049,16 @@ class CombatPatternTracker:
             "style": self.get_combat_style(),
             "protector_count": latest.get('protectors', 0),
             "aggression": self.get_aggression_level(),
-            "coordination": self.coordination_scores[-1] if self.coordination_scores else 0.5
+            "coordination": self.coordination_scores.last() if self.coordination_scores else 0.5
         }
     
     def _calculate_formation_consistency(self) -> float:
         """Calculate how consistent formation patterns are"""
-        if not self.formation_patterns:
-            return 0.5
-        
-        spreads = [fp['spread'] for fp in self.formation_patterns]
-        if not spreads:
+        if not self._formation_spreads:
             return 0.5
         
         # Lower variance in spread = higher consistency
-        consistency = 1.0 / (1.0 + np.var(spreads))
+        consistency = 1.0 / (1.0 + self._formation_spreads.var())
         return min(1.0, consistency)
 
 
@@ -1055,21 +1074,32 @@ class EnergyManagementTracker:
         # Spending analysis
         self.spending_categories = defaultdict(list)  # Track spending by category
         self.spending_timing = deque(maxlen=100)
-        self.efficiency_scores = deque(maxlen=50)
+        self.efficiency_scores = RollingWindow(50)
         
         # Risk analysis
         self.low_energy_events = deque(maxlen=30)  # Times when energy was critically low
         self.recovery_patterns = deque(maxlen=30)
-        self.risk_tolerance_scores = deque(maxlen=50)
+        self.risk_tolerance_scores = RollingWindow(50)
+        self.low_energy_duration = 0.0
         
         # Strategic analysis
         self.energy_phases = {"buildup": 0, "spending": 0, "conservation": 0}
         self.spending_bursts = deque(maxlen=30)  # Large spending events
-    
-    async def update(self, game_state: GameStateSnapshot):
+
+        # Rolling aggregates
+        self._energy_levels = RollingWindow(200)
+        self._recent_energy_levels = RollingWindow(20)
+        self._spend_amounts = RollingWindow(100)
+        self._spending_by_phase = defaultdict(int)
+        self._recent_spend_remaining = RollingWindow(5)
+        self._recent_spend_amounts = RollingWindow(10)
+        self._recent_spend_times = RollingWindow(10)
+        self._recoveries = RollingWindow(50)
+    
+    async def update(self, features: SnapshotFeatures):
         """Update energy management patterns"""
-        current_time = game_state.timestamp
-        current_energy = game_state.energy_level
+        current_time = features.timestamp
+        current_energy = features.energy_level
         
         # Track energy level over time
         energy_snapshot = {
@@ -1077,11 +1107,20 @@ class EnergyManagementTracker:
             'energy': current_energy,
             'phase': self._determine_energy_phase(current_energy)
         }
+        prev_snapshot = self.energy_history[-1] if self.energy_history else None
         self.energy_history.append(energy_snapshot)
+        self._energy_levels.append(current_energy)
+        self._recent_energy_levels.append(current_energy)
+        
+        # Track how long energy has stayed critically low
+        if current_energy < 100 and prev_snapshot is not None:
+            self.low_energy_duration += current_time - prev_snapshot['timestamp']
+        else:
+            self.low_energy_duration = 0.0
         
         # Detect spending patterns
-        if len(self.energy_history) > 1:
-            prev_energy = self.energy_history[-2]['energy']
+        if prev_snapshot is not None:
+            prev_energy = prev_snapshot['energy']
             energy_change = current_energy - prev_energy
             
             if energy_change < -50:  # Significant spending
@@ -1091,7 +1130,7 @@ class EnergyManagementTracker:
                     'remaining': current_energy,
                     'phase': self._determine_game_phase(current_time)
                 }
-                self.spending_patterns.append(spending_event)
+                self._record_spending(spending_event)
                 
                 # Track large spending bursts
                 if abs(energy_change) > 200:
@@ -1104,6 +1143,7 @@ class EnergyManagementTracker:
                     'level': current_energy
                 }
                 self.conservation_events.append(conservation_event)
+                self._recoveries.append(energy_change)
         
         # Track energy phases
         phase = self._determine_energy_phase(current_energy)
@@ -1114,7 +1154,7 @@ class EnergyManagementTracker:
             risk_event = {
                 'timestamp': current_time,
                 'energy': current_energy,
-                'duration': self._calculate_low_energy_duration()
+                'duration': self.low_energy_duration
             }
             self.low_energy_events.append(risk_event)
         
@@ -1127,6 +1167,18 @@ class EnergyManagementTracker:
             efficiency = self._calculate_spending_efficiency()
             self.efficiency_scores.append(efficiency)
     
+    def _record_spending(self, spending_event: Dict[str, Any]):
+        """Record a spending event and update the rolling spending aggregates"""
+        if len(self.spending_patterns) == self.spending_patterns.maxlen:
+            self._spending_by_phase[self.spending_patterns[0]['phase']] -= 1
+        self.spending_patterns.append(spending_event)
+        self._spending_by_phase[spending_event['phase']] += 1
+
+        self._spend_amounts.append(spending_event['amount'])
+        self._recent_spend_remaining.append(spending_event['remaining'])
+        self._recent_spend_amounts.append(spending_event['amount'])
+        self._recent_spend_times.append(spending_event['timestamp'])
+
     def _determine_energy_phase(self, energy_level: int) -> str:
         """Determine current energy management phase"""
         if energy_level > 800:
@@ -1145,25 +1197,6 @@ class EnergyManagementTracker:
         else:
             return "late"
     
-    def _calculate_low_energy_duration(self) -> float:
-        """Calculate how long player has been in low energy state"""
-        if len(self.energy_history) < 2:
-            return 0.0
-        
-        # Count consecutive low energy snapshots
-        duration = 0.0
-        for i in range(len(self.energy_history) - 1, -1, -1):
-            if self.energy_history[i]['energy'] < 100:
-                if i > 0:
-                    duration += (self.energy_history[i]['timestamp'] - 
-                               self.energy_history[i-1]['timestamp'])
-                else:
-                    break
-            else:
-                break
-        
-        return duration
-    
     def _calculate_current_risk_tolerance(self, energy: int, timestamp: float) -> float:
         """Calculate current risk tolerance based on energy management"""
         # Base risk tolerance on current energy level
@@ -1171,8 +1204,7 @@ class EnergyManagementTracker:
         
         # Adjust based on recent spending patterns
         if self.spending_patterns:
-            recent_spending = list(self.spending_patterns)[-5:]  # Last 5 spending events
-            avg_remaining = np.mean([sp['remaining'] for sp in recent_spending])
+            avg_remaining = self._recent_spend_remaining.mean()  # Last 5 spending events
             spending_risk = 1.0 - (avg_remaining / 1000.0)
         else:
             spending_risk = 0.5
@@ -1186,12 +1218,10 @@ class EnergyManagementTracker:
         if not self.spending_patterns:
             return 0.5
         
-        recent_spending = list(self.spending_patterns)[-10:]
-        
-        # Efficiency based on spending timing and amounts
-        total_spent = sum(sp['amount'] for sp in recent_spending)
-        time_span = (recent_spending[-1]['timestamp'] - 
-                    recent_spending[0]['timestamp']) if len(recent_spending) > 1 else 1.0
+        # Efficiency based on spending timing and amounts over the last 10 events
+        total_spent = self._recent_spend_amounts.sum()
+        time_span = (self._recent_spend_times.last() - 
+                    self._recent_spend_times.first()) if len(self._recent_spend_times) > 1 else 1.0
         
         # Higher efficiency = more spending in shorter time (burst spending)
         if time_span > 0:
@@ -1207,9 +1237,8 @@ class EnergyManagementTracker:
         if not self.energy_history:
             return "balanced"
         
-        recent_energy = [eh['energy'] for eh in list(self.energy_history)[-20:]]
-        avg_energy = np.mean(recent_energy)
-        energy_variance = np.var(recent_energy)
+        avg_energy = self._recent_energy_levels.mean()
+        energy_variance = self._recent_energy_levels.var()
         
         # Analyze spending patterns
         total_phases = sum(self.energy_phases.values())
@@ -1236,14 +1265,13 @@ class EnergyManagementTracker:
         if not self.risk_tolerance_scores:
             return {"tolerance": 0.5, "consistency": 0.5, "recovery_ability": 0.5}
         
-        scores = list(self.risk_tolerance_scores)
-        avg_tolerance = np.mean(scores)
-        consistency = 1.0 / (1.0 + np.var(scores))
+        avg_tolerance = self.risk_tolerance_scores.mean()
+        consistency = 1.0 / (1.0 + self.risk_tolerance_scores.var())
         
         # Recovery ability based on conservation events
         recovery_ability = 0.5
         if self.conservation_events:
-            avg_recovery = np.mean([ce['recovery'] for ce in self.conservation_events])
+            avg_recovery = self._recoveries.mean()
             recovery_ability = min(1.0, avg_recovery / 100.0)  # Normalize
         
         return {
@@ -1259,12 +1287,10 @@ class EnergyManagementTracker:
             return {"efficiency": 0.5, "burst_frequency": 0, "timing_preference": "balanced"}
         
         # Calculate spending efficiency
-        avg_efficiency = np.mean(list(self.efficiency_scores)) if self.efficiency_scores else 0.5
+        avg_efficiency = self.efficiency_scores.mean(default=0.5)
         
         # Analyze spending timing preferences
-        spending_by_phase = defaultdict(int)
-        for sp in self.spending_patterns:
-            spending_by_phase[sp['phase']] += 1
+        spending_by_phase = {phase: count for phase, count in self._spending_by_phase.items() if count > 0}
         
         total_spending_events = sum(spending_by_phase.values())
         if total_spending_events > 0:
@@ -1278,7 +1304,7 @@ class EnergyManagementTracker:
             "efficiency": avg_efficiency,
             "burst_frequency": len(self.spending_bursts),
             "timing_preference": preferred_phase,
-            "average_spending": np.mean([sp['amount'] for sp in self.spending_patterns])
+            "average_spending": self._spend_amounts.mean()
         }
     
     def get_patterns(self) -> Dict[str, Any]:
@@ -1316,7 +1342,7 @@ class EnergyManagementTracker:
         return {
             "style": self.get_management_style(),
             "level": latest.get('energy', 500),
-            "risk_tolerance": self.risk_tolerance_scores[-1] if self.risk_tolerance_scores else 0.5,
+            "risk_tolerance": self.risk_tolerance_scores.last() if self.risk_tolerance_scores else 0.5,
             "phase": latest.get('phase', 'spending')
         }
     
@@ -1325,8 +1351,7 @@ class EnergyManagementTracker:
         if not self.energy_history:
             return 0.5
         
-        energy_levels = [eh['energy'] for eh in self.energy_history]
-        stability = 1.0 / (1.0 + np.var(energy_levels) / 10000.0)  # Normalize variance
+        stability = 1.0 / (1.0 + self._energy_levels.var() / 10000.0)  # Normalize variance
         return min(1.0, stability)
     
     def _calculate_conservation_ability(self) -> float:
@@ -1335,7 +1360,7 @@ class EnergyManagementTracker:
             return 0.5
         
         # Average recovery rate
-        avg_recovery = np.mean([ce['recovery'] for ce in self.conservation_events])
+        avg_recovery = self._recoveries.mean()
         conservation_ability = min(1.0, avg_recovery / 150.0)  # Normalize
         
         return conservation_ability
@@ -1354,6 +1379,8 @@ class ExplorationPatternTracker:
         self.risk_taking_events = deque(maxlen=50)
         self.exploration_efficiency = deque(maxlen=50)
         self.discovery_patterns = deque(maxlen=50)
+        self._risk_scores = RollingWindow(50)
+        self._efficiency_scores = RollingWindow(50)
         
         # Strategic exploration analysis
         self.exploration_timing = {"early": 0, "mid": 0, "late": 0}
@@ -1363,11 +1390,16 @@ class ExplorationPatternTracker:
         # Performance tracking
         self.exploration_outcomes = deque(maxlen=30)
         self.resource_discovery_rate = deque(maxlen=30)
+
+        # Rolling aggregates
+        self._recent_explored = RollingWindow(10)
+        self._recent_coverage_times = RollingWindow(10)
+        self._event_intervals = RollingWindow(self.exploration_events.maxlen - 1)
     
-    async def update(self, game_state: GameStateSnapshot):
+    async def update(self, features: SnapshotFeatures):
         """Update exploration patterns with detailed analysis"""
-        current_time = game_state.timestamp
-        explored_count = len(game_state.explored_areas) if hasattr(game_state, 'explored_areas') else 5
+        current_time = features.timestamp
+        explored_count = features.explored_count
         
         # Track territory coverage over time
         coverage_snapshot = {
@@ -1377,6 +1409,8 @@ class ExplorationPatternTracker:
             'phase': self._determine_game_phase(current_time)
         }
         self.territory_coverage.append(coverage_snapshot)
+        self._recent_explored.append(explored_count)
+        self._recent_coverage_times.append(current_time)
         
         # Detect new exploration events
         if len(self.territory_coverage) > 1:
@@ -1388,6 +1422,8 @@ class ExplorationPatternTracker:
                     'total_explored': explored_count,
                     'phase': self._determine_game_phase(current_time)
                 }
+                if self.exploration_events:
+                    self._event_intervals.append(current_time - self.exploration_events[-1]['timestamp'])
                 self.exploration_events.append(exploration_event)
                 
                 # Track exploration timing
@@ -1395,19 +1431,21 @@ class ExplorationPatternTracker:
                 self.exploration_timing[phase] += exploration_event['new_areas']
         
         # Analyze exploration efficiency
-        if game_state.worker_positions:
+        if features.worker_count:
             efficiency = self._calculate_exploration_efficiency(
-                game_state.worker_positions, explored_count, current_time
+                features.worker_count, explored_count, current_time
             )
             self.exploration_efficiency.append(efficiency)
+            self._efficiency_scores.append(efficiency['efficiency_score'])
         
         # Track risk-taking behavior in exploration
-        risk_score = self._assess_exploration_risk(game_state, current_time)
+        risk_score = self._assess_exploration_risk(features, current_time)
         self.risk_taking_events.append({
             'timestamp': current_time,
             'risk_score': risk_score,
             'explored_areas': explored_count
         })
+        self._risk_scores.append(risk_score)
         
         # Analyze exploration methods (systematic vs random)
         if len(self.exploration_events) > 2:
@@ -1416,21 +1454,17 @@ class ExplorationPatternTracker:
     
     def _calculate_exploration_rate(self) -> float:
         """Calculate current exploration rate (areas per minute)"""
-        if len(self.territory_coverage) < 2:
+        # Compare first and last of the last 10 snapshots
+        if len(self._recent_coverage_times) < 2:
             return 0.0
         
-        recent_snapshots = list(self.territory_coverage)[-10:]  # Last 10 snapshots
-        if len(recent_snapshots) < 2:
-            return 0.0
-        
-        time_span = (recent_snapshots[-1]['timestamp'] - 
-                    recent_snapshots[0]['timestamp']) / 60.0  # Convert to minutes
+        time_span = (self._recent_coverage_times.last() - 
+                    self._recent_coverage_times.first()) / 60.0  # Convert to minutes
         
         if time_span <= 0:
             return 0.0
         
-        area_increase = (recent_snapshots[-1]['explored_areas'] - 
-                        recent_snapshots[0]['explored_areas'])
+        area_increase = self._recent_explored.last() - self._recent_explored.first()
         
         return max(0.0, area_increase / time_span)
     
@@ -1443,11 +1477,10 @@ class ExplorationPatternTracker:
         else:
             return "late"
     
-    def _calculate_exploration_efficiency(self, worker_positions: List[Dict], 
+    def _calculate_exploration_efficiency(self, worker_count: int, 
                                         explored_count: int, timestamp: float) -> Dict[str, float]:
         """Calculate exploration efficiency metrics"""
-        worker_count = len(worker_positions)
-        
+
         # Efficiency = explored areas per worker over time
         if worker_count > 0 and timestamp > 0:
             areas_per_worker = explored_count / worker_count
@@ -1465,7 +1498,7 @@ class ExplorationPatternTracker:
             'efficiency_score': efficiency_score
         }
     
-    def _assess_exploration_risk(self, game_state: GameStateSnapshot, timestamp: float) -> float:
+    def _assess_exploration_risk(self, features: SnapshotFeatures, timestamp: float) -> float:
         """Assess risk level of current exploration behavior"""
         # Risk factors:
         # 1. Exploring with low energy
@@ -1475,7 +1508,7 @@ class ExplorationPatternTracker:
         risk_factors = []
         
         # Energy risk
-        energy_risk = max(0.0, (500 - game_state.energy_level) / 500.0)
+        energy_risk = max(0.0, (500 - features.energy_level) / 500.0)
         risk_factors.append(energy_risk)
         
         # Timing risk (early exploration is riskier)
@@ -1484,34 +1517,14 @@ class ExplorationPatternTracker:
         risk_factors.append(timing_risk)
         
         # Worker distribution risk (spreading workers thin)
-        if game_state.worker_positions:
-            worker_spread = self._calculate_worker_spread(game_state.worker_positions)
-            spread_risk = min(1.0, worker_spread / 100.0)  # Normalize
+        if features.worker_spread is not None:
+            spread_risk = min(1.0, features.worker_spread / 100.0)  # Normalize
             risk_factors.append(spread_risk)
         else:
             risk_factors.append(0.5)
         
         return np.mean(risk_factors)
     
-    def _calculate_worker_spread(self, worker_positions: List[Dict[str, float]]) -> float:
-        """Calculate how spread out workers are"""
-        if len(worker_positions) < 2:
-            return 0.0
-        
-        # Calculate center of mass
-        center_x = np.mean([pos.get('x', 0) for pos in worker_positions])
-        center_z = np.mean([pos.get('z', 0) for pos in worker_positions])
-        
-        # Calculate average distance from center
-        distances = []
-        for pos in worker_positions:
-            dx = pos.get('x', 0) - center_x
-            dz = pos.get('z', 0) - center_z
-            distance = np.sqrt(dx*dx + dz*dz)
-            distances.append(distance)
-        
-        return np.mean(distances)
-    
     def _classify_exploration_method(self) -> str:
         """Classify exploration method as systematic or random"""
         if len(self.exploration_events) < 3:
@@ -1564,9 +1577,8 @@ class ExplorationPatternTracker:
         if not self.risk_taking_events:
             return {"risk_level": 0.5, "consistency": 0.5, "timing": "balanced"}
         
-        risk_scores = [event['risk_score'] for event in self.risk_taking_events]
-        avg_risk = np.mean(risk_scores)
-        risk_consistency = 1.0 / (1.0 + np.var(risk_scores))
+        avg_risk = self._risk_scores.mean()
+        risk_consistency = 1.0 / (1.0 + self._risk_scores.var())
         
         # Analyze risk timing
         total_timing = sum(self.exploration_timing.values())
@@ -1592,13 +1604,13 @@ class ExplorationPatternTracker:
         if not self.exploration_efficiency:
             return {"efficiency": 0.5, "trend": 0.0, "method": "unknown"}
         
-        efficiencies = [eff['efficiency_score'] for eff in self.exploration_efficiency]
-        avg_efficiency = np.mean(efficiencies)
+        efficiencies = self._efficiency_scores
+        avg_efficiency = efficiencies.mean()
         
         # Calculate efficiency trend
         if len(efficiencies) > 5:
-            recent_avg = np.mean(efficiencies[-5:])
-            early_avg = np.mean(efficiencies[:5])
+            recent_avg = efficiencies.tail_mean(5)
+            early_avg = efficiencies.head_mean(5)
             trend = (recent_avg - early_avg) / max(0.1, early_avg)
         else:
             trend = 0.0
@@ -1679,15 +1691,6 @@ class ExplorationPatternTracker:
         if len(self.exploration_events) < 3:
             return 0.5
         
-        intervals = []
-        events = list(self.exploration_events)
-        for i in range(1, len(events)):
-            interval = events[i]['timestamp'] - events[i-1]['timestamp']
-            intervals.append(interval)
-        
-        if not intervals:
-            return 0.5
-        
-        # Lower variance = higher consistency
-        consistency = 1.0 / (1.0 + np.var(intervals) / 3600.0)  # Normalize by hour
+        # Lower variance in exploration intervals = higher consistency
+        consistency = 1.0 / (1.0 + self._event_intervals.var() / 3600.0)  # Normalize by hour
         return min(1.0, consistency)
\ No newline at end of file
@@ -13,12 +13,17 @@ Spawn Location Rewards (Strategic Spatial Awareness):
 - ACTIVE mode (workers present): Penalize spawning far from workers (offensive posture)
 
 All rates use unified normalization: (end - start) / max(start, end) → [-1, +1]
+
+calculate_reward() scores one transition online. For relabeling logged
+transitions (e.g. after reward weights change), compile them once with
+TransitionBatch.from_observations() and score them with
+calculate_rewards_batch(), which gives the same rewards as arrays.
 """
 
 import logging
-from typing import Dict, Any, Optional, List
-from dataclasses import dataclass
-from collections import defaultdict
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+from dataclasses import dataclass, fields
+from collections import defaultdict, deque
 import numpy as np
 
 logger = logging.getLogger(__name__)
@@ -62,6 +67,107 @@ class RewardConfig:
     max_reward: float = 1.0
 
 
+# Column order of the component matrix returned by calculate_rewards_batch
+REWARD_COMPONENTS = (
+    'mining_disruption',
+    'protector_reduction',
+    'player_energy_drain',
+    'bonuses',
+    'no_impact_penalty',
+    'spawn_gating',
+    'spawn_location'
+)
+
+
+@dataclass
+class TransitionBatch:
+    """
+    Aligned per-transition arrays compiled from (prev, curr, spawn_decision) triples.
+
+    Holds only the observation facts rewards depend on, not reward
+    weights, so one compiled batch can be rescored under any RewardConfig.
+    """
+    prev_mining: np.ndarray  # [N] miningWorkers count in prev
+    curr_mining: np.ndarray  # [N] miningWorkers count in curr
+    chunks_cleared: np.ndarray  # [N] chunks mined in prev with no mining in curr
+    prev_protectors: np.ndarray  # [N]
+    curr_protectors: np.ndarray  # [N]
+    energy_start: np.ndarray  # [N] curr playerEnergy window
+    energy_end: np.ndarray  # [N]
+    mineral_start: np.ndarray  # [N] curr playerMinerals window
+    mineral_end: np.ndarray  # [N]
+    prev_workers_present: np.ndarray  # [N] workersPresent (or miningWorkers) count in prev
+    has_decision: np.ndarray  # [N] bool, a spawn decision was given
+    skipped: np.ndarray  # [N] bool
+    spawn_chunk: np.ndarray  # [N] -1 if none
+    hive_chunk: np.ndarray  # [N] curr hiveChunk, -1 if none
+    curr_workers_present: np.ndarray  # [N] workersPresent count in curr
+    worker_chunks: np.ndarray  # [N, W] curr workersPresent chunk IDs, padded with -1
+
+    def __len__(self) -> int:
+        return len(self.prev_mining)
+
+    @classmethod
+    def from_observations(
+        cls,
+        transitions: Iterable[Tuple[Dict[str, Any], Dict[str, Any], Optional[Dict[str, Any]]]]
+    ) -> "TransitionBatch":
+        """
+        Compile transitions into arrays.
+
+        Args:
+            transitions: (prev_observation, curr_observation, spawn_decision) triples,
+                as passed to RewardCalculator.calculate_reward
+
+        Returns:
+            TransitionBatch with one row per transition
+        """
+        rows = []
+        worker_lists = []
+        for prev_obs, curr_obs, decision in transitions:
+            prev_workers = prev_obs.get('miningWorkers', [])
+            curr_workers = curr_obs.get('miningWorkers', [])
+            prev_chunks = {c for c in (w.get('chunkId', -1) for w in prev_workers) if c >= 0}
+            curr_chunks = {w.get('chunkId', -1) for w in curr_workers}
+
+            energy = curr_obs.get('playerEnergy', {})
+            minerals = curr_obs.get('playerMinerals', {})
+            present = curr_obs.get('workersPresent', [])
+            has_decision = decision is not None
+            decision = decision or {}
+
+            rows.append((
+                len(prev_workers),
+                len(curr_workers),
+                len(prev_chunks - curr_chunks),
+                len(prev_obs.get('protectors', [])),
+                len(curr_obs.get('protectors', [])),
+                energy.get('start', 0),
+                energy.get('end', 0),
+                minerals.get('start', 0),
+                minerals.get('end', 0),
+                len(prev_obs.get('workersPresent', prev_workers)),
+                has_decision,
+                decision.get('skipped', False),
+                decision.get('spawnChunk', -1),
+                curr_obs.get('hiveChunk', -1),
+                len(present)
+            ))
+            worker_lists.append([w.get('chunkId', -1) for w in present])
+
+        columns = list(zip(*rows)) if rows else [()] * 15
+        dtypes = [np.int32] * 5 + [np.float64] * 4 + [np.int32, bool, bool, np.int32, np.int32, np.int32]
+        arrays = [np.array(column, dtype=dtype) for column, dtype in zip(columns, dtypes)]
+
+        width = max((len(chunks) for chunks in worker_lists), default=0)
+        worker_chunks = np.full((len(worker_lists), width), -1, dtype=np.int32)
+        for i, chunks in enumerate(worker_lists):
+            worker_chunks[i, :len(chunks)] = chunks
+
+        names = [f.name for f in fields(cls)]
+        return cls(**dict(zip(names, arrays + [worker_chunks])))
+
+
 class RewardCalculator:
     """
     Calculates reward signals for Queen NN training.
@@ -74,9 +180,19 @@ class RewardCalculator:
         self.config = config or RewardConfig()
 
         # Track history for multi-step rewards
-        self.observation_history: List[Dict[str, Any]] = []
-        self.reward_history: List[float] = []
         self.max_history = 10
+        self.observation_history: deque = deque(maxlen=self.max_history)
+        self.reward_history: deque = deque(maxlen=self.max_history)
+
+        # Chunk-to-chunk distances for every chunk on the grid
+        self._distance_table = self._build_distance_table()
+
+    def _build_distance_table(self) -> np.ndarray:
+        """Euclidean distance between every pair of chunk IDs on the grid."""
+        chunks = np.arange(self.config.chunks_per_axis ** 2)
+        x = chunks % self.config.chunks_per_axis
+        z = chunks // self.config.chunks_per_axis
+        return np.sqrt((x[:, None] - x[None, :]) ** 2 + (z[:, None] - z[None, :]) ** 2)
 
     def calculate_reward(
         self,
@@ -157,11 +273,7 @@ class RewardCalculator:
             components['spawn_location'] = spawn_location_reward
 
         # 9. Clip to bounds
-        total_reward = np.clip(
-            total_reward,
-            self.config.min_reward,
-            self.config.max_reward
-        )
+        total_reward = min(max(total_reward, self.config.min_reward), self.config.max_reward)
 
         # Store in history
         self._update_history(curr_observation, total_reward)
@@ -172,6 +284,139 @@ class RewardCalculator:
             'details': details
         }
 
+    def calculate_rewards_batch(self, batch: TransitionBatch) -> Dict[str, Any]:
+        """
+        Calculate rewards for many transitions at once.
+
+        Gives the same rewards and components as calculate_reward on each
+        transition, without updating the reward history.
+
+        Args:
+            batch: Compiled transitions (TransitionBatch.from_observations)
+
+        Returns:
+            Dictionary with:
+            - reward: [N] total rewards, clipped to bounds
+            - components: [N, len(REWARD_COMPONENTS)] component values (0 where not applied)
+            - component_names: REWARD_COMPONENTS
+        """
+        cfg = self.config
+        rate = self._calculate_rate_batch
+
+        mining_rate = rate(batch.prev_mining, batch.curr_mining)
+        protector_rate = rate(batch.prev_protectors, batch.curr_protectors)
+        energy_rate = rate(batch.energy_start, batch.energy_end)
+
+        protectors_killed = np.maximum(0, batch.prev_protectors - batch.curr_protectors)
+        bonuses = (
+            batch.chunks_cleared * cfg.mining_stopped_bonus +
+            protectors_killed * cfg.protector_killed_bonus
+        )
+
+        threshold = 0.05
+        no_impact = (
+            (np.abs(mining_rate) < threshold) &
+            (np.abs(protector_rate) < threshold) &
+            (np.abs(energy_rate) < threshold)
+        )
+
+        components = np.zeros((len(batch), len(REWARD_COMPONENTS)))
+        components[:, 0] = -mining_rate
+        components[:, 1] = -protector_rate
+        components[:, 2] = -energy_rate
+        components[:, 3] = bonuses
+        components[:, 4] = np.where(no_impact, cfg.no_impact_penalty, 0.0)
+        components[:, 5] = self._spawn_gating_batch(batch, rate(batch.mineral_start, batch.mineral_end))
+        components[:, 6] = self._spawn_location_batch(batch)
+
+        total = (
+            components[:, 0] * cfg.mining_disruption_weight +
+            components[:, 1] * cfg.protector_reduction_weight +
+            components[:, 2] * cfg.player_energy_weight +
+            components[:, 3:].sum(axis=1)
+        )
+
+        return {
+            'reward': np.clip(total, cfg.min_reward, cfg.max_reward),
+            'components': components,
+            'component_names': REWARD_COMPONENTS
+        }
+
+    def _spawn_gating_batch(self, batch: TransitionBatch, mineral_rate: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_spawn_gating_reward."""
+        cfg = self.config
+        energy_rate = self._calculate_rate_batch(batch.energy_start, batch.energy_end)
+        workers = batch.prev_workers_present > 0
+        mining = batch.prev_mining > 0
+
+        skip_penalty = (
+            np.where(workers, cfg.workers_present_penalty, 0.0) +
+            np.where(mining, cfg.active_mining_penalty, 0.0) +
+            np.where(energy_rate > 0, energy_rate * cfg.energy_rate_penalty_multiplier, 0.0) +
+            np.where(mineral_rate > 0, mineral_rate * cfg.mineral_rate_penalty_multiplier, 0.0)
+        )
+        idle = ~workers & ~mining
+        skip_penalty = np.where(
+            idle & (energy_rate <= 0) & (mineral_rate <= 0), cfg.skip_no_targets_reward, skip_penalty
+        )
+        spawn_penalty = np.where(idle, cfg.spawn_no_targets_penalty, 0.0)
+
+        gating = np.where(batch.skipped, skip_penalty, spawn_penalty)
+        return np.where(batch.has_decision, gating, 0.0)
+
+    def _spawn_location_batch(self, batch: TransitionBatch) -> np.ndarray:
+        """Vectorized _calculate_spawn_location_reward using the distance table."""
+        cfg = self.config
+        spawned = batch.has_decision & ~batch.skipped & (batch.spawn_chunk >= 0)
+
+        hive_distance = self._chunk_distances(batch.spawn_chunk, batch.hive_chunk)
+        idle_penalty = np.where(
+            batch.hive_chunk >= 0,
+            np.minimum(1.0, hive_distance / cfg.max_chunk_distance) * cfg.hive_proximity_penalty_weight,
+            0.0
+        )
+
+        if batch.worker_chunks.shape[1] > 0:
+            valid = batch.worker_chunks >= 0
+            worker_distance = self._chunk_distances(batch.spawn_chunk[:, None], batch.worker_chunks)
+            nearest = np.where(valid, worker_distance, np.inf).min(axis=1)
+            active_penalty = np.where(
+                valid.any(axis=1),
+                np.minimum(1.0, nearest / cfg.max_chunk_distance) * cfg.threat_proximity_penalty_weight,
+                0.0
+            )
+        else:
+            active_penalty = np.zeros(len(batch))
+
+        location = np.where(batch.curr_workers_present == 0, idle_penalty, active_penalty)
+        return np.where(spawned, location, 0.0)
+
+    def _chunk_distances(self, chunks1: np.ndarray, chunks2: np.ndarray) -> np.ndarray:
+        """Vectorized _chunk_distance (broadcasting); max distance for invalid chunks."""
+        chunks1, chunks2 = np.broadcast_arrays(chunks1, chunks2)
+        size = len(self._distance_table)
+        valid = (chunks1 >= 0) & (chunks2 >= 0)
+        in_table = valid & (chunks1 < size) & (chunks2 < size)
+
+        distances = np.full(chunks1.shape, self.config.max_chunk_distance)
+        distances[in_table] = self._distance_table[chunks1[in_table], chunks2[in_table]]
+
+        outside = valid & ~in_table
+        if outside.any():
+            axis = self.config.chunks_per_axis
+            a, b = chunks1[outside], chunks2[outside]
+            distances[outside] = np.hypot(a % axis - b % axis, a // axis - b // axis)
+        return distances
+
+    @staticmethod
+    def _calculate_rate_batch(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        """Vectorized _calculate_rate."""
+        start = np.asarray(start, dtype=np.float64)
+        end = np.asarray(end, dtype=np.float64)
+        max_val = np.maximum(start, end)
+        safe = np.where(max_val == 0, 1.0, max_val)
+        return np.where(max_val == 0, 0.0, (end - start) / safe)
+
     def _calculate_mining_reward(
         self,
         prev_obs: Dict[str, Any],
@@ -433,6 +678,10 @@ class RewardCalculator:
         if chunk1 < 0 or chunk2 < 0:
             return self.config.max_chunk_distance  # Max distance for invalid chunks
 
+        size = len(self._distance_table)
+        if chunk1 < size and chunk2 < size:
+            return float(self._distance_table[chunk1, chunk2])
+
         x1 = chunk1 % self.config.chunks_per_axis
         z1 = chunk1 // self.config.chunks_per_axis
         x2 = chunk2 % self.config.chunks_per_axis
@@ -534,21 +783,16 @@ class RewardCalculator:
         return dict(counts)
 
     def _update_history(self, observation: Dict[str, Any], reward: float) -> None:
-        """Update observation and reward history."""
+        """Update observation and reward history (bounded to max_history)."""
         self.observation_history.append(observation)
         self.reward_history.append(reward)
 
-        # Trim to max history
-        if len(self.observation_history) > self.max_history:
-            self.observation_history.pop(0)
-            self.reward_history.pop(0)
-
     def get_average_reward(self, window: int = 5) -> float:
         """Get average reward over recent history."""
         if not self.reward_history:
             return 0.0
 
-        recent = self.reward_history[-window:]
+        recent = list(self.reward_history)[-window:]
         return sum(recent) / len(recent)
 
     def get_reward_trend(self) -> str:
@@ -556,8 +800,9 @@ class RewardCalculator:
         if len(self.reward_history) < 3:
             return 'insufficient_data'
 
-        recent = self.reward_history[-5:]
-        older = self.reward_history[-10:-5] if len(self.reward_history) >= 10 else self.reward_history[:-5]
+        history = list(self.reward_history)
+        recent = history[-5:]
+        older = history[-10:-5] if len(history) >= 10 else history[:-5]
 
         if not older:
             return 'insufficient_data'
@@ -580,7 +825,7 @@ class RewardCalculator:
             'history_length': len(self.reward_history),
             'average_reward': self.get_average_reward(),
             'trend': self.get_reward_trend(),
-            'recent_rewards': self.reward_history[-5:] if self.reward_history else [],
+            'recent_rewards': list(self.reward_history)[-5:],
             'config': {
                 'mining_weight': self.config.mining_disruption_weight,
                 'protector_weight': self.config.protector_reduction_weight,
@@ -0,0 +1,128 @@
+"""
+Rolling Statistics - Constant-time aggregates over fixed-size windows
+
+Used by the player behavior trackers so per-update cost does not depend on
+how much history has been collected.
+"""
+
+import numpy as np
+
+
+class RollingWindow:
+    """
+    Fixed-capacity ring buffer over a NumPy array with running aggregates.
+
+    Appends, mean, variance, sum and first/last access are O(1). Head and
+    tail means over k elements are O(k). Running sums are recomputed from
+    the buffer once per capacity appends to keep floating point drift
+    bounded, so the amortized append cost stays constant.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("RollingWindow capacity must be positive")
+        self.capacity = capacity
+        self._values = np.zeros(capacity, dtype=np.float64)
+        self._start = 0  # Index of the oldest element
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._appends_since_resync = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def append(self, value: float):
+        """Add a value, evicting the oldest one when full"""
+        value = float(value)
+        if self._count < self.capacity:
+            self._values[(self._start + self._count) % self.capacity] = value
+            self._count += 1
+        else:
+            evicted = self._values[self._start]
+            self._sum -= evicted
+            self._sum_sq -= evicted * evicted
+            self._values[self._start] = value
+            self._start = (self._start + 1) % self.capacity
+
+        self._sum += value
+        self._sum_sq += value * value
+
+        self._appends_since_resync += 1
+        if self._appends_since_resync >= self.capacity:
+            self._resync()
+
+    def _resync(self):
+        """Recompute running sums exactly from the buffer"""
+        values = self.values()
+        self._sum = float(values.sum())
+        self._sum_sq = float(np.dot(values, values))
+        self._appends_since_resync = 0
+
+    def clear(self):
+        """Remove all values"""
+        self._start = 0
+        self._count = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._appends_since_resync = 0
+
+    def values(self) -> np.ndarray:
+        """Get the window contents, oldest first (O(n) copy)"""
+        indices = (self._start + np.arange(self._count)) % self.capacity
+        return self._values[indices]
+
+    def sum(self) -> float:
+        return self._sum
+
+    def mean(self, default: float = 0.0) -> float:
+        """Mean of the window, or default when empty"""
+        if self._count == 0:
+            return default
+        return self._sum / self._count
+
+    def var(self, default: float = 0.0) -> float:
+        """Population variance of the window, or default when empty"""
+        if self._count == 0:
+            return default
+        mean = self._sum / self._count
+        return max(0.0, self._sum_sq / self._count - mean * mean)
+
+    def first(self) -> float:
+        """Oldest value in the window"""
+        if self._count == 0:
+            raise IndexError("RollingWindow is empty")
+        return float(self._values[self._start])
+
+    def last(self) -> float:
+        """Newest value in the window"""
+        if self._count == 0:
+            raise IndexError("RollingWindow is empty")
+        return float(self._values[(self._start + self._count - 1) % self.capacity])
+
+    def _range_sum(self, offset: int, k: int) -> float:
+        """Sum of k values starting offset elements after the oldest"""
+        start = (self._start + offset) % self.capacity
+        end = start + k
+        if end <= self.capacity:
+            return float(self._values[start:end].sum())
+        # Range wraps around the end of the buffer
+        return float(self._values[start:].sum() + self._values[:end - self.capacity].sum())
+
+    def head_mean(self, k: int) -> float:
+        """Mean of the k oldest values"""
+        k = min(k, self._count)
+        if k == 0:
+            return 0.0
+        return self._range_sum(0, k) / k
+
+    def tail_mean(self, k: int, skip: int = 0) -> float:
+        """Mean of the k newest values, optionally skipping the skip newest"""
+        end = self._count - skip
+        k = min(k, end)
+        if k <= 0:
+            return 0.0
+        return self._range_sum(end - k, k) / k
@@ -0,0 +1,357 @@
+"""
+Snapshot Batch - Columnar game-state snapshots for offline behavior replay
+
+Recorded sessions are loaded from JSONL (one GameStateSnapshot dict per
+line) or from a columnar .npz file, and the per-snapshot geometry used by
+the player behavior trackers (formation spread, worker spread, mining grid
+cells, resource diversity) is derived for the whole batch at once.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .data_models import GameStateSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+MINING_GRID_SIZE = 50  # Grid cell size used for mining location preferences
+
+
+@dataclass
+class SnapshotFeatures:
+    """Per-snapshot values consumed by the player behavior trackers"""
+    timestamp: float
+    energy_level: int
+    site_count: int
+    worker_count: int
+    protector_count: int
+    explored_count: int
+    site_locations: List[Dict[str, float]]  # Sites that report a location
+    site_keys: List[str]  # Mining grid key for each located site
+    resource_diversity: int
+    formation: Optional[Dict[str, Any]]  # None when there are no protectors
+    worker_spread: Optional[float]  # None when there are no workers
+
+    @classmethod
+    def from_snapshot(cls, snapshot: GameStateSnapshot) -> 'SnapshotFeatures':
+        """Derive tracker features from a single live snapshot"""
+        site_locations = []
+        site_keys = []
+        for site in snapshot.active_mining:
+            location = site.get('location', {})
+            if location:
+                grid_x = int(location.get('x', 0) // MINING_GRID_SIZE)
+                grid_z = int(location.get('z', 0) // MINING_GRID_SIZE)
+                site_locations.append(location)
+                site_keys.append(f"{grid_x},{grid_z}")
+
+        resource_diversity = len(set(site.get('resource_type', 'energy')
+                                     for site in snapshot.active_mining))
+
+        formation = None
+        if snapshot.protector_positions:
+            formation = analyze_formation(_positions_array(snapshot.protector_positions))
+
+        worker_spread = None
+        if snapshot.worker_positions:
+            worker_spread = _mean_spread(_positions_array(snapshot.worker_positions))
+
+        return cls(
+            timestamp=snapshot.timestamp,
+            energy_level=snapshot.energy_level,
+            site_count=len(snapshot.active_mining),
+            worker_count=len(snapshot.worker_positions),
+            protector_count=len(snapshot.protector_positions),
+            explored_count=len(snapshot.explored_areas),
+            site_locations=site_locations,
+            site_keys=site_keys,
+            resource_diversity=resource_diversity,
+            formation=formation,
+            worker_spread=worker_spread
+        )
+
+
+def analyze_formation(positions: np.ndarray) -> Dict[str, Any]:
+    """Analyze a unit formation given an (N, 2) array of x/z positions"""
+    if len(positions) < 2:
+        return {'spread': 0.0, 'center': {'x': 0, 'z': 0}, 'coordination': 0.5}
+
+    # Formation spread is the standard deviation of distances from the center
+    center = positions.mean(axis=0)
+    distances = np.sqrt(((positions - center) ** 2).sum(axis=1))
+    spread = float(distances.std())
+
+    # Tighter formations = higher coordination
+    coordination = 1.0 / (1.0 + spread / max(1.0, float(distances.max())))
+
+    return {
+        'spread': spread,
+        'center': {'x': float(center[0]), 'z': float(center[1])},
+        'coordination': min(1.0, coordination)
+    }
+
+
+def _positions_array(positions: List[Dict[str, float]]) -> np.ndarray:
+    return np.array([(pos.get('x', 0), pos.get('z', 0)) for pos in positions],
+                    dtype=np.float64).reshape(-1, 2)
+
+
+def _mean_spread(positions: np.ndarray) -> float:
+    """Average distance from the center of mass, 0 for fewer than 2 units"""
+    if len(positions) < 2:
+        return 0.0
+    distances = np.sqrt(((positions - positions.mean(axis=0)) ** 2).sum(axis=1))
+    return float(distances.mean())
+
+
+class SnapshotBatch:
+    """
+    Columnar batch of game-state snapshots.
+
+    Scalars are stored as (N,) arrays. Ragged per-snapshot position lists are
+    stored CSR-style: one flat (M, 2) x/z array plus an (N + 1,) offsets array
+    whose consecutive entries delimit each snapshot's rows.
+    """
+
+    # Array names written to and read from columnar .npz files
+    COLUMNS = (
+        'timestamps', 'energy_levels', 'explored_counts',
+        'worker_xz', 'worker_offsets',
+        'protector_xz', 'protector_offsets',
+        'site_xz', 'site_has_location', 'site_resources', 'site_offsets',
+        'resource_types'
+    )
+
+    def __init__(self, timestamps: np.ndarray, energy_levels: np.ndarray,
+                 explored_counts: np.ndarray,
+                 worker_xz: np.ndarray, worker_offsets: np.ndarray,
+                 protector_xz: np.ndarray, protector_offsets: np.ndarray,
+                 site_xz: np.ndarray, site_has_location: np.ndarray,
+                 site_resources: np.ndarray, site_offsets: np.ndarray,
+                 resource_types: List[str]):
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+        self.energy_levels = np.asarray(energy_levels, dtype=np.int64)
+        self.explored_counts = np.asarray(explored_counts, dtype=np.int64)
+        self.worker_xz = np.asarray(worker_xz, dtype=np.float64).reshape(-1, 2)
+        self.worker_offsets = np.asarray(worker_offsets, dtype=np.int64)
+        self.protector_xz = np.asarray(protector_xz, dtype=np.float64).reshape(-1, 2)
+        self.protector_offsets = np.asarray(protector_offsets, dtype=np.int64)
+        self.site_xz = np.asarray(site_xz, dtype=np.float64).reshape(-1, 2)
+        self.site_has_location = np.asarray(site_has_location, dtype=bool)
+        self.site_resources = np.asarray(site_resources, dtype=np.int64)
+        self.site_offsets = np.asarray(site_offsets, dtype=np.int64)
+        self.resource_types = [str(t) for t in resource_types]
+
+        count = len(self.timestamps)
+        for name in ('worker_offsets', 'protector_offsets', 'site_offsets'):
+            if len(getattr(self, name)) != count + 1:
+                raise ValueError(f"{name} must have {count + 1} entries, got {len(getattr(self, name))}")
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_snapshots(cls, snapshots: Iterable[Union[Dict[str, Any], GameStateSnapshot]]) -> 'SnapshotBatch':
+        """Build a batch from snapshot dicts or GameStateSnapshot objects"""
+        timestamps, energy_levels, explored_counts = [], [], []
+        worker_xz, worker_offsets = [], [0]
+        protector_xz, protector_offsets = [], [0]
+        site_xz, site_has_location, site_resources, site_offsets = [], [], [], [0]
+        resource_codes: Dict[str, int] = {}
+
+        for snapshot in snapshots:
+            if isinstance(snapshot, GameStateSnapshot):
+                snapshot = snapshot.to_dict()
+
+            # Same defaults as GameStateSnapshot.from_dict
+            timestamps.append(snapshot.get('timestamp', 0.0))
+            energy_levels.append(snapshot.get('energy_level', 500))
+            explored_counts.append(len(snapshot.get('explored_areas', [])))
+
+            worker_xz.extend((pos.get('x', 0), pos.get('z', 0)) for pos in snapshot.get('worker_positions', []))
+            worker_offsets.append(len(worker_xz))
+            protector_xz.extend((pos.get('x', 0), pos.get('z', 0)) for pos in snapshot.get('protector_positions', []))
+            protector_offsets.append(len(protector_xz))
+
+            for site in snapshot.get('active_mining', []):
+                location = site.get('location', {})
+                site_xz.append((location.get('x', 0), location.get('z', 0)) if location else (0, 0))
+                site_has_location.append(bool(location))
+                resource = site.get('resource_type', 'energy')
+                site_resources.append(resource_codes.setdefault(resource, len(resource_codes)))
+            site_offsets.append(len(site_xz))
+
+        return cls(
+            timestamps=timestamps, energy_levels=energy_levels, explored_counts=explored_counts,
+            worker_xz=worker_xz, worker_offsets=worker_offsets,
+            protector_xz=protector_xz, protector_offsets=protector_offsets,
+            site_xz=site_xz, site_has_location=site_has_location,
+            site_resources=site_resources, site_offsets=site_offsets,
+            resource_types=list(resource_codes)
+        )
+
+    @classmethod
+    def from_jsonl(cls, path: Union[str, Path]) -> 'SnapshotBatch':
+        """Load a recorded stream with one snapshot dict per line"""
+        def records():
+            with open(path, 'r') as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping malformed snapshot on line {line_number} of {path}: {e}")
+
+        return cls.from_snapshots(records())
+
+    @classmethod
+    def from_npz(cls, path: Union[str, Path]) -> 'SnapshotBatch':
+        """Load a columnar batch written by save_npz"""
+        with np.load(path, allow_pickle=False) as data:
+            missing = [name for name in cls.COLUMNS if name not in data]
+            if missing:
+                raise ValueError(f"Columnar snapshot file {path} is missing columns: {missing}")
+            columns = {name: data[name] for name in cls.COLUMNS}
+        columns['resource_types'] = columns['resource_types'].tolist()
+        return cls(**columns)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> 'SnapshotBatch':
+        """Load a batch, choosing the format from the file extension"""
+        suffix = Path(path).suffix.lower()
+        if suffix in ('.jsonl', '.ndjson'):
+            return cls.from_jsonl(path)
+        if suffix == '.npz':
+            return cls.from_npz(path)
+        raise ValueError(f"Unsupported snapshot file format: {path}")
+
+    def save_npz(self, path: Union[str, Path]):
+        """Write the batch as a compressed columnar .npz file"""
+        columns = {name: getattr(self, name) for name in self.COLUMNS}
+        columns['resource_types'] = np.array(self.resource_types, dtype=str)
+        np.savez_compressed(path, **columns)
+
+    def _group_stats(self, xz: np.ndarray, offsets: np.ndarray) -> Dict[str, np.ndarray]:
+        """Per-snapshot centroid and distance statistics for a ragged position column"""
+        count = len(self)
+        sizes = np.diff(offsets)
+        segment = np.repeat(np.arange(count), sizes)
+        safe_sizes = np.maximum(sizes, 1)
+
+        center = np.stack([
+            np.bincount(segment, weights=xz[:, 0], minlength=count) / safe_sizes,
+            np.bincount(segment, weights=xz[:, 1], minlength=count) / safe_sizes
+        ], axis=1)
+        distances = np.sqrt(((xz - center[segment]) ** 2).sum(axis=1))
+        mean = np.bincount(segment, weights=distances, minlength=count) / safe_sizes
+        deviations = distances - mean[segment]
+        std = np.sqrt(np.bincount(segment, weights=deviations * deviations, minlength=count) / safe_sizes)
+
+        maximum = np.zeros(count)
+        non_empty = sizes > 0
+        if non_empty.any():
+            maximum[non_empty] = np.maximum.reduceat(distances, offsets[:-1][non_empty])
+
+        return {'sizes': sizes, 'center': center, 'mean': mean, 'std': std, 'max': maximum}
+
+    def _site_features(self) -> Dict[str, Any]:
+        """Mining grid keys and resource diversity for every snapshot"""
+        count = len(self)
+        sizes = np.diff(self.site_offsets)
+        segment = np.repeat(np.arange(count), sizes)
+
+        # Resource diversity: distinct (snapshot, resource) pairs per snapshot
+        diversity = np.zeros(count, dtype=np.int64)
+        if len(segment):
+            pairs = np.unique(segment * max(1, len(self.resource_types)) + self.site_resources)
+            diversity = np.bincount(pairs // max(1, len(self.resource_types)), minlength=count)
+
+        # Grid keys: format each distinct cell once, then look keys up per site
+        site_keys = []
+        if len(self.site_xz):
+            cells = np.floor_divide(self.site_xz, MINING_GRID_SIZE).astype(np.int64)
+            cells -= cells.min(axis=0)
+            packed = cells[:, 0] * (int(cells[:, 1].max()) + 1) + cells[:, 1]
+            unique_packed, first_index, cell_index = np.unique(packed, return_index=True, return_inverse=True)
+            origin = np.floor_divide(self.site_xz[first_index], MINING_GRID_SIZE).astype(np.int64)
+            cell_keys = [f"{x},{z}" for x, z in origin.tolist()]
+            site_keys = [cell_keys[k] for k in cell_index.reshape(-1).tolist()]
+
+        return {'diversity': diversity, 'site_keys': site_keys}
+
+    def iter_features(self) -> Iterator[SnapshotFeatures]:
+        """Yield tracker features for each snapshot in order, derived in one vectorized pass"""
+        if len(self) == 0:
+            return
+
+        protectors = self._group_stats(self.protector_xz, self.protector_offsets)
+        workers = self._group_stats(self.worker_xz, self.worker_offsets)
+        sites = self._site_features()
+
+        coordination = np.minimum(1.0, 1.0 / (1.0 + protectors['std'] / np.maximum(1.0, protectors['max'])))
+
+        # Convert to Python scalars once rather than per attribute access
+        timestamps = self.timestamps.tolist()
+        energy_levels = self.energy_levels.tolist()
+        explored_counts = self.explored_counts.tolist()
+        protector_sizes = protectors['sizes'].tolist()
+        protector_spread = protectors['std'].tolist()
+        protector_center = protectors['center'].tolist()
+        coordination = coordination.tolist()
+        worker_sizes = workers['sizes'].tolist()
+        worker_spread = workers['mean'].tolist()
+        site_offsets = self.site_offsets.tolist()
+        site_locations = [{'x': x, 'z': z} for x, z in self.site_xz.tolist()]
+        site_keys = sites['site_keys']
+        diversity = sites['diversity'].tolist()
+
+        # Snapshots where every site reports a location can slice the flat lists
+        segment = np.repeat(np.arange(len(self)), np.diff(self.site_offsets))
+        missing = np.bincount(segment, weights=~self.site_has_location, minlength=len(self)).astype(np.int64).tolist()
+        has_location = self.site_has_location.tolist()
+
+        for i in range(len(self)):
+            start, end = site_offsets[i], site_offsets[i + 1]
+            if missing[i]:
+                located = [j for j in range(start, end) if has_location[j]]
+                locations = [site_locations[j] for j in located]
+                keys = [site_keys[j] for j in located]
+            else:
+                locations = site_locations[start:end]
+                keys = site_keys[start:end]
+
+            formation = None
+            if protector_sizes[i] == 1:
+                formation = analyze_formation(np.zeros((1, 2)))
+            elif protector_sizes[i] > 1:
+                formation = {
+                    'spread': protector_spread[i],
+                    'center': {'x': protector_center[i][0], 'z': protector_center[i][1]},
+                    'coordination': coordination[i]
+                }
+
+            spread = None
+            if worker_sizes[i] > 0:
+                spread = worker_spread[i] if worker_sizes[i] > 1 else 0.0
+
+            yield SnapshotFeatures(
+                timestamp=timestamps[i],
+                energy_level=energy_levels[i],
+                site_count=site_offsets[i + 1] - site_offsets[i],
+                worker_count=worker_sizes[i],
+                protector_count=protector_sizes[i],
+                explored_count=explored_counts[i],
+                site_locations=locations,
+                site_keys=keys,
+                resource_diversity=diversity[i],
+                formation=formation,
+                worker_spread=spread
+            )
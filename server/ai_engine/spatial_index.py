@@ -0,0 +1,145 @@
+"""
+Spatial Index - Uniform grid index over 3D locations for radius queries
+
+Used by the hive placement generator to cluster failed hive locations and
+rank candidate zones without pairwise Python distance loops.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+
+class LocationIndex:
+    """
+    Uniform grid index over {x, y, z} location dicts.
+
+    Positions are stored in a contiguous (N, 3) float array; each grid cell
+    maps to the indices of the locations inside it. Radius queries only
+    visit the cells overlapping the query sphere, and all distance math is
+    vectorized.
+    """
+
+    # Location count up to which clustering uses a dense distance matrix
+    DENSE_MAX_LOCATIONS = 256
+
+    def __init__(self, locations: Sequence[Dict[str, float]], cell_size: float = 40.0):
+        """
+        Args:
+            locations: Location dicts; missing coordinates default to 0
+            cell_size: Grid cell edge length, ideally the typical query radius
+        """
+        self.cell_size = float(cell_size)
+        self.positions = self.to_array(locations)
+        self._cells: Dict[tuple, np.ndarray] = {}
+
+        if len(self.positions) > 0:
+            keys = np.floor(self.positions / self.cell_size).astype(np.int64)
+            # Group indices by cell with one sort instead of a Python dict walk
+            order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+            sorted_keys = keys[order]
+            boundaries = np.flatnonzero(np.any(np.diff(sorted_keys, axis=0) != 0, axis=1)) + 1
+            for group in np.split(order, boundaries):
+                self._cells[tuple(keys[group[0]])] = np.sort(group)
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @staticmethod
+    def to_array(locations: Sequence[Dict[str, float]]) -> np.ndarray:
+        """Convert location dicts to an (N, 3) float array"""
+        if len(locations) == 0:
+            return np.zeros((0, 3), dtype=np.float64)
+        return np.array(
+            [(loc.get('x', 0), loc.get('y', 0), loc.get('z', 0)) for loc in locations],
+            dtype=np.float64
+        )
+
+    def query_radius(self, point: np.ndarray, radius: float) -> np.ndarray:
+        """
+        Get indices of all locations strictly closer than radius to point.
+
+        Returns:
+            Sorted array of location indices
+        """
+        if len(self.positions) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        lo = np.floor((point - radius) / self.cell_size).astype(np.int64)
+        hi = np.floor((point + radius) / self.cell_size).astype(np.int64)
+
+        candidates = [
+            self._cells[(cx, cy, cz)]
+            for cx in range(lo[0], hi[0] + 1)
+            for cy in range(lo[1], hi[1] + 1)
+            for cz in range(lo[2], hi[2] + 1)
+            if (cx, cy, cz) in self._cells
+        ]
+        if not candidates:
+            return np.zeros(0, dtype=np.int64)
+
+        idx = np.concatenate(candidates)
+        deltas = self.positions[idx] - point
+        within = np.einsum('ij,ij->i', deltas, deltas) < radius * radius
+        return np.sort(idx[within])
+
+    def min_distances(self, points: np.ndarray, chunk_size: int = 4096) -> np.ndarray:
+        """
+        Get the distance from each query point to its nearest location.
+
+        Returns inf for every point when the index is empty.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        result = np.full(len(points), np.inf)
+        if len(self.positions) == 0:
+            return result
+
+        # Chunk over locations to bound the (M, chunk) distance matrix
+        for start in range(0, len(self.positions), chunk_size):
+            block = self.positions[start:start + chunk_size]
+            deltas = points[:, None, :] - block[None, :, :]
+            sq = np.einsum('ijk,ijk->ij', deltas, deltas)
+            np.minimum(result, np.sqrt(sq.min(axis=1)), out=result)
+        return result
+
+    def distances_from(self, point: np.ndarray, indices: np.ndarray = None) -> np.ndarray:
+        """Get distances from point to the given (or all) locations"""
+        positions = self.positions if indices is None else self.positions[indices]
+        return np.sqrt(np.einsum('ij,ij->i', positions - point, positions - point))
+
+    def greedy_clusters(self, radius: float) -> List[np.ndarray]:
+        """
+        Group locations into clusters seeded in index order.
+
+        Each unclustered location seeds a cluster with every later,
+        unclustered location closer than radius to it. Seeds without
+        neighbours are left unclustered.
+
+        Returns:
+            List of index arrays, seed first, in seeding order
+        """
+        clusters = []
+        count = len(self.positions)
+        processed = np.zeros(count, dtype=bool)
+
+        # Small sets are cheaper as one dense adjacency matrix than per-seed grid queries
+        adjacency = None
+        if count <= self.DENSE_MAX_LOCATIONS:
+            deltas = self.positions[:, None, :] - self.positions[None, :, :]
+            adjacency = np.einsum('ijk,ijk->ij', deltas, deltas) < radius * radius
+
+        for i in range(count):
+            if processed[i]:
+                continue
+            if adjacency is not None:
+                neighbours = np.flatnonzero(adjacency[i])
+            else:
+                neighbours = self.query_radius(self.positions[i], radius)
+            neighbours = neighbours[(neighbours > i) & ~processed[neighbours]]
+            if len(neighbours) == 0:
+                continue
+            members = np.concatenate(([i], neighbours))
+            processed[members] = True
+            clusters.append(members)
+
+        return clusters
@@ -2,10 +2,17 @@
 Strategy Generator - Generates Queen strategies based on neural network learning
 """
 
+import asyncio
+import copy
 import logging
 import math
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
 from .data_models import QueenStrategy, PlayerPatterns, DeathAnalysis
+from .spatial_index import LocationIndex
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +21,30 @@ class StrategyGenerator:
     """
     Generates diverse and effective strategies based on neural network learning
     """
+
+    # Bounded LRU of recently generated strategies
+    CACHE_SIZE = 128
+    # Width of the complexity bucket used in the cache key
+    COMPLEXITY_BUCKET = 0.1
     
     def __init__(self):
         self.hive_placement = HivePlacementGenerator()
         self.spawn_timing = SpawnTimingGenerator()
         self.defensive_coordination = DefensiveCoordinationGenerator()
         self.predictive_behavior = PredictiveBehaviorGenerator()
+        self._strategy_cache: "OrderedDict[Tuple, QueenStrategy]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
     
     async def generate_strategy(self, generation: int, learned_patterns: PlayerPatterns, 
                                death_lessons: DeathAnalysis, difficulty_modifiers: Dict[str, float] = None) -> QueenStrategy:
         """
         Generate comprehensive Queen strategy based on learning and difficulty adjustment
+
+        The component generators are independent of each other and run
+        concurrently. Near-identical deaths (same complexity bucket, failure
+        cluster signature, difficulty modifiers and learned patterns) reuse
+        a cached strategy instead of regenerating it.
         
         Args:
             generation: Queen generation number
@@ -44,40 +64,58 @@ class StrategyGenerator:
                 logger.info(f"Using difficulty-adjusted complexity: {complexity_level}")
             else:
                 complexity_level = min(1.0, generation * 0.1)
-            
-            # Generate hive placement strategy with difficulty adjustment
-            hive_strategy = await self.hive_placement.generate(
-                failed_locations=death_lessons.get_failed_locations(),
-                player_approach_patterns=learned_patterns.get_approach_vectors(),
-                generation_complexity=complexity_level,
-                difficulty_modifiers=difficulty_modifiers
-            )
-            
-            # Generate parasite spawning strategy with difficulty adjustment
-            spawn_strategy = await self.spawn_timing.generate(
-                player_mining_patterns=learned_patterns.mining_patterns,
-                previous_spawn_effectiveness=death_lessons.get_spawn_effectiveness(),
-                generation_complexity=complexity_level,
-                difficulty_modifiers=difficulty_modifiers
+
+            failed_locations = death_lessons.get_failed_locations()
+            use_predictive = generation >= 4 or bool(
+                difficulty_modifiers and difficulty_modifiers.get('predictive_ability', 0) > 0.3
             )
-            
-            # Generate defensive coordination strategy with difficulty adjustment
-            defensive_strategy = await self.defensive_coordination.generate(
-                assault_patterns=learned_patterns.combat_patterns,
-                defensive_failures=death_lessons.get_defensive_failures(),
-                generation_complexity=complexity_level,
-                difficulty_modifiers=difficulty_modifiers
+
+            cache_key = self._make_cache_key(
+                complexity_level, failed_locations, learned_patterns,
+                death_lessons, difficulty_modifiers, use_predictive
             )
+            cached = self._strategy_cache.get(cache_key)
+            if cached is not None:
+                self._strategy_cache.move_to_end(cache_key)
+                self.cache_hits += 1
+                logger.info(f"Reusing cached strategy for generation {generation}")
+                return self._strategy_from_cache(cached, generation, failed_locations)
+            self.cache_misses += 1
+
+            # Component generators do not depend on each other's output
+            components = [
+                self.hive_placement.generate(
+                    failed_locations=failed_locations,
+                    player_approach_patterns=learned_patterns.get_approach_vectors(),
+                    generation_complexity=complexity_level,
+                    difficulty_modifiers=difficulty_modifiers
+                ),
+                self.spawn_timing.generate(
+                    player_mining_patterns=learned_patterns.mining_patterns,
+                    previous_spawn_effectiveness=death_lessons.get_spawn_effectiveness(),
+                    generation_complexity=complexity_level,
+                    difficulty_modifiers=difficulty_modifiers
+                ),
+                self.defensive_coordination.generate(
+                    assault_patterns=learned_patterns.combat_patterns,
+                    defensive_failures=death_lessons.get_defensive_failures(),
+                    generation_complexity=complexity_level,
+                    difficulty_modifiers=difficulty_modifiers
+                )
+            ]
             
-            # Generate predictive behavior (advanced generations only) with difficulty adjustment
-            predictive_strategy = None
-            if generation >= 4 or (difficulty_modifiers and difficulty_modifiers.get('predictive_ability', 0) > 0.3):
-                predictive_strategy = await self.predictive_behavior.generate(
+            # Predictive behavior (advanced generations only) with difficulty adjustment
+            if use_predictive:
+                components.append(self.predictive_behavior.generate(
                     player_behavior_model=learned_patterns,
                     prediction_horizon=60,  # 60 seconds ahead
                     confidence_threshold=0.7,
                     difficulty_modifiers=difficulty_modifiers
-                )
+                ))
+
+            results = await asyncio.gather(*components)
+            hive_strategy, spawn_strategy, defensive_strategy = results[:3]
+            predictive_strategy = results[3] if use_predictive else None
             
             strategy = QueenStrategy(
                 generation=generation,
@@ -87,6 +125,10 @@ class StrategyGenerator:
                 predictive_behavior=predictive_strategy,
                 complexity_level=complexity_level
             )
+
+            self._strategy_cache[cache_key] = copy.deepcopy(strategy)
+            if len(self._strategy_cache) > self.CACHE_SIZE:
+                self._strategy_cache.popitem(last=False)
             
             logger.info(f"Strategy generated for generation {generation} with complexity {complexity_level}")
             return strategy
@@ -95,9 +137,64 @@ class StrategyGenerator:
             logger.error(f"Error generating strategy: {e}")
             raise
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get strategy cache statistics"""
+        total = self.cache_hits + self.cache_misses
+        return {
+            'size': len(self._strategy_cache),
+            'max_size': self.CACHE_SIZE,
+            'hits': self.cache_hits,
+            'misses': self.cache_misses,
+            'hit_rate': self.cache_hits / total if total > 0 else 0.0
+        }
+
+    def clear_cache(self):
+        """Drop all cached strategies"""
+        self._strategy_cache.clear()
+
+    def _make_cache_key(self, complexity: float, failed_locations: list, learned_patterns: PlayerPatterns,
+                        death_lessons: DeathAnalysis, difficulty_modifiers: Optional[Dict[str, float]],
+                        use_predictive: bool) -> Tuple:
+        """Build the cache key for a strategy request"""
+        complexity_bucket = round(complexity / self.COMPLEXITY_BUCKET)
+        return (
+            complexity_bucket,
+            self.hive_placement.failure_signature(failed_locations),
+            _quantize(difficulty_modifiers or {}),
+            _quantize(learned_patterns.to_dict()),
+            _quantize(death_lessons.get_spawn_effectiveness()),
+            _quantize(death_lessons.get_defensive_failures()),
+            use_predictive
+        )
+
+    def _strategy_from_cache(self, cached: QueenStrategy, generation: int,
+                             failed_locations: list) -> QueenStrategy:
+        """Materialize a cached strategy for a new generation"""
+        strategy = copy.deepcopy(cached)
+        strategy.generation = generation
+        # Avoid zones point at exact failure sites, so they are never reused
+        strategy.hive_placement['avoid_zones'] = self.hive_placement._create_avoidance_zones(failed_locations)
+        return strategy
+
+
+def _quantize(value: Any, precision: int = 1) -> Any:
+    """Convert a nested structure into a hashable, coarsely rounded form"""
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)):
+        return round(float(value), precision)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _quantize(v, precision)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_quantize(v, precision) for v in value)
+    return str(value)
+
 
 class HivePlacementGenerator:
     """Generates hive placement strategies based on death analysis"""
+
+    # Distance under which two failed locations belong to the same cluster
+    CLUSTER_THRESHOLD = 40
     
     def __init__(self):
         self.placement_history = []
@@ -110,11 +207,16 @@ class HivePlacementGenerator:
         try:
             logger.info(f"Generating hive placement strategy with complexity {generation_complexity}")
             
+            # One spatial index is shared by clustering and zone ranking
+            index = LocationIndex(failed_locations, cell_size=self.CLUSTER_THRESHOLD)
+
             # Analyze failed locations to identify patterns
-            failure_analysis = self._analyze_failure_patterns(failed_locations)
+            failure_analysis = self._analyze_failure_patterns(failed_locations, index)
             
             # Generate optimal placement zones
-            optimal_zones = self._identify_optimal_zones(failed_locations, player_approach_patterns, generation_complexity)
+            optimal_zones = self._identify_optimal_zones(
+                failed_locations, player_approach_patterns, generation_complexity, index
+            )
             
             # Create placement criteria based on learning
             placement_criteria = self._create_placement_criteria(failure_analysis, generation_complexity)
@@ -144,13 +246,16 @@ class HivePlacementGenerator:
             logger.error(f"Error generating hive placement strategy: {e}")
             return self._get_fallback_placement_strategy(generation_complexity)
     
-    def _analyze_failure_patterns(self, failed_locations: list) -> Dict[str, Any]:
+    def _analyze_failure_patterns(self, failed_locations: list, index: LocationIndex = None) -> Dict[str, Any]:
         """Analyze patterns in failed hive locations"""
         if not failed_locations:
             return {"pattern_type": "insufficient_data", "risk_factors": []}
         
+        if index is None:
+            index = LocationIndex(failed_locations, cell_size=self.CLUSTER_THRESHOLD)
+
         # Analyze spatial clustering of failures
-        failure_clusters = self._identify_failure_clusters(failed_locations)
+        failure_clusters = self._identify_failure_clusters(failed_locations, index)
         
         # Identify high-risk zones
         high_risk_zones = []
@@ -175,48 +280,50 @@ class HivePlacementGenerator:
             "pattern_type": timing_pattern,
             "failure_clusters": failure_clusters,
             "high_risk_zones": high_risk_zones,
-            "risk_factors": self._identify_risk_factors(failed_locations)
+            "risk_factors": self._identify_risk_factors(failed_locations, index)
         }
     
-    def _identify_failure_clusters(self, failed_locations: list) -> List[Dict]:
+    def _identify_failure_clusters(self, failed_locations: list, index: LocationIndex = None) -> List[Dict]:
         """Identify clusters of failed locations"""
+        if index is None:
+            index = LocationIndex(failed_locations, cell_size=self.CLUSTER_THRESHOLD)
+
         clusters = []
-        processed = set()
-        
-        for i, loc1 in enumerate(failed_locations):
-            if i in processed:
-                continue
-                
-            cluster_locations = [loc1]
-            cluster_indices = {i}
-            
-            for j, loc2 in enumerate(failed_locations):
-                if j <= i or j in processed:
-                    continue
-                    
-                distance = self._calculate_distance(loc1, loc2)
-                if distance < 40:  # Cluster threshold
-                    cluster_locations.append(loc2)
-                    cluster_indices.add(j)
-            
-            if len(cluster_locations) > 1:
-                center = self._calculate_cluster_center(cluster_locations)
-                radius = max(self._calculate_distance(center, loc) for loc in cluster_locations)
-                clusters.append({
-                    'center': center,
-                    'radius': radius,
-                    'locations': cluster_locations
-                })
-                processed.update(cluster_indices)
+        for members in index.greedy_clusters(self.CLUSTER_THRESHOLD):
+            center_array = index.positions[members].mean(axis=0)
+            center = {'x': float(center_array[0]), 'y': float(center_array[1]), 'z': float(center_array[2])}
+            radius = float(index.distances_from(center_array, members).max())
+            clusters.append({
+                'center': center,
+                'radius': radius,
+                'locations': [failed_locations[i] for i in members]
+            })
         
         return clusters
     
-    def _identify_optimal_zones(self, failed_locations: list, approach_patterns: dict, complexity: float) -> List[Dict]:
+    def failure_signature(self, failed_locations: list) -> Tuple:
+        """
+        Coarse signature of failed locations for strategy caching
+
+        Locations are snapped to cluster-sized cells, so deaths that would
+        produce the same clusters and timing pattern share a signature.
+        """
+        cell = self.CLUSTER_THRESHOLD
+        cells = sorted(
+            (int(loc.get('x', 0) // cell), int(loc.get('y', 0) // cell), int(loc.get('z', 0) // cell))
+            for loc in failed_locations
+        )
+        timing = tuple(
+            0 if t < 60 else (2 if t > 180 else 1)
+            for t in (loc.get('discovery_time', 120) for loc in failed_locations[-3:])
+        )
+        return tuple(cells), timing
+
+    def _identify_optimal_zones(self, failed_locations: list, approach_patterns: dict, complexity: float,
+                                index: LocationIndex = None) -> List[Dict]:
         """Identify optimal placement zones based on learning"""
-        zones = []
-        
         # Base zones - areas that haven't failed recently
-        safe_zones = self._identify_safe_zones(failed_locations)
+        safe_zones = self._identify_safe_zones(failed_locations, index)
         
         # Counter-approach zones - areas that counter player approach patterns
         counter_zones = self._identify_counter_approach_zones(approach_patterns, complexity)
@@ -337,28 +444,26 @@ class HivePlacementGenerator:
         
         return strategy
     
-    def _identify_safe_zones(self, failed_locations: list) -> List[Dict]:
+    def _identify_safe_zones(self, failed_locations: list, index: LocationIndex = None) -> List[Dict]:
         """Identify zones that are safe from recent failures"""
-        safe_zones = []
-        
+        if index is None:
+            index = LocationIndex(failed_locations, cell_size=self.CLUSTER_THRESHOLD)
+
         # Grid-based zone generation
-        for x in range(-80, 81, 40):
-            for z in range(-80, 81, 40):
-                zone_center = {'x': x, 'y': 10, 'z': z}
-                
-                # Check distance from all failed locations
-                min_failure_distance = float('inf')
-                for failed_loc in failed_locations:
-                    distance = self._calculate_distance(zone_center, failed_loc)
-                    min_failure_distance = min(min_failure_distance, distance)
-                
-                if min_failure_distance > 50 or not failed_locations:
-                    safe_zones.append({
-                        'center': zone_center,
-                        'radius': 25,
-                        'safety_score': min(1.0, min_failure_distance / 100.0),
-                        'zone_type': 'safe'
-                    })
+        centers = [{'x': x, 'y': 10, 'z': z} for x in range(-80, 81, 40) for z in range(-80, 81, 40)]
+        
+        # Distance from every zone center to its nearest failed location
+        min_failure_distances = index.min_distances(LocationIndex.to_array(centers))
+
+        safe_zones = []
+        for zone_center, min_failure_distance in zip(centers, min_failure_distances.tolist()):
+            if min_failure_distance > 50 or not failed_locations:
+                safe_zones.append({
+                    'center': zone_center,
+                    'radius': 25,
+                    'safety_score': min(1.0, min_failure_distance / 100.0),
+                    'zone_type': 'safe'
+                })
         
         return safe_zones
     
@@ -421,23 +526,27 @@ class HivePlacementGenerator:
         
         return {'x': avg_x, 'y': avg_y, 'z': avg_z}
     
-    def _identify_risk_factors(self, failed_locations: list) -> List[str]:
+    def _identify_risk_factors(self, failed_locations: list, index: LocationIndex = None) -> List[str]:
         """Identify common risk factors from failed locations"""
         risk_factors = []
         
         if not failed_locations:
             return risk_factors
+
+        if index is None:
+            index = LocationIndex(failed_locations, cell_size=self.CLUSTER_THRESHOLD)
+        positions = index.positions
         
         # Check for common patterns
-        center_failures = sum(1 for loc in failed_locations if self._calculate_distance(loc, {'x': 0, 'y': 0, 'z': 0}) < 30)
+        center_failures = int(np.count_nonzero(index.distances_from(np.zeros(3)) < 30))
         if center_failures > len(failed_locations) * 0.6:
             risk_factors.append("center_zone_vulnerability")
         
-        edge_failures = sum(1 for loc in failed_locations if self._is_near_edge(loc))
+        edge_failures = int(np.count_nonzero((np.abs(positions[:, 0]) > 70) | (np.abs(positions[:, 2]) > 70)))
         if edge_failures > len(failed_locations) * 0.6:
             risk_factors.append("edge_zone_vulnerability")
         
-        low_height_failures = sum(1 for loc in failed_locations if loc.get('y', 0) < 5)
+        low_height_failures = int(np.count_nonzero(positions[:, 1] < 5))
         if low_height_failures > len(failed_locations) * 0.7:
             risk_factors.append("low_elevation_vulnerability")
         
@@ -10,6 +10,24 @@ from .buffer import ExperienceReplayBuffer
 from .config import ContinuousTrainingConfig
 from .trainer import ContinuousTrainer
 from .metrics import TrainingMetrics
+from .checkpoints import CheckpointManager
+from .experience_store import ExperienceStore
+
+# OfflineTrainer imports torch; it is resolved on first access
+_LAZY_EXPORTS = {
+    'OfflineTrainer': '.offline_trainer',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
 __all__ = [
     'Experience',
@@ -17,4 +35,7 @@ __all__ = [
     'ContinuousTrainingConfig',
     'ContinuousTrainer',
     'TrainingMetrics',
+    'CheckpointManager',
+    'ExperienceStore',
+    'OfflineTrainer',
 ]
@@ -0,0 +1,270 @@
+"""
+Model Checkpoints - Versioned, asynchronous checkpointing for the trainer
+
+snapshot() only copies the model's state dict in memory, so it is cheap
+enough to call while holding the trainer's model lock. A background thread
+serializes the copy and writes it with write-to-temp plus atomic rename:
+once to a ring of the last `keep` checkpoints (<stem>_v<version>.pt in a
+checkpoints directory next to the model file) and once to the model path
+itself, so NNModel picks up the newest weights on startup.
+
+If snapshots arrive faster than they can be written, only the newest
+pending one is written. Ring entries are also kept in memory, so rolling
+back to a recent version does not touch the disk.
+"""
+
+import io
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
+
+def metadata_path_for(model_path: str) -> str:
+    """Metadata JSON path for a weights file (same convention as NNModel)"""
+    return model_path.replace('.pt', '_metadata.json')
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write a file so readers see either the old or the new content, never a partial one"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class Checkpoint:
+    """Ring entry for one written checkpoint"""
+    version: int
+    path: str
+    created: float
+    size_bytes: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+class CheckpointManager:
+    """
+    Ring of versioned model checkpoints written by a background thread.
+    """
+
+    DEFAULT_KEEP = 5  # Checkpoints kept in the ring
+
+    def __init__(self, model_path: str, keep: int = DEFAULT_KEEP, directory: Optional[str] = None):
+        """
+        Args:
+            model_path: Model weights path (e.g. models/queen_sequential.pt)
+            keep: Number of checkpoints kept in the ring
+            directory: Ring directory (default: checkpoints/ next to model_path)
+        """
+        if keep <= 0:
+            raise ValueError("CheckpointManager keep must be positive")
+        self.model_path = model_path
+        self.keep = keep
+        self.directory = directory or os.path.join(os.path.dirname(model_path) or '.', 'checkpoints')
+        self.stem = os.path.splitext(os.path.basename(model_path))[0]
+        self._pattern = re.compile(rf'^{re.escape(self.stem)}_v(?P<version>\d+)\.pt$')
+
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._pending: Optional[Tuple[int, Dict[str, "torch.Tensor"], Dict[str, Any]]] = None
+        self._writing = False
+        self._closing = False
+        self._thread: Optional[threading.Thread] = None
+
+        self._ring: Dict[int, Checkpoint] = {}
+        self._states: "OrderedDict[int, Dict[str, torch.Tensor]]" = OrderedDict()  # In-memory copies
+
+        self.stats = {"snapshots": 0, "written": 0, "superseded": 0, "failed": 0, "expired": 0}
+
+        self._build_index()
+
+    def _build_index(self) -> None:
+        """Index checkpoints already in the ring directory"""
+        if not os.path.isdir(self.directory):
+            return
+        for filename in os.listdir(self.directory):
+            match = self._pattern.match(filename)
+            if not match:
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            version = int(match.group('version'))
+            self._ring[version] = Checkpoint(version, path, stat.st_mtime, stat.st_size)
+
+    def snapshot(self, state_dict: Dict[str, "torch.Tensor"], version: int, metadata: Dict[str, Any]) -> None:
+        """
+        Queue a checkpoint of a state dict (copied now, written in the background).
+
+        Args:
+            state_dict: Model state dict (e.g. NNModel.model.state_dict())
+            version: Model version the weights belong to
+            metadata: JSON-serializable metadata written alongside the weights
+        """
+        state = {name: tensor.detach().to('cpu', copy=True) for name, tensor in state_dict.items()}
+        with self._changed:
+            if self._pending is not None:
+                self.stats["superseded"] += 1
+            self._pending = (version, state, dict(metadata))
+            self._states[version] = state
+            self._states.move_to_end(version)
+            while len(self._states) > self.keep:
+                self._states.popitem(last=False)
+            self.stats["snapshots"] += 1
+            self._changed.notify_all()
+        self._ensure_thread()
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closing = False
+                self._thread = threading.Thread(target=self._run, name="checkpoint-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Writer thread: write the newest pending snapshot until closed"""
+        while True:
+            with self._changed:
+                while self._pending is None and not self._closing:
+                    self._changed.wait()
+                if self._pending is None:
+                    return
+                version, state, metadata = self._pending
+                self._pending = None
+                self._writing = True
+
+            try:
+                self._write(version, state, metadata)
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.error(f"[Checkpoints] Failed to write checkpoint v{version}: {e}")
+            finally:
+                with self._changed:
+                    self._writing = False
+                    self._changed.notify_all()
+
+    def _write(self, version: int, state: Dict[str, "torch.Tensor"], metadata: Dict[str, Any]) -> None:
+        """Serialize once, write the ring entry and publish it as the current model"""
+        import torch
+
+        buffer = io.BytesIO()
+        torch.save(state, buffer)
+        weights = buffer.getvalue()
+        metadata_bytes = json.dumps(metadata, indent=2).encode()
+
+        os.makedirs(self.directory, exist_ok=True)
+        path = os.path.join(self.directory, f"{self.stem}_v{version}.pt")
+        _atomic_write(path, weights)
+        _atomic_write(metadata_path_for(path), metadata_bytes)
+
+        os.makedirs(os.path.dirname(self.model_path) or '.', exist_ok=True)
+        _atomic_write(self.model_path, weights)
+        _atomic_write(metadata_path_for(self.model_path), metadata_bytes)
+
+        with self._lock:
+            self._ring[version] = Checkpoint(version, path, time.time(), len(weights), metadata)
+            expired = sorted(self._ring)[:-self.keep]
+            expired_entries = [self._ring.pop(v) for v in expired]
+            self.stats["written"] += 1
+
+        for entry in expired_entries:
+            for expired_path in (entry.path, metadata_path_for(entry.path)):
+                try:
+                    os.remove(expired_path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"[Checkpoints] Failed to remove {expired_path}: {e}")
+            self.stats["expired"] += 1
+
+        logger.info(f"[Checkpoints] Wrote checkpoint v{version} ({len(weights)} bytes)")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued snapshot has been written.
+
+        Returns:
+            True if nothing is left to write, False on timeout
+        """
+        deadline = None if timeout is None else time.time() + timeout
+        with self._changed:
+            while self._pending is not None or self._writing:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 10.0) -> None:
+        """Write any pending snapshot and stop the writer thread"""
+        with self._changed:
+            self._closing = True
+            self._changed.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            if thread.is_alive():
+                logger.warning("[Checkpoints] Writer did not stop within timeout")
+
+    def versions(self) -> List[int]:
+        """Versions available for rollback (written or still in memory), oldest first"""
+        with self._lock:
+            return sorted(set(self._ring) | set(self._states))
+
+    def load(self, version: int) -> Dict[str, "torch.Tensor"]:
+        """
+        Get the state dict of a checkpoint.
+
+        Recent snapshots are served from memory; older ring entries are read from disk.
+
+        Raises:
+            KeyError: If the version is not in the ring
+        """
+        with self._lock:
+            state = self._states.get(version)
+            entry = self._ring.get(version)
+        if state is not None:
+            return state
+        if entry is None:
+            raise KeyError(f"No checkpoint for model version {version}")
+
+        import torch
+        return torch.load(entry.path, map_location='cpu', weights_only=True)
+
+    def list_checkpoints(self) -> List[Dict[str, Any]]:
+        """Describe the written checkpoints in the ring, oldest first"""
+        with self._lock:
+            entries = [self._ring[v] for v in sorted(self._ring)]
+        return [
+            {
+                "version": entry.version,
+                "path": entry.path,
+                "created": entry.created,
+                "size_bytes": entry.size_bytes,
+                "in_memory": entry.version in self._states
+            }
+            for entry in entries
+        ]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get writer counters and the versions available for rollback"""
+        with self._lock:
+            pending = self._pending is not None or self._writing
+        return {**self.stats, "pending": pending, "versions": self.versions(), "keep": self.keep}
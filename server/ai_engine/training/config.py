@@ -34,6 +34,15 @@ class ContinuousTrainingConfig:
     # Gate threshold (must match gate config)
     reward_threshold: float = 0.6
 
+    # Checkpointing
+    save_interval: int = 50  # Model versions between checkpoints
+    checkpoint_keep: int = 5  # Checkpoints kept for rollback
+
+    # Persistent experience log (see ExperienceStore; empty directory disables it)
+    experience_store_dir: str = ""
+    experience_segment_size: int = 65536  # Rows per segment
+    experience_retention_days: float = 30.0  # Sealed segments older than this are removed
+
     # Feature flags
     enabled: bool = True  # Master switch
 
@@ -60,6 +69,14 @@ class ContinuousTrainingConfig:
 
         if self.learning_rate <= 0:
             errors.append("learning_rate must be positive")
+        if self.save_interval <= 0:
+            errors.append("save_interval must be positive")
+        if self.checkpoint_keep <= 0:
+            errors.append("checkpoint_keep must be positive")
+        if self.experience_segment_size <= 0:
+            errors.append("experience_segment_size must be positive")
+        if self.experience_retention_days <= 0:
+            errors.append("experience_retention_days must be positive")
 
         if errors:
             for error in errors:
@@ -89,6 +106,11 @@ class ContinuousTrainingConfig:
                 actual_weight=data.get("actual_weight", cls.actual_weight),
                 learning_rate=data.get("learning_rate", cls.learning_rate),
                 reward_threshold=data.get("reward_threshold", cls.reward_threshold),
+                save_interval=data.get("save_interval", cls.save_interval),
+                checkpoint_keep=data.get("checkpoint_keep", cls.checkpoint_keep),
+                experience_store_dir=data.get("experience_store_dir") or cls.experience_store_dir,
+                experience_segment_size=data.get("experience_segment_size", cls.experience_segment_size),
+                experience_retention_days=data.get("experience_retention_days", cls.experience_retention_days),
                 enabled=data.get("enabled", cls.enabled),
             )
 
@@ -114,5 +136,10 @@ class ContinuousTrainingConfig:
             "actual_weight": self.actual_weight,
             "learning_rate": self.learning_rate,
             "reward_threshold": self.reward_threshold,
+            "save_interval": self.save_interval,
+            "checkpoint_keep": self.checkpoint_keep,
+            "experience_store_dir": self.experience_store_dir,
+            "experience_segment_size": self.experience_segment_size,
+            "experience_retention_days": self.experience_retention_days,
             "enabled": self.enabled,
         }
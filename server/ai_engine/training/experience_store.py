@@ -0,0 +1,405 @@
+"""
+Persistent experience store with memory-mapped columnar segments.
+
+The replay buffer is drained and discarded after each training step. The
+ExperienceStore keeps a durable log of every drained Experience for
+offline training and analytics, without ever loading it into RAM:
+
+- The log is a sequence of segment directories (seg_000001, ...), each
+  holding SEGMENT_SIZE preallocated rows.
+- Every column is its own .npy file (np.load(mmap_mode='r') or
+  np.memmap), so a reader maps only the columns it needs.
+- meta.json records the committed row count and is replaced atomically
+  after rows are flushed, so a crash can only lose uncommitted rows.
+- Full segments are sealed and a new one is started; sealed segments past
+  max_segments or retention_days are removed.
+
+Columns (fixed schema; the feature width is recorded per segment, and a
+changed width after a restart starts a new segment):
+    observation    float32[feature_dim]  normalized NN features
+    spawn_chunk    int16                 -1 for no spawn
+    spawn_type     int8                  0 energy, 1 combat, -1 none
+    nn_confidence  float32
+    gate_signal    float32
+    r_expected     float32
+    was_executed   bool
+    actual_reward  float32               NaN when no reward arrived
+    timestamp      float64
+    territory_id   S64                   UTF-8, truncated to 64 bytes
+    model_version  int32
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .experience import Experience
+
+logger = logging.getLogger(__name__)
+
+STORE_FORMAT_VERSION = 1
+TERRITORY_BYTES = 64
+SPAWN_TYPES = ('energy', 'combat')
+
+# Scalar columns: name -> dtype (observation is added with the store's feature width)
+SCALAR_COLUMNS: Dict[str, np.dtype] = {
+    'spawn_chunk': np.dtype(np.int16),
+    'spawn_type': np.dtype(np.int8),
+    'nn_confidence': np.dtype(np.float32),
+    'gate_signal': np.dtype(np.float32),
+    'r_expected': np.dtype(np.float32),
+    'was_executed': np.dtype(np.bool_),
+    'actual_reward': np.dtype(np.float32),
+    'timestamp': np.dtype(np.float64),
+    'territory_id': np.dtype(f'S{TERRITORY_BYTES}'),
+    'model_version': np.dtype(np.int32),
+}
+COLUMNS = ('observation',) + tuple(SCALAR_COLUMNS)
+
+
+def _write_json_atomic(path: str, data: Dict[str, Any]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+@dataclass
+class SegmentInfo:
+    """Committed state of one segment"""
+    path: str
+    sequence: int
+    count: int
+    capacity: int
+    feature_dim: int
+    sealed: bool
+    first_timestamp: Optional[float]
+    last_timestamp: Optional[float]
+
+
+def read_segment_info(path: str) -> SegmentInfo:
+    """Read a segment's meta.json"""
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta.get('format_version') != STORE_FORMAT_VERSION:
+        raise ValueError(f"{path}: unsupported experience segment version {meta.get('format_version')!r}")
+    return SegmentInfo(
+        path=path,
+        sequence=meta['sequence'],
+        count=meta['count'],
+        capacity=meta['capacity'],
+        feature_dim=meta['feature_dim'],
+        sealed=meta['sealed'],
+        first_timestamp=meta.get('first_timestamp'),
+        last_timestamp=meta.get('last_timestamp')
+    )
+
+
+def open_segment_columns(path: str, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Map the committed rows of a segment's columns read-only.
+
+    Args:
+        path: Segment directory
+        columns: Columns to map (default: all)
+
+    Returns:
+        Column name -> memory-mapped array of the committed rows
+    """
+    info = read_segment_info(path)
+    mapped = {}
+    for name in columns or COLUMNS:
+        if name not in COLUMNS:
+            raise KeyError(f"Unknown experience column: {name}")
+        mapped[name] = np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')[:info.count]
+    return mapped
+
+
+def rows_to_experiences(rows: Dict[str, np.ndarray]) -> List[Experience]:
+    """Convert a batch of column arrays (all columns) back to Experience objects"""
+    experiences = []
+    for i in range(len(rows['spawn_chunk'])):
+        spawn_type = int(rows['spawn_type'][i])
+        actual_reward = float(rows['actual_reward'][i])
+        experiences.append(Experience(
+            observation=np.array(rows['observation'][i], dtype=np.float32),
+            spawn_chunk=int(rows['spawn_chunk'][i]),
+            spawn_type=SPAWN_TYPES[spawn_type] if spawn_type >= 0 else None,
+            nn_confidence=float(rows['nn_confidence'][i]),
+            gate_signal=float(rows['gate_signal'][i]),
+            R_expected=float(rows['r_expected'][i]),
+            was_executed=bool(rows['was_executed'][i]),
+            actual_reward=None if np.isnan(actual_reward) else actual_reward,
+            timestamp=float(rows['timestamp'][i]),
+            territory_id=rows['territory_id'][i].decode('utf-8', errors='ignore'),
+            model_version=int(rows['model_version'][i])
+        ))
+    return experiences
+
+
+class ExperienceStore:
+    """
+    Append-only experience log of memory-mapped columnar segments.
+
+    append() is thread-safe. Readers (this process or others) only see rows
+    committed to meta.json, so they can read while the store is written.
+    """
+
+    SEGMENT_SIZE = 65536  # Rows per segment
+
+    def __init__(
+        self,
+        directory: str,
+        segment_size: Optional[int] = None,
+        max_segments: Optional[int] = None,
+        retention_days: Optional[float] = None
+    ):
+        """
+        Args:
+            directory: Store directory (created if missing)
+            segment_size: Rows per segment (default SEGMENT_SIZE)
+            max_segments: Keep at most this many segments (None = unlimited)
+            retention_days: Remove sealed segments whose newest row is older (None = keep)
+        """
+        self.directory = directory
+        self.segment_size = segment_size or self.SEGMENT_SIZE
+        self.max_segments = max_segments
+        self.retention_days = retention_days
+
+        self._lock = threading.Lock()
+        self._current: Optional[SegmentInfo] = None
+        self._columns: Dict[str, np.memmap] = {}
+
+        self.stats = {"appended": 0, "segments_created": 0, "segments_removed": 0}
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._apply_retention()
+
+    def segment_paths(self) -> List[str]:
+        """Segment directories, oldest first"""
+        names = sorted(
+            name for name in os.listdir(self.directory)
+            if name.startswith('seg_') and os.path.isfile(os.path.join(self.directory, name, 'meta.json'))
+        )
+        return [os.path.join(self.directory, name) for name in names]
+
+    def segments(self) -> List[SegmentInfo]:
+        """Committed state of every segment, oldest first"""
+        infos = []
+        for path in self.segment_paths():
+            try:
+                infos.append(read_segment_info(path))
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"[ExperienceStore] Skipping unreadable segment {path}: {e}")
+        return infos
+
+    def __len__(self) -> int:
+        return sum(info.count for info in self.segments())
+
+    # ---- Writing ----
+
+    def _open(self, info: SegmentInfo) -> None:
+        self._current = info
+        self._columns = {
+            name: np.load(os.path.join(info.path, f'{name}.npy'), mmap_mode='r+')
+            for name in COLUMNS
+        }
+
+    def _open_or_create_segment(self, feature_dim: int) -> None:
+        """Continue the newest unsealed segment (e.g. after a restart) or start a new one"""
+        existing = self.segments()
+        if existing and not existing[-1].sealed and existing[-1].feature_dim == feature_dim:
+            self._open(existing[-1])
+            return
+        if existing and not existing[-1].sealed:
+            existing[-1].sealed = True  # Different feature width: close it as is
+            self._write_meta(existing[-1])
+
+        sequence = existing[-1].sequence + 1 if existing else 1
+        path = os.path.join(self.directory, f'seg_{sequence:06d}')
+        os.makedirs(path, exist_ok=True)
+        dtypes = {'observation': np.dtype(np.float32), **SCALAR_COLUMNS}
+        for name in COLUMNS:
+            shape = (self.segment_size, feature_dim) if name == 'observation' else (self.segment_size,)
+            np.lib.format.open_memmap(os.path.join(path, f'{name}.npy'), mode='w+',
+                                      dtype=dtypes[name], shape=shape).flush()
+
+        info = SegmentInfo(path=path, sequence=sequence, count=0, capacity=self.segment_size,
+                           feature_dim=feature_dim, sealed=False, first_timestamp=None, last_timestamp=None)
+        self._write_meta(info)
+        self._open(info)
+        self.stats["segments_created"] += 1
+        logger.info(f"[ExperienceStore] Started segment {os.path.basename(path)}")
+        self._apply_retention()
+
+    def _write_meta(self, info: SegmentInfo) -> None:
+        _write_json_atomic(os.path.join(info.path, 'meta.json'), {
+            'format_version': STORE_FORMAT_VERSION,
+            'sequence': info.sequence,
+            'count': info.count,
+            'capacity': info.capacity,
+            'feature_dim': info.feature_dim,
+            'sealed': info.sealed,
+            'first_timestamp': info.first_timestamp,
+            'last_timestamp': info.last_timestamp,
+            'columns': list(COLUMNS)
+        })
+
+    def _seal(self) -> None:
+        self._current.sealed = True
+        self._write_meta(self._current)
+        self._current = None
+        self._columns = {}
+
+    def append(self, experiences: Sequence[Experience]) -> int:
+        """
+        Append experiences and commit them.
+
+        Returns:
+            Number of experiences written
+
+        Raises:
+            ValueError: If an observation's width differs from the store's
+        """
+        if not experiences:
+            return 0
+
+        with self._lock:
+            feature_dim = len(experiences[0].observation)
+            if self._current is None:
+                self._open_or_create_segment(feature_dim)
+            if self._current.feature_dim != feature_dim:
+                raise ValueError(
+                    f"Observation width {feature_dim} does not match the store's {self._current.feature_dim}"
+                )
+
+            written = 0
+            while written < len(experiences):
+                if self._current is None:
+                    self._open_or_create_segment(feature_dim)
+                info = self._current
+                take = min(len(experiences) - written, info.capacity - info.count)
+                self._write_rows(experiences[written:written + take], info.count)
+
+                for column in self._columns.values():
+                    column.flush()
+                if info.first_timestamp is None:
+                    info.first_timestamp = float(experiences[written].timestamp)
+                info.last_timestamp = float(experiences[written + take - 1].timestamp)
+                info.count += take
+                self._write_meta(info)
+                written += take
+
+                if info.count >= info.capacity:
+                    self._seal()
+
+            self.stats["appended"] += written
+            return written
+
+    def _write_rows(self, batch: Sequence[Experience], start: int) -> None:
+        end = start + len(batch)
+        columns = self._columns
+        columns['observation'][start:end] = np.asarray([e.observation for e in batch], dtype=np.float32)
+        columns['spawn_chunk'][start:end] = [e.spawn_chunk for e in batch]
+        columns['spawn_type'][start:end] = [
+            SPAWN_TYPES.index(e.spawn_type) if e.spawn_type in SPAWN_TYPES else -1 for e in batch
+        ]
+        columns['nn_confidence'][start:end] = [e.nn_confidence for e in batch]
+        columns['gate_signal'][start:end] = [e.gate_signal for e in batch]
+        columns['r_expected'][start:end] = [e.R_expected for e in batch]
+        columns['was_executed'][start:end] = [e.was_executed for e in batch]
+        columns['actual_reward'][start:end] = [
+            np.nan if e.actual_reward is None else e.actual_reward for e in batch
+        ]
+        columns['timestamp'][start:end] = [e.timestamp for e in batch]
+        columns['territory_id'][start:end] = [
+            (e.territory_id or '').encode('utf-8')[:TERRITORY_BYTES] for e in batch
+        ]
+        columns['model_version'][start:end] = [e.model_version for e in batch]
+
+    def _apply_retention(self) -> None:
+        """Remove the oldest sealed segments past max_segments or retention_days"""
+        segments = self.segments()
+        cutoff = time.time() - self.retention_days * 24 * 3600 if self.retention_days else None
+        excess = len(segments) - self.max_segments if self.max_segments else 0
+
+        for info in segments:
+            if not info.sealed:
+                break
+            expired = cutoff is not None and (info.last_timestamp or 0.0) < cutoff
+            if excess <= 0 and not expired:
+                break
+            shutil.rmtree(info.path, ignore_errors=True)
+            excess -= 1
+            self.stats["segments_removed"] += 1
+            logger.info(f"[ExperienceStore] Removed segment {os.path.basename(info.path)}")
+
+    def close(self) -> None:
+        """
+        Release the open segment's memory maps.
+
+        Committed rows are already on disk; a later append() continues the
+        same segment.
+        """
+        with self._lock:
+            self._current = None
+            self._columns = {}
+
+    # ---- Reading ----
+
+    def iter_batches(
+        self,
+        batch_size: int = 4096,
+        columns: Optional[Sequence[str]] = None
+    ) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Stream committed rows in order as column batches.
+
+        Batches are memory-mapped views and never span segments, so a batch
+        may be shorter than batch_size at a segment boundary.
+
+        Args:
+            batch_size: Max rows per batch
+            columns: Columns to read (default: all)
+
+        Yields:
+            Column name -> array slice
+        """
+        unknown = set(columns or ()) - set(COLUMNS)
+        if unknown:
+            raise KeyError(f"Unknown experience columns: {sorted(unknown)}")
+
+        for path in self.segment_paths():
+            try:
+                mapped = open_segment_columns(path, columns)
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"[ExperienceStore] Skipping unreadable segment {path}: {e}")
+                continue
+            count = len(next(iter(mapped.values())))
+            for start in range(0, count, batch_size):
+                yield {name: array[start:start + batch_size] for name, array in mapped.items()}
+
+    def iter_experiences(self, batch_size: int = 4096) -> Iterator[Experience]:
+        """Stream committed rows as Experience objects"""
+        for rows in self.iter_batches(batch_size):
+            yield from rows_to_experiences(rows)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get store statistics"""
+        segments = self.segments()
+        return {
+            "directory": self.directory,
+            "segments": len(segments),
+            "rows": sum(info.count for info in segments),
+            "segment_size": self.segment_size,
+            **self.stats
+        }
@@ -0,0 +1,410 @@
+"""
+Offline multi-epoch training over recorded experience.
+
+ContinuousTrainer trains online, once per drained batch, one experience at
+a time. OfflineTrainer pretrains a model from recorded experience instead:
+
+- Experiences are streamed from ExperienceStore directories (one shard per
+  memory-mapped segment) and experience logs (JSONL, optionally gzipped,
+  one Experience dict per line; one shard per file).
+- Each worker shuffles its rows with a bounded window, so memory stays
+  flat no matter how much experience is recorded.
+- Mini-batches are prepared by DataLoader worker processes and prefetched
+  while the model trains.
+- The result is written with the metadata NNModel._load_model_if_exists
+  checks, so servers load it like any other model file.
+
+Only experiences with an actual reward are trained on (WAIT decisions and
+SEND decisions still pending a reward carry no training signal), with the
+same targets as ContinuousTrainer: the spawn type, the selected chunk's
+index among the top 5 chunks, quantity 1, weighted by |actual_reward|. The
+loss of a mini-batch is the mean of the online per-experience losses.
+"""
+
+import gzip
+import io
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from torch.utils.data import DataLoader, IterableDataset, get_worker_info
+
+from .checkpoints import _atomic_write, metadata_path_for
+from .experience_store import SPAWN_TYPES, ExperienceStore, open_segment_columns
+
+if TYPE_CHECKING:
+    from ..nn_model import NNModel
+
+logger = logging.getLogger(__name__)
+
+TRAIN_COLUMNS = ('observation', 'spawn_chunk', 'spawn_type', 'was_executed', 'actual_reward')
+QUANTITY_TARGET = 1  # ContinuousTrainer trains with train_with_reward's default quantity
+TOP_CHUNKS = 5
+
+
+@dataclass(frozen=True)
+class Shard:
+    """Unit of experience read by one worker: a store segment or a log file"""
+    kind: str  # 'segment' or 'log'
+    path: str
+
+
+def discover_shards(paths: Sequence[str]) -> List[Shard]:
+    """
+    Expand sources into shards.
+
+    Args:
+        paths: ExperienceStore directories and experience log files (.jsonl, .jsonl.gz)
+
+    Raises:
+        ValueError: If a path is neither a store directory nor a log file
+    """
+    shards = []
+    for path in paths:
+        if os.path.isdir(path):
+            segments = ExperienceStore(path).segment_paths()
+            shards.extend(Shard('segment', segment) for segment in segments)
+        elif os.path.isfile(path) and path.endswith(('.jsonl', '.jsonl.gz', '.ndjson')):
+            shards.append(Shard('log', path))
+        else:
+            raise ValueError(f"Not an experience store directory or log file: {path}")
+    return shards
+
+
+def _trainable(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Rows with a training signal, as in-memory arrays"""
+    mask = np.asarray(columns['was_executed'], dtype=bool) & ~np.isnan(columns['actual_reward'])
+    return {
+        'features': np.asarray(columns['observation'][mask], dtype=np.float32),
+        'spawn_chunk': np.asarray(columns['spawn_chunk'][mask], dtype=np.int64),
+        'spawn_type': np.asarray(columns['spawn_type'][mask], dtype=np.int64),
+        'reward': np.asarray(columns['actual_reward'][mask], dtype=np.float32)
+    }
+
+
+def _read_segment(path: str, block_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+    columns = open_segment_columns(path, TRAIN_COLUMNS)
+    count = len(columns['spawn_chunk'])
+    for start in range(0, count, block_rows):
+        yield _trainable({name: array[start:start + block_rows] for name, array in columns.items()})
+
+
+def _read_log(path: str, block_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+    opener = gzip.open if path.endswith('.gz') else open
+    rows: Dict[str, list] = {name: [] for name in TRAIN_COLUMNS}
+
+    def flush():
+        block = {name: np.asarray(values) for name, values in rows.items()}
+        for values in rows.values():
+            values.clear()
+        return _trainable(block)
+
+    with opener(path, 'rt') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+                observation = np.asarray(record['observation'], dtype=np.float32)
+                spawn_type = record.get('spawn_type')
+                actual_reward = record.get('actual_reward')
+                row = (
+                    observation,
+                    int(record['spawn_chunk']),
+                    SPAWN_TYPES.index(spawn_type) if spawn_type in SPAWN_TYPES else -1,
+                    bool(record.get('was_executed', False)),
+                    np.nan if actual_reward is None else float(actual_reward)
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                logger.warning(f"Skipping malformed experience on line {line_number} of {path}: {e}")
+                continue
+            for name, value in zip(TRAIN_COLUMNS, row):
+                rows[name].append(value)
+            if len(rows['spawn_chunk']) >= block_rows:
+                yield flush()
+    if rows['spawn_chunk']:
+        yield flush()
+
+
+def read_shard(shard: Shard, block_rows: int = 4096) -> Iterator[Dict[str, np.ndarray]]:
+    """Stream a shard's trainable rows in blocks"""
+    if shard.kind == 'segment':
+        return _read_segment(shard.path, block_rows)
+    return _read_log(shard.path, block_rows)
+
+
+def chunk_targets(features: np.ndarray, spawn_chunk: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Index of each selected chunk among the top 5 chunks of its features.
+
+    Vectorized NNModel.train_with_reward mapping: chunk ids are encoded at
+    features[i*5] (/255), with empty slots marked by zero worker density at
+    features[i*5+1]. A chunk that is not among them gets a random valid slot
+    (any slot if all are empty).
+    """
+    slots = np.arange(TOP_CHUNKS) * 5
+    valid = features[:, slots + 1] > 0
+    chunk_ids = np.where(valid, np.rint(features[:, slots] * 255).astype(np.int64), -1)
+    matches = chunk_ids == spawn_chunk[:, None]
+
+    targets = np.argmax(matches, axis=1)
+    unmatched = ~matches.any(axis=1)
+    if unmatched.any():
+        # Random valid slot: argmax of random keys restricted to valid slots
+        keys = rng.random((int(unmatched.sum()), TOP_CHUNKS))
+        choices = valid[unmatched]
+        keys = np.where(choices | ~choices.any(axis=1, keepdims=True), keys, -1.0)
+        targets[unmatched] = np.argmax(keys, axis=1)
+    return targets
+
+
+def shuffled_rows(
+    blocks: Iterator[Dict[str, np.ndarray]],
+    window: int,
+    rng: np.random.Generator
+) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Shuffle a stream of row blocks with a bounded window.
+
+    Up to `window` rows are held back; each incoming block is mixed with
+    them and everything beyond the window is emitted in random order.
+    """
+    held: Optional[Dict[str, np.ndarray]] = None
+    for block in blocks:
+        if len(block['reward']) == 0:
+            continue
+        held = block if held is None else {name: np.concatenate([held[name], block[name]]) for name in block}
+        count = len(held['reward'])
+        if count <= window:
+            continue
+        order = rng.permutation(count)
+        emit, keep = order[:count - window], order[count - window:]
+        yield {name: values[emit] for name, values in held.items()}
+        held = {name: values[keep] for name, values in held.items()}
+
+    if held is not None and len(held['reward']):
+        order = rng.permutation(len(held['reward']))
+        yield {name: values[order] for name, values in held.items()}
+
+
+class ExperienceBatches(IterableDataset):
+    """
+    Shuffled training mini-batches from experience shards.
+
+    With DataLoader workers, each worker reads every num_workers-th shard
+    (in a per-epoch seeded order) and prepares whole mini-batches, so the
+    DataLoader must be created with batch_size=None.
+    """
+
+    def __init__(self, shards: Sequence[Shard], batch_size: int, shuffle_window: int, seed: int = 0):
+        self.shards = list(shards)
+        self.batch_size = batch_size
+        self.shuffle_window = shuffle_window
+        self.seed = seed
+        self.epoch = 0
+
+    def set_epoch(self, epoch: int) -> None:
+        """Select the epoch's shuffle (call before iterating)"""
+        self.epoch = epoch
+
+    def __iter__(self) -> Iterator[Dict[str, torch.Tensor]]:
+        info = get_worker_info()
+        worker_id, num_workers = (info.id, info.num_workers) if info else (0, 1)
+        rng = np.random.default_rng([self.seed, self.epoch, worker_id])
+
+        order = np.random.default_rng([self.seed, self.epoch]).permutation(len(self.shards))
+        shards = [self.shards[i] for i in order[worker_id::num_workers]]
+
+        def blocks():
+            for shard in shards:
+                yield from read_shard(shard)
+
+        pending: Optional[Dict[str, np.ndarray]] = None
+        for rows in shuffled_rows(blocks(), self.shuffle_window, rng):
+            pending = rows if pending is None else {name: np.concatenate([pending[name], rows[name]]) for name in rows}
+            while len(pending['reward']) >= self.batch_size:
+                yield self._collate({name: values[:self.batch_size] for name, values in pending.items()}, rng)
+                pending = {name: values[self.batch_size:] for name, values in pending.items()}
+        if pending is not None and len(pending['reward']):
+            yield self._collate(pending, rng)
+
+    @staticmethod
+    def _collate(rows: Dict[str, np.ndarray], rng: np.random.Generator) -> Dict[str, torch.Tensor]:
+        features = rows['features']
+        return {
+            'features': torch.from_numpy(np.ascontiguousarray(features)),
+            'type_target': torch.from_numpy((rows['spawn_type'] == 1).astype(np.int64)),
+            'chunk_target': torch.from_numpy(chunk_targets(features, rows['spawn_chunk'], rng)),
+            'quantity_target': torch.full((len(features),), QUANTITY_TARGET, dtype=torch.long),
+            'weight': torch.from_numpy(np.abs(rows['reward']))
+        }
+
+
+def weighted_sequential_loss(
+    outputs: Dict[str, torch.Tensor],
+    batch: Dict[str, torch.Tensor],
+    entropy_coef: float
+) -> torch.Tensor:
+    """
+    Mean of the per-experience sequential_loss values of a batch.
+
+    Each experience's loss (type and chunk cross-entropy minus the entropy
+    bonus, plus quantity cross-entropy) is weighted by its |reward|, as
+    when ContinuousTrainer trains on it alone.
+    """
+    def entropy(probs: torch.Tensor) -> torch.Tensor:
+        return -torch.sum(probs * torch.log(probs + 1e-8), dim=-1)
+
+    type_loss = F.cross_entropy(outputs['type_logits'], batch['type_target'], reduction='none') \
+        - entropy_coef * entropy(outputs['type_probs'])
+    chunk_loss = F.cross_entropy(outputs['chunk_logits'], batch['chunk_target'], reduction='none') \
+        - entropy_coef * entropy(outputs['chunk_probs'])
+    quantity_loss = F.cross_entropy(outputs['quantity_logits'], batch['quantity_target'], reduction='none')
+    return ((type_loss + chunk_loss + quantity_loss) * batch['weight']).mean()
+
+
+class OfflineTrainer:
+    """
+    Multi-epoch mini-batch trainer for an NNModel over recorded experience.
+    """
+
+    def __init__(
+        self,
+        model: "NNModel",
+        shards: Sequence[Shard],
+        batch_size: int = 1024,
+        shuffle_window: int = 65536,
+        learning_rate: float = 0.001,
+        num_workers: int = 0,
+        prefetch_factor: int = 4,
+        seed: int = 0
+    ):
+        """
+        Args:
+            model: Model to train in place
+            shards: Experience shards (see discover_shards)
+            batch_size: Experiences per optimizer step
+            shuffle_window: Rows held back per worker for shuffling
+            learning_rate: Adam learning rate
+            num_workers: DataLoader worker processes (0 prepares batches in this process)
+            prefetch_factor: Batches prefetched per worker
+            seed: Seed for shuffling, chunk target tie-breaks and the loader
+        """
+        self.model = model
+        self.dataset = ExperienceBatches(shards, batch_size, shuffle_window, seed)
+        self.learning_rate = learning_rate
+        self.num_workers = min(num_workers, len(self.dataset.shards))
+        self.prefetch_factor = prefetch_factor
+        self.seed = seed
+        self.history: List[Dict[str, Any]] = []
+
+    def _loader(self, epoch: int) -> DataLoader:
+        self.dataset.set_epoch(epoch)
+        kwargs = {}
+        if self.num_workers > 0:
+            kwargs['prefetch_factor'] = self.prefetch_factor
+        return DataLoader(self.dataset, batch_size=None, num_workers=self.num_workers, **kwargs)
+
+    def train_epoch(self, epoch: int) -> Dict[str, Any]:
+        """Train one pass over every shard"""
+        model = self.model
+        torch.manual_seed(self.seed + epoch)
+        for group in model.optimizer.param_groups:
+            group['lr'] = self.learning_rate
+        model.model.train()
+
+        start = time.perf_counter()
+        total_loss = 0.0
+        rows = 0
+        batches = 0
+        for batch in self._loader(epoch):
+            batch = {name: tensor.to(model.device) for name, tensor in batch.items()}
+            outputs = model._run_forward(batch['features'])
+            loss = weighted_sequential_loss(outputs, batch, float(model.entropy_coef))
+
+            model.optimizer.zero_grad()
+            loss.backward()
+            model.optimizer.step()
+
+            count = len(batch['weight'])
+            total_loss += loss.item() * count
+            rows += count
+            batches += 1
+
+        model.mark_weights_changed()
+        elapsed = time.perf_counter() - start
+        stats = {
+            'epoch': epoch,
+            'rows': rows,
+            'batches': batches,
+            'loss': total_loss / rows if rows else 0.0,
+            'seconds': elapsed,
+            'rows_per_s': rows / elapsed if elapsed > 0 else 0.0
+        }
+        self.history.append(stats)
+        logger.info(
+            f"[OfflineTraining] epoch {epoch}: loss={stats['loss']:.4f} rows={rows} "
+            f"batches={batches} ({stats['rows_per_s']:.0f} rows/s)"
+        )
+        return stats
+
+    def train(self, epochs: int, checkpoint_path: Optional[str] = None,
+              base_version: int = 0) -> List[Dict[str, Any]]:
+        """
+        Train for several epochs, writing a checkpoint after each one.
+
+        Args:
+            epochs: Passes over the data
+            checkpoint_path: Model file to write (None: keep weights in memory only)
+            base_version: model_version of the starting weights
+
+        Raises:
+            ValueError: If the shards hold no trainable experience
+        """
+        for epoch in range(epochs):
+            if self.train_epoch(epoch)['rows'] == 0:
+                raise ValueError("No trainable experiences (with an actual reward) in the given sources")
+            if checkpoint_path:
+                save_checkpoint(self.model, checkpoint_path, base_version + epoch + 1, self.history)
+        return self.history
+
+
+def save_checkpoint(model: "NNModel", path: str, model_version: int,
+                    history: Sequence[Dict[str, Any]] = ()) -> None:
+    """
+    Write weights and metadata the way the server loads them.
+
+    Both files are replaced atomically, so a server never loads a partial
+    checkpoint.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    buffer = io.BytesIO()
+    torch.save(model.model.state_dict(), buffer)
+
+    metadata = model.build_metadata()
+    metadata['model_version'] = model_version
+    metadata['offline_training'] = {
+        'epochs': len(history),
+        'rows_trained': sum(stats['rows'] for stats in history),
+        'final_loss': history[-1]['loss'] if history else None,
+        'saved_at': time.time()
+    }
+    _atomic_write(path, buffer.getvalue())
+    _atomic_write(metadata_path_for(path), json.dumps(metadata, indent=2).encode())
+    logger.info(f"[OfflineTraining] Wrote checkpoint v{model_version} to {path}")
+
+
+def read_model_version(path: str) -> int:
+    """model_version from a model file's metadata (0 if absent)"""
+    try:
+        with open(metadata_path_for(path)) as f:
+            return int(json.load(f).get('model_version', 0))
+    except (OSError, ValueError):
+        return 0
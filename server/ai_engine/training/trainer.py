@@ -7,7 +7,9 @@ blocking the WebSocket event loop. Features:
 - Non-blocking training execution
 - Thread-safe model updates
 - Graceful shutdown handling
-- Training state persistence
+- Training state persistence (versioned checkpoints written in the background)
+- Optional persistent experience log (every drained batch is appended to an
+  ExperienceStore for offline training and analytics)
 
 The background trainer wraps the NN model and executes
 training steps in a dedicated daemon thread.
@@ -16,6 +18,9 @@ Thread Safety:
     - Model weights are updated atomically with _model_lock
     - Training state is protected by the lock
     - Shutdown is coordinated with pending operations
+    - Checkpoints only copy weights under the lock; disk writes happen on
+      the CheckpointManager thread, so neither training nor inference
+      waits on disk
 
 Training Approach:
     - Uses gate_signal directly as training feedback
@@ -35,10 +40,13 @@ from typing import Optional, TYPE_CHECKING, List
 import numpy as np
 
 from .buffer import ExperienceReplayBuffer
+from .checkpoints import CheckpointManager
 from .config import ContinuousTrainingConfig
 from .experience import Experience
+from .experience_store import ExperienceStore
 from .metrics import TrainingMetrics
 from ..decision_gate.dashboard_metrics import get_dashboard_metrics
+from ..latency_metrics import get_latency_metrics
 
 if TYPE_CHECKING:
     from ..nn_model import NNModel
@@ -69,13 +77,28 @@ class ContinuousTrainer:
 
         # Threading
         self._running = False
+        self._closed = False
         self._thread: Optional[threading.Thread] = None
         self._model_lock = threading.Lock()
 
         # Versioning
         self._model_version = self._load_model_version()  # Restore from metadata
         self._last_save_version = self._model_version
-        self._save_interval = 50  # Save every 50 versions
+        self._save_interval = config.save_interval
+
+        # Checkpoints (ring next to the model file; none for models without a path)
+        self._checkpoints: Optional[CheckpointManager] = None
+        if isinstance(getattr(model, 'model_path', None), str):
+            self._checkpoints = CheckpointManager(model.model_path, keep=config.checkpoint_keep)
+
+        # Experience log (drained batches would otherwise be discarded after training)
+        self._experience_store: Optional[ExperienceStore] = None
+        if config.experience_store_dir:
+            self._experience_store = ExperienceStore(
+                config.experience_store_dir,
+                segment_size=config.experience_segment_size,
+                retention_days=config.experience_retention_days
+            )
 
         # Metrics
         self._metrics = TrainingMetrics()
@@ -112,10 +135,37 @@ class ContinuousTrainer:
             if self._thread.is_alive():
                 logger.warning("[Training] Thread did not stop gracefully")
 
-        # Save model on shutdown
-        self._save_model()
+        self._save_final(timeout)
         logger.info("[Training] Stopped background trainer")
 
+    def close(self, timeout: float = 5.0) -> None:
+        """
+        Stop training (if running), write the final model and stop the checkpoint writer.
+
+        Unlike stop(), this also finalizes a trainer that was driven with
+        train_step() and never started. When it returns, the model path
+        holds the latest weights. The trainer cannot train afterwards.
+        """
+        if self._closed:
+            return
+        if self._running:
+            self.stop(timeout)
+        else:
+            self._save_final(timeout)
+        self._closed = True
+        if self._checkpoints is not None:
+            self._checkpoints.close(timeout)
+
+    def _save_final(self, timeout: float) -> None:
+        """Checkpoint the current weights, wait for the write and release the experience log."""
+        with self._model_lock:
+            self._save_model()
+        if self._checkpoints is not None:
+            if not self._checkpoints.flush(timeout=timeout):
+                logger.warning("[Training] Final checkpoint not written within timeout")
+        if self._experience_store is not None:
+            self._experience_store.close()
+
     def _training_loop(self) -> None:
         """
         Main training loop - runs until stopped.
@@ -145,20 +195,47 @@ class ContinuousTrainer:
 
         logger.info("[Training] Training loop stopped")
 
-    def _training_step(self) -> None:
+    def train_step(self) -> Optional[dict]:
+        """
+        Run one training step in the calling thread.
+
+        For callers that drive training themselves instead of starting the
+        background thread (e.g. reproducible hyperparameter sweeps).
+
+        Returns:
+            Step summary (model_version, loss, batch_size, avg_reward,
+            drained, step_time_ms), or None if nothing was trained
+
+        Raises:
+            RuntimeError: If the background thread is running or the trainer is closed
+        """
+        if self._running or self._closed:
+            raise RuntimeError("train_step() needs a trainer that is neither running nor closed")
+        return self._training_step()
+
+    def _training_step(self) -> Optional[dict]:
         """
         Execute single training step.
 
         Drains ALL experiences from buffer and trains on them.
         After training, experiences are removed (not reused).
+
+        Returns:
+            Step summary, or None if nothing was trained
         """
-        step_start = time.time()
+        step_start = time.perf_counter()
 
         # Drain all experiences from buffer (train once, then remove)
         batch = self.buffer.drain()
 
         if len(batch) == 0:
-            return
+            return None
+
+        if self._experience_store is not None:
+            try:
+                self._experience_store.append(batch)
+            except Exception as e:
+                logger.error(f"[Training] Failed to persist experiences: {e}")
 
         # Train on each experience in batch (only those with actual_reward)
         total_loss = 0.0
@@ -197,13 +274,15 @@ class ContinuousTrainer:
 
         # Skip metrics if nothing was trained
         if trained_count == 0:
-            return
+            return None
 
         avg_loss = total_loss / trained_count
         avg_training_reward = total_training_reward / trained_count
 
         # Update metrics
-        step_time = (time.time() - step_start) * 1000  # ms
+        step_seconds = time.perf_counter() - step_start
+        step_time = step_seconds * 1000  # ms
+        get_latency_metrics().observe("train_step", step_seconds, message_type="training")
         self._metrics.record_step(
             loss=avg_loss,
             batch_size=trained_count,
@@ -230,6 +309,15 @@ class ContinuousTrainer:
         except Exception as e:
             logger.info(f"Failed to record to dashboard: {e}")
 
+        return {
+            "model_version": self._model_version,
+            "loss": avg_loss,
+            "batch_size": trained_count,
+            "avg_reward": avg_training_reward,
+            "drained": len(batch),
+            "step_time_ms": step_time
+        }
+
     def _calculate_training_reward(self, experience: Experience) -> float:
         """
         Calculate training reward from experience.
@@ -311,45 +399,68 @@ class ContinuousTrainer:
             "training": training_stats,
             "model_version": self._model_version,
             "is_running": self._running,
+            "checkpoints": self._checkpoints.get_statistics() if self._checkpoints else None,
+            "experience_store": self._experience_store.get_statistics() if self._experience_store else None,
         }
 
-    def _save_model(self) -> None:
-        """Save model weights and version to disk."""
-        try:
-            if self.model.save_model():
-                self._last_save_version = self._model_version
-                self._save_model_version()
-                logger.info(f"[Training] Model saved at version {self._model_version}")
-        except Exception as e:
-            logger.error(f"[Training] Failed to save model: {e}")
+    def list_checkpoints(self) -> List[dict]:
+        """Checkpoints available for rollback, oldest first."""
+        if self._checkpoints is None:
+            return []
+        return self._checkpoints.list_checkpoints()
+
+    def rollback(self, version: int) -> bool:
+        """
+        Restore the model weights of a checkpointed version.
+
+        The weights come from memory for recent checkpoints. The model
+        version keeps increasing (a rollback is a new version), and the
+        restored weights are checkpointed under it.
+
+        Args:
+            version: Model version to restore
+
+        Returns:
+            True if the weights were restored
+        """
+        if self._checkpoints is None:
+            logger.warning("[Training] Rollback unavailable: no checkpoint ring")
+            return False
 
-    def _save_model_version(self) -> None:
-        """Save model version to metadata file."""
         try:
-            # Handle both .pt (PyTorch) and .weights.h5 (TensorFlow) paths
-            if self.model.model_path.endswith('.pt'):
-                metadata_path = self.model.model_path.replace('.pt', '_metadata.json')
-            else:
-                metadata_path = self.model.model_path.replace('.weights.h5', '_metadata.json')
+            state_dict = self._checkpoints.load(version)
+        except (KeyError, OSError, RuntimeError) as e:
+            logger.error(f"[Training] Rollback to v{version} failed: {e}")
+            return False
 
-            # Load existing metadata
-            metadata = {}
-            if os.path.exists(metadata_path):
-                import json
-                with open(metadata_path, 'r') as f:
-                    metadata = json.load(f)
+        with self._model_lock:
+            self.model.restore_state_dict(state_dict)
+            self._model_version += 1
+            self._save_model(restored_from=version)
 
-            # Update with version
-            metadata['model_version'] = self._model_version
-            metadata['total_training_steps'] = self._model_version
+        logger.info(f"[Training] Rolled back to v{version} weights as v{self._model_version}")
+        return True
 
-            # Save back
-            import json
-            with open(metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+    def _save_model(self, restored_from: Optional[int] = None) -> None:
+        """
+        Snapshot model weights for a background checkpoint (call with _model_lock held).
 
+        Only an in-memory copy is made here; the CheckpointManager thread
+        writes it to the checkpoint ring and the model path.
+        """
+        if self._checkpoints is None:
+            return
+        try:
+            metadata = self.model.build_metadata()
+            metadata['model_version'] = self._model_version
+            metadata['total_training_steps'] = self._model_version
+            if restored_from is not None:
+                metadata['restored_from'] = restored_from
+            self._checkpoints.snapshot(self.model.model.state_dict(), self._model_version, metadata)
+            self._last_save_version = self._model_version
+            logger.info(f"[Training] Checkpoint queued at version {self._model_version}")
         except Exception as e:
-            logger.warning(f"[Training] Failed to save model version: {e}")
+            logger.error(f"[Training] Failed to snapshot model: {e}")
 
     def _load_model_version(self) -> int:
         """Load model version from metadata file."""
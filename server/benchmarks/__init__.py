@@ -0,0 +1 @@
+"""Benchmarks package - reproducible microbenchmarks for server hot paths."""
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Hive placement benchmark.
+
+Times failure clustering, risk factor analysis and safe zone ranking in
+HivePlacementGenerator over growing failed-location histories, optionally
+against the original pairwise Python implementation.
+
+Usage:
+    python -m benchmarks.hive_placement [options]
+
+Examples:
+    # Default sizes (10 to 10,000 locations)
+    python -m benchmarks.hive_placement
+
+    # Compare against the pairwise reference up to 2,000 locations
+    python -m benchmarks.hive_placement --compare-naive --naive-max 2000
+
+    # Machine-readable output
+    python -m benchmarks.hive_placement --json
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Allow running from the server directory or the repository root
+server_dir = Path(__file__).parent.parent
+if str(server_dir) not in sys.path:
+    sys.path.insert(0, str(server_dir))
+
+from ai_engine.spatial_index import LocationIndex
+from ai_engine.strategy_generator import HivePlacementGenerator
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+
+
+def generate_locations(count: int, seed: int) -> List[Dict[str, float]]:
+    """Generate failed hive locations inside the territory bounds."""
+    rng = random.Random(seed)
+    return [
+        {
+            'x': rng.uniform(-100, 100),
+            'y': rng.uniform(-10, 50),
+            'z': rng.uniform(-100, 100),
+            'discovery_time': rng.uniform(0, 300)
+        }
+        for _ in range(count)
+    ]
+
+
+def _distance(a: Dict, b: Dict) -> float:
+    dx = a.get('x', 0) - b.get('x', 0)
+    dy = a.get('y', 0) - b.get('y', 0)
+    dz = a.get('z', 0) - b.get('z', 0)
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def naive_analysis(failed_locations: List[Dict]) -> int:
+    """Pairwise reference implementation of clustering and safe zones."""
+    clusters = 0
+    processed = set()
+    for i, loc1 in enumerate(failed_locations):
+        if i in processed:
+            continue
+        members = {i}
+        for j, loc2 in enumerate(failed_locations):
+            if j <= i or j in processed:
+                continue
+            if _distance(loc1, loc2) < HivePlacementGenerator.CLUSTER_THRESHOLD:
+                members.add(j)
+        if len(members) > 1:
+            clusters += 1
+            processed.update(members)
+
+    for x in range(-80, 81, 40):
+        for z in range(-80, 81, 40):
+            center = {'x': x, 'y': 10, 'z': z}
+            min(_distance(center, loc) for loc in failed_locations)
+
+    return clusters
+
+
+def indexed_analysis(generator: HivePlacementGenerator, failed_locations: List[Dict]) -> int:
+    """Indexed implementation used by HivePlacementGenerator."""
+    index = LocationIndex(failed_locations, cell_size=HivePlacementGenerator.CLUSTER_THRESHOLD)
+    analysis = generator._analyze_failure_patterns(failed_locations, index)
+    generator._identify_safe_zones(failed_locations, index)
+    return len(analysis['failure_clusters'])
+
+
+def time_call(func, *args, repeat: int) -> float:
+    """Best-of-repeat wall time in milliseconds."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000.0
+
+
+def run_benchmark(sizes: List[int], seed: int, repeat: int,
+                  compare_naive: bool, naive_max: int) -> List[Dict]:
+    """Run the benchmark for each history size."""
+    generator = HivePlacementGenerator()
+    results = []
+
+    for size in sizes:
+        locations = generate_locations(size, seed)
+        result = {
+            'locations': size,
+            'clusters': indexed_analysis(generator, locations),
+            'indexed_ms': time_call(indexed_analysis, generator, locations, repeat=repeat)
+        }
+        if compare_naive and size <= naive_max:
+            assert naive_analysis(locations) == result['clusters']
+            result['naive_ms'] = time_call(naive_analysis, locations, repeat=1)
+            result['speedup'] = result['naive_ms'] / max(result['indexed_ms'], 1e-9)
+        results.append(result)
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark hive placement spatial analysis')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Failed location counts to benchmark')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing repetitions (best is reported)')
+    parser.add_argument('--compare-naive', action='store_true',
+                        help='Also time the pairwise reference implementation')
+    parser.add_argument('--naive-max', type=int, default=1000,
+                        help='Largest size to run the pairwise reference on')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.sizes, args.seed, args.repeat, args.compare_naive, args.naive_max)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'locations':>10} {'clusters':>9} {'indexed ms':>11} {'naive ms':>10} {'speedup':>8}")
+    for r in results:
+        naive = f"{r['naive_ms']:10.2f}" if 'naive_ms' in r else f"{'-':>10}"
+        speedup = f"{r['speedup']:7.1f}x" if 'speedup' in r else f"{'-':>8}"
+        print(f"{r['locations']:>10} {r['clusters']:>9} {r['indexed_ms']:11.2f} {naive} {speedup}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+NN compile mode benchmark.
+
+Times the SequentialQueenNN torch forward (inference) and a full training
+step (forward, sequential_loss, backward, optimizer step) for each NNModel
+compile mode across batch sizes. The mode a model actually ran in is
+reported, so a mode that fell back to eager is visible.
+
+Usage:
+    python -m benchmarks.nn_compile [options]
+
+Examples:
+    # Default run (eager, script, trace)
+    python -m benchmarks.nn_compile
+
+    # Include torch.compile (first call compiles, which can take a minute)
+    python -m benchmarks.nn_compile --modes eager script compile --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Allow running from the server directory or the repository root
+server_dir = Path(__file__).parent.parent
+if str(server_dir) not in sys.path:
+    sys.path.insert(0, str(server_dir))
+
+import numpy as np
+import torch
+
+from ai_engine.nn_model import COMPILE_MODES, NNModel
+
+
+def time_per_call(func: Callable, iterations: int) -> float:
+    """Mean wall time per call in microseconds, after two warm-up calls."""
+    func()
+    func()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_benchmark(modes: List[str], batch_sizes: List[int], rows: int, seed: int = 0) -> List[Dict]:
+    """Time inference and training steps for each compile mode and batch size."""
+    rng = np.random.default_rng(seed)
+    results = []
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode in modes:
+            torch.manual_seed(seed)
+            nn_model = NNModel(model_path=os.path.join(temp_dir, f'{mode}.pt'), compile_mode=mode)
+
+            for batch_size in batch_sizes:
+                features = rng.random((batch_size, 29), dtype=np.float32)
+                x = torch.from_numpy(features).to(nn_model.device)
+                targets = {
+                    'type_target': torch.from_numpy(rng.integers(0, 2, batch_size)).to(nn_model.device),
+                    'chunk_target': torch.from_numpy(rng.integers(0, 5, batch_size)).to(nn_model.device),
+                    'quantity_target': torch.from_numpy(rng.integers(0, 5, batch_size)).to(nn_model.device)
+                }
+
+                def infer():
+                    with torch.no_grad():
+                        nn_model._run_forward(x)
+
+                def train():
+                    nn_model.train_step(features, targets, reward=0.5)
+
+                iterations = max(3, rows // batch_size)
+                infer_us = time_per_call(infer, iterations)
+                train_us = time_per_call(train, iterations)
+                results.append({
+                    'mode': mode,
+                    'ran_as': nn_model.compile_mode,
+                    'batch_size': batch_size,
+                    'infer_us': infer_us,
+                    'train_us': train_us,
+                    'train_rows_per_s': batch_size / train_us * 1e6
+                })
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark NNModel compile modes')
+    parser.add_argument('--modes', nargs='+', choices=COMPILE_MODES, default=['eager', 'script', 'trace'],
+                        help='Compile modes to time')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 256, 4096], help='Batch sizes to time')
+    parser.add_argument('--rows', type=int, default=20000, help='Rows per batch size to time')
+    parser.add_argument('--threads', type=int, default=0, help='torch threads (0 = torch default)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    results = run_benchmark(args.modes, args.batch_sizes, args.rows)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'mode':<8} {'ran as':<8} {'batch':>6} {'infer us':>10} {'train us':>10} {'train rows/s':>13}")
+    for r in results:
+        print(f"{r['mode']:<8} {r['ran_as']:<8} {r['batch_size']:6d} {r['infer_us']:10.1f} "
+              f"{r['train_us']:10.1f} {r['train_rows_per_s']:13.0f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+NN inference benchmark.
+
+Times SequentialQueenNN inference through the torch forward (as NNModel
+ran it before the NumPy engine) against NumpySequentialEngine, for single
+observations and batches, and reports the parity error between the two.
+
+Usage:
+    python -m benchmarks.nn_inference [options]
+
+Examples:
+    # Default run
+    python -m benchmarks.nn_inference
+
+    # Larger batches, machine-readable output
+    python -m benchmarks.nn_inference --batch-sizes 1 64 1024 --json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Allow running from the server directory or the repository root
+server_dir = Path(__file__).parent.parent
+if str(server_dir) not in sys.path:
+    sys.path.insert(0, str(server_dir))
+
+import numpy as np
+import torch
+
+from ai_engine.nn_model import SequentialQueenNN
+from ai_engine.numpy_inference import NumpySequentialEngine
+
+
+def torch_predict(model: SequentialQueenNN) -> Callable[[np.ndarray], Dict]:
+    """Torch inference as NNModel.predict runs it (tensor creation, eval, no_grad)."""
+    def predict(features: np.ndarray) -> Dict:
+        x = torch.from_numpy(features.astype(np.float32))
+        model.eval()
+        with torch.no_grad():
+            outputs = model(x)
+        return {key: value.cpu().numpy() for key, value in outputs.items()}
+    return predict
+
+
+def time_per_call(func: Callable, arg, iterations: int) -> float:
+    """Mean wall time per call in microseconds."""
+    func(arg)  # Warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_benchmark(batch_sizes: List[int], iterations: int, seed: int = 0) -> Dict:
+    """Time torch and NumPy inference for each batch size."""
+    torch.manual_seed(seed)
+    torch.set_num_threads(1)
+    model = SequentialQueenNN()
+    engine = NumpySequentialEngine.from_module(model)
+    rng = np.random.default_rng(seed)
+
+    results = []
+    for batch_size in batch_sizes:
+        features = rng.random((batch_size, 29), dtype=np.float32)
+        if batch_size == 1:
+            features = features[0]
+        # Fewer iterations for large batches, whose torch path loops per row
+        count = max(1, iterations // batch_size)
+        torch_us = time_per_call(torch_predict(model), features, count)
+        numpy_us = time_per_call(engine.forward, features, count)
+        results.append({
+            'batch_size': batch_size,
+            'torch_us': torch_us,
+            'numpy_us': numpy_us,
+            'speedup': torch_us / max(numpy_us, 1e-9)
+        })
+
+    probe = rng.random((1024, 29), dtype=np.float32)
+    export_us = time_per_call(lambda m: NumpySequentialEngine.from_module(m), model, 200)
+    return {
+        'results': results,
+        'export_us': export_us,
+        'parity_error': engine.parity_error(model, probe)
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark SequentialQueenNN inference backends')
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 16, 256], help='Batch sizes to time')
+    parser.add_argument('--iterations', type=int, default=2000, help='Rows per batch size to time')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.batch_sizes, args.iterations)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    print(f"{'batch':>6} {'torch us':>10} {'numpy us':>10} {'speedup':>8}")
+    for r in report['results']:
+        print(f"{r['batch_size']:6d} {r['torch_us']:10.1f} {r['numpy_us']:10.1f} {r['speedup']:7.1f}x")
+    print(f"\nWeight export: {report['export_us']:.1f} us, parity error: {report['parity_error']:.2e}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Trace replay load generator.
+
+Replays traces recorded by MessageHandler (WS_TRACE_PATH, see
+websocket/trace_recorder.py) against a running server over /ws
+connections, at the recorded pace (--speed 1), N times faster
+(--speed N) or as fast as possible (--speed max).
+
+Each recorded client becomes one connection. With more --connections
+than recorded clients, client streams are reused in a seeded order;
+reused copies get their own territory ids so they do not share server
+state, and with --stagger each connection starts at a seeded random
+delay. Every sent message gets a unique messageId, which the server
+echoes, so responses are matched to requests for latency.
+
+Reports throughput, response latency percentiles, the error rate (error
+responses by error code), messages that received no response within
+--timeout (some message types are never answered) and connection
+failures.
+
+Usage:
+    python -m benchmarks.replay TRACE [TRACE ...] [options]
+
+Examples:
+    # Record traffic, then replay it at the recorded pace
+    WS_TRACE_PATH=traces/session.jsonl.gz python start_server.py
+    python -m benchmarks.replay traces/session.jsonl.gz
+
+    # 16 connections at 4x speed, staggered over 2 seconds
+    python -m benchmarks.replay traces/session.jsonl.gz --connections 16 --speed 4 --stagger 2
+
+    # Saturate a pipelined server, machine-readable output
+    python -m benchmarks.replay traces/*.jsonl.gz --speed max --pipeline --json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Allow running from the server directory or the repository root
+server_dir = Path(__file__).parent.parent
+if str(server_dir) not in sys.path:
+    sys.path.insert(0, str(server_dir))
+
+import websockets
+
+from websocket.trace_recorder import TraceRecord, read_trace
+
+DEFAULT_URL = 'ws://localhost:8000/ws'
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class ConnectionPlan:
+    """Messages one replay connection sends, with send offsets in seconds"""
+    index: int
+    source_client: str
+    start_delay: float
+    schedule: List[Tuple[float, Dict[str, Any]]] = field(default_factory=list)
+
+
+def load_streams(paths: List[str]) -> Dict[str, List[TraceRecord]]:
+    """Group the records of one or more traces by recorded client, in order."""
+    streams: Dict[str, List[TraceRecord]] = {}
+    for trace_index, path in enumerate(paths):
+        for record in read_trace(path):
+            # Equal client ids in different traces are different clients
+            key = record.client_id if len(paths) == 1 else f'{trace_index}:{record.client_id}'
+            streams.setdefault(key, []).append(record)
+    return streams
+
+
+def _retarget(message: Any, copy_index: int) -> Any:
+    """Give a reused stream's messages their own territory id."""
+    if copy_index == 0 or not isinstance(message, dict):
+        return message
+    data = message.get('data')
+    if isinstance(data, dict) and 'territoryId' in data:
+        message = dict(message)
+        message['data'] = dict(data, territoryId=f"{data['territoryId']}-r{copy_index}")
+    return message
+
+
+def build_plans(
+    streams: Dict[str, List[TraceRecord]],
+    connections: Optional[int] = None,
+    speed: float = 1.0,
+    seed: int = 0,
+    stagger: float = 0.0
+) -> List[ConnectionPlan]:
+    """
+    Plan what each connection sends and when.
+
+    Args:
+        streams: Recorded messages per client (from load_streams)
+        connections: Number of connections (defaults to one per recorded client)
+        speed: Pace multiplier; 0 sends every message immediately
+        seed: Seed for stream reuse order and start delays
+        stagger: Start connections at random delays in [0, stagger) seconds
+
+    Returns:
+        One plan per connection; the same arguments always give the same plans
+    """
+    if not streams:
+        raise ValueError('No recorded messages to replay')
+    rng = random.Random(seed)
+    clients = sorted(streams, key=lambda client: (streams[client][0].offset, client))
+    connections = connections or len(clients)
+
+    order = list(clients)
+    plans = []
+    for index in range(connections):
+        copy_index, position = divmod(index, len(clients))
+        if position == 0 and copy_index > 0:
+            rng.shuffle(order)
+        client = order[position] if copy_index else clients[position]
+        records = streams[client]
+        first = records[0].offset
+
+        plan = ConnectionPlan(index=index, source_client=client,
+                              start_delay=rng.uniform(0, stagger) if stagger > 0 else 0.0)
+        for sequence, record in enumerate(records):
+            message = _retarget(record.message, copy_index)
+            if isinstance(message, dict):
+                message = dict(message, messageId=f'replay-{index}-{sequence}')
+            send_at = (record.offset - first) / speed if speed > 0 else 0.0
+            plan.schedule.append((send_at, message))
+        plans.append(plan)
+    return plans
+
+
+@dataclass
+class ReplayStats:
+    """Counters and latencies gathered across all connections"""
+    sent: int = 0
+    responses: int = 0
+    unanswered: int = 0
+    connection_errors: int = 0
+    send_lag: List[float] = field(default_factory=list)  # Seconds behind schedule when sent
+    latencies: List[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+
+async def replay_connection(url: str, plan: ConnectionPlan, stats: ReplayStats, timeout: float) -> None:
+    """Open one connection, send its schedule and match responses to requests."""
+    pending: Dict[str, float] = {}
+    await asyncio.sleep(plan.start_delay)
+
+    try:
+        async with websockets.connect(url, max_size=None) as ws:
+            async def receive():
+                async for raw in ws:
+                    received = time.perf_counter()
+                    try:
+                        response = json.loads(raw)
+                    except ValueError:
+                        continue
+                    sent_at = pending.pop(response.get('messageId'), None) if isinstance(response, dict) else None
+                    if sent_at is None:
+                        continue  # Pings and unsolicited messages
+                    stats.responses += 1
+                    stats.latencies.append(received - sent_at)
+                    if response.get('type') == 'error':
+                        data = response.get('data') if isinstance(response.get('data'), dict) else {}
+                        stats.errors[data.get('errorCode', 'unknown')] += 1
+
+            receiver = asyncio.create_task(receive())
+            start = time.perf_counter()
+            for send_at, message in plan.schedule:
+                delay = start + send_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                now = time.perf_counter()
+                stats.send_lag.append(max(0.0, now - start - send_at))
+                if isinstance(message, dict):
+                    pending[message['messageId']] = now
+                await ws.send(json.dumps(message))
+                stats.sent += 1
+
+            # Wait for the last responses (some message types are not answered)
+            deadline = time.perf_counter() + timeout
+            while pending and time.perf_counter() < deadline and not receiver.done():
+                await asyncio.sleep(0.01)
+            receiver.cancel()
+            await asyncio.gather(receiver, return_exceptions=True)
+    except (OSError, websockets.WebSocketException) as e:
+        stats.connection_errors += 1
+        print(f'connection {plan.index}: {e}', file=sys.stderr)
+    stats.unanswered += len(pending)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile (0.0 for no values)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+async def run_replay(url: str, plans: List[ConnectionPlan], timeout: float = 5.0) -> Dict[str, Any]:
+    """Replay all plans concurrently and summarize."""
+    stats = ReplayStats()
+    start = time.perf_counter()
+    await asyncio.gather(*(replay_connection(url, plan, stats, timeout) for plan in plans))
+    elapsed = time.perf_counter() - start
+
+    latencies_ms = [latency * 1000 for latency in stats.latencies]
+    return {
+        'connections': len(plans),
+        'duration_s': elapsed,
+        'sent': stats.sent,
+        'responses': stats.responses,
+        'throughput_msg_s': stats.sent / elapsed if elapsed > 0 else 0.0,
+        'response_rate_s': stats.responses / elapsed if elapsed > 0 else 0.0,
+        'latency_ms': {
+            'mean': sum(latencies_ms) / len(latencies_ms) if latencies_ms else 0.0,
+            **{f'p{pct}': percentile(latencies_ms, pct) for pct in PERCENTILES},
+            'max': max(latencies_ms, default=0.0)
+        },
+        'max_send_lag_ms': max(stats.send_lag, default=0.0) * 1000,
+        'error_responses': dict(stats.errors),
+        'unanswered': stats.unanswered,
+        'connection_errors': stats.connection_errors,
+        'error_rate': sum(stats.errors.values()) / stats.sent if stats.sent else 0.0
+    }
+
+
+def parse_speed(value: str) -> float:
+    """Parse a pace multiplier ('max' = as fast as possible)"""
+    if value.lower() == 'max':
+        return 0.0
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError('speed must be positive or "max"')
+    return speed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Replay recorded WebSocket traces against a server')
+    parser.add_argument('traces', nargs='+', help='Trace files recorded with WS_TRACE_PATH')
+    parser.add_argument('--url', default=DEFAULT_URL, help='WebSocket endpoint')
+    parser.add_argument('--connections', type=int, help='Connections (default: one per recorded client)')
+    parser.add_argument('--speed', type=parse_speed, default=1.0, help='Pace multiplier, or "max"')
+    parser.add_argument('--stagger', type=float, default=0.0, help='Spread connection starts over this many seconds')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for stream reuse and start delays')
+    parser.add_argument('--timeout', type=float, default=5.0, help='Seconds to wait for outstanding responses')
+    parser.add_argument('--pipeline', action='store_true', help='Ask the server for pipelined handling')
+    parser.add_argument('--output', type=Path, help='Write the JSON report to a file')
+    parser.add_argument('--json', action='store_true', help='Print the JSON report')
+    args = parser.parse_args()
+
+    url = args.url
+    if args.pipeline:
+        url += ('&' if '?' in url else '?') + 'pipeline=1'
+    plans = build_plans(load_streams(args.traces), args.connections, args.speed, args.seed, args.stagger)
+    report = asyncio.run(run_replay(url, plans, args.timeout))
+    report['config'] = {
+        'url': url,
+        'traces': args.traces,
+        'speed': args.speed or 'max',
+        'seed': args.seed,
+        'stagger': args.stagger
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        latency = report['latency_ms']
+        print(f"{report['connections']} connections, {report['sent']} messages in {report['duration_s']:.2f}s "
+              f"({report['throughput_msg_s']:.0f} msg/s sent, {report['response_rate_s']:.0f} responses/s)")
+        print('latency ms: ' + '  '.join(f"{name} {value:.2f}" for name, value in latency.items()))
+        print(f"max send lag: {report['max_send_lag_ms']:.1f}ms")
+        print(f"errors: {report['error_responses'] or 'none'}, unanswered: {report['unanswered']}, "
+              f"connection errors: {report['connection_errors']}, error rate: {report['error_rate']:.2%}")
+    return 1 if report['connection_errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Hot path benchmark suite with regression checks.
+
+Times every per-observation hot path on seeded game simulator observations
+at several entity counts:
+
+    feature_extractor.extract          FeatureExtractor.extract
+    nn_model.predict                   NNModel.predict
+    nn_model.get_spawn_decision        NNModel.get_spawn_decision
+    nn_model.train_with_reward         NNModel.train_with_reward
+    simulation_gate.evaluate           SimulationGate.evaluate
+    reward_calculator.calculate_reward RewardCalculator.calculate_reward
+    replay_buffer.add                  ExperienceReplayBuffer.add
+    replay_buffer.drain                ExperienceReplayBuffer.drain (per experience)
+    message_handler.handle_message     Full in-process observation_data round trip
+
+Results are keyed "<benchmark>[entities=N]" with the median and minimum
+time per operation over several timed rounds. With --baseline, results are
+compared against a stored baseline and the run fails (exit code 1) when a
+benchmark is slower than the baseline by more than its tolerance. The
+minimum is compared by default, as it is the least affected by other load
+on the machine (--statistic median_us to compare medians).
+Tolerances come from --tolerance-for, then the baseline file's
+"tolerances" (keyed by benchmark name), then --tolerance.
+
+Usage:
+    python -m benchmarks.suite [options]
+
+Examples:
+    # Run and compare against the stored baseline
+    python -m benchmarks.suite --baseline benchmarks/baseline.json
+
+    # Refresh the stored baseline (keeps its tolerances)
+    python -m benchmarks.suite --save-baseline benchmarks/baseline.json
+
+    # Quick run of two benchmarks, machine-readable output
+    python -m benchmarks.suite --only nn_model.predict replay_buffer.add --entities 8 --json
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Allow running from the server directory or the repository root
+server_dir = Path(__file__).parent.parent
+repo_root = server_dir.parent
+for path in (server_dir, repo_root):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import numpy as np
+import torch
+
+from ai_engine.nn_model import NNModel
+from ai_engine.training import Experience, ExperienceReplayBuffer
+from tools.game_simulator import Parasite, SimulationConfig, Simulator, generate_observation
+from websocket.message_handler import MessageHandler
+
+DEFAULT_ENTITIES = [8, 32, 128]
+DEFAULT_TOLERANCE = 0.30  # Allowed slowdown vs baseline (0.30 = 30%)
+DEFAULT_STATISTIC = 'min_us'
+DEFAULT_BASELINE = Path(__file__).parent / 'baseline.json'
+OBSERVATIONS_PER_SET = 64
+GRID_CHUNKS = 256
+
+# Benchmark function: (context, iterations) -> timed seconds for `iterations` operations
+BenchFunc = Callable[[Dict[str, Any], int], float]
+
+
+def generate_observations(entities: int, count: int, seed: int) -> List[Dict[str, Any]]:
+    """
+    Seeded simulator observations with about `entities` workers.
+
+    Protectors and parasites scale with the worker count, and a parasite
+    is spawned at a seeded chunk on every tick the queen can afford it.
+    """
+    rng = random.Random(seed)
+    config = SimulationConfig(
+        mining_spots=rng.sample(range(GRID_CHUNKS), entities),
+        num_workers=entities,
+        num_protectors=max(1, entities // 4),
+        queen_start_energy=100
+    )
+    simulator = Simulator(config)
+    for _ in range(entities // 2):
+        simulator.state.parasites.append(Parasite(
+            chunk=rng.randrange(GRID_CHUNKS),
+            type=rng.choice(('energy', 'combat')),
+            spawn_time=0
+        ))
+
+    observations = []
+    for _ in range(count):
+        simulator.tick()
+        simulator.spawn_parasite(rng.randrange(GRID_CHUNKS), rng.choice(('energy', 'combat')))
+        observations.append(generate_observation(simulator.state))
+    return observations
+
+
+def build_context(entities: int, seed: int, model_dir: str) -> Dict[str, Any]:
+    """Observations, features and server components shared by the benchmarks."""
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+    # Deferred model: the handler's own NNModel would use (and train) the repo model
+    handler = MessageHandler(None, defer_model=True)
+    handler.nn_model = NNModel(model_path=os.path.join(model_dir, f'bench_{entities}.pt'))
+    handler.replay_buffer = ExperienceReplayBuffer(capacity=1_000_000)
+    handler.attach_model_components()
+    handler.nn_model.warm_up()
+
+    observations = generate_observations(entities, OBSERVATIONS_PER_SET, seed)
+    features = [handler.feature_extractor.extract(observation) for observation in observations]
+    decisions = [handler.nn_model.get_spawn_decision(f, explore=False) for f in features]
+    return {
+        'handler': handler,
+        'observations': observations,
+        'features': features,
+        'decisions': decisions,
+        'sim_observations': [handler.observation_handler._build_simulation_observation(o) for o in observations]
+    }
+
+
+def _cycle(items: List[Any], iterations: int) -> List[Any]:
+    return [items[i % len(items)] for i in range(iterations)]
+
+
+def _timed_loop(func: Callable[[Any], Any], args: List[Any]) -> float:
+    start = time.perf_counter()
+    for arg in args:
+        func(arg)
+    return time.perf_counter() - start
+
+
+def bench_extract(ctx: Dict[str, Any], iterations: int) -> float:
+    return _timed_loop(ctx['handler'].feature_extractor.extract, _cycle(ctx['observations'], iterations))
+
+
+def bench_predict(ctx: Dict[str, Any], iterations: int) -> float:
+    return _timed_loop(ctx['handler'].nn_model.predict, _cycle(ctx['features'], iterations))
+
+
+def bench_spawn_decision(ctx: Dict[str, Any], iterations: int) -> float:
+    return _timed_loop(ctx['handler'].nn_model.get_spawn_decision, _cycle(ctx['features'], iterations))
+
+
+def bench_train(ctx: Dict[str, Any], iterations: int) -> float:
+    model = ctx['handler'].nn_model
+    samples = _cycle(list(zip(ctx['features'], ctx['decisions'])), iterations)
+    start = time.perf_counter()
+    for i, (features, decision) in enumerate(samples):
+        model.train_with_reward(features, decision['spawnChunk'], decision['spawnType'],
+                                reward=0.5 if i % 2 else -0.5, learning_rate=0.001)
+    return time.perf_counter() - start
+
+
+def bench_gate(ctx: Dict[str, Any], iterations: int) -> float:
+    gate = ctx['handler'].simulation_gate
+    samples = _cycle(list(zip(ctx['sim_observations'], ctx['decisions'])), iterations)
+    start = time.perf_counter()
+    for sim_observation, decision in samples:
+        gate.evaluate(sim_observation, decision['spawnChunk'], decision['spawnType'], decision['confidence'])
+    return time.perf_counter() - start
+
+
+def bench_reward(ctx: Dict[str, Any], iterations: int) -> float:
+    calculator = ctx['handler'].reward_calculator
+    observations = ctx['observations']
+    pairs = _cycle(list(zip(observations[:-1], observations[1:], ctx['decisions'])), iterations)
+    start = time.perf_counter()
+    for prev_observation, observation, decision in pairs:
+        calculator.calculate_reward(prev_observation, observation, decision)
+    return time.perf_counter() - start
+
+
+def _experiences(ctx: Dict[str, Any], iterations: int) -> List[Experience]:
+    samples = _cycle(list(zip(ctx['features'], ctx['decisions'])), iterations)
+    return [
+        Experience(
+            observation=features, spawn_chunk=decision['spawnChunk'], spawn_type=decision['spawnType'],
+            nn_confidence=decision['confidence'], gate_signal=0.1, R_expected=0.7, was_executed=True,
+            actual_reward=0.5, territory_id='bench'
+        )
+        for features, decision in samples
+    ]
+
+
+def bench_buffer_add(ctx: Dict[str, Any], iterations: int) -> float:
+    buffer = ExperienceReplayBuffer(capacity=max(iterations, 1))
+    elapsed = _timed_loop(buffer.add, _experiences(ctx, iterations))
+    buffer.drain()
+    return elapsed
+
+
+def bench_buffer_drain(ctx: Dict[str, Any], iterations: int) -> float:
+    buffer = ExperienceReplayBuffer(capacity=max(iterations, 1))
+    for experience in _experiences(ctx, iterations):
+        buffer.add(experience)
+    start = time.perf_counter()
+    buffer.drain()
+    return time.perf_counter() - start
+
+
+def bench_handle_message(ctx: Dict[str, Any], iterations: int) -> float:
+    handler = ctx['handler']
+    messages = [
+        {'type': 'observation_data', 'timestamp': observation['timestamp'], 'data': observation}
+        for observation in _cycle(ctx['observations'], iterations)
+    ]
+
+    async def run() -> float:
+        start = time.perf_counter()
+        for message in messages:
+            await handler.handle_message(message, 'bench_client')
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(run())
+    handler.replay_buffer.drain()
+    return elapsed
+
+
+BENCHMARKS: Dict[str, BenchFunc] = {
+    'feature_extractor.extract': bench_extract,
+    'nn_model.predict': bench_predict,
+    'nn_model.get_spawn_decision': bench_spawn_decision,
+    'nn_model.train_with_reward': bench_train,
+    'simulation_gate.evaluate': bench_gate,
+    'reward_calculator.calculate_reward': bench_reward,
+    'replay_buffer.add': bench_buffer_add,
+    'replay_buffer.drain': bench_buffer_drain,
+    'message_handler.handle_message': bench_handle_message,
+}
+
+
+def measure(func: BenchFunc, ctx: Dict[str, Any], rounds: int, round_time: float) -> Dict[str, Any]:
+    """Calibrate iterations to about `round_time` seconds, then time `rounds` rounds."""
+    func(ctx, 2)  # Warm-up
+    probe = max(func(ctx, 8) / 8, 1e-7)
+    iterations = max(8, min(100_000, int(round_time / probe)))
+
+    per_op_us = [func(ctx, iterations) / iterations * 1e6 for _ in range(rounds)]
+    median_us = statistics.median(per_op_us)
+    return {
+        'median_us': median_us,
+        'min_us': min(per_op_us),
+        'max_us': max(per_op_us),
+        'ops_per_s': 1e6 / median_us if median_us > 0 else 0.0,
+        'iterations': iterations,
+        'rounds': rounds
+    }
+
+
+def run_suite(entity_counts: List[int], names: List[str], rounds: int, round_time: float,
+              seed: int = 0) -> Dict[str, Any]:
+    """Run the selected benchmarks at each entity count."""
+    results = {}
+    with tempfile.TemporaryDirectory() as model_dir:
+        for entities in entity_counts:
+            ctx = build_context(entities, seed, model_dir)
+            for name in names:
+                results[f'{name}[entities={entities}]'] = measure(BENCHMARKS[name], ctx, rounds, round_time)
+
+    return {
+        'meta': {
+            'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'torch': torch.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine(),
+            'processor': platform.processor() or platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'torch_threads': torch.get_num_threads(),
+            'seed': seed,
+            'rounds': rounds
+        },
+        'results': results
+    }
+
+
+def benchmark_name(key: str) -> str:
+    """Benchmark name of a result key ('nn_model.predict[entities=8]' -> 'nn_model.predict')"""
+    return key.split('[', 1)[0]
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], default_tolerance: float,
+            overrides: Optional[Dict[str, float]] = None,
+            statistic: str = DEFAULT_STATISTIC) -> List[Dict[str, Any]]:
+    """
+    Compare results with a baseline on one statistic (min_us or median_us).
+
+    Returns:
+        One row per result key present in both, with ratio, tolerance and status
+        ('regression', 'improved' or 'ok')
+    """
+    tolerances = {**baseline.get('tolerances', {}), **(overrides or {})}
+    rows = []
+    for key, result in report['results'].items():
+        reference = baseline.get('results', {}).get(key)
+        if reference is None:
+            continue
+        tolerance = tolerances.get(key, tolerances.get(benchmark_name(key), default_tolerance))
+        ratio = result[statistic] / max(reference[statistic], 1e-9)
+        if ratio > 1.0 + tolerance:
+            status = 'regression'
+        elif ratio < 1.0 / (1.0 + tolerance):
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append({
+            'key': key,
+            'baseline_us': reference[statistic],
+            'current_us': result[statistic],
+            'ratio': ratio,
+            'tolerance': tolerance,
+            'status': status
+        })
+    return rows
+
+
+def parse_overrides(values: List[str]) -> Dict[str, float]:
+    """Parse NAME=TOLERANCE pairs (NAME may be a full result key, which contains '=')"""
+    overrides = {}
+    for value in values:
+        name, _, tolerance = value.rpartition('=')
+        if not name or not tolerance:
+            raise argparse.ArgumentTypeError(f'Expected NAME=TOLERANCE, got {value!r}')
+        overrides[name] = float(tolerance)
+    return overrides
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark server hot paths and check for regressions')
+    parser.add_argument('--entities', type=int, nargs='+', default=DEFAULT_ENTITIES,
+                        help='Simulator entity (worker) counts')
+    parser.add_argument('--only', nargs='+', choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help='Benchmarks to run')
+    parser.add_argument('--rounds', type=int, default=5, help='Timed rounds per benchmark')
+    parser.add_argument('--round-time', type=float, default=0.1, help='Target seconds per round')
+    parser.add_argument('--seed', type=int, default=0, help='Observation and model seed')
+    parser.add_argument('--threads', type=int, default=1, help='torch threads (0 = torch default)')
+    parser.add_argument('--baseline', type=Path, help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='Default allowed slowdown (0.3 = 30%%)')
+    parser.add_argument('--statistic', choices=('min_us', 'median_us'), default=DEFAULT_STATISTIC,
+                        help='Per-operation time compared with the baseline')
+    parser.add_argument('--tolerance-for', nargs='+', default=[], metavar='NAME=TOLERANCE',
+                        help='Per-benchmark tolerance (benchmark name or full result key)')
+    parser.add_argument('--save-baseline', type=Path, help='Write results as a baseline (keeps its tolerances)')
+    parser.add_argument('--output', type=Path, help='Write the JSON report to a file')
+    parser.add_argument('--json', action='store_true', help='Print the JSON report')
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)  # Handler INFO logging would dominate the round trip
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    report = run_suite(args.entities, args.only, args.rounds, args.round_time, args.seed)
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        rows = compare(report, baseline, args.tolerance, parse_overrides(args.tolerance_for), args.statistic)
+        report['comparison'] = {'baseline': str(args.baseline), 'statistic': args.statistic, 'rows': rows}
+        if any(row['status'] == 'regression' for row in rows):
+            exit_code = 1
+
+    if args.save_baseline:
+        tolerances = {}
+        if args.save_baseline.exists():
+            with open(args.save_baseline) as f:
+                tolerances = json.load(f).get('tolerances', {})
+        with open(args.save_baseline, 'w') as f:
+            json.dump({**report, 'tolerances': tolerances}, f, indent=2)
+            f.write('\n')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return exit_code
+
+    print(f"{'benchmark':<52} {'median us':>11} {'min us':>10} {'ops/s':>11}")
+    for key, result in report['results'].items():
+        print(f"{key:<52} {result['median_us']:11.1f} {result['min_us']:10.1f} {result['ops_per_s']:11.0f}")
+
+    if 'comparison' in report:
+        print(f"\nAgainst {args.baseline} ({args.statistic}):")
+        print(f"{'benchmark':<52} {'baseline us':>11} {'current us':>11} {'ratio':>7} {'allowed':>8}  status")
+        for row in report['comparison']['rows']:
+            print(f"{row['key']:<52} {row['baseline_us']:11.1f} {row['current_us']:11.1f} {row['ratio']:7.2f} "
+                  f"{1.0 + row['tolerance']:7.2f}x  {row['status']}")
+        regressions = sum(row['status'] == 'regression' for row in report['comparison']['rows'])
+        print(f"\n{regressions} regression(s)")
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
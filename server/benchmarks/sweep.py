@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Parallel hyperparameter sweep over simulator, gate, reward and training configs.
+
+Each trial runs the game simulator against an in-process MessageHandler (the
+observation -> gate -> spawn -> reward -> replay buffer pipeline the server
+runs) and trains the model whenever the buffer holds min_batch_size
+experiences, as the background trainer does. Trials run in a process pool,
+each with its own config overrides, seed and model file, and the sweep
+reports one row per trial: final reward, loss curve and throughput.
+
+Overrides are SECTION.FIELD=VALUE, where SECTION is one of:
+
+    training   ContinuousTrainingConfig (base: --training-config)
+    gate       SimulationGateConfig     (base: --gate-config)
+    reward     RewardConfig             (defaults)
+    simulator  SimulationConfig         (base: --simulator-config)
+
+A spec file (YAML or JSON) may give the grid, explicit override sets and
+seeds; every explicit set is crossed with the grid and every seed:
+
+    ticks: 2000
+    seeds: [0, 1, 2]
+    grid:
+      training.learning_rate: [0.001, 0.0003]
+      training.min_batch_size: [16, 32, 64]
+    trials:
+      - {}
+      - {gate.survival_weight: 0.5, gate.disruption_weight: 0.4, gate.location_weight: 0.1}
+
+Usage:
+    python -m benchmarks.sweep [--spec FILE] [--param KEY=V1,V2 ...] [options]
+
+Examples:
+    # Learning rate x min_batch_size, two seeds each, on all cores
+    python -m benchmarks.sweep --param training.learning_rate=0.001,0.0003 \\
+        --param training.min_batch_size=16,32,64 --seeds 0 1 --ticks 2000
+
+    # Sweep from a spec file, keep every trial's model and write the results
+    python -m benchmarks.sweep --spec sweep.yaml --output-dir sweeps/run1 --output sweeps/run1/results.json
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import itertools
+import json
+import logging
+import math
+import multiprocessing
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Allow running from the server directory or the repository root
+server_dir = Path(__file__).resolve().parent.parent
+repo_root = server_dir.parent
+for path in (server_dir, repo_root):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+CONFIG_DIR = server_dir / 'ai_engine' / 'configs'
+DEFAULT_TRAINING_CONFIG = CONFIG_DIR / 'continuous_training_sim.yaml'
+DEFAULT_GATE_CONFIG = CONFIG_DIR / 'simulation_gate.yaml'
+DEFAULT_SIMULATOR_CONFIG = CONFIG_DIR / 'game_simulator.yaml'
+SECTIONS = ('training', 'gate', 'reward', 'simulator')
+DEFAULT_TICKS = 1000
+DEFAULT_FINAL_FRACTION = 0.2  # Share of training steps averaged into final_reward
+CLIENT_ID = 'sweep'
+
+
+def parse_param(value: str) -> Dict[str, List[Any]]:
+    """
+    Parse a KEY=V1,V2,... grid parameter (values are YAML scalars or lists).
+
+    Raises:
+        argparse.ArgumentTypeError: If the value is not KEY=VALUES
+    """
+    key, _, values = value.partition('=')
+    if not key or not values:
+        raise argparse.ArgumentTypeError(f'Expected SECTION.FIELD=V1,V2,..., got {value!r}')
+    return {key.strip(): [_number(item) for item in yaml.safe_load(f'[{values}]')]}
+
+
+def _number(value: Any) -> Any:
+    """YAML 1.1 reads exponents without a dot (3e-4) as strings."""
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    return value
+
+
+def expand_trials(grid: Dict[str, List[Any]], override_sets: Optional[List[Dict[str, Any]]],
+                  seeds: List[int]) -> List[Dict[str, Any]]:
+    """
+    Cross every explicit override set with the grid and the seeds.
+
+    Returns:
+        Trials as {'trial': index, 'seed': seed, 'overrides': {key: value}}
+    """
+    keys = list(grid)
+    grid_points = [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+    trials = []
+    for base in override_sets or [{}]:
+        for point in grid_points:
+            for seed in seeds:
+                trials.append({'trial': len(trials), 'seed': seed, 'overrides': {**base, **point}})
+    return trials
+
+
+def apply_overrides(config: Any, overrides: Dict[str, Any]) -> Any:
+    """
+    Copy of a config dataclass with fields replaced.
+
+    Raises:
+        ValueError: If a field does not exist on the config
+    """
+    names = {field.name for field in dataclasses.fields(config)}
+    unknown = sorted(set(overrides) - names)
+    if unknown:
+        raise ValueError(f'Unknown {type(config).__name__} field(s): {", ".join(unknown)}')
+    return dataclasses.replace(config, **overrides)
+
+
+def build_configs(overrides: Dict[str, Any], training_config: Path = DEFAULT_TRAINING_CONFIG,
+                  gate_config: Path = DEFAULT_GATE_CONFIG,
+                  simulator_config: Path = DEFAULT_SIMULATOR_CONFIG) -> Dict[str, Any]:
+    """
+    Base configs with a trial's SECTION.FIELD overrides applied and validated.
+
+    Raises:
+        ValueError: If a key has no known section, a field is unknown or a
+            resulting config is invalid
+    """
+    from ai_engine.decision_gate import SimulationGateConfig
+    from ai_engine.reward_calculator import RewardConfig
+    from ai_engine.training import ContinuousTrainingConfig
+    from tools.game_simulator import SimulationConfig
+
+    by_section: Dict[str, Dict[str, Any]] = {section: {} for section in SECTIONS}
+    for key, value in overrides.items():
+        section, _, name = key.partition('.')
+        if section not in by_section or not name:
+            raise ValueError(f'Override {key!r} is not SECTION.FIELD with SECTION one of {", ".join(SECTIONS)}')
+        by_section[section][name] = value
+
+    # batch_size is unused by the drain() trainer but validated against min_batch_size
+    training_overrides = by_section['training']
+    training = ContinuousTrainingConfig.from_yaml(Path(training_config))
+    if 'batch_size' not in training_overrides:
+        training_overrides['batch_size'] = max(training.batch_size, training_overrides.get('min_batch_size', 0))
+
+    configs = {
+        'training': apply_overrides(training, training_overrides),
+        'gate': apply_overrides(SimulationGateConfig.from_yaml(str(gate_config)), by_section['gate']),
+        'reward': apply_overrides(RewardConfig(), by_section['reward']),
+        'simulator': apply_overrides(SimulationConfig.from_yaml(str(simulator_config)), by_section['simulator']),
+    }
+    if not configs['training'].validate():
+        raise ValueError('Invalid training config (see log)')
+    if not configs['gate'].validate():
+        raise ValueError('Invalid gate config (see log)')
+    configs['simulator'].validate()
+    return configs
+
+
+def run_trial(trial: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run one trial; failures are reported in the result rather than raised.
+
+    Args:
+        trial: Trial from expand_trials plus 'ticks', 'model_path', 'threads',
+            'final_fraction' and optional base config paths
+
+    Returns:
+        Result row: status, reward and loss curves, final reward and throughput
+    """
+    result = {
+        'trial': trial['trial'],
+        'seed': trial['seed'],
+        'overrides': trial['overrides'],
+        'model_path': trial['model_path'],
+    }
+    try:
+        result.update(asyncio.run(_run_trial(trial)))
+        result['status'] = 'ok'
+    except Exception as e:
+        logger.error(f"Trial {trial['trial']} failed: {e}")
+        result.update({'status': 'failed', 'error': f'{type(e).__name__}: {e}'})
+    return result
+
+
+async def _run_trial(trial: Dict[str, Any]) -> Dict[str, Any]:
+    import numpy as np
+    import torch
+
+    from ai_engine.decision_gate import SimulationGate
+    from ai_engine.nn_model import NNModel
+    from ai_engine.reward_calculator import RewardCalculator
+    from ai_engine.training import ExperienceReplayBuffer
+    from ai_engine.training.trainer import ContinuousTrainer
+    from tools.game_simulator import Simulator, generate_observation
+    from websocket.message_handler import MessageHandler
+
+    configs = build_configs(
+        trial['overrides'],
+        trial.get('training_config', DEFAULT_TRAINING_CONFIG),
+        trial.get('gate_config', DEFAULT_GATE_CONFIG),
+        trial.get('simulator_config', DEFAULT_SIMULATOR_CONFIG)
+    )
+    training_config = configs['training']
+    sim_config = configs['simulator']
+
+    if trial.get('threads'):
+        torch.set_num_threads(trial['threads'])
+    random.seed(trial['seed'])
+    np.random.seed(trial['seed'])
+    torch.manual_seed(trial['seed'])
+
+    # '' disables trace recording even when WS_TRACE_PATH is set
+    handler = MessageHandler(None, defer_model=True, trace_path='')
+    handler.reward_calculator = handler.observation_handler.reward_calculator = RewardCalculator(configs['reward'])
+    gate = SimulationGate(configs['gate'])
+    handler.simulation_gate = handler.observation_handler.simulation_gate = handler.gate_handler.simulation_gate = gate
+    handler.nn_model = NNModel(model_path=trial['model_path'])
+    handler.replay_buffer = ExperienceReplayBuffer(
+        capacity=training_config.buffer_capacity,
+        lock_timeout=training_config.lock_timeout
+    )
+    # Trained in this loop, not on the trainer thread, so trials are reproducible
+    trainer = ContinuousTrainer(handler.nn_model, handler.replay_buffer, training_config)
+    handler.background_trainer = trainer
+    handler.attach_model_components()
+
+    simulator = Simulator(sim_config)
+    max_chunk = sim_config.grid_size * sim_config.grid_size - 1
+    losses: List[float] = []
+    rewards: List[float] = []
+    samples: List[int] = []
+    spawns = failed_spawns = 0
+    train_seconds = 0.0
+
+    start = time.perf_counter()
+    for _ in range(trial['ticks']):
+        simulator.tick()
+        response = await handler.handle_message({
+            'type': 'observation_data',
+            'timestamp': time.time(),
+            'data': generate_observation(simulator.state)
+        }, CLIENT_ID)
+
+        # Same spawn handling as SimulationRunner
+        data = (response or {}).get('data') or {}
+        chunk, spawn_type = data.get('spawnChunk'), data.get('spawnType')
+        if response and response.get('type') == 'spawn_decision' and chunk is not None and chunk >= 0 and spawn_type:
+            spawns += 1
+            if not (chunk <= max_chunk and spawn_type in ('energy', 'combat')
+                    and simulator.spawn_parasite(chunk, spawn_type)):
+                failed_spawns += 1
+                await handler.handle_message({
+                    'type': 'spawn_result',
+                    'success': False,
+                    'spawnChunk': chunk,
+                    'spawnType': spawn_type,
+                    'reason': 'insufficient_energy',
+                    'tick': simulator.state.tick
+                }, CLIENT_ID)
+
+        if len(handler.replay_buffer) >= training_config.min_batch_size:
+            step_start = time.perf_counter()
+            step = trainer.train_step()
+            train_seconds += time.perf_counter() - step_start
+            if step is not None:
+                losses.append(step['loss'])
+                rewards.append(step['avg_reward'])
+                samples.append(step['batch_size'])
+    elapsed = time.perf_counter() - start
+
+    # Writes the final weights to model_path after any pending checkpoint
+    trainer.close()
+
+    return {
+        'ticks': trial['ticks'],
+        'elapsed_s': elapsed,
+        'ticks_per_s': trial['ticks'] / elapsed if elapsed > 0 else 0.0,
+        'train_seconds': train_seconds,
+        'samples_per_s': sum(samples) / train_seconds if train_seconds > 0 else 0.0,
+        'spawns': spawns,
+        'failed_spawns': failed_spawns,
+        'train_steps': len(losses),
+        'samples_trained': sum(samples),
+        'model_version': trainer.model_version,
+        'final_reward': _weighted_tail_mean(rewards, samples, trial.get('final_fraction', DEFAULT_FINAL_FRACTION)),
+        'mean_reward': _weighted_tail_mean(rewards, samples, 1.0),
+        'final_loss': losses[-1] if losses else None,
+        'loss_curve': losses,
+        'reward_curve': rewards,
+        'batch_sizes': samples,
+    }
+
+
+def _weighted_tail_mean(values: List[float], weights: List[int], fraction: float) -> Optional[float]:
+    """Weighted mean over the last `fraction` of values (at least one), None when empty."""
+    if not values:
+        return None
+    tail = max(1, math.ceil(len(values) * fraction))
+    total = sum(weights[-tail:])
+    return sum(v * w for v, w in zip(values[-tail:], weights[-tail:])) / total if total else None
+
+
+def run_sweep(trials: List[Dict[str, Any]], workers: int) -> List[Dict[str, Any]]:
+    """
+    Run trials in a process pool (in this process when workers <= 1).
+
+    Returns:
+        Results in trial order
+    """
+    results = []
+    if workers <= 1 or len(trials) == 1:
+        for trial in trials:
+            results.append(run_trial(trial))
+            _log_progress(results[-1], len(results), len(trials))
+    else:
+        # spawn: forked workers would inherit torch's thread pools and locks
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=min(workers, len(trials)), mp_context=context) as pool:
+            futures = [pool.submit(run_trial, trial) for trial in trials]
+            for future in as_completed(futures):
+                results.append(future.result())
+                _log_progress(results[-1], len(results), len(trials))
+    return sorted(results, key=lambda result: result['trial'])
+
+
+def _log_progress(result: Dict[str, Any], done: int, total: int) -> None:
+    if result['status'] == 'ok':
+        logger.warning(f"[{done}/{total}] trial {result['trial']}: final_reward={_fmt(result['final_reward'])}, "
+                       f"{result['ticks_per_s']:.0f} ticks/s")
+    else:
+        logger.warning(f"[{done}/{total}] trial {result['trial']} failed: {result['error']}")
+
+
+def _fmt(value: Optional[float], spec: str = '.4f') -> str:
+    return '-' if value is None else format(value, spec)
+
+
+def load_spec(path: Path) -> Dict[str, Any]:
+    """Load a YAML or JSON sweep spec (JSON is valid YAML)."""
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Sweep simulator, gate, reward and training configs in parallel')
+    parser.add_argument('--spec', type=Path, help='YAML/JSON spec with grid, trials, seeds and ticks')
+    parser.add_argument('--param', type=parse_param, action='append', default=[], metavar='KEY=V1,V2',
+                        help='Grid values for SECTION.FIELD (repeatable; adds to the spec grid)')
+    parser.add_argument('--seeds', type=int, nargs='+', help='Seeds per grid point (default: spec seeds or 0)')
+    parser.add_argument('--ticks', type=int, help=f'Simulator ticks per trial (default: spec ticks or {DEFAULT_TICKS})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Trial processes')
+    parser.add_argument('--threads', type=int, default=1, help='torch threads per trial (0 = torch default)')
+    parser.add_argument('--final-fraction', type=float, default=DEFAULT_FINAL_FRACTION,
+                        help='Share of the last training steps averaged into final_reward')
+    parser.add_argument('--training-config', type=Path, default=DEFAULT_TRAINING_CONFIG,
+                        help='Base continuous training config')
+    parser.add_argument('--gate-config', type=Path, default=DEFAULT_GATE_CONFIG, help='Base simulation gate config')
+    parser.add_argument('--simulator-config', type=Path, default=DEFAULT_SIMULATOR_CONFIG,
+                        help='Base game simulator config')
+    parser.add_argument('--output-dir', type=Path, help='Keep trial models here (default: discarded temp dir)')
+    parser.add_argument('--output', type=Path, help='Write the JSON report to a file')
+    parser.add_argument('--json', action='store_true', help='Print the JSON report')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s: %(message)s')
+
+    spec = load_spec(args.spec) if args.spec else {}
+    grid = {key: [_number(value) for value in values] for key, values in (spec.get('grid') or {}).items()}
+    for param in args.param:
+        grid.update(param)
+    seeds = args.seeds or spec.get('seeds') or [0]
+    ticks = args.ticks or spec.get('ticks') or DEFAULT_TICKS
+    trials = expand_trials(grid, spec.get('trials'), seeds)
+
+    output_dir = args.output_dir or Path(tempfile.mkdtemp(prefix='sweep_'))
+    for trial in trials:
+        trial.update({
+            'ticks': ticks,
+            'threads': args.threads,
+            'final_fraction': args.final_fraction,
+            'model_path': str(output_dir / f"trial_{trial['trial']:03d}" / 'queen.pt'),
+            'training_config': str(args.training_config),
+            'gate_config': str(args.gate_config),
+            'simulator_config': str(args.simulator_config),
+        })
+    logger.warning(f'Running {len(trials)} trials of {ticks} ticks on {min(args.workers, len(trials))} workers')
+
+    start = time.perf_counter()
+    try:
+        results = run_sweep(trials, args.workers)
+    finally:
+        if args.output_dir is None:
+            shutil.rmtree(output_dir, ignore_errors=True)
+    report = {
+        'system': {
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'workers': args.workers,
+            'threads_per_trial': args.threads,
+            'elapsed_s': time.perf_counter() - start,
+        },
+        'sweep': {'grid': grid, 'trials': spec.get('trials'), 'seeds': seeds, 'ticks': ticks},
+        'results': results,
+    }
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        ranked = sorted(results, key=lambda r: (r.get('final_reward') is None, -(r.get('final_reward') or 0.0)))
+        print(f"{'trial':>5} {'seed':>5} {'final rwd':>10} {'mean rwd':>9} {'loss first->last':>19} "
+              f"{'steps':>6} {'ticks/s':>8} {'samples/s':>10}  overrides")
+        for r in ranked:
+            overrides = ' '.join(f'{k}={v}' for k, v in r['overrides'].items()) or '(base)'
+            if r['status'] != 'ok':
+                print(f"{r['trial']:>5} {r['seed']:>5} {'FAILED':>10}  {overrides}: {r['error']}")
+                continue
+            curve = r['loss_curve']
+            loss = f"{_fmt(curve[0] if curve else None)}->{_fmt(r['final_loss'])}"
+            print(f"{r['trial']:>5} {r['seed']:>5} {_fmt(r['final_reward']):>10} {_fmt(r['mean_reward']):>9} "
+                  f"{loss:>19} {r['train_steps']:>6} {r['ticks_per_s']:>8.0f} {r['samples_per_s']:>10.0f}  {overrides}")
+
+    return 1 if any(r['status'] != 'ok' for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
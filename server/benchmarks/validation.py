@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Message validation benchmark.
+
+Times per-message validation cost for every WebSocket message type and for
+the DataValidator schemas: one-shot jsonschema.validate (schema checked and
+a validator built on every call) against the precompiled validators, plus
+the structural check used for verified clients.
+
+Usage:
+    python -m benchmarks.validation [options]
+
+Examples:
+    # Default run
+    python -m benchmarks.validation
+
+    # More iterations per message type, machine-readable output
+    python -m benchmarks.validation --iterations 5000 --json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+# Allow running from the server directory or the repository root
+server_dir = Path(__file__).parent.parent
+if str(server_dir) not in sys.path:
+    sys.path.insert(0, str(server_dir))
+
+from jsonschema import validate
+
+from ai_engine.data_validator import DataValidator
+from websocket.schemas import MESSAGE_SCHEMAS, STRUCTURAL_CHECKS, validate_message
+
+
+def sample_messages() -> Dict[str, Dict]:
+    """Representative valid message for each WebSocket message type."""
+    observation = {
+        "timestamp": 1000.0,
+        "miningWorkers": [{"x": i * 3.0, "z": i * 2.0, "chunkId": i} for i in range(12)],
+        "protectors": [{"x": i * 5.0, "z": i * 1.5, "chunkId": 40 + i} for i in range(6)],
+        "parasitesStart": [{"x": 1.0, "z": 1.0, "type": "energy"}] * 8,
+        "parasitesEnd": [{"x": 2.0, "z": 2.0, "type": "energy"}] * 8,
+        "queenEnergy": {"current": 60, "max": 100},
+        "playerEnergy": {"start": 400, "end": 380},
+        "territoryId": "territory_1"
+    }
+    messages = {
+        "queen_death": {"data": {
+            "queenId": "queen_1", "territoryId": "territory_1", "generation": 3,
+            "deathLocation": {"x": 10.0, "y": 0.0, "z": -20.0}, "deathCause": "protector_assault",
+            "survivalTime": 240.0, "parasitesSpawned": 12, "hiveDiscoveryTime": 90.0,
+            "playerUnits": {"protectors": [], "workers": []}, "assaultPattern": {}, "gameState": {}
+        }},
+        "queen_success": {"data": {"queenId": "queen_1", "generation": 3, "survivalTime": 600.0}},
+        "game_outcome": {"data": {"player_won": False, "survival_time": 600.0, "queens_killed": 1}},
+        "observation_data": {"timestamp": 1000.0, "data": observation},
+        "learning_progress_request": {"data": {"queenId": "queen_1"}},
+        "reconnect": {"data": {"clientId": "client_1"}},
+        "reset_nn": {"data": {"confirm": True}},
+        "spawn_result": {"success": True, "spawnChunk": 12, "spawnType": "energy"},
+    }
+    result = {}
+    for message_type in MESSAGE_SCHEMAS:
+        message = {"type": message_type, "timestamp": 1000.0}
+        message.update(messages.get(message_type, {}))
+        result[message_type] = message
+    return result
+
+
+def sample_records() -> Dict[str, Dict]:
+    """Representative valid record for each DataValidator schema."""
+    return {
+        "queen_death": {
+            "queen_id": "queen_1", "territory_id": "territory_1", "generation": 3,
+            "death_location": {"x": 10.0, "y": 0.0, "z": -20.0}, "death_cause": "protector_assault",
+            "survival_time": 240.0, "parasites_spawned": 12, "hive_discovery_time": 90.0,
+            "player_units": {"protectors": [], "workers": []}, "assault_pattern": {}, "game_state": {}
+        },
+        "training_data": {
+            "generation": 3, "reward_signal": 0.4,
+            "game_state_features": [0.5] * 20, "player_pattern_features": [0.5] * 15,
+            "death_analysis_features": [0.5] * 10, "generation_features": [0.5] * 5,
+            "strategy_labels": [1, 4, 7]
+        },
+        "strategy": {
+            "generation": 3, "complexity_level": 0.4,
+            "hive_placement": {"strategy": "avoid_failures", "parameters": {}},
+            "parasite_spawning": {"strategy": "burst", "parameters": {}},
+            "defensive_coordination": {"strategy": "swarm", "parameters": {}}
+        },
+        "memory_data": {
+            "generation": 3, "timestamp": 1000.0, "data_type": "strategy", "data": {},
+            "checksum": "0" * 64
+        }
+    }
+
+
+def time_per_call(func: Callable, arg, iterations: int) -> float:
+    """Mean wall time per call in microseconds."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(arg)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def run_benchmark(iterations: int) -> List[Dict]:
+    """Time legacy and compiled validation for each message and record type."""
+    results = []
+
+    for message_type, message in sample_messages().items():
+        schema = MESSAGE_SCHEMAS[message_type]
+        assert validate_message(message) == (True, None), message_type
+        result = {
+            'kind': 'message',
+            'type': message_type,
+            'legacy_us': time_per_call(lambda m: validate(instance=m, schema=schema), message, iterations),
+            'compiled_us': time_per_call(validate_message, message, iterations)
+        }
+        if message_type in STRUCTURAL_CHECKS:
+            result['structural_us'] = time_per_call(
+                lambda m: validate_message(m, structural_only=True), message, iterations
+            )
+        results.append(result)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        validator = DataValidator(backup_directory=temp_dir)
+        for data_type, record in sample_records().items():
+            schema = validator.validation_schemas[data_type]
+            assert validator.validate_data(record, data_type) == (True, None), data_type
+            results.append({
+                'kind': 'data',
+                'type': data_type,
+                'legacy_us': time_per_call(lambda r: validate(instance=r, schema=schema), record, iterations),
+                'compiled_us': time_per_call(lambda r: validator.validate_data(r, data_type), record, iterations)
+            })
+
+    for result in results:
+        result['speedup'] = result['legacy_us'] / max(result['compiled_us'], 1e-9)
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark message and data validation')
+    parser.add_argument('--iterations', type=int, default=1000, help='Validations per message type')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.iterations)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{'kind':<8} {'type':<36} {'legacy us':>10} {'compiled us':>12} {'structural us':>14} {'speedup':>8}")
+    for r in results:
+        structural = f"{r['structural_us']:14.1f}" if 'structural_us' in r else f"{'-':>14}"
+        print(f"{r['kind']:<8} {r['type']:<36} {r['legacy_us']:10.1f} {r['compiled_us']:12.1f} "
+              f"{structural} {r['speedup']:7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
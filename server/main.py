@@ -13,15 +13,18 @@ from typing import Dict, Any
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 
 from ai_engine.ai_engine import AIEngine
 from ai_engine.decision_gate.dashboard_metrics import get_dashboard_metrics
-from websocket.connection_manager import ConnectionManager
+from ai_engine.latency_metrics import get_latency_metrics
+from websocket.connection_manager import BackpressurePolicy, ConnectionManager
 from websocket.message_handler import MessageHandler
+from websocket.pipeline import MessagePipeline
 from routes.progress_routes import router as progress_router
 from routes.dashboard_routes import router as dashboard_router
 from database.energy_lords import init_db
+from startup import StartupReport
 
 logger = logging.getLogger(__name__)
 
@@ -29,39 +32,50 @@ logger = logging.getLogger(__name__)
 ai_engine: AIEngine = None
 connection_manager: ConnectionManager = None
 message_handler: MessageHandler = None
+startup_report: StartupReport = None
+
+# Opt-in pipelined message handling (per connection with ?pipeline=1, or for all via WS_PIPELINING)
+PIPELINING_DEFAULT = os.getenv("WS_PIPELINING", "0").lower() in ("1", "true", "yes")
+PIPELINE_DEPTH = int(os.getenv("WS_PIPELINE_DEPTH", "8"))
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager for startup and shutdown"""
-    global ai_engine, connection_manager, message_handler
+    global ai_engine, connection_manager, message_handler, startup_report
 
     logger.info("Starting Adaptive Queen Intelligence AI Backend...")
-
-    # Initialize Energy Lords database
-    try:
-        init_db()
+    startup_report = StartupReport()
+
+    # Initialize the Energy Lords database (on a worker thread) and the AI Engine in parallel
+    ai_engine = AIEngine()
+    db_result, engine_result = await asyncio.gather(
+        startup_report.run_in_thread("database", init_db),
+        startup_report.run("ai_engine", ai_engine.initialize()),
+        return_exceptions=True
+    )
+    if isinstance(db_result, Exception):
+        logger.warning(f"Failed to initialize Energy Lords database: {db_result}")
+    else:
         logger.info("Energy Lords database initialized successfully")
-    except Exception as e:
-        logger.warning(f"Failed to initialize Energy Lords database: {e}")
-
-    # Initialize AI Engine with GPU acceleration if available
-    try:
-        ai_engine = AIEngine()
-        await ai_engine.initialize()
-        logger.info("AI Engine initialized successfully")
-    except Exception as e:
-        logger.error(f"Failed to initialize AI Engine: {e}")
-        raise
+    if isinstance(engine_result, Exception):
+        logger.error(f"Failed to initialize AI Engine: {engine_result}")
+        raise engine_result
+    logger.info("AI Engine initialized successfully")
 
     # Initialize WebSocket connection manager
-    connection_manager = ConnectionManager()
+    with startup_report.time("connection_manager"):
+        connection_manager = ConnectionManager()
     logger.info("WebSocket connection manager initialized")
 
-    # Initialize message handler
-    message_handler = MessageHandler(ai_engine)
-    logger.info("Message handler initialized")
+    # Initialize message handler; the NN model and trainer are built and
+    # warmed up in the background while connections are already accepted
+    with startup_report.time("message_handler"):
+        message_handler = MessageHandler(ai_engine, defer_model=True)
+    message_handler.start_model_initialization(startup_report)
+    logger.info("Message handler initialized (NN model initializing in background)")
 
+    startup_report.mark_ready()
     logger.info("Backend initialization complete")
 
     yield
@@ -73,6 +87,12 @@ async def lifespan(app: FastAPI):
         await connection_manager.shutdown()
         logger.info("Connection manager shutdown complete")
 
+    if message_handler and message_handler.model_task and not message_handler.model_task.done():
+        message_handler.model_task.cancel()
+
+    if message_handler:
+        await message_handler.close()
+
     if ai_engine:
         await ai_engine.cleanup()
         logger.info("AI engine cleanup complete")
@@ -136,14 +156,15 @@ async def health_check():
         "status": "healthy",
         "timestamp": asyncio.get_event_loop().time(),
         "ai_engine": "running" if ai_engine.initialized else "initializing",
-        "neural_network": "ready",  # PyTorch NNModel via ContinuousTrainer
+        "neural_network": "ready" if message_handler and message_handler.nn_model else "initializing",
         "gpu_acceleration": False,  # GPU config handled by ContinuousTrainer
         "active_connections": len(connection_manager.active_connections) if connection_manager else 0,
         "system_metrics": {
             "uptime_seconds": asyncio.get_event_loop().time(),
             "environment": os.getenv("ENVIRONMENT", "development"),
             "log_level": os.getenv("LOG_LEVEL", "INFO")
-        }
+        },
+        "startup": startup_report.to_dict() if startup_report else None
     }
 
     # Add model version info if available
@@ -270,34 +291,79 @@ async def trigger_system_test():
         return JSONResponse(status_code=500, content=test_results)
 
 
-@app.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    """Main WebSocket endpoint for client-backend communication"""
-    client_id = None
-    message_count = 0
+def _pipelining_enabled(websocket: WebSocket) -> bool:
+    """Check whether a connection asked for pipelined handling"""
+    requested = websocket.query_params.get("pipeline")
+    if requested is None:
+        return PIPELINING_DEFAULT
+    return requested.lower() in ("1", "true", "yes")
 
-    try:
-        client_id = await connection_manager.connect(websocket)
 
-        # Send queued messages if this is a reconnection
-        await connection_manager.send_queued_messages(client_id)
+async def _message_loop(websocket: WebSocket, client_id: str):
+    """
+    Receive and handle messages until the client disconnects.
+
+    By default each message is handled and answered before the next is
+    read. With pipelining, messages are read ahead (up to PIPELINE_DEPTH)
+    and handled concurrently across territories, with responses kept in
+    order per territory (see MessagePipeline).
+
+    Replies go through the client's send queue so they stay in order with
+    broadcasts and never write to the socket concurrently with them.
+    """
+    async def send_response(response: Dict[str, Any]):
+        if not await connection_manager.queue_message(response, client_id):
+            logger.warning(f"Response to client {client_id} dropped: send queue closed or full")
+
+    pipeline = None
+    if _pipelining_enabled(websocket):
+        pipeline = MessagePipeline(
+            message_handler.handle_message,
+            send_response,
+            client_id,
+            max_in_flight=PIPELINE_DEPTH,
+            admit_message=message_handler.admit_message,
+            release_message=message_handler.release_message
+        )
 
+    try:
         while True:
             try:
                 data = await asyncio.wait_for(websocket.receive_json(), timeout=30.0)
-                message_count += 1
+                message_handler.record_incoming(data, client_id)
+
+                if pipeline:
+                    await pipeline.submit(data)
+                    continue
 
                 response = await message_handler.handle_message(data, client_id)
 
                 if response:
-                    await websocket.send_json(response)
+                    await send_response(response)
 
             except asyncio.TimeoutError:
                 ping_message = {
                     "type": "ping",
                     "timestamp": asyncio.get_event_loop().time()
                 }
-                await websocket.send_json(ping_message)
+                await connection_manager.queue_message(ping_message, client_id, BackpressurePolicy.DROP_OLDEST)
+    finally:
+        if pipeline:
+            await pipeline.close()
+
+
+@app.websocket("/ws")
+async def websocket_endpoint(websocket: WebSocket):
+    """Main WebSocket endpoint for client-backend communication"""
+    client_id = None
+
+    try:
+        client_id = await connection_manager.connect(websocket)
+
+        # Send queued messages if this is a reconnection
+        await connection_manager.send_queued_messages(client_id)
+
+        await _message_loop(websocket, client_id)
 
     except WebSocketDisconnect:
         pass
@@ -314,19 +380,19 @@ async def websocket_endpoint(websocket: WebSocket):
                     "retryable": True
                 }
             }
-            await websocket.send_json(error_response)
+            await connection_manager.send_personal_message(error_response, client_id, queue_if_offline=False)
         except:
             pass
 
     finally:
         if client_id:
             connection_manager.disconnect(websocket, client_id)
+            message_handler.forget_client(client_id)
 
 
 @app.websocket("/ws/{client_id}")
 async def websocket_endpoint_with_id(websocket: WebSocket, client_id: str):
     """WebSocket endpoint with explicit client ID for reconnection"""
-    message_count = 0
 
     try:
         await connection_manager.connect(websocket, client_id)
@@ -344,24 +410,9 @@ async def websocket_endpoint_with_id(websocket: WebSocket, client_id: str):
                 "queuedMessages": queued_count
             }
         }
-        await websocket.send_json(reconnect_confirmation)
+        await connection_manager.queue_message(reconnect_confirmation, client_id)
 
-        while True:
-            try:
-                data = await asyncio.wait_for(websocket.receive_json(), timeout=30.0)
-                message_count += 1
-
-                response = await message_handler.handle_message(data, client_id)
-
-                if response:
-                    await websocket.send_json(response)
-
-            except asyncio.TimeoutError:
-                ping_message = {
-                    "type": "ping",
-                    "timestamp": asyncio.get_event_loop().time()
-                }
-                await websocket.send_json(ping_message)
+        await _message_loop(websocket, client_id)
 
     except WebSocketDisconnect:
         pass
@@ -378,12 +429,13 @@ async def websocket_endpoint_with_id(websocket: WebSocket, client_id: str):
                     "retryable": True
                 }
             }
-            await websocket.send_json(error_response)
+            await connection_manager.send_personal_message(error_response, client_id, queue_if_offline=False)
         except:
             pass
 
     finally:
         connection_manager.disconnect(websocket, client_id)
+        message_handler.forget_client(client_id)
 
 
 @app.get("/connections")
@@ -423,6 +475,21 @@ async def get_message_statistics():
     return message_handler.get_message_statistics()
 
 
+@app.get("/metrics")
+async def get_prometheus_metrics():
+    """
+    Prometheus text metrics: per-stage latency histograms (per message type),
+    replay buffer depth, training step time and model version
+    """
+    metrics = get_latency_metrics()
+    if message_handler:
+        message_handler.update_metric_gauges()
+    if connection_manager:
+        metrics.set_gauge("active_connections", len(connection_manager.active_connections),
+                          "Open WebSocket connections")
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/reset-db")
 async def reset_database():
     """
@@ -2,13 +2,18 @@
 Dashboard Routes
 
 FastAPI routes for the NN Visualization Dashboard.
-Provides API endpoint for metrics and serves the dashboard HTML page.
+Provides API endpoint for metrics, a server-sent event stream of metric
+updates, and serves the dashboard HTML page.
 """
 
 import os
+import json
+import time
+import asyncio
 import logging
-from fastapi import APIRouter
-from fastapi.responses import HTMLResponse, JSONResponse
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 
 from ai_engine.decision_gate.dashboard_metrics import get_dashboard_metrics
 
@@ -16,21 +21,34 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["dashboard"])
 
+# Push stream settings
+STREAM_DEFAULT_INTERVAL = 1.0  # Seconds between pushes to one subscriber
+STREAM_MIN_INTERVAL = 0.25  # Fastest push rate a subscriber may request
+STREAM_MAX_INTERVAL = 60.0
+STREAM_HEARTBEAT = 15.0  # Seconds of silence before a keep-alive comment
+
 
 @router.get("/api/nn-dashboard")
-async def get_dashboard_data():
+async def get_dashboard_data(since: Optional[int] = None):
     """
-    Return complete dashboard metrics snapshot.
+    Return complete dashboard metrics snapshot, or the changes since a version.
 
     Returns JSON with:
+    - version: Metrics version to pass back as ?since= on the next poll
     - nn_decisions: Chunk frequency, recent decisions, type counts, confidence histogram
     - gate_behavior: Pass rate, decision reasons, component breakdown, reward history
     - training: Loss history, simulation/real rewards, training stats
     - game_state: Current game state info
+
+    With ?since=<version> only new records and changed heatmap cells are
+    returned ('full': false); see DashboardMetrics.get_delta.
     """
     try:
         metrics = get_dashboard_metrics()
-        snapshot = metrics.get_snapshot()
+        if since is not None:
+            return JSONResponse(content=metrics.get_delta(since))
+        # Pollers share one snapshot rebuilt at most once per interval
+        snapshot = metrics.get_snapshot(max_age=metrics.SNAPSHOT_INTERVAL)
         return JSONResponse(content=snapshot)
     except Exception as e:
         logger.error(f"Error getting dashboard data: {e}")
@@ -40,6 +58,84 @@ async def get_dashboard_data():
         )
 
 
+def _format_event(event: str, payload: dict) -> str:
+    """Encode a payload as one server-sent event, using the version as the event id."""
+    data = json.dumps(payload, separators=(',', ':'))
+    return f"id: {payload['version']}\nevent: {event}\ndata: {data}\n\n"
+
+
+async def _dashboard_events(
+    request: Request,
+    interval: float,
+    since: Optional[int] = None
+) -> AsyncIterator[str]:
+    """
+    Yield dashboard updates for one subscriber.
+
+    The subscriber gets a full snapshot first (unless resuming from a known
+    version), then at most one delta per interval covering everything
+    recorded since its last event. Idle periods cost a version comparison
+    per interval and an occasional keep-alive comment.
+
+    Args:
+        request: Streaming request, polled for client disconnect
+        interval: Minimum seconds between events for this subscriber
+        since: Version the subscriber already has, if resuming
+    """
+    metrics = get_dashboard_metrics()
+    last_version = since
+    last_event_time = time.time()
+
+    while not await request.is_disconnected():
+        if last_version is None:
+            payload = metrics.get_snapshot(max_age=metrics.SNAPSHOT_INTERVAL)
+        elif metrics.version != last_version:
+            payload = metrics.get_delta(last_version)
+        else:
+            payload = None
+
+        if payload is not None:
+            last_version = payload['version']
+            last_event_time = time.time()
+            yield _format_event('snapshot' if payload['full'] else 'delta', payload)
+        elif time.time() - last_event_time >= STREAM_HEARTBEAT:
+            last_event_time = time.time()
+            yield ": keep-alive\n\n"
+
+        await asyncio.sleep(interval)
+
+
+@router.get("/api/nn-dashboard/stream")
+async def stream_dashboard_data(
+    request: Request,
+    interval: float = STREAM_DEFAULT_INTERVAL,
+    since: Optional[int] = None
+):
+    """
+    Stream dashboard updates as server-sent events.
+
+    Events are 'snapshot' (same shape as /api/nn-dashboard) and 'delta'
+    (same shape as /api/nn-dashboard?since=). Each event id is the metrics
+    version, so a reconnecting EventSource resumes from Last-Event-ID with
+    a delta instead of a full snapshot.
+
+    Args:
+        interval: Seconds between pushes, clamped to
+            [STREAM_MIN_INTERVAL, STREAM_MAX_INTERVAL]
+        since: Version the client already has
+    """
+    last_event_id = request.headers.get('last-event-id')
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    interval = min(max(interval, STREAM_MIN_INTERVAL), STREAM_MAX_INTERVAL)
+    return StreamingResponse(
+        _dashboard_events(request, interval, since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/dashboard", response_class=HTMLResponse)
 async def serve_dashboard():
     """
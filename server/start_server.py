@@ -3,6 +3,7 @@
 Startup script for Adaptive Queen Intelligence AI Backend
 """
 
+import importlib.util
 import logging
 import os
 import sys
@@ -24,14 +25,10 @@ def check_python_version():
 
 
 def check_dependencies():
-    """Check if required dependencies are installed"""
-    try:
-        import fastapi
-        import uvicorn
-        import torch
-        import numpy as np
-    except ImportError:
-        sys.exit(1)
+    """Check if required dependencies are installed (without importing them; torch alone takes seconds)"""
+    for module in ("fastapi", "uvicorn", "torch", "numpy"):
+        if importlib.util.find_spec(module) is None:
+            sys.exit(1)
 
 
 def setup_environment():
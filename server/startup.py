@@ -0,0 +1,86 @@
+"""
+Startup Report - Per-component startup timing for the AI backend
+
+The server accepts connections once the cheap components exist; the NN
+model and its trainer (which import torch) are built and warmed up on a
+worker thread afterwards. StartupReport records how long each step took,
+when the server became ready to accept connections, and when background
+initialization finished, for the startup log and the /health endpoint.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Startup timings, in milliseconds since the report was created.
+
+    Components can be timed from any thread.
+    """
+
+    def __init__(self):
+        self._start = time.perf_counter()
+        self.components: Dict[str, Dict[str, Any]] = {}
+        self.ready_ms: Optional[float] = None  # Accepting connections
+        self.complete_ms: Optional[float] = None  # Background initialization finished
+
+    def _elapsed_ms(self) -> float:
+        return (time.perf_counter() - self._start) * 1000
+
+    def record(self, component: str, duration_ms: float, status: str = "ok") -> None:
+        """Record a component's initialization time"""
+        self.components[component] = {
+            "duration_ms": round(duration_ms, 2),
+            "finished_ms": round(self._elapsed_ms(), 2),
+            "status": status
+        }
+        logger.info(f"[Startup] {component}: {duration_ms:.1f}ms ({status})")
+
+    @contextmanager
+    def time(self, component: str) -> Iterator[None]:
+        """Time a block; the component is recorded as failed if it raises"""
+        start = time.perf_counter()
+        status = "ok"
+        try:
+            yield
+        except Exception:
+            status = "failed"
+            raise
+        finally:
+            self.record(component, (time.perf_counter() - start) * 1000, status)
+
+    async def run_in_thread(self, component: str, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a blocking initializer on the default executor, timed"""
+        def timed():
+            with self.time(component):
+                return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, timed)
+
+    async def run(self, component: str, awaitable: Awaitable[Any]) -> Any:
+        """Await an async initializer, timed"""
+        with self.time(component):
+            return await awaitable
+
+    def mark_ready(self) -> None:
+        """Record that the server is accepting connections"""
+        self.ready_ms = round(self._elapsed_ms(), 2)
+        logger.info(f"[Startup] Accepting connections after {self.ready_ms:.1f}ms")
+
+    def mark_complete(self) -> None:
+        """Record that background initialization has finished"""
+        self.complete_ms = round(self._elapsed_ms(), 2)
+        logger.info(f"[Startup] Background initialization complete after {self.complete_ms:.1f}ms")
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the report for health endpoints"""
+        return {
+            "ready_ms": self.ready_ms,
+            "complete_ms": self.complete_ms,
+            "components": dict(self.components)
+        }
@@ -0,0 +1,106 @@
+"""
+Test batch replay of recorded game-state snapshots into the player behavior analyzer
+"""
+
+import pytest
+import json
+import os
+import tempfile
+import numpy as np
+from ai_engine.player_behavior import PlayerBehaviorAnalyzer
+from ai_engine.snapshot_batch import SnapshotBatch, SnapshotFeatures
+from ai_engine.data_models import GameStateSnapshot
+
+
+def _recorded_session(count=120):
+    """Deterministic session covering empty, single-unit and location-less cases"""
+    snapshots = []
+    for i in range(count):
+        mining = [
+            {'location': {'x': 40.0 * j + i, 'y': 0, 'z': 75.0 * j}, 'resource_type': ('energy', 'crystal')[j % 2]}
+            for j in range(i % 6)
+        ]
+        if i % 7 == 0:
+            mining.append({'resource_type': 'gas'})
+        snapshots.append({
+            'timestamp': 60.0 + i * 9.5,
+            'energy_level': 500 + ((i * 37) % 11 - 5) * 60,
+            'active_mining': mining,
+            'protector_positions': [{'x': 15.0 * k + i % 5, 'z': 8.0 * k} for k in range(i % 5)],
+            'worker_positions': [{'x': -20.0 * k, 'z': 3.0 * k + i % 3} for k in range((i + 2) % 4)],
+            'explored_areas': [{'area_id': a} for a in range(i // 4)]
+        })
+    return snapshots
+
+
+def test_batch_features_match_live_features():
+    """Test that vectorized batch features match per-snapshot derivation"""
+    snapshots = _recorded_session()
+    # Empty snapshot closing the batch right after one with a location-less site
+    snapshots[-1]['active_mining'] = [{'location': {'x': 5.0, 'z': 9.0}, 'resource_type': 'energy'}, {'resource_type': 'gas'}]
+    snapshots.append(dict(snapshots[-1], timestamp=snapshots[-1]['timestamp'] + 9.5, active_mining=[]))
+    batch = SnapshotBatch.from_snapshots(snapshots)
+    assert len(batch) == len(snapshots)
+
+    for snapshot, batch_features in zip(snapshots, batch.iter_features()):
+        live = SnapshotFeatures.from_snapshot(GameStateSnapshot.from_dict(snapshot))
+        assert batch_features.site_locations == [{'x': l['x'], 'z': l['z']} for l in live.site_locations]
+        assert batch_features.site_keys == live.site_keys
+        assert batch_features.resource_diversity == live.resource_diversity
+        assert (batch_features.site_count, batch_features.worker_count, batch_features.protector_count) == \
+            (live.site_count, live.worker_count, live.protector_count)
+        assert (batch_features.formation is None) == (live.formation is None)
+        if live.formation is not None:
+            assert batch_features.formation['spread'] == pytest.approx(live.formation['spread'])
+            assert batch_features.formation['coordination'] == pytest.approx(live.formation['coordination'])
+        assert (batch_features.worker_spread is None) == (live.worker_spread is None)
+        if live.worker_spread is not None:
+            assert batch_features.worker_spread == pytest.approx(live.worker_spread)
+
+
+@pytest.mark.asyncio
+async def test_replay_matches_live_updates():
+    """Test that JSONL and columnar replay end in the same state as live updates"""
+    snapshots = _recorded_session()
+    live = PlayerBehaviorAnalyzer()
+    for snapshot in snapshots:
+        await live.update_patterns(snapshot)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        jsonl_path = os.path.join(temp_dir, 'session.jsonl')
+        with open(jsonl_path, 'w') as f:
+            for snapshot in snapshots:
+                f.write(json.dumps(snapshot) + '\n')
+        npz_path = os.path.join(temp_dir, 'session.npz')
+        SnapshotBatch.load(jsonl_path).save_npz(npz_path)
+
+        for path in (jsonl_path, npz_path):
+            analyzer = PlayerBehaviorAnalyzer()
+            result = await analyzer.replay_snapshots(path, feature_interval=10)
+
+            assert result.snapshot_count == len(snapshots)
+            assert len(result.feature_vectors) == 12
+            assert result.feature_timestamps[-1] == snapshots[-1]['timestamp']
+            assert result.player_profile.player_type == live.get_patterns().player_profile.player_type
+            assert result.pattern_confidence == pytest.approx(live.learning_confidence)
+            np.testing.assert_allclose(result.feature_vectors[-1], live.get_feature_vector())
+            assert analyzer.update_count == live.update_count
+            assert len(analyzer.behavioral_transitions) == len(live.behavioral_transitions)
+
+
+@pytest.mark.asyncio
+async def test_replay_input_validation():
+    """Test replay of in-memory snapshots and rejection of bad inputs"""
+    analyzer = PlayerBehaviorAnalyzer()
+    result = await analyzer.replay_snapshots(_recorded_session(15))
+    assert len(result.feature_vectors) == 15
+    assert all(len(vector) == 15 for vector in result.feature_vectors)
+
+    with pytest.raises(ValueError):
+        await analyzer.replay_snapshots([], feature_interval=0)
+    with pytest.raises(ValueError):
+        SnapshotBatch.load('session.csv')
+
+    empty = await PlayerBehaviorAnalyzer().replay_snapshots([])
+    assert empty.snapshot_count == 0
+    assert empty.player_profile.player_type == 'unknown'
@@ -0,0 +1,92 @@
+"""
+Test the benchmark suite baseline comparison - tolerances, status and exit code
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+
+import pytest
+
+from benchmarks import suite
+from benchmarks.suite import compare, parse_overrides
+
+
+def _report(**times):
+    return {'results': {key: {'min_us': value, 'median_us': value * 2} for key, value in times.items()}}
+
+
+BASELINE = {
+    'results': {
+        'nn_model.predict[entities=8]': {'min_us': 100.0, 'median_us': 200.0},
+        'nn_model.predict[entities=64]': {'min_us': 100.0, 'median_us': 200.0},
+        'reward.calculate[entities=8]': {'min_us': 100.0, 'median_us': 200.0},
+    },
+    'tolerances': {'nn_model.predict': 0.5, 'nn_model.predict[entities=64]': 0.1}
+}
+
+
+def test_compare_tolerances_and_status():
+    """Test tolerance precedence, regression/improved/ok status and keys missing from the baseline"""
+    report = _report(**{
+        'nn_model.predict[entities=8]': 140.0,
+        'nn_model.predict[entities=64]': 140.0,
+        'reward.calculate[entities=8]': 70.0,
+        'feature_extractor.extract[entities=8]': 1000.0,
+    })
+    rows = {row['key']: row for row in compare(report, BASELINE, default_tolerance=0.3)}
+
+    # Not in the baseline: skipped rather than reported
+    assert 'feature_extractor.extract[entities=8]' not in rows
+
+    # Full key beats benchmark name, which beats the default
+    assert rows['nn_model.predict[entities=64]']['tolerance'] == 0.1
+    assert rows['nn_model.predict[entities=64]']['status'] == 'regression'
+    assert rows['nn_model.predict[entities=8]']['tolerance'] == 0.5
+    assert rows['nn_model.predict[entities=8]']['status'] == 'ok'
+    assert rows['reward.calculate[entities=8]']['tolerance'] == 0.3
+    assert rows['reward.calculate[entities=8]']['status'] == 'improved'
+    assert rows['reward.calculate[entities=8]']['ratio'] == pytest.approx(0.7)
+
+    # Command-line overrides beat the baseline's tolerances
+    rows = {row['key']: row for row in compare(report, BASELINE, 0.3, {'nn_model.predict': 0.2})}
+    assert rows['nn_model.predict[entities=8]']['status'] == 'regression'
+    assert rows['nn_model.predict[entities=64]']['tolerance'] == 0.1
+
+    # Compared on the chosen statistic
+    rows = compare(_report(**{'reward.calculate[entities=8]': 100.0}), BASELINE, 0.3, statistic='median_us')
+    assert rows[0]['baseline_us'] == 200.0 and rows[0]['status'] == 'ok'
+
+
+def test_parse_overrides():
+    """Test NAME=TOLERANCE parsing for benchmark names and full result keys"""
+    assert parse_overrides([]) == {}
+    assert parse_overrides(['nn_model.predict=0.5', 'reward.calculate[entities=8]=0.25']) == {
+        'nn_model.predict': 0.5,
+        'reward.calculate[entities=8]': 0.25
+    }
+    for value in ('nn_model.predict', 'nn_model.predict='):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_overrides([value])
+    with pytest.raises(ValueError):
+        parse_overrides(['nn_model.predict=fast'])
+
+
+def test_main_exits_non_zero_on_regression(monkeypatch, capsys):
+    """Test that a regression against the baseline gives exit code 1"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        baseline_path = os.path.join(temp_dir, 'baseline.json')
+        with open(baseline_path, 'w') as f:
+            json.dump(BASELINE, f)
+
+        for predict_us, expected_code in ((120.0, 0), (180.0, 1)):
+            report = _report(**{'nn_model.predict[entities=8]': predict_us})
+            monkeypatch.setattr(suite, 'run_suite', lambda *args, **kwargs: report)
+            monkeypatch.setattr(sys, 'argv', ['suite', '--baseline', baseline_path, '--threads', '0', '--json'])
+
+            assert suite.main() == expected_code
+            output = json.loads(capsys.readouterr().out)
+            statuses = [row['status'] for row in output['comparison']['rows']]
+            assert statuses == ['regression' if expected_code else 'ok']
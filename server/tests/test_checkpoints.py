@@ -0,0 +1,104 @@
+"""
+Test model checkpoints - background writes, the versioned ring and trainer rollback
+"""
+
+import json
+import os
+import tempfile
+import numpy as np
+import pytest
+import torch
+from ai_engine.nn_model import NNModel
+from ai_engine.training import CheckpointManager, ContinuousTrainingConfig, Experience, ExperienceReplayBuffer
+from ai_engine.training.trainer import ContinuousTrainer
+
+
+def test_ring_keeps_newest_checkpoints_and_publishes_latest():
+    """Test that snapshots are written in the background, pruned to `keep` and published to the model path"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, 'queen.pt')
+        manager = CheckpointManager(model_path, keep=2)
+        states = {version: {'weight': torch.full((3,), float(version))} for version in (1, 2, 3)}
+        for version, state in states.items():
+            manager.snapshot(state, version, {'model_version': version})
+            assert manager.flush(timeout=10.0)
+
+        assert manager.versions() == [2, 3]
+        assert [entry['version'] for entry in manager.list_checkpoints()] == [2, 3]
+        assert not os.path.exists(os.path.join(temp_dir, 'checkpoints', 'queen_v1.pt'))
+        assert torch.equal(torch.load(model_path, weights_only=True)['weight'], states[3]['weight'])
+        with open(model_path.replace('.pt', '_metadata.json')) as f:
+            assert json.load(f)['model_version'] == 3
+        assert not [name for name in os.listdir(temp_dir) if name.endswith('.tmp')]
+
+        # Snapshots are copies: later in-place updates do not leak into the ring
+        states[3]['weight'].add_(100.0)
+        assert manager.load(3)['weight'][0].item() == 3.0
+        manager.close()
+
+        # A new manager indexes the ring from disk
+        reopened = CheckpointManager(model_path, keep=2)
+        assert reopened.versions() == [2, 3]
+        assert reopened.load(2)['weight'][0].item() == 2.0
+
+
+def test_trainer_rollback_restores_checkpointed_weights():
+    """Test that rollback restores an earlier version's weights under a new model version"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        nn_model = NNModel(model_path=os.path.join(temp_dir, 'queen.pt'))
+        trainer = ContinuousTrainer(nn_model, ExperienceReplayBuffer(capacity=16), ContinuousTrainingConfig())
+
+        trainer._model_version = 7
+        with trainer._model_lock:
+            trainer._save_model()
+        saved = {name: tensor.clone() for name, tensor in nn_model.model.state_dict().items()}
+
+        with torch.no_grad():
+            for param in nn_model.model.parameters():
+                param.add_(1.0)
+        trainer._model_version = 8
+
+        assert trainer.rollback(7)
+        assert not trainer.rollback(3)
+        assert trainer.model_version == 9
+        for name, tensor in nn_model.model.state_dict().items():
+            assert torch.equal(tensor, saved[name])
+
+        assert trainer._checkpoints.flush(timeout=10.0)
+        with open(os.path.join(temp_dir, 'queen_metadata.json')) as f:
+            metadata = json.load(f)
+        assert metadata['model_version'] == 9 and metadata['restored_from'] == 7
+        assert trainer.get_metrics()['checkpoints']['versions'] == [7, 9]
+
+
+def test_driven_trainer_close_publishes_latest_weights():
+    """Test that train_step() trains in the caller's thread and close() leaves the newest weights on disk"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = os.path.join(temp_dir, 'queen.pt')
+        nn_model = NNModel(model_path=model_path)
+        buffer = ExperienceReplayBuffer(capacity=16)
+        trainer = ContinuousTrainer(nn_model, buffer, ContinuousTrainingConfig(save_interval=1))
+
+        assert trainer.train_step() is None  # Empty buffer
+        for step in range(3):
+            for i in range(4):
+                buffer.add(Experience(
+                    observation=np.full(29, 0.1 * i, dtype=np.float32), spawn_chunk=i, spawn_type='energy',
+                    nn_confidence=0.5, gate_signal=0.1, R_expected=0.2,
+                    was_executed=True, actual_reward=1.0 - i, timestamp=1000.0 + i
+                ))
+            result = trainer.train_step()
+            assert result['model_version'] == step + 1 and result['batch_size'] == 4
+
+        # Periodic checkpoints were queued for every version; close() must not let an older one win
+        trainer.close()
+        saved = torch.load(model_path, weights_only=True)
+        for name, tensor in nn_model.model.state_dict().items():
+            assert torch.equal(saved[name], tensor)
+        with open(os.path.join(temp_dir, 'queen_metadata.json')) as f:
+            assert json.load(f)['model_version'] == 3
+
+        with pytest.raises(RuntimeError):
+            trainer.train_step()
+        trainer.close()  # Idempotent
+
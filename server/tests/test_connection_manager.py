@@ -0,0 +1,128 @@
+"""
+Test Connection Manager send queues - serialize-once broadcast, per-client writers and backpressure
+"""
+
+import pytest
+import asyncio
+import json
+from unittest.mock import Mock, AsyncMock
+from websocket.connection_manager import BackpressurePolicy, ClientSender, ConnectionManager
+
+
+def _websocket(send_text=None):
+    websocket = Mock()
+    websocket.accept = AsyncMock()
+    websocket.close = AsyncMock()
+    websocket.send_text = send_text or AsyncMock()
+    return websocket
+
+
+def _blocking_send(release: asyncio.Event, sent: list):
+    async def send_text(text):
+        await release.wait()
+        sent.append(text)
+    return send_text
+
+
+@pytest.mark.asyncio
+async def test_broadcast_is_not_delayed_by_slow_client():
+    """Test that one stalled client does not hold up broadcast or other clients"""
+    manager = ConnectionManager()
+    release = asyncio.Event()
+    slow_sent = []
+    fast = [_websocket() for _ in range(3)]
+    await manager.connect(_websocket(_blocking_send(release, slow_sent)), "slow")
+    for i, websocket in enumerate(fast):
+        await manager.connect(websocket, f"fast_{i}")
+
+    message = {"type": "strategy_update", "data": {"generation": 2}}
+    assert await asyncio.wait_for(manager.broadcast(message), timeout=0.5) == 4
+    await asyncio.sleep(0.05)
+
+    expected = json.dumps(message, separators=(",", ":"))
+    for websocket in fast:
+        websocket.send_text.assert_called_once_with(expected)
+    assert slow_sent == []
+
+    release.set()
+    assert await manager.flush(timeout=1.0)
+    assert slow_sent == [expected]
+    assert manager.get_connection_info()["connections"]["slow"]["send_queue"]["sent"] == 1
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_backpressure_policies():
+    """Test drop-oldest replacement and bounded blocking on a full queue"""
+    release = asyncio.Event()
+    sent = []
+    sender = ClientSender(_websocket(_blocking_send(release, sent)), max_size=2)
+    sender.BLOCK_TIMEOUT = 0.05
+    sender.start()
+
+    sender.put_nowait("in_flight")
+    await asyncio.sleep(0)  # Writer takes the first message and stalls
+    decision = sender.put_nowait("decision", BackpressurePolicy.BLOCK)
+    first_heartbeat = sender.put_nowait("heartbeat_1", BackpressurePolicy.DROP_OLDEST)
+    sender.put_nowait("heartbeat_2", BackpressurePolicy.DROP_OLDEST)
+
+    # The older heartbeat made room; the decision is kept
+    assert first_heartbeat.done() and first_heartbeat.result() is False
+    with pytest.raises(asyncio.QueueFull):
+        sender.put_nowait("decision_2", BackpressurePolicy.BLOCK)
+    assert await sender.put("decision_2", BackpressurePolicy.BLOCK) is None
+
+    release.set()
+    assert await decision is True
+    await sender.drain()
+    assert sent == ["in_flight", "decision", "heartbeat_2"]
+    assert sender.stats["dropped"] == 2
+    sender.close()
+
+
+@pytest.mark.asyncio
+async def test_send_failure_marks_connection_lost_and_queues_offline():
+    """Test that a failing writer drops the connection and personal messages are queued"""
+    manager = ConnectionManager()
+    websocket = _websocket(AsyncMock(side_effect=RuntimeError("socket closed")))
+    await manager.connect(websocket, "client_1")
+
+    message = {"type": "queen_strategy", "data": {"queenId": "queen_1"}}
+    assert await manager.send_personal_message(message, "client_1") is False
+
+    assert "client_1" not in manager.active_connections
+    assert "client_1" not in manager.senders
+    assert manager.connection_metadata["client_1"]["status"] == "connection_lost"
+    assert manager.get_client_queue_info("client_1")["queue_size"] == 1
+    await manager.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_replies_and_replayed_messages_use_send_queue():
+    """Test that replayed offline messages and replies are written in order by the client's writer"""
+    manager = ConnectionManager()
+    await manager.connect(_websocket(), "client_1")
+    await manager._handle_disconnection("client_1")
+    assert await manager.send_personal_message({"type": "queen_strategy"}, "client_1") is True
+    assert await manager.queue_message({"type": "spawn_decision"}, "client_1") is False
+
+    websocket = _websocket()
+    await manager.connect(websocket, "client_1")
+    assert await manager.send_queued_messages("client_1") == 1
+    assert await manager.queue_message({"type": "spawn_decision"}, "client_1") is True
+    assert await manager.queue_message({"type": "ping"}, "client_1", BackpressurePolicy.DROP_OLDEST) is True
+    assert await manager.flush(timeout=1.0)
+
+    sent = [json.loads(call.args[0]) for call in websocket.send_text.call_args_list]
+    assert [message["type"] for message in sent] == ["queen_strategy", "spawn_decision", "ping"]
+    assert sent[0]["replayed"] is True
+    assert manager.get_client_queue_info("client_1")["queue_size"] == 0
+
+    # A late disconnect for a replaced connection must not stop the new writer
+    replacement = _websocket()
+    await manager.connect(replacement, "client_1")
+    manager.disconnect(websocket, "client_1")
+    await asyncio.sleep(0.01)
+    assert manager.active_connections["client_1"] is replacement
+    assert await manager.queue_message({"type": "spawn_decision"}, "client_1") is True
+    await manager.shutdown()
@@ -0,0 +1,143 @@
+"""
+Test Dashboard Metrics - running aggregates, shared snapshots, deltas and the push stream
+"""
+
+import pytest
+import json
+from ai_engine.decision_gate.dashboard_metrics import get_dashboard_metrics
+from routes.dashboard_routes import _dashboard_events
+
+
+@pytest.fixture
+def metrics():
+    dashboard = get_dashboard_metrics()
+    dashboard.reset()
+    yield dashboard
+    dashboard.reset()
+
+
+def _record_gate(metrics, i):
+    decision = 'SEND' if i % 3 == 0 else 'WAIT'
+    reason = 'positive_reward' if decision == 'SEND' else 'negative_reward'
+    reward = float('-inf') if i % 7 == 0 else i * 0.1
+    metrics.record_gate_decision(decision, reason, reward, {'survival': i * 0.01, 'disruption': 0.5})
+
+
+def test_running_aggregates_match_window(metrics):
+    """Test that gate and training aggregates match a scan of the history"""
+    for i in range(250):
+        _record_gate(metrics, i)
+        metrics.record_training_step(loss=1.0 / (i + 1), reward=i * 0.01, is_simulation=i % 2 == 0)
+
+    snapshot = metrics.get_snapshot()
+    gate = list(metrics.gate_decisions)
+    gate_behavior = snapshot['gate_behavior']
+    assert gate_behavior['pass_rate'] == round(sum(d.decision == 'SEND' for d in gate) / len(gate), 3)
+    assert gate_behavior['decision_reasons']['negative_reward'] == sum(d.reason == 'negative_reward' for d in gate)
+    assert gate_behavior['avg_components']['survival'] == round(
+        sum(d.components['survival'] for d in gate) / len(gate), 3
+    )
+    expected_rewards = [d.expected_reward for d in gate if d.expected_reward > -999][-50:]
+    assert gate_behavior['reward_history'] == [round(r, 3) for r in expected_rewards]
+
+    losses = list(metrics.loss_history)
+    rewards = list(metrics.simulation_rewards) + list(metrics.real_rewards)
+    assert snapshot['training']['avg_loss'] == round(sum(losses) / len(losses), 4)
+    assert snapshot['training']['avg_reward'] == round(sum(rewards) / len(rewards), 3)
+
+
+def test_snapshot_is_shared_until_interval(metrics):
+    """Test that pollers share a cached snapshot within max_age"""
+    metrics.record_training_step(loss=0.5, reward=0.1)
+    first = metrics.get_snapshot(max_age=60.0)
+    metrics.record_training_step(loss=0.4, reward=0.2)
+
+    cached = metrics.get_snapshot(max_age=60.0)
+    assert cached['version'] == first['version']
+    assert cached['nn_decisions'] is first['nn_decisions']
+
+    current = metrics.get_snapshot()
+    assert current['version'] == metrics.version
+    assert current['training']['loss_history'] == [0.5, 0.4]
+
+
+def test_delta_returns_only_new_records(metrics):
+    """Test that applying deltas to a snapshot reproduces the full snapshot"""
+    metrics.record_nn_decision(chunk=5, spawn_type='energy', confidence=0.7, sent=True, expected_reward=0.3)
+    metrics.record_training_step(loss=0.9, reward=0.1)
+    base = metrics.get_snapshot()
+
+    metrics.record_nn_decision(chunk=9, spawn_type='combat', confidence=0.4, sent=False, expected_reward=-0.2)
+    metrics.record_training_step(loss=0.8, reward=0.2, is_simulation=True)
+    metrics.record_entropy(entropy=2.0, max_entropy=5.549, effective_actions=7.4)
+    _record_gate(metrics, 3)
+
+    delta = metrics.get_delta(base['version'])
+    assert delta['full'] is False and delta['version'] == metrics.version
+    assert delta['nn_decisions']['chunk_updates'] == [[9, 1, 0, 1]]
+    assert [d['chunk'] for d in delta['nn_decisions']['new_decisions']] == [9]
+    assert delta['training']['new_loss'] == [0.8]
+    assert delta['training']['new_simulation_rewards'] == [0.2]
+    assert delta['training']['new_real_rewards'] == []
+    assert delta['entropy']['new_history'] == [2.0]
+    assert 'pipeline' in delta and 'game_state' not in delta
+
+    full = metrics.get_snapshot()
+    assert base['training']['loss_history'] + delta['training']['new_loss'] == full['training']['loss_history']
+    assert delta['gate_behavior']['pass_rate'] == full['gate_behavior']['pass_rate']
+
+    assert metrics.get_delta(metrics.version)['nn_decisions']['chunk_updates'] == []
+
+
+def test_delta_resyncs_after_reset(metrics):
+    """Test that a version from before a reset gets a full snapshot"""
+    metrics.record_training_step(loss=0.5, reward=0.1)
+    old_version = metrics.version
+    metrics.reset()
+    metrics.record_training_step(loss=0.3, reward=0.1)
+
+    delta = metrics.get_delta(old_version)
+    assert delta['full'] is True
+    assert delta['training']['loss_history'] == [0.3]
+    assert metrics.get_delta(metrics.version + 5)['full'] is True
+
+
+class _StreamRequest:
+    """Request stand-in that disconnects after a number of stream iterations."""
+
+    def __init__(self, iterations):
+        self.iterations = iterations
+
+    async def is_disconnected(self):
+        self.iterations -= 1
+        return self.iterations < 0
+
+
+def _parse_event(raw):
+    fields = dict(line.split(': ', 1) for line in raw.strip().split('\n'))
+    return fields.get('event'), json.loads(fields['data']) if 'data' in fields else None
+
+
+@pytest.mark.asyncio
+async def test_stream_sends_snapshot_then_coalesced_deltas(metrics):
+    """Test that a subscriber gets one delta per interval covering all new records"""
+    metrics.record_training_step(loss=0.5, reward=0.1)
+    events = []
+    async for raw in _dashboard_events(_StreamRequest(3), interval=0.01):
+        events.append(_parse_event(raw))
+        if len(events) == 1:
+            for i in range(5):
+                metrics.record_training_step(loss=0.1 * i, reward=0.1)
+
+    assert [event for event, _ in events] == ['snapshot', 'delta']
+    assert events[0][1]['training']['loss_history'] == [0.5]
+    assert events[1][1]['since'] == events[0][1]['version']
+    assert events[1][1]['training']['new_loss'] == [0.0, 0.1, 0.2, 0.3, 0.4]
+
+    # Resuming from a known version skips the snapshot
+    metrics.record_training_step(loss=0.9, reward=0.1)
+    resumed = [_parse_event(raw) async for raw in _dashboard_events(
+        _StreamRequest(2), interval=0.01, since=events[1][1]['version']
+    )]
+    assert [event for event, _ in resumed] == ['delta']
+    assert resumed[0][1]['training']['new_loss'] == [0.9]
@@ -361,6 +361,45 @@ class TestGateMetrics:
         assert 'recent' in stats
         assert stats['lifetime']['total_evaluations'] == 1
 
+    def test_rolling_statistics_match_sample_scan(self):
+        from ai_engine.decision_gate.metrics import GateMetrics
+
+        metrics = GateMetrics(window_size=10)
+        rng = np.random.default_rng(0)
+
+        for i in range(37):
+            decision = 'SEND' if rng.random() < 0.3 else 'WAIT'
+            reward = float('-inf') if rng.random() < 0.2 else float(rng.normal())
+            components = {'survival': float(rng.random())}
+            if i % 4 == 0:
+                components['exploration'] = float(rng.random())
+            metrics.record_evaluation(decision, 'negative_reward', reward, 0.5, components)
+
+            samples = list(metrics.samples)
+            for window in (None, 3, 10):
+                recent = samples[-window:] if window else samples
+                sends = sum(s.decision == 'SEND' for s in recent)
+                assert metrics.get_pass_rate(window) == pytest.approx(sends / len(recent))
+
+                rewards = [s.expected_reward for s in recent if s.expected_reward != float('-inf')]
+                expected_reward = sum(rewards) / len(rewards) if rewards else 0.0
+                assert metrics.get_average_expected_reward(window) == pytest.approx(expected_reward)
+
+                averages = metrics.get_average_components(window)
+                for name in ('survival', 'exploration'):
+                    values = [s.components[name] for s in recent if name in s.components]
+                    if values:
+                        assert averages[name] == pytest.approx(sum(values) / len(values))
+                    else:
+                        assert name not in averages
+
+            streak = 0
+            for sample in reversed(samples):
+                if sample.decision != 'WAIT':
+                    break
+                streak += 1
+            assert metrics.get_wait_streak() == streak
+
 
 class TestGateLogger:
     """Test structured gate logging."""
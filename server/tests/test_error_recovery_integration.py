@@ -226,10 +226,12 @@ class TestErrorRecoveryIntegration:
         backup_success = data_validator.backup_data(test_data, 'queen_death', 'test_backup')
         assert backup_success == True
         
-        # Verify backup file exists
+        # Verify backup segment exists and holds the data
+        data_validator.backup_writer.flush(timeout=5.0)
         backup_files = [f for f in os.listdir(data_validator.backup_directory) 
-                       if f.startswith('queen_death_backup_') and 'test_backup' in f]
+                       if f.startswith('queen_death_segment_')]
         assert len(backup_files) > 0
+        assert data_validator.backup_writer.recent_records('queen_death', limit=1) == [test_data]
     
     @pytest.mark.asyncio
     async def test_ai_engine_error_recovery_integration(self, ai_engine):
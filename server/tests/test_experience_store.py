@@ -0,0 +1,93 @@
+"""
+Test the persistent experience store - columnar memory-mapped segments, rotation and retention
+"""
+
+import os
+import tempfile
+import time
+
+import numpy as np
+from unittest.mock import Mock
+
+from ai_engine.training import (
+    ContinuousTrainingConfig, Experience, ExperienceReplayBuffer, ExperienceStore
+)
+from ai_engine.training.trainer import ContinuousTrainer
+
+
+def _experience(i, timestamp=None, spawn_type='combat', actual_reward=0.5):
+    return Experience(
+        observation=np.full(29, i, dtype=np.float32),
+        spawn_chunk=i,
+        spawn_type=spawn_type,
+        nn_confidence=0.9,
+        gate_signal=-0.25,
+        R_expected=0.35,
+        was_executed=actual_reward is not None,
+        actual_reward=actual_reward,
+        timestamp=timestamp if timestamp is not None else 1000.0 + i,
+        territory_id=f'territory_{i}',
+        model_version=i // 2
+    )
+
+
+def test_append_rotates_segments_and_reads_back_via_memmap():
+    """Test that experiences round-trip through rotated segments and a reopened store"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = ExperienceStore(temp_dir, segment_size=4)
+        batch = [_experience(i) for i in range(6)] + [_experience(6, spawn_type=None, actual_reward=None)]
+        assert store.append(batch) == 7
+
+        segments = store.segments()
+        assert [(s.count, s.sealed) for s in segments] == [(4, True), (3, False)]
+        assert segments[0].first_timestamp == 1000.0 and segments[0].last_timestamp == 1003.0
+        assert len(store) == 7
+
+        restored = list(store.iter_experiences(batch_size=3))
+        assert [e.spawn_chunk for e in restored] == list(range(7))
+        assert restored[2].territory_id == 'territory_2' and restored[2].model_version == 1
+        assert np.array_equal(restored[5].observation, batch[5].observation)
+        assert restored[6].spawn_type is None and restored[6].actual_reward is None
+        assert not restored[6].was_executed
+
+        # A column subset is mapped from disk, not copied
+        batches = list(store.iter_batches(batch_size=8, columns=['actual_reward']))
+        assert [len(b['actual_reward']) for b in batches] == [4, 3]
+        assert isinstance(batches[0]['actual_reward'], np.memmap)
+        store.close()
+
+        # A reopened store continues the unsealed segment
+        reopened = ExperienceStore(temp_dir, segment_size=4)
+        reopened.append([_experience(7)])
+        assert [(s.count, s.sealed) for s in reopened.segments()] == [(4, True), (4, True)]
+        column = np.load(os.path.join(reopened.segments()[1].path, 'spawn_chunk.npy'), mmap_mode='r')
+        assert list(column) == [4, 5, 6, 7]
+
+
+def test_retention_and_trainer_persists_drained_batches():
+    """Test segment retention limits and that the trainer logs every drained experience"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = ExperienceStore(os.path.join(temp_dir, 'by_count'), segment_size=2, max_segments=2)
+        store.append([_experience(i) for i in range(7)])
+        assert [s.sequence for s in store.segments()] == [3, 4]
+        assert store.stats['segments_removed'] == 2
+
+        old = time.time() - 10 * 24 * 3600
+        aged_dir = os.path.join(temp_dir, 'by_age')
+        ExperienceStore(aged_dir, segment_size=2).append([_experience(i, timestamp=old) for i in range(3)])
+        aged = ExperienceStore(aged_dir, segment_size=2, retention_days=7)
+        assert [(s.sequence, s.sealed) for s in aged.segments()] == [(2, False)]
+
+        model = Mock()
+        model.model_path = None
+        model.train_with_reward = Mock(return_value={"loss": 0.1})
+        config = ContinuousTrainingConfig(experience_store_dir=os.path.join(temp_dir, 'trainer'))
+        buffer = ExperienceReplayBuffer(capacity=16)
+        trainer = ContinuousTrainer(model, buffer, config)
+        buffer.add(_experience(1))
+        buffer.add(_experience(2, spawn_type=None, actual_reward=None))
+        assert trainer.train_step()['batch_size'] == 1  # The WAIT experience is logged, not trained
+
+        logged = list(ExperienceStore(config.experience_store_dir).iter_experiences())
+        assert [e.spawn_chunk for e in logged] == [1, 2]
+        assert trainer.get_metrics()['experience_store']['rows'] == 2
@@ -0,0 +1,65 @@
+"""
+Test the hyperparameter sweep - grid expansion, config overrides and in-process trials
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+
+from benchmarks.sweep import build_configs, expand_trials, parse_param, run_sweep
+
+
+def test_grid_expansion_and_config_overrides():
+    """Test parsing grid parameters, crossing them with override sets and seeds, and validation"""
+    assert parse_param('training.learning_rate=0.001,3e-4') == {'training.learning_rate': [0.001, 0.0003]}
+    assert parse_param('simulator.mining_spots=[1,2],[3]') == {'simulator.mining_spots': [[1, 2], [3]]}
+
+    trials = expand_trials(
+        {'training.learning_rate': [0.001, 0.01], 'training.min_batch_size': [8, 16]},
+        [{}, {'reward.no_impact_penalty': -0.2}],
+        seeds=[0, 1]
+    )
+    assert len(trials) == 16 and [t['trial'] for t in trials] == list(range(16))
+    assert trials[-1] == {
+        'trial': 15, 'seed': 1,
+        'overrides': {'reward.no_impact_penalty': -0.2, 'training.learning_rate': 0.01, 'training.min_batch_size': 16}
+    }
+
+    configs = build_configs({'training.min_batch_size': 128, 'gate.kill_range': 1.5, 'simulator.num_workers': 4})
+    assert configs['training'].min_batch_size == 128 and configs['training'].batch_size >= 128
+    assert configs['gate'].kill_range == 1.5 and configs['simulator'].num_workers == 4
+
+    for overrides, match in [
+        ({'optimizer.lr': 0.1}, 'SECTION.FIELD'),
+        ({'training.learning_rte': 0.1}, 'learning_rte'),
+        ({'gate.survival_weight': 0.9}, 'Invalid gate config'),
+    ]:
+        with pytest.raises(ValueError, match=match):
+            build_configs(overrides)
+
+
+def test_trials_train_reproducibly_and_report_failures():
+    """Test that seeded trials give identical curves, write their models and isolate failures"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        trials = expand_trials({'training.min_batch_size': [8]}, [{}, {}, {'gate.location_weight': 0.9}], seeds=[4])
+        for trial in trials:
+            trial.update({
+                'ticks': 60,
+                'threads': 1,
+                'model_path': os.path.join(temp_dir, f"trial_{trial['trial']}", 'queen.pt')
+            })
+        results = run_sweep(trials, workers=1)
+
+        first, second, invalid = results
+        assert first['status'] == second['status'] == 'ok'
+        assert first['train_steps'] > 0 and len(first['loss_curve']) == first['train_steps']
+        assert first['samples_trained'] == sum(first['batch_sizes'])
+        assert first['final_reward'] is not None and first['ticks_per_s'] > 0
+        assert first['loss_curve'] == second['loss_curve'] and first['final_reward'] == second['final_reward']
+        with open(first['model_path'].replace('.pt', '_metadata.json')) as f:
+            assert json.load(f)['model_version'] == first['model_version']  # Final weights, not an older checkpoint
+
+        assert invalid['status'] == 'failed' and 'Invalid gate config' in invalid['error']
+        assert not os.path.exists(invalid['model_path'])
@@ -0,0 +1,49 @@
+"""
+Test latency metrics - fixed-bucket histograms and Prometheus text export
+"""
+
+from ai_engine.latency_metrics import LatencyHistogram, LatencyMetrics
+
+
+def test_histogram_buckets_and_quantiles():
+    """Test bucket placement, sums and approximate quantiles"""
+    histogram = LatencyHistogram(bounds=(0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.001, 0.005, 0.05, 2.0):
+        histogram.observe(seconds)
+
+    assert histogram.counts == [2, 1, 1, 1]  # Bounds are inclusive upper limits
+    assert histogram.cumulative_counts() == [2, 3, 4, 5]
+    assert histogram.count == 5 and abs(histogram.sum - 2.0565) < 1e-9
+    assert histogram.quantile(0.4) == 0.001
+    assert histogram.quantile(0.6) == 0.01
+    assert histogram.quantile(1.0) == 0.1  # +Inf bucket reports the largest bound
+    assert LatencyHistogram().quantile(0.5) == 0.0
+
+
+def test_prometheus_export():
+    """Test histogram series per message type and stage, gauges and counters"""
+    metrics = LatencyMetrics(buckets=(0.001, 0.01))
+    timer = metrics.stage_timer("observation_data")
+    timer.lap("feature_extraction")
+    timer.finish()
+    metrics.observe("train_step", 0.005, message_type="training")
+    metrics.set_gauge("replay_buffer_depth", 12, "Experiences waiting")
+    metrics.set_counter("messages_processed", 40, "Messages handled")
+
+    text = metrics.render_prometheus()
+    lines = text.splitlines()
+    assert "# TYPE queen_ai_stage_latency_seconds histogram" in lines
+    assert 'queen_ai_stage_latency_seconds_bucket{message_type="training",stage="train_step",le="0.001"} 0' in lines
+    assert 'queen_ai_stage_latency_seconds_bucket{message_type="training",stage="train_step",le="0.01"} 1' in lines
+    assert 'queen_ai_stage_latency_seconds_count{message_type="observation_data",stage="total"} 1' in lines
+    assert 'queen_ai_stage_latency_seconds_sum{message_type="training",stage="train_step"} 0.005' in lines
+    assert "# TYPE queen_ai_replay_buffer_depth gauge" in lines
+    assert "queen_ai_replay_buffer_depth 12.0" in lines
+    assert "# TYPE queen_ai_messages_processed_total counter" in lines
+    assert "queen_ai_messages_processed_total 40.0" in lines
+    assert not any(line.startswith("queen_ai_messages_processed ") for line in lines)
+    assert text.endswith("\n")
+
+    summary = metrics.get_summary()
+    assert summary["training"]["train_step"]["mean_ms"] == 5.0
+    assert set(summary["observation_data"]) == {"feature_extraction", "total"}
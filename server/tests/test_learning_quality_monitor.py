@@ -0,0 +1,126 @@
+"""
+Test Learning Quality Monitor persistence - journal writes, compaction and tail loading
+"""
+
+import pytest
+import asyncio
+import json
+import os
+import tempfile
+from ai_engine.learning_quality_monitor import LearningQualityMonitor
+
+
+async def _learning_function(learning_data):
+    return {'accuracy': learning_data.get('accuracy', 0.8), 'loss_history': [0.5, 0.4, 0.3]}
+
+
+async def _run_sessions(monitor, count, generation=1):
+    for i in range(count):
+        await monitor.monitor_learning_session(
+            queen_id=f'queen_{i % 3}',
+            territory_id=f'territory_{i % 2}',
+            generation=generation,
+            learning_function=_learning_function,
+            learning_data={'accuracy': 0.8}
+        )
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_journaled_per_session():
+    """Test that each learning session appends one compact journal record"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monitor = LearningQualityMonitor(storage_path=temp_dir)
+        await monitor.start_monitoring()
+
+        await _run_sessions(monitor, 5)
+        await monitor._save_metrics_to_disk()
+
+        with open(monitor.journal_file) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 5
+        assert ', ' not in lines[0]  # Compact separators
+        assert json.loads(lines[0])['queen_id'] == 'queen_0'
+
+        with open(monitor.baseline_file) as f:
+            assert set(json.load(f)) == {'queen_0', 'queen_1', 'queen_2'}
+
+        # Subsequent saves only append new records
+        await _run_sessions(monitor, 2)
+        await monitor.stop_monitoring()
+        with open(monitor.journal_file) as f:
+            assert len(f.read().splitlines()) == 7
+
+
+@pytest.mark.asyncio
+async def test_write_behind_coalesces_sessions():
+    """Test that the background flush writes several sessions at once"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monitor = LearningQualityMonitor(storage_path=temp_dir)
+        monitor.FLUSH_DELAY = 0.05
+        await monitor.start_monitoring()
+
+        await _run_sessions(monitor, 4)
+        assert not os.path.exists(monitor.journal_file)
+
+        await asyncio.sleep(0.2)
+        with open(monitor.journal_file) as f:
+            assert len(f.read().splitlines()) == 4
+        assert monitor._pending_records == []
+        await monitor.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_compaction_and_tail_loading():
+    """Test that compaction keeps the window and loading restores it"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monitor = LearningQualityMonitor(storage_path=temp_dir)
+        monitor.HISTORY_WINDOW = 20
+        monitor.COMPACTION_BYTES = 8 * 1024
+        monitor.READ_BLOCK_SIZE = 256
+        await monitor.start_monitoring()
+
+        for generation in range(1, 6):
+            await _run_sessions(monitor, 10, generation=generation)
+            await monitor._save_metrics_to_disk()
+        await monitor.stop_monitoring()
+
+        with open(monitor.journal_file) as f:
+            assert len(f.read().splitlines()) < 50
+
+        restored = LearningQualityMonitor(storage_path=temp_dir)
+        restored.HISTORY_WINDOW = 20
+        restored.metrics_history = type(restored.metrics_history)(maxlen=20)
+        assert await restored.load_metrics_from_disk()
+
+        assert len(restored.metrics_history) == 20
+        assert restored.metrics_history[-1].to_dict() == monitor.metrics_history[-1].to_dict()
+        assert set(restored.generation_metrics) == {4, 5}
+        assert set(restored.validator.baseline_metrics) == {'queen_0', 'queen_1', 'queen_2'}
+
+
+@pytest.mark.asyncio
+async def test_legacy_snapshot_migration():
+    """Test that a legacy quality_metrics.json is migrated to the journal"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monitor = LearningQualityMonitor(storage_path=temp_dir)
+        await monitor.start_monitoring()
+        await _run_sessions(monitor, 3)
+        legacy = {
+            'metrics_history': [m.to_dict() for m in monitor.metrics_history],
+            'baseline_metrics': {
+                queen_id: m.to_dict() for queen_id, m in monitor.validator.baseline_metrics.items()
+            }
+        }
+        monitor._pending_records.clear()
+        monitor._baselines_dirty = False
+        await monitor.cleanup()
+        with open(monitor.metrics_file, 'w') as f:
+            json.dump(legacy, f)
+
+        restored = LearningQualityMonitor(storage_path=temp_dir)
+        assert await restored.load_metrics_from_disk()
+
+        assert len(restored.metrics_history) == 3
+        assert not os.path.exists(restored.metrics_file)
+        with open(restored.journal_file) as f:
+            assert len(f.read().splitlines()) == 3
@@ -0,0 +1,90 @@
+"""
+Test Message Pipeline - read-ahead, per-territory ordering and barriers
+"""
+
+import pytest
+import asyncio
+from websocket.pipeline import MessagePipeline
+
+
+def _observation(territory_id, seq):
+    return {"type": "observation_data", "seq": seq, "data": {"territoryId": territory_id}}
+
+
+class _Recorder:
+    """Handler/sender pair that records processing order, with per-message delays"""
+
+    def __init__(self, delays=None):
+        self.delays = delays or {}
+        self.started = []
+        self.responses = []
+        self.active = 0
+        self.peak_active = 0
+
+    async def handle(self, message, client_id):
+        self.started.append(message.get("seq"))
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+        await asyncio.sleep(self.delays.get(message.get("seq"), 0.01))
+        self.active -= 1
+        return {"type": "response", "seq": message.get("seq")}
+
+    async def send(self, response):
+        self.responses.append(response["seq"])
+
+
+@pytest.mark.asyncio
+async def test_territories_run_concurrently_with_ordered_responses():
+    """Test that each territory answers in order while territories overlap"""
+    recorder = _Recorder(delays={0: 0.05, 2: 0.01})
+    pipeline = MessagePipeline(recorder.handle, recorder.send, "client_1")
+
+    await pipeline.submit(_observation("t1", 0))  # Slow
+    await pipeline.submit(_observation("t2", 1))
+    await pipeline.submit(_observation("t1", 2))  # Fast, but must wait for 0
+    await pipeline.submit(_observation("t2", 3))
+    await pipeline.drain()
+
+    assert recorder.responses.index(0) < recorder.responses.index(2)
+    assert recorder.responses.index(1) < recorder.responses.index(3)
+    assert recorder.responses.index(1) < recorder.responses.index(0)  # t2 was not held up by t1
+    assert recorder.peak_active == 2
+    assert pipeline.stats["completed"] == 4 and pipeline.in_flight() == 0
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_is_bounded():
+    """Test that submit waits once max_in_flight messages are pending"""
+    recorder = _Recorder(delays={i: 0.05 for i in range(3)})
+    pipeline = MessagePipeline(recorder.handle, recorder.send, "client_1", max_in_flight=2)
+
+    await pipeline.submit(_observation("t1", 0))
+    await pipeline.submit(_observation("t2", 1))
+    blocked = asyncio.create_task(pipeline.submit(_observation("t3", 2)))
+    await asyncio.sleep(0.01)
+    assert not blocked.done()
+
+    await blocked
+    await pipeline.drain()
+    assert pipeline.stats["peak_in_flight"] == 2
+    assert sorted(recorder.responses) == [0, 1, 2]
+
+
+@pytest.mark.asyncio
+async def test_barrier_and_untagged_messages():
+    """Test that untagged messages follow their territory and barriers isolate"""
+    recorder = _Recorder(delays={0: 0.03, 10: 0.03})
+    pipeline = MessagePipeline(recorder.handle, recorder.send, "client_1")
+
+    await pipeline.submit(_observation("t1", 0))
+    await pipeline.submit({"type": "spawn_result", "seq": 1, "success": True})
+    await pipeline.submit(_observation("t2", 10))
+    await pipeline.submit({"type": "reset_nn", "seq": 2, "data": {"confirm": True}})
+    await pipeline.submit(_observation("t2", 11))
+    await pipeline.drain()
+
+    assert recorder.responses.index(0) < recorder.responses.index(1)
+    # The reset starts only after everything before it and before anything after it
+    assert recorder.started.index(2) > max(recorder.started.index(s) for s in (0, 1, 10))
+    assert recorder.started.index(11) > recorder.started.index(2)
+    assert recorder.responses[-2:] == [2, 11]
@@ -0,0 +1,200 @@
+"""
+Test precompiled message validation and verified-client structural checks
+"""
+
+import copy
+import tempfile
+import pytest
+from unittest.mock import Mock, AsyncMock
+from jsonschema import validate, ValidationError
+
+from websocket import schemas
+from websocket.schemas import MESSAGE_SCHEMAS, validate_message, get_validator
+from websocket.message_handler import MessageHandler
+from ai_engine.data_validator import DataValidator
+
+
+def _observation_message(territory_id="territory_1"):
+    return {
+        "type": "observation_data",
+        "data": {
+            "timestamp": 1000.0,
+            "miningWorkers": [{"x": 1, "z": 2, "chunkId": 5}],
+            "protectors": [],
+            "queenEnergy": {"current": 50, "max": 100},
+            "playerEnergy": {"start": 100, "end": 90},
+            "territoryId": territory_id
+        }
+    }
+
+
+INVALID_MESSAGES = [
+    {"type": "queen_death", "data": {"queenId": "queen_1"}},
+    {"type": "queen_death", "data": {"queenId": "q", "generation": 0, "deathLocation": {"x": 0, "y": 0, "z": 0},
+                                     "deathCause": "meteor"}},
+    {"type": "observation_data", "data": {"timestamp": "now"}},
+    {"type": "game_outcome", "data": {"player_won": "yes", "survival_time": -1}},
+    {"type": "ping", "timestamp": "soon"},
+]
+
+
+def _init_without_models(self):
+    """Skip NN and trainer setup; only validation and routing are exercised"""
+    for name in ("continuous_trainer", "feature_extractor", "nn_model", "reward_calculator",
+                 "simulation_gate", "preprocess_gate", "replay_buffer", "background_trainer"):
+        setattr(self, name, None)
+
+
+def _reference_error(message):
+    try:
+        validate(instance=message, schema=MESSAGE_SCHEMAS[message["type"]])
+    except ValidationError as e:
+        return f"Schema validation error: {e.message}"
+    return None
+
+
+def test_compiled_validation_matches_jsonschema():
+    """Test that compiled validators report the same errors as jsonschema.validate"""
+    assert validate_message(_observation_message()) == (True, None)
+    for message in INVALID_MESSAGES:
+        assert validate_message(message) == (False, _reference_error(message))
+
+    assert validate_message({"data": {}}) == (False, "Missing message type")
+    assert validate_message({"type": "unknown"})[0] is False
+
+
+def test_validators_are_reused_and_recompiled_on_schema_change():
+    """Test that validators are cached and follow replaced schemas"""
+    validator = get_validator("ping")
+    assert get_validator("ping") is validator
+
+    original = MESSAGE_SCHEMAS["ping"]
+    try:
+        strict = copy.deepcopy(original)
+        strict["required"] = ["type", "timestamp"]
+        MESSAGE_SCHEMAS["ping"] = strict
+        assert get_validator("ping") is not validator
+        assert validate_message({"type": "ping"})[0] is False
+    finally:
+        MESSAGE_SCHEMAS["ping"] = original
+    assert validate_message({"type": "ping"}) == (True, None)
+
+
+def test_structural_check():
+    """Test the observation structural check used for verified clients"""
+    assert validate_message(_observation_message(), structural_only=True) == (True, None)
+
+    missing = _observation_message()
+    del missing["data"]["territoryId"]
+    is_valid, error = validate_message(missing, structural_only=True)
+    assert not is_valid and "territoryId" in error
+
+    wrong_container = _observation_message()
+    wrong_container["data"]["protectors"] = {}
+    assert validate_message(wrong_container, structural_only=True)[0] is False
+
+    # Types without a structural check still get full validation
+    assert validate_message(INVALID_MESSAGES[0], structural_only=True)[0] is False
+    assert "observation_data" in schemas.STRUCTURAL_CHECKS
+
+
+@pytest.mark.asyncio
+async def test_verified_client_uses_structural_check(monkeypatch):
+    """Test that a client switches to structural checks after enough valid messages"""
+    monkeypatch.setattr(MessageHandler, "_init_components", _init_without_models)
+    handler = MessageHandler(Mock(), fast_validation=True)
+    handler.VERIFIED_CLIENT_THRESHOLD = 3
+    handler.router.register("observation_data", AsyncMock(return_value={"type": "spawn_decision"}))
+
+    calls = []
+    original_validate = schemas.validate_message
+
+    def tracking_validate(message, structural_only=False):
+        calls.append(structural_only)
+        return original_validate(message, structural_only=structural_only)
+
+    monkeypatch.setattr("websocket.message_handler.validate_message", tracking_validate)
+
+    for _ in range(5):
+        response = await handler.handle_message(_observation_message(), "client_a")
+        assert response["type"] == "spawn_decision"
+    assert calls == [False, False, False, True, True]
+
+    # Other clients are not trusted
+    await handler.handle_message(_observation_message(), "client_b")
+    assert calls[-1] is False
+
+    # A validation failure revokes trust
+    response = await handler.handle_message({"type": "observation_data", "data": {}}, "client_a")
+    assert response["data"]["errorCode"] == "VALIDATION_ERROR"
+    await handler.handle_message(_observation_message(), "client_a")
+    assert calls[-1] is False
+
+    handler.forget_client("client_b")
+    assert all(key[0] != "client_b" for key in handler._verified_counts)
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_observations_are_validated_once(monkeypatch):
+    """Test that admission validates fully, invalid messages never supersede valid ones, and handling reuses the result"""
+    monkeypatch.setattr(MessageHandler, "_init_components", _init_without_models)
+    handler = MessageHandler(Mock(), fast_validation=True)
+    handler.VERIFIED_CLIENT_THRESHOLD = 2
+    handler.router.register("observation_data", AsyncMock(return_value={"type": "spawn_decision"}))
+
+    calls = []
+    original_validate = schemas.validate_message
+
+    def tracking_validate(message, structural_only=False):
+        calls.append(structural_only)
+        return original_validate(message, structural_only=structural_only)
+
+    monkeypatch.setattr("websocket.message_handler.validate_message", tracking_validate)
+
+    older = _observation_message()
+    invalid = _observation_message()
+    invalid["data"]["timestamp"] = "now"
+    assert original_validate(invalid, structural_only=True)[0] is True
+
+    handler.admit_message(older, "client_a")
+    handler.admit_message(invalid, "client_a")
+    assert handler.observation_handler.coalescing_stats["admitted"] == 1
+    # The older observation is still the newest admitted one, so it is not coalesced
+    assert handler.observation_handler.release(older["data"]) is False
+
+    assert (await handler.handle_message(older, "client_a"))["type"] == "spawn_decision"
+    response = await handler.handle_message(invalid, "client_a")
+    assert response["data"]["errorCode"] == "VALIDATION_ERROR"
+    handler.release_message(older, "client_a")
+    handler.release_message(invalid, "client_a")
+    assert calls == [False, False]  # Once per message, at admission
+    assert handler._admitted_validation == {}
+
+    # Verified clients get the structural check at admission too
+    for _ in range(2):
+        message = _observation_message()
+        handler.admit_message(message, "client_b")
+        await handler.handle_message(message, "client_b")
+        handler.release_message(message, "client_b")
+    handler.admit_message(_observation_message(), "client_b")
+    assert calls[-3:] == [False, False, True]
+
+
+def test_data_validator_uses_compiled_validators():
+    """Test that DataValidator compiles schemas once and keeps error messages"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        validator = DataValidator(backup_directory=temp_dir)
+        assert set(validator._compiled_validators) == set(validator.validation_schemas)
+
+        strategy = {"generation": 2, "complexity_level": 0.4}
+        assert validator.validate_data(strategy, "strategy") == (True, None)
+
+        invalid = {"generation": 0}
+        is_valid, error = validator.validate_data(invalid, "strategy")
+        assert not is_valid
+        try:
+            validate(instance=invalid, schema=validator.validation_schemas["strategy"])
+        except ValidationError as e:
+            assert error == f"Validation error: {e.message}"
+
+        assert validator.validate_data({}, "missing_type")[0] is False
@@ -0,0 +1,48 @@
+"""
+Test NumPy inference engine - parity with the torch forward and refresh on weight updates
+"""
+
+import os
+import tempfile
+import numpy as np
+import torch
+from ai_engine.nn_model import NNModel, SequentialQueenNN
+from ai_engine.numpy_inference import NumpySequentialEngine
+
+
+def test_engine_matches_torch_forward():
+    """Test batched and single-row outputs against SequentialQueenNN.forward"""
+    torch.manual_seed(1)
+    model = SequentialQueenNN()
+    engine = NumpySequentialEngine.from_module(model)
+    features = np.random.default_rng(1).random((256, 29), dtype=np.float32)
+
+    assert engine.parity_error(model, features) < engine.PARITY_TOLERANCE
+
+    with torch.no_grad():
+        expected = model(torch.from_numpy(features[3]))
+    row = engine.forward(features[3])
+    assert set(row) == set(expected)
+    assert row['chunk_probs'].shape == (5,) and row['chunk_decision'].ndim == 0
+    np.testing.assert_allclose(row['quantity_probs'], expected['quantity_probs'].numpy(), atol=1e-6)
+
+
+def test_predict_uses_engine_and_tracks_weight_updates():
+    """Test that predict re-exports the engine after a training step"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        nn_model = NNModel(model_path=os.path.join(temp_dir, 'queen.pt'))
+        features = np.random.default_rng(2).random(29, dtype=np.float32)
+
+        before = nn_model.predict(features)
+        engine = nn_model._inference_engine
+        assert engine is not None
+        assert nn_model.get_stats()['inference_backend'] == 'numpy'
+        assert isinstance(before['chunk_decision'], int)
+
+        nn_model.train_step(features, {'type_target': 1, 'chunk_target': 2, 'quantity_target': 3}, reward=1.0)
+        after = nn_model.predict(features)
+
+        assert nn_model._inference_engine is not engine
+        torch_after = nn_model._predict_torch(features)
+        np.testing.assert_allclose(after['chunk_probs'], torch_after['chunk_probs'], atol=1e-6)
+        assert not np.allclose(after['chunk_probs'], before['chunk_probs'])
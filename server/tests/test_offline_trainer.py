@@ -0,0 +1,114 @@
+"""
+Test offline training - streamed shards, bounded shuffling, batch loss parity and checkpoints
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+import numpy as np
+import torch
+
+from ai_engine.nn_model import NNModel
+from ai_engine.training import Experience, ExperienceStore
+from ai_engine.training.offline_trainer import (
+    OfflineTrainer, chunk_targets, discover_shards, shuffled_rows, weighted_sequential_loss
+)
+
+
+def _features(rng, chunk_ids):
+    features = rng.random(29).astype(np.float32)
+    for slot, chunk_id in enumerate(chunk_ids):
+        features[slot * 5] = chunk_id / 255
+        features[slot * 5 + 1] = 0.5 if chunk_id >= 0 else 0.0
+    return features
+
+
+def _experiences(count, seed=0):
+    rng = np.random.default_rng(seed)
+    experiences = []
+    for i in range(count):
+        chunk_ids = [int(c) for c in rng.choice(256, 5, replace=False)]
+        experiences.append(Experience(
+            observation=_features(rng, chunk_ids),
+            spawn_chunk=chunk_ids[i % 5],
+            spawn_type='combat' if i % 3 else 'energy',
+            nn_confidence=0.8,
+            gate_signal=0.1,
+            R_expected=0.7,
+            was_executed=i % 4 != 0,  # Every 4th is a WAIT without reward
+            actual_reward=float(rng.uniform(-1, 1)) if i % 4 else None
+        ))
+    return experiences
+
+
+def test_targets_shuffling_and_loss_match_online_training():
+    """Test chunk target mapping, the bounded shuffle and per-experience loss parity"""
+    rng = np.random.default_rng(0)
+    features = np.stack([_features(rng, [10, 20, 30, -1, -1]), _features(rng, [-1] * 5)])
+    targets = chunk_targets(features, np.array([30, 99]), np.random.default_rng(1))
+    assert targets[0] == 2 and 0 <= targets[1] < 5
+    unmatched = chunk_targets(features[:1].repeat(50, axis=0), np.full(50, 99), np.random.default_rng(2))
+    assert set(unmatched) == {0, 1, 2}  # Only slots with workers
+
+    blocks = [{'reward': np.arange(start, start + 10, dtype=np.float32)} for start in range(0, 50, 10)]
+    emitted = list(shuffled_rows(iter(blocks), window=15, rng=np.random.default_rng(3)))
+    values = np.concatenate([block['reward'] for block in emitted])
+    assert sorted(values) == list(range(50)) and list(values) != list(range(50))
+
+    # Mini-batch loss == mean of the losses ContinuousTrainer computes one experience at a time
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model = NNModel(model_path=os.path.join(temp_dir, 'queen.pt'))
+        model.model.eval()
+        batch = {
+            'features': torch.from_numpy(np.stack([_features(rng, [1, 2, 3, 4, 5]) for _ in range(3)])),
+            'type_target': torch.tensor([0, 1, 1]),
+            'chunk_target': torch.tensor([4, 0, 2]),
+            'quantity_target': torch.tensor([1, 1, 1]),
+            'weight': torch.tensor([0.5, 1.0, 0.25])
+        }
+        with torch.no_grad():
+            batched = weighted_sequential_loss(model.model(batch['features']), batch, model.entropy_coef).item()
+            online = [
+                model._compute_loss(
+                    model.model(batch['features'][i]),
+                    {name: int(batch[name][i]) for name in ('type_target', 'chunk_target', 'quantity_target')},
+                    reward=-float(batch['weight'][i])  # Only |reward| weights the loss
+                )[0].item()
+                for i in range(3)
+            ]
+        assert abs(batched - np.mean(online)) < 1e-5
+
+
+def test_multi_epoch_training_writes_a_loadable_checkpoint():
+    """Test training over a store and a log with prefetch workers, then loading the result"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = ExperienceStore(os.path.join(temp_dir, 'experience'), segment_size=40)
+        store.append(_experiences(100))
+        log_path = os.path.join(temp_dir, 'experiences.jsonl.gz')
+        with gzip.open(log_path, 'wt') as f:
+            for experience in _experiences(20, seed=1):
+                f.write(json.dumps({**experience.__dict__, 'observation': experience.observation.tolist()}) + '\n')
+            f.write('not json\n')
+
+        shards = discover_shards([store.directory, log_path])
+        assert [shard.kind for shard in shards] == ['segment'] * 3 + ['log']
+
+        output = os.path.join(temp_dir, 'models', 'pretrained.pt')
+        model = NNModel(model_path=output)
+        before = {name: tensor.clone() for name, tensor in model.model.state_dict().items()}
+        trainer = OfflineTrainer(model, shards, batch_size=16, shuffle_window=32, num_workers=1, seed=5)
+        history = trainer.train(2, checkpoint_path=output, base_version=7)
+
+        assert [stats['rows'] for stats in history] == [90, 90]  # 75 + 15 with an actual reward
+        assert all(np.isfinite(stats['loss']) for stats in history)
+        with open(output.replace('.pt', '_metadata.json')) as f:
+            metadata = json.load(f)
+        assert metadata['model_version'] == 9 and metadata['offline_training']['epochs'] == 2
+        assert metadata['architecture_version'] == NNModel.ARCHITECTURE_VERSION
+
+        loaded = NNModel(model_path=output)
+        for name, tensor in model.model.state_dict().items():
+            assert torch.equal(loaded.model.state_dict()[name], tensor)
+        assert any(not torch.equal(before[name], tensor) for name, tensor in model.model.state_dict().items())
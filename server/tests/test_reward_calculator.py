@@ -0,0 +1,63 @@
+"""
+Test Reward Calculator batch scoring - parity with calculate_reward and bounded history
+"""
+
+import random
+import numpy as np
+from ai_engine.reward_calculator import RewardCalculator, RewardConfig, TransitionBatch, REWARD_COMPONENTS
+
+
+def _observation(rng):
+    def entities(limit):
+        return [{'chunkId': rng.choice([-1] + list(range(400)))} for _ in range(rng.randint(0, limit))]
+
+    observation = {
+        'miningWorkers': entities(6),
+        'protectors': entities(4),
+        'playerEnergy': {'start': rng.choice([0, 50, 100]), 'end': rng.choice([0, 40, 100, 120])},
+        'playerMinerals': {'start': rng.choice([0, 10]), 'end': rng.choice([0, 10, 20])}
+    }
+    if rng.random() < 0.7:
+        observation['workersPresent'] = entities(5)
+    if rng.random() < 0.8:
+        observation['hiveChunk'] = rng.choice([-1, 5, 255, 399])
+    return observation
+
+
+def _decision(rng):
+    if rng.random() < 0.2:
+        return None
+    return {'skipped': rng.random() < 0.4, 'spawnChunk': rng.choice([-1, 0, 17, 255, 399])}
+
+
+def _transitions(count, seed=0):
+    rng = random.Random(seed)
+    return [(_observation(rng), _observation(rng), _decision(rng)) for _ in range(count)]
+
+
+def test_batch_matches_single_transition_rewards():
+    """Test that calculate_rewards_batch reproduces calculate_reward per transition"""
+    transitions = _transitions(500)
+    config = RewardConfig(mining_disruption_weight=0.6, active_mining_penalty=-0.3)
+    calculator = RewardCalculator(config)
+
+    expected = [calculator.calculate_reward(*t) for t in transitions]
+    result = calculator.calculate_rewards_batch(TransitionBatch.from_observations(transitions))
+
+    assert result['component_names'] == REWARD_COMPONENTS
+    assert result['components'].shape == (500, len(REWARD_COMPONENTS))
+    np.testing.assert_allclose(result['reward'], [e['reward'] for e in expected], atol=1e-12)
+    for row, single in zip(result['components'], expected):
+        np.testing.assert_allclose(row, [single['components'].get(name, 0.0) for name in REWARD_COMPONENTS], atol=1e-12)
+
+
+def test_empty_batch_and_bounded_history():
+    """Test empty batches and that online history stays at max_history"""
+    calculator = RewardCalculator()
+    result = calculator.calculate_rewards_batch(TransitionBatch.from_observations([]))
+    assert result['reward'].shape == (0,)
+
+    for transition in _transitions(25, seed=1):
+        calculator.calculate_reward(*transition)
+    assert len(calculator.reward_history) == calculator.max_history
+    assert len(calculator.get_stats()['recent_rewards']) == 5
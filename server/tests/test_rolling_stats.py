@@ -0,0 +1,79 @@
+"""
+Test rolling statistics and the incremental player behavior aggregates
+"""
+
+import pytest
+import numpy as np
+from ai_engine.rolling_stats import RollingWindow
+from ai_engine.player_behavior import PlayerBehaviorAnalyzer
+
+
+def test_rolling_window_matches_numpy():
+    """Test that running aggregates match a recomputed window"""
+    rng = np.random.default_rng(7)
+    window = RollingWindow(20)
+    history = []
+
+    for value in rng.normal(50.0, 10.0, size=137):
+        window.append(value)
+        history.append(value)
+        expected = np.array(history[-20:])
+
+        assert len(window) == len(expected)
+        assert window.mean() == pytest.approx(expected.mean())
+        assert window.var() == pytest.approx(expected.var(), abs=1e-9)
+        assert window.sum() == pytest.approx(expected.sum())
+        assert window.first() == expected[0]
+        assert window.last() == expected[-1]
+        assert window.head_mean(5) == pytest.approx(expected[:5].mean())
+        assert window.tail_mean(5) == pytest.approx(expected[-5:].mean())
+        np.testing.assert_array_equal(window.values(), expected)
+
+
+def test_rolling_window_edge_cases():
+    """Test empty windows, defaults and partial tails"""
+    window = RollingWindow(4)
+    assert not window
+    assert window.mean(default=0.5) == 0.5
+    assert window.var(default=0.25) == 0.25
+    with pytest.raises(IndexError):
+        window.last()
+
+    for value in (1.0, 2.0, 3.0):
+        window.append(value)
+    assert window.tail_mean(2, skip=1) == pytest.approx(1.5)
+    assert window.tail_mean(5, skip=3) == 0.0
+
+    window.clear()
+    assert len(window) == 0
+    with pytest.raises(ValueError):
+        RollingWindow(0)
+
+
+@pytest.mark.asyncio
+async def test_analyzer_history_stays_bounded():
+    """Test that long sessions keep bounded history and stable aggregates"""
+    analyzer = PlayerBehaviorAnalyzer()
+    for i in range(300):
+        await analyzer.update_patterns({
+            'timestamp': 100.0 + i * 5,
+            'energy_level': 600 - (i % 10) * 60,
+            'active_mining': [{'location': {'x': 50 * (i % 7), 'z': 20}, 'resource_type': 'energy'}] * (1 + i % 4),
+            'protector_positions': [{'x': 10.0 * (i % 3), 'z': 5.0}, {'x': 30.0, 'z': 15.0}],
+            'worker_positions': [{'x': 0.0, 'z': 0.0}, {'x': 40.0, 'z': 30.0}],
+            'explored_areas': [{'area_id': a} for a in range(i // 3)]
+        })
+
+    assert len(analyzer.pattern_history) == analyzer.PATTERN_HISTORY_SIZE
+    assert len(analyzer._consistency_window) == len(analyzer.consistency_scores)
+    assert analyzer._consistency_window.mean() == pytest.approx(np.mean(analyzer.consistency_scores))
+
+    energy = analyzer.energy_patterns
+    spend_counts = {}
+    for event in energy.spending_patterns:
+        spend_counts[event['phase']] = spend_counts.get(event['phase'], 0) + 1
+    assert {k: v for k, v in energy._spending_by_phase.items() if v} == spend_counts
+
+    feature_vector = analyzer.get_feature_vector()
+    assert len(feature_vector) == 15
+    assert all(np.isfinite(feature_vector))
@@ -0,0 +1,49 @@
+"""
+Test server startup - lazy AI Engine subsystems and deferred NN model initialization
+"""
+
+import pytest
+from unittest.mock import Mock
+from ai_engine.ai_engine import AIEngine
+from startup import StartupReport
+from websocket.message_handler import MessageHandler
+
+
+@pytest.mark.asyncio
+async def test_queen_death_subsystems_are_built_on_first_use():
+    """Test that initialize() leaves the analysis components to first access"""
+    engine = AIEngine()
+    await engine.initialize()
+    assert engine.initialized
+    assert not any(engine.is_component_built(name) for name in AIEngine.LAZY_COMPONENTS)
+
+    analyzer = engine.death_analyzer
+    assert engine.death_analyzer is analyzer
+    assert engine.is_component_built('death_analyzer')
+    assert 'death_analyzer' in engine.component_init_ms
+    assert not engine.is_component_built('strategy_generator')
+
+    with pytest.raises(AttributeError):
+        engine.not_a_component
+    await engine.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_deferred_model_is_built_warmed_up_and_attached(monkeypatch):
+    """Test that a deferred NN model is built in the background and handed to the handlers"""
+    # No trainer thread: it would write checkpoints next to the default model
+    monkeypatch.setattr(MessageHandler, "_init_background_training", lambda self: None)
+    report = StartupReport()
+    handler = MessageHandler(Mock(), defer_model=True)
+    assert handler.nn_model is None and handler.observation_handler.nn_model is None
+
+    task = handler.start_model_initialization(report)
+    assert handler.start_model_initialization(report) is task
+    assert handler.observation_handler.model_pending is task
+    await task
+
+    assert handler.nn_model is not None
+    assert handler.observation_handler.nn_model is handler.nn_model
+    assert {'nn_model', 'nn_warm_up', 'background_training'} <= set(report.components)
+    assert report.components['nn_warm_up']['status'] == 'ok'
+    assert report.complete_ms is not None
@@ -12,6 +12,7 @@ from ai_engine.strategy_generator import (
     PredictiveBehaviorGenerator
 )
 from ai_engine.data_models import PlayerPatterns, DeathAnalysis, PlayerProfile
+from ai_engine.spatial_index import LocationIndex
 
 
 class TestStrategyGeneration:
@@ -303,6 +304,111 @@ class TestStrategyGeneration:
         defensive_tactics = strategy.defensive_coordination['formation_tactics']
         assert 'counter_formations' in defensive_tactics
 
+    @pytest.mark.asyncio
+    async def test_strategy_cache_reuses_near_identical_deaths(self, strategy_generator, sample_player_patterns, sample_death_analysis):
+        """Test that near-identical deaths reuse the cached strategy"""
+        first = await strategy_generator.generate_strategy(
+            generation=4,
+            learned_patterns=sample_player_patterns,
+            death_lessons=sample_death_analysis
+        )
+        
+        # Slightly moved failure location falls into the same cluster cell
+        sample_death_analysis.spatial_insights['failed_locations'] = [{'x': 11, 'y': 5, 'z': 16}]
+        second = await strategy_generator.generate_strategy(
+            generation=4,
+            learned_patterns=sample_player_patterns,
+            death_lessons=sample_death_analysis
+        )
+        
+        stats = strategy_generator.get_cache_stats()
+        assert stats['hits'] == 1
+        assert stats['misses'] == 1
+        assert second.parasite_spawning == first.parasite_spawning
+        # Avoid zones always reflect the actual failure sites
+        assert second.hive_placement['avoid_zones'][0]['center'] == {'x': 11, 'y': 5, 'z': 16}
+        # Cached entries are isolated from caller mutation
+        second.parasite_spawning['base_spawn_rate'] = -1
+        third = await strategy_generator.generate_strategy(
+            generation=4,
+            learned_patterns=sample_player_patterns,
+            death_lessons=sample_death_analysis
+        )
+        assert third.parasite_spawning['base_spawn_rate'] == first.parasite_spawning['base_spawn_rate']
+    
+    @pytest.mark.asyncio
+    async def test_strategy_cache_misses_on_different_failures(self, strategy_generator, sample_player_patterns, sample_death_analysis):
+        """Test that distant failures and other difficulty modifiers regenerate"""
+        await strategy_generator.generate_strategy(
+            generation=4,
+            learned_patterns=sample_player_patterns,
+            death_lessons=sample_death_analysis
+        )
+        
+        sample_death_analysis.spatial_insights['failed_locations'] = [{'x': -90, 'y': 5, 'z': 80}]
+        await strategy_generator.generate_strategy(
+            generation=4,
+            learned_patterns=sample_player_patterns,
+            death_lessons=sample_death_analysis
+        )
+        await strategy_generator.generate_strategy(
+            generation=4,
+            learned_patterns=sample_player_patterns,
+            death_lessons=sample_death_analysis,
+            difficulty_modifiers={'strategy_complexity': 0.4, 'predictive_ability': 0.8}
+        )
+        
+        assert strategy_generator.get_cache_stats()['misses'] == 3
+    
+    @pytest.mark.asyncio
+    async def test_large_failure_history(self):
+        """Test that a failure history larger than the analyzer ever keeps still clusters into avoid zones"""
+        generator = HivePlacementGenerator()
+        failed_locations = [
+            {'x': (i % 10) * 15, 'y': 5, 'z': (i // 10) * 15}
+            for i in range(64)
+        ]
+        
+        strategy = await generator.generate(failed_locations, {}, 0.5)
+        
+        assert strategy['strategy_type'] == 'learned_adaptive_placement'
+        assert len(strategy['avoid_zones']) == 5
+
+    def test_failure_clusters_grid_matches_dense(self):
+        """Test that grid-indexed clustering matches the dense path"""
+        import random
+        rng = random.Random(7)
+        failed_locations = [
+            {'x': rng.uniform(-100, 100), 'y': rng.uniform(-10, 50), 'z': rng.uniform(-100, 100)}
+            for _ in range(LocationIndex.DENSE_MAX_LOCATIONS + 50)
+        ]
+        generator = HivePlacementGenerator()
+        
+        grid_clusters = generator._identify_failure_clusters(failed_locations)
+        dense_index = LocationIndex(failed_locations, cell_size=HivePlacementGenerator.CLUSTER_THRESHOLD)
+        dense_index.DENSE_MAX_LOCATIONS = len(failed_locations)
+        dense_clusters = generator._identify_failure_clusters(failed_locations, dense_index)
+        
+        assert len(grid_clusters) == len(dense_clusters) > 0
+        for grid, dense in zip(grid_clusters, dense_clusters):
+            assert grid['locations'] == dense['locations']
+            assert grid['radius'] == pytest.approx(dense['radius'])
+            assert grid['radius'] < HivePlacementGenerator.CLUSTER_THRESHOLD * 2
+    
+    def test_safe_zones_respect_failure_distance(self):
+        """Test that safe zones keep clear of failed locations"""
+        generator = HivePlacementGenerator()
+        failed_locations = [{'x': 0, 'y': 10, 'z': 0}, {'x': 80, 'y': 10, 'z': 80}]
+        
+        safe_zones = generator._identify_safe_zones(failed_locations)
+        centers = [(z['center']['x'], z['center']['z']) for z in safe_zones]
+        
+        assert (0, 0) not in centers
+        assert (80, 80) not in centers
+        assert (-80, -80) in centers
+        assert all(0 < z['safety_score'] <= 1.0 for z in safe_zones)
+        assert len(generator._identify_safe_zones([])) == 25
+
 
 if __name__ == '__main__':
-    pytest.main([__file__, '-v'])
\ No newline at end of file
+    pytest.main([__file__, '-v'])
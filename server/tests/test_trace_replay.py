@@ -0,0 +1,93 @@
+"""
+Test trace recording in the message handler and trace replay over WebSocket connections
+"""
+
+import json
+import os
+import tempfile
+
+import pytest
+import websockets
+from unittest.mock import Mock
+
+from benchmarks.replay import build_plans, load_streams, run_replay
+from websocket.message_handler import MessageHandler
+from websocket.trace_recorder import TraceRecorder, read_trace
+
+
+@pytest.mark.asyncio
+async def test_handler_records_messages_across_sessions():
+    """Test that received messages (valid or not) are appended to the trace with timing"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'traces', 'session.jsonl.gz')
+        handler = MessageHandler(Mock(), defer_model=True, trace_path=path)
+        for client_id, message in [("client_a", {"type": "not_a_type"}),
+                                   ("client_b", {"type": "heartbeat_response", "timestamp": 1.0})]:
+            handler.record_incoming(message, client_id)
+            await handler.handle_message(message, client_id)  # Handling does not record again
+        await handler.close()
+        assert handler.get_message_statistics()["trace"]["written"] == 2
+
+        recorder = TraceRecorder(path)  # A second session appends to the same file
+        recorder.record("client_a", {"type": "ping"})
+        recorder.close()
+
+        records = list(read_trace(path))
+        assert [r.client_id for r in records] == ["client_a", "client_b", "client_a"]
+        assert records[0].message == {"type": "not_a_type"}
+        assert records[1].message == {"type": "heartbeat_response", "timestamp": 1.0}
+        assert records[0].offset <= records[1].offset <= records[2].offset
+
+    assert MessageHandler(Mock(), defer_model=True).trace_recorder is None
+
+
+@pytest.mark.asyncio
+async def test_replay_plans_and_connections():
+    """Test seeded plans (paced, reused streams retargeted) and a replay against a live server"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'trace.jsonl.gz')
+        recorder = TraceRecorder(path)
+        for client, message in [
+            ("a", {"type": "observation_data", "data": {"territoryId": "t1"}}),
+            ("b", {"type": "silent"}),
+            ("a", {"type": "fail"}),
+        ]:
+            recorder.record(client, message)
+        recorder.close()
+        streams = load_streams([path])
+
+    plans = build_plans(streams, connections=3, speed=2.0, seed=7, stagger=0.5)
+    assert [p.source_client for p in plans[:2]] == ["a", "b"]
+    assert plans == build_plans(streams, connections=3, speed=2.0, seed=7, stagger=0.5)
+    first_a = plans[0].schedule
+    a_records = streams["a"]
+    assert first_a[1][0] == pytest.approx((a_records[1].offset - a_records[0].offset) / 2)
+    assert first_a[0][1]["data"]["territoryId"] == "t1"
+    reused = plans[2]
+    if reused.source_client == "a":
+        assert reused.schedule[0][1]["data"]["territoryId"] == "t1-r1"
+    message_ids = [m["messageId"] for p in plans for _, m in p.schedule]
+    assert len(set(message_ids)) == len(message_ids)
+
+    async def serve(ws):
+        async for raw in ws:
+            message = json.loads(raw)
+            if message["type"] == "silent":
+                continue
+            response = {"type": "ack", "messageId": message["messageId"]}
+            if message["type"] == "fail":
+                response = {"type": "error", "messageId": message["messageId"],
+                            "data": {"errorCode": "VALIDATION_ERROR"}}
+            await ws.send(json.dumps({"type": "ping"}))
+            await ws.send(json.dumps(response))
+
+    async with websockets.serve(serve, "127.0.0.1", 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        plans = build_plans(streams, connections=2, speed=0.0)
+        report = await run_replay(f"ws://127.0.0.1:{port}", plans, timeout=0.2)
+
+    assert report["sent"] == 3 and report["responses"] == 2
+    assert report["unanswered"] == 1 and report["connection_errors"] == 0
+    assert report["error_responses"] == {"VALIDATION_ERROR": 1}
+    assert report["error_rate"] == pytest.approx(1 / 3)
+    assert report["latency_ms"]["p50"] > 0
@@ -22,6 +22,7 @@ from websocket.handlers.training_handler import TrainingHandler
 from websocket.handlers.gate_handler import GateHandler
 from websocket.handlers.game_state_handler import GameStateHandler
 from websocket.handlers.system_handler import SystemHandler
+from ai_engine.latency_metrics import LatencyMetrics
 
 
 class TestMessageRouter:
@@ -272,6 +273,65 @@ class TestObservationHandler:
         assert result["type"] == "spawn_decision"
         assert result["data"]["skipped"] is True
 
+    def test_superseded_observation_is_coalesced(self, mock_components):
+        """Older admitted observation only advances the reward chain."""
+        handler = ObservationHandler(**mock_components)
+        first = {"territoryId": "t1", "workersPresent": [{"chunkId": 50}], "seq": 0}
+        asyncio.run(handler.handle_raw({"type": "observation_data", "data": first}, "client1"))
+        assert "t1" in handler.prev_decisions
+
+        stale = {"territoryId": "t1", "workersPresent": [{"chunkId": 50}], "seq": 1}
+        latest = {"territoryId": "t1", "workersPresent": [{"chunkId": 50}], "seq": 2}
+        handler.admit(stale)
+        handler.admit(latest)
+        mock_components['nn_model'].get_spawn_decision.reset_mock()
+
+        result = asyncio.run(handler.handle_raw({"type": "observation_data", "data": stale}, "client1"))
+
+        assert result["data"]["skipReason"] == "superseded"
+        mock_components['nn_model'].get_spawn_decision.assert_not_called()
+        prev_obs, obs, _ = mock_components['reward_calculator'].calculate_reward.call_args[0]
+        assert prev_obs is first and obs is stale
+        assert handler.prev_observations["t1"] is stale
+        assert "t1" not in handler.prev_decisions
+
+        result = asyncio.run(handler.handle_raw({"type": "observation_data", "data": latest}, "client1"))
+
+        assert result["data"]["spawnChunk"] == 50
+        mock_components['nn_model'].get_spawn_decision.assert_called_once()
+        stats = handler.get_coalescing_stats()
+        assert stats["coalesced"] == 1 and stats["pending"] == {}
+
+    def test_unadmitted_observations_are_not_coalesced(self, mock_components):
+        """Released or never-admitted observations are always fully processed."""
+        handler = ObservationHandler(**mock_components)
+        abandoned = {"territoryId": "t1", "workersPresent": [{"chunkId": 50}], "seq": 0}
+        latest = {"territoryId": "t1", "workersPresent": [{"chunkId": 50}], "seq": 1}
+        handler.admit(abandoned)
+        handler.admit(latest)
+        handler.release(abandoned)  # e.g. its task was cancelled
+        assert handler.release(abandoned) is False
+
+        for observation in (abandoned, latest):
+            result = asyncio.run(handler.handle_raw({"type": "observation_data", "data": observation}, "client1"))
+            assert result["data"]["spawnChunk"] == 50
+
+        assert handler.get_coalescing_stats()["coalesced"] == 0
+
+    def test_pipeline_stages_are_timed(self, mock_components):
+        """Each observation pipeline stage is recorded in the latency histograms."""
+        metrics = LatencyMetrics()
+        handler = ObservationHandler(**mock_components, latency_metrics=metrics)
+        observation = {"territoryId": "t1", "workersPresent": [{"chunkId": 50}]}
+
+        asyncio.run(handler.handle_raw({"type": "observation_data", "data": observation}, "client1"))
+
+        stages = metrics.get_summary()["observation_data"]
+        for stage in ("preprocess_gate", "dashboard_update", "reward_calculation", "feature_extraction",
+                      "nn_inference", "entropy", "gate_evaluation", "buffer_add", "response", "total"):
+            assert stages[stage]["count"] == 1
+        assert 'stage="nn_inference",le="+Inf"} 1' in metrics.render_prometheus()
+
 
 class TestTrainingHandler:
     """Tests for training control messages."""
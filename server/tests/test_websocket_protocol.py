@@ -364,6 +364,7 @@ class TestConnectionManager:
         mock_websocket = Mock()
         mock_websocket.accept = AsyncMock()
         mock_websocket.send_json = AsyncMock()
+        mock_websocket.send_text = AsyncMock()
         
         client_id = await connection_manager.connect(mock_websocket, "test_client")
         await connection_manager._handle_disconnection("test_client")
@@ -382,12 +383,12 @@ class TestConnectionManager:
         assert queue_info["messages"][0]["type"] == "test"
         
         # Reconnect and send queued messages
-        mock_websocket.send_json.reset_mock()
+        mock_websocket.send_text.reset_mock()
         await connection_manager.connect(mock_websocket, "test_client")
         sent_count = await connection_manager.send_queued_messages("test_client")
         
         assert sent_count == 1
-        mock_websocket.send_json.assert_called()
+        assert json.loads(mock_websocket.send_text.call_args[0][0])["replayed"] is True
     
     @pytest.mark.asyncio
     async def test_broadcast_functionality(self, connection_manager):
@@ -397,29 +398,33 @@ class TestConnectionManager:
         for i in range(3):
             mock_websocket = Mock()
             mock_websocket.accept = AsyncMock()
-            mock_websocket.send_json = AsyncMock()
+            mock_websocket.send_text = AsyncMock()
             client_id = await connection_manager.connect(mock_websocket, f"client_{i}")
             clients.append((client_id, mock_websocket))
         
-        # Broadcast message
+        # Broadcast message (serialized once, sent by each client's writer task)
         broadcast_message = {"type": "broadcast", "data": "test_broadcast"}
+        broadcast_text = json.dumps(broadcast_message, separators=(",", ":"))
         await connection_manager.broadcast(broadcast_message)
+        await connection_manager.flush(timeout=1.0)
         
         # Verify all clients received the message
         for client_id, mock_websocket in clients:
-            mock_websocket.send_json.assert_called_with(broadcast_message)
+            mock_websocket.send_text.assert_called_with(broadcast_text)
         
         # Test broadcast with exclusions
-        mock_websocket.send_json.reset_mock()
+        for client_id, mock_websocket in clients:
+            mock_websocket.send_text.reset_mock()
         await connection_manager.broadcast(
             broadcast_message, 
             exclude_clients=["client_0"]
         )
+        await connection_manager.flush(timeout=1.0)
         
         # Verify client_0 was excluded
-        clients[0][1].send_json.assert_not_called()
-        clients[1][1].send_json.assert_called_with(broadcast_message)
-        clients[2][1].send_json.assert_called_with(broadcast_message)
+        clients[0][1].send_text.assert_not_called()
+        clients[1][1].send_text.assert_called_with(broadcast_text)
+        clients[2][1].send_text.assert_called_with(broadcast_text)
     
     @pytest.mark.asyncio
     async def test_cleanup_stale_connections(self, connection_manager):
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Offline trainer for the Queen NN
+
+Pretrains the five-NN sequential model for several epochs on recorded
+experience (ExperienceStore directories and/or JSONL experience logs) and
+writes a model file the server loads on startup.
+
+Usage:
+    python train_offline.py SOURCE [SOURCE ...] --output models/queen_sequential.pt [options]
+
+Examples:
+    # Fresh model, 5 epochs over the live server's experience store
+    python train_offline.py data/experience --output models/pretrained.pt --epochs 5
+
+    # Continue from the current model with 4 prefetch workers
+    python train_offline.py data/experience logs/experiences.jsonl.gz \\
+        --init models/queen_sequential.pt --output models/pretrained.pt --workers 4
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+log_level_name = os.getenv("LOG_LEVEL", "info").upper()
+logging.basicConfig(
+    level=getattr(logging, log_level_name, logging.INFO),
+    format='%(levelname)s: %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Train the Queen NN offline on recorded experience")
+    parser.add_argument("sources", nargs="+",
+                        help="ExperienceStore directories and experience logs (.jsonl, .jsonl.gz)")
+    parser.add_argument("--output", required=True, help="Model file to write (metadata is written next to it)")
+    parser.add_argument("--init", help="Start from these weights (default: fresh weights)")
+    parser.add_argument("--epochs", type=int, default=3, help="Passes over the data")
+    parser.add_argument("--batch-size", type=int, default=1024, help="Experiences per optimizer step")
+    parser.add_argument("--learning-rate", type=float, default=0.001, help="Adam learning rate")
+    parser.add_argument("--shuffle-window", type=int, default=65536, help="Rows held back per worker for shuffling")
+    parser.add_argument("--workers", type=int, default=max(0, min(4, (os.cpu_count() or 1) - 1)),
+                        help="DataLoader worker processes preparing batches (0 = in the training process)")
+    parser.add_argument("--prefetch", type=int, default=4, help="Batches prefetched per worker")
+    parser.add_argument("--threads", type=int, default=0, help="torch threads (0 = all cores)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for weights, shuffling and targets")
+    parser.add_argument("--json", action="store_true", help="Print the epoch history as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    import torch
+    from ai_engine.nn_model import NNModel
+    from ai_engine.training.offline_trainer import (
+        OfflineTrainer, discover_shards, read_model_version
+    )
+
+    torch.manual_seed(args.seed)
+    torch.set_num_threads(args.threads or os.cpu_count() or 1)
+
+    try:
+        shards = discover_shards(args.sources)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    if not shards:
+        logger.error("No experience found in the given sources")
+        return 1
+
+    if args.init:
+        if not os.path.exists(args.init):
+            logger.error(f"Initial weights not found: {args.init}")
+            return 1
+        model = NNModel(model_path=args.init)
+        base_version = read_model_version(args.init)
+    else:
+        model = NNModel(model_path=args.output)
+        model.model._init_weights()  # Fresh weights even if the output exists
+        model.optimizer.state.clear()
+        model.mark_weights_changed()
+        base_version = 0
+
+    trainer = OfflineTrainer(
+        model,
+        shards,
+        batch_size=args.batch_size,
+        shuffle_window=args.shuffle_window,
+        learning_rate=args.learning_rate,
+        num_workers=args.workers,
+        prefetch_factor=args.prefetch,
+        seed=args.seed
+    )
+    logger.info(
+        f"Training on {len(shards)} shards for {args.epochs} epochs "
+        f"(batch {args.batch_size}, {trainer.num_workers} workers, {torch.get_num_threads()} threads)"
+    )
+
+    start = time.perf_counter()
+    try:
+        history = trainer.train(args.epochs, checkpoint_path=args.output, base_version=base_version)
+    except ValueError as e:
+        logger.error(str(e))
+        return 1
+    logger.info(f"Done in {time.perf_counter() - start:.1f}s; wrote {args.output}")
+
+    if args.json:
+        print(json.dumps(history, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,18 @@
 """
 WebSocket Connection Manager for handling client connections
 Enhanced with reconnection, timeout handling, and message queuing
+
+Outbound messages go through a bounded per-client send queue drained by
+that client's own writer task, so a slow client never delays the others.
+Broadcasts serialize a message once and enqueue the same text for every
+client.
 """
 
 import asyncio
 import logging
 import json
-from typing import Dict, List, Optional, Any
+from enum import Enum
+from typing import Awaitable, Callable, Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from collections import deque
 from fastapi import WebSocket
@@ -43,6 +49,167 @@ class MessageQueue:
         return len(self.messages)
 
 
+class BackpressurePolicy(Enum):
+    """What to do when a client's send queue is full"""
+    DROP_OLDEST = "drop_oldest"  # Replace the oldest droppable message (heartbeats, dashboards)
+    BLOCK = "block"  # Wait for space (decisions and other messages that must arrive)
+
+
+def serialize_message(message: Dict[str, Any]) -> str:
+    """Serialize a message exactly as WebSocket.send_json would"""
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class ClientSender:
+    """
+    Bounded outbound queue for one WebSocket, drained by a dedicated writer task.
+
+    Each queued message is paired with a future that resolves to True once
+    the text has been sent, or False if the connection failed or was closed
+    first.
+    """
+
+    BLOCK_TIMEOUT = 5.0  # Seconds a BLOCK enqueue waits for space before giving up
+
+    def __init__(self,
+                 websocket: WebSocket,
+                 max_size: int = 256,
+                 on_sent: Optional[Callable[[], Awaitable[None]]] = None,
+                 on_failure: Optional[Callable[['ClientSender', Exception], Awaitable[None]]] = None):
+        self.websocket = websocket
+        self.max_size = max_size
+        self._on_sent = on_sent
+        self._on_failure = on_failure
+        self._items: deque = deque()  # (payload, droppable, future)
+        self._has_items = asyncio.Event()
+        self._has_space = asyncio.Event()
+        self._has_space.set()
+        self._last_future: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self.closed = False
+
+        self.stats = {"sent": 0, "dropped": 0, "blocked": 0, "send_failures": 0}
+
+    def start(self):
+        """Start the writer task"""
+        self._task = asyncio.create_task(self._run())
+
+    def size(self) -> int:
+        """Get number of messages waiting to be sent"""
+        return len(self._items)
+
+    def put_nowait(self, payload: str, policy: BackpressurePolicy = BackpressurePolicy.BLOCK) -> Optional[asyncio.Future]:
+        """
+        Queue serialized text without waiting.
+
+        Returns:
+            Delivery future, or None if the sender is closed or the message was dropped
+
+        Raises:
+            asyncio.QueueFull: If the queue is full and the policy is BLOCK
+        """
+        if self.closed:
+            return None
+
+        droppable = policy is BackpressurePolicy.DROP_OLDEST
+        if len(self._items) >= self.max_size:
+            if not droppable:
+                raise asyncio.QueueFull()
+            if not self._drop_oldest_droppable():
+                # Everything queued must be delivered; drop the new message instead
+                self.stats["dropped"] += 1
+                return None
+
+        future = asyncio.get_event_loop().create_future()
+        self._items.append((payload, droppable, future))
+        self._last_future = future
+        self._has_items.set()
+        if len(self._items) >= self.max_size:
+            self._has_space.clear()
+        return future
+
+    async def put(self, payload: str, policy: BackpressurePolicy = BackpressurePolicy.BLOCK) -> Optional[asyncio.Future]:
+        """
+        Queue serialized text, waiting up to BLOCK_TIMEOUT for space under the BLOCK policy.
+
+        Returns:
+            Delivery future, or None if the message could not be queued
+        """
+        try:
+            return self.put_nowait(payload, policy)
+        except asyncio.QueueFull:
+            pass
+
+        self.stats["blocked"] += 1
+        try:
+            await asyncio.wait_for(self._wait_for_space(), self.BLOCK_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.stats["dropped"] += 1
+            logger.warning("Send queue full, message dropped after blocking")
+            return None
+        return self.put_nowait(payload, policy)
+
+    async def _wait_for_space(self):
+        while len(self._items) >= self.max_size and not self.closed:
+            self._has_space.clear()
+            await self._has_space.wait()
+
+    def _drop_oldest_droppable(self) -> bool:
+        for index, (_, droppable, future) in enumerate(self._items):
+            if droppable:
+                del self._items[index]
+                future.set_result(False)
+                self.stats["dropped"] += 1
+                return True
+        return False
+
+    async def _run(self):
+        """Writer task: send queued messages in order until the connection fails or closes"""
+        while not self.closed:
+            if not self._items:
+                self._has_items.clear()
+                await self._has_items.wait()
+                continue
+
+            payload, _, future = self._items.popleft()
+            self._has_space.set()
+            try:
+                await self.websocket.send_text(payload)
+            except asyncio.CancelledError:
+                if not future.done():
+                    future.set_result(False)
+                raise
+            except Exception as e:
+                self.stats["send_failures"] += 1
+                future.set_result(False)
+                self.close()
+                if self._on_failure:
+                    await self._on_failure(self, e)
+                return
+
+            self.stats["sent"] += 1
+            future.set_result(True)
+            if self._on_sent:
+                await self._on_sent()
+
+    async def drain(self):
+        """Wait until everything queued so far has been sent (or failed)"""
+        future = self._last_future
+        if future is not None and not future.done():
+            await asyncio.shield(future)
+
+    def close(self):
+        """Stop the writer and fail anything still queued"""
+        self.closed = True
+        while self._items:
+            _, _, future = self._items.popleft()
+            if not future.done():
+                future.set_result(False)
+        self._has_space.set()
+        if self._task is not None and self._task is not asyncio.current_task():
+            self._task.cancel()
+
+
 class ConnectionManager:
     """
     Manages WebSocket connections for real-time client-backend communication
@@ -52,13 +219,16 @@ class ConnectionManager:
     def __init__(self, 
                  connection_timeout: int = 300,  # 5 minutes
                  heartbeat_interval: int = 30,   # 30 seconds
-                 max_queue_size: int = 100):
+                 max_queue_size: int = 100,
+                 send_queue_size: int = 256):
         self.active_connections: Dict[str, WebSocket] = {}
         self.connection_metadata: Dict[str, Dict] = {}
         self.message_queues: Dict[str, MessageQueue] = {}
+        self.senders: Dict[str, ClientSender] = {}  # Outbound queue per active connection
         self.connection_timeout = connection_timeout
         self.heartbeat_interval = heartbeat_interval
         self.max_queue_size = max_queue_size
+        self.send_queue_size = send_queue_size
         self._lock = asyncio.Lock()
         self._heartbeat_task: Optional[asyncio.Task] = None
         self._cleanup_task: Optional[asyncio.Task] = None
@@ -103,20 +273,12 @@ class ConnectionManager:
             "timestamp": asyncio.get_event_loop().time(),
             "data": {"status": "alive"}
         }
+        payload = serialize_message(heartbeat_message)
         
-        disconnected_clients = []
-        
-        for client_id, websocket in self.active_connections.items():
-            try:
-                await websocket.send_json(heartbeat_message)
-                await self._update_activity(client_id)
-            except Exception as e:
-                logger.warning(f"Heartbeat failed for client {client_id}: {e}")
-                disconnected_clients.append(client_id)
-        
-        # Clean up failed connections
-        for client_id in disconnected_clients:
-            await self._handle_connection_loss(client_id)
+        # Writer tasks send it; failed connections are handled by _on_send_failure.
+        # A newer heartbeat replaces an unsent one for a backed-up client.
+        for sender in list(self.senders.values()):
+            sender.put_nowait(payload, BackpressurePolicy.DROP_OLDEST)
     
     async def connect(self, websocket: WebSocket, client_id: Optional[str] = None):
         """Accept a new WebSocket connection with enhanced metadata"""
@@ -133,6 +295,7 @@ class ConnectionManager:
             is_reconnection = client_id in self.connection_metadata
             
             self.active_connections[client_id] = websocket
+            self._start_sender(client_id, websocket)
             
             if is_reconnection:
                 # Update existing metadata for reconnection
@@ -161,6 +324,31 @@ class ConnectionManager:
         logger.info(f"Total active connections: {len(self.active_connections)}")
         return client_id
     
+    def _start_sender(self, client_id: str, websocket: WebSocket):
+        """Create the outbound queue and writer task for a connection (replacing any previous one)"""
+        self._stop_sender(client_id)
+        
+        sender = ClientSender(
+            websocket,
+            self.send_queue_size,
+            on_sent=lambda: self._update_activity(client_id),
+            on_failure=lambda failed_sender, error: self._on_send_failure(client_id, failed_sender, error)
+        )
+        self.senders[client_id] = sender
+        sender.start()
+    
+    def _stop_sender(self, client_id: str):
+        sender = self.senders.pop(client_id, None)
+        if sender:
+            sender.close()
+    
+    async def _on_send_failure(self, client_id: str, sender: ClientSender, error: Exception):
+        """Writer task failed to send: treat as connection loss unless the client already reconnected"""
+        if self.senders.get(client_id) is not sender:
+            return
+        logger.warning(f"Send failed for client {client_id}: {error}")
+        await self._handle_connection_loss(client_id)
+    
     def disconnect(self, websocket: WebSocket, client_id: Optional[str] = None):
         """Remove a WebSocket connection with graceful handling"""
         if client_id is None:
@@ -171,13 +359,19 @@ class ConnectionManager:
                     break
         
         if client_id:
-            asyncio.create_task(self._handle_disconnection(client_id))
+            asyncio.create_task(self._handle_disconnection(client_id, websocket))
     
-    async def _handle_disconnection(self, client_id: str):
+    async def _handle_disconnection(self, client_id: str, websocket: Optional[WebSocket] = None):
         """Handle client disconnection with metadata update"""
         async with self._lock:
+            current = self.active_connections.get(client_id)
+            if websocket is not None and current is not None and current is not websocket:
+                # The client already reconnected; leave the new connection and its sender alone
+                return
+            
             if client_id in self.active_connections:
                 del self.active_connections[client_id]
+            self._stop_sender(client_id)
             
             if client_id in self.connection_metadata:
                 self.connection_metadata[client_id]["status"] = "disconnected"
@@ -190,6 +384,7 @@ class ConnectionManager:
         async with self._lock:
             if client_id in self.active_connections:
                 del self.active_connections[client_id]
+            self._stop_sender(client_id)
             
             if client_id in self.connection_metadata:
                 self.connection_metadata[client_id]["status"] = "connection_lost"
@@ -202,6 +397,7 @@ class ConnectionManager:
         async with self._lock:
             if client_id in self.active_connections:
                 del self.active_connections[client_id]
+            self._stop_sender(client_id)
             if client_id in self.connection_metadata:
                 del self.connection_metadata[client_id]
             if client_id in self.message_queues:
@@ -210,13 +406,19 @@ class ConnectionManager:
         logger.info(f"Client {client_id} removed completely. Total connections: {len(self.active_connections)}")
     
     async def send_personal_message(self, message: dict, client_id: str, queue_if_offline: bool = True) -> bool:
-        """Send a message to a specific client with offline queuing support"""
-        websocket = self.active_connections.get(client_id)
+        """
+        Send a message to a specific client with offline queuing support
         
-        if websocket:
+        The message goes through the client's send queue (BLOCK policy) so it
+        stays in order with broadcasts; this waits until it has been sent.
+        """
+        sender = self.senders.get(client_id)
+        
+        if sender:
             try:
-                await websocket.send_json(message)
-                await self._update_activity(client_id)
+                future = await sender.put(serialize_message(message))
+                if future is None or not await future:
+                    raise ConnectionError("message was not delivered")
                 logger.debug(f"Message sent to client {client_id}")
                 return True
             except Exception as e:
@@ -239,70 +441,122 @@ class ConnectionManager:
                 logger.warning(f"Client {client_id} not found and queuing disabled")
                 return False
     
+    async def queue_message(self,
+                            message: dict,
+                            client_id: str,
+                            policy: BackpressurePolicy = BackpressurePolicy.BLOCK) -> bool:
+        """
+        Queue a message on a connected client's send queue without waiting for it to be sent
+        
+        Keeps replies in order with broadcasts and personal messages. Under the
+        BLOCK policy this waits (up to ClientSender.BLOCK_TIMEOUT) for queue
+        space; send failures are handled by the client's writer task.
+        
+        Returns:
+            True if the message was queued, False if the client has no active
+            connection or the message was dropped
+        """
+        sender = self.senders.get(client_id)
+        if sender is None:
+            return False
+        return await sender.put(serialize_message(message), policy) is not None
+    
     async def send_queued_messages(self, client_id: str) -> int:
-        """Send all queued messages to a reconnected client"""
-        if client_id not in self.message_queues or client_id not in self.active_connections:
+        """Send all queued messages to a reconnected client through its send queue"""
+        if client_id not in self.message_queues or client_id not in self.senders:
             return 0
         
-        websocket = self.active_connections[client_id]
+        sender = self.senders[client_id]
         message_queue = self.message_queues[client_id]
         messages = message_queue.get_all_messages()
         
         if not messages:
             return 0
         
-        sent_count = 0
-        failed_messages = []
-        
+        deliveries = []
         for message in messages:
-            try:
-                # Add replay indicator
-                message["replayed"] = True
-                message["replayed_at"] = asyncio.get_event_loop().time()
-                
-                await websocket.send_json(message)
-                sent_count += 1
-                await self._update_activity(client_id)
-            except Exception as e:
-                logger.error(f"Failed to send queued message to client {client_id}: {e}")
-                failed_messages.append(message)
-                break  # Stop sending if connection fails
+            # Add replay indicator
+            message["replayed"] = True
+            message["replayed_at"] = asyncio.get_event_loop().time()
+            
+            future = await sender.put(serialize_message(message))
+            if future is None:
+                break
+            deliveries.append(future)
         
-        # Clear successfully sent messages, keep failed ones
+        # Messages are sent in order, so everything after the first failure was not delivered
+        results = await asyncio.gather(*deliveries)
+        sent_count = results.index(False) if False in results else len(results)
+        
+        # Clear successfully sent messages, keep the rest for the next reconnection
         if sent_count > 0:
             message_queue.clear()
-            for failed_msg in failed_messages:
+            for failed_msg in messages[sent_count:]:
                 message_queue.add_message(failed_msg)
+        if sent_count < len(messages):
+            logger.error(f"Failed to send {len(messages) - sent_count} queued messages to client {client_id}")
         
         logger.info(f"Sent {sent_count} queued messages to client {client_id}")
         return sent_count
     
-    async def broadcast(self, message: dict, exclude_clients: Optional[List[str]] = None):
-        """Send a message to all connected clients with enhanced error handling"""
-        if not self.active_connections:
-            return
+    async def broadcast(self,
+                        message: dict,
+                        exclude_clients: Optional[List[str]] = None,
+                        policy: BackpressurePolicy = BackpressurePolicy.BLOCK) -> int:
+        """
+        Queue a message for all connected clients
+        
+        The message is serialized once and the same text is queued for every
+        client; writer tasks do the sending. Under the BLOCK policy, clients
+        with a full queue are waited on concurrently (up to
+        ClientSender.BLOCK_TIMEOUT); under DROP_OLDEST nothing waits.
+        
+        Args:
+            message: Message to send
+            exclude_clients: Client IDs to skip
+            policy: Backpressure policy for clients whose queue is full
+            
+        Returns:
+            Number of clients the message was queued for
+        """
+        if not self.senders:
+            return 0
         
-        exclude_clients = exclude_clients or []
-        disconnected_clients = []
-        successful_sends = 0
+        exclude_clients = set(exclude_clients or [])
+        payload = serialize_message(message)
+        targets = [sender for client_id, sender in self.senders.items() if client_id not in exclude_clients]
+        queued = 0
+        blocked = []
         
-        for client_id, websocket in self.active_connections.items():
-            if client_id in exclude_clients:
-                continue
-                
+        for sender in targets:
             try:
-                await websocket.send_json(message)
-                await self._update_activity(client_id)
-                successful_sends += 1
-            except Exception as e:
-                logger.error(f"Failed to broadcast to client {client_id}: {e}")
-                disconnected_clients.append(client_id)
+                if sender.put_nowait(payload, policy) is not None:
+                    queued += 1
+            except asyncio.QueueFull:
+                blocked.append(sender.put(payload, policy))
         
-        # Clean up disconnected clients
-        for client_id in disconnected_clients:
-            await self._handle_connection_loss(client_id)
+        if blocked:
+            results = await asyncio.gather(*blocked)
+            queued += sum(1 for future in results if future is not None)
         
-        logger.info(f"Broadcast sent to {successful_sends} clients, {len(disconnected_clients)} failed")
+        logger.debug(f"Broadcast queued for {queued} clients, {len(targets) - queued} dropped")
+        return queued
+    
+    async def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every send queue has drained
+        
+        Returns:
+            True if all queues drained, False on timeout
+        """
+        drains = [sender.drain() for sender in list(self.senders.values())]
+        if not drains:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.gather(*drains), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     async def _update_activity(self, client_id: str):
         """Update client activity metadata"""
@@ -329,6 +583,9 @@ class ConnectionManager:
                 "is_active": client_id in self.active_connections,
                 "queued_messages": self.message_queues.get(client_id, MessageQueue()).size()
             }
+            sender = self.senders.get(client_id)
+            if sender:
+                connections_info[client_id]["send_queue"] = {"pending": sender.size(), **sender.stats}
         
         return {
             "total_connections": len(self.active_connections),
@@ -337,7 +594,8 @@ class ConnectionManager:
             "system_info": {
                 "heartbeat_interval": self.heartbeat_interval,
                 "connection_timeout": self.connection_timeout,
-                "max_queue_size": self.max_queue_size
+                "max_queue_size": self.max_queue_size,
+                "send_queue_size": self.send_queue_size
             }
         }
     
@@ -395,6 +653,11 @@ class ConnectionManager:
             except asyncio.CancelledError:
                 pass
         
+        # Give writers a moment to send what is queued, then stop them
+        await self.flush(timeout=1.0)
+        for client_id in list(self.senders):
+            self._stop_sender(client_id)
+        
         # Close all active connections
         for client_id, websocket in list(self.active_connections.items()):
             try:
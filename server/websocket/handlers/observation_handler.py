@@ -8,10 +8,11 @@ the neural network with simulation-gated inference.
 import asyncio
 import json
 import logging
-from typing import Dict, Any, Optional, Callable, Tuple, TYPE_CHECKING
+from typing import Dict, Any, Optional, Callable, Set, Tuple, TYPE_CHECKING
 
 from websocket.schemas import ParsedMessage
 from websocket.handlers.base import create_error_response
+from ai_engine.latency_metrics import LatencyMetrics, get_latency_metrics
 from ai_engine.exceptions import (
     InvalidObservationError,
     ModelNotInitializedError,
@@ -47,6 +48,9 @@ class ObservationHandler:
     6. Response generation
     """
 
+    INFERENCE_TIMEOUT = 1.0  # Seconds per inference (the model is warmed up at startup)
+    MODEL_WAIT_TIMEOUT = 30.0  # Seconds an observation waits for a model still being built
+
     def __init__(
         self,
         feature_extractor: Optional["FeatureExtractor"],
@@ -57,7 +61,8 @@ class ObservationHandler:
         replay_buffer: Optional["ExperienceReplayBuffer"],
         background_trainer: Optional["BackgroundTrainer"],
         nn_config: Any,
-        get_dashboard_metrics_func: Callable[[], "DashboardMetrics"]
+        get_dashboard_metrics_func: Callable[[], "DashboardMetrics"],
+        latency_metrics: Optional[LatencyMetrics] = None
     ) -> None:
         """
         Initialize the observation handler.
@@ -72,6 +77,7 @@ class ObservationHandler:
             background_trainer: BackgroundTrainer instance
             nn_config: NN configuration object
             get_dashboard_metrics_func: Function to get dashboard metrics singleton
+            latency_metrics: Stage latency histograms (defaults to the global instance)
         """
         self.feature_extractor: Optional["FeatureExtractor"] = feature_extractor
         self.nn_model: Optional["NNModel"] = nn_model
@@ -82,11 +88,23 @@ class ObservationHandler:
         self.background_trainer: Optional["BackgroundTrainer"] = background_trainer
         self.nn_config: Any = nn_config
         self.get_dashboard_metrics: Callable[[], "DashboardMetrics"] = get_dashboard_metrics_func
+        self.latency_metrics: LatencyMetrics = latency_metrics or get_latency_metrics()
+        self.model_pending: Optional[asyncio.Future] = None  # Set while the NN model is built in the background
 
         # Store previous observations for reward calculation (per territory)
         self.prev_observations: Dict[str, Dict[str, Any]] = {}
         self.prev_decisions: Dict[str, Dict[str, Any]] = {}
 
+        # Admission tracking for stale-observation coalescing (per territory)
+        self._latest_admitted: Dict[str, Dict[str, Any]] = {}
+        self._admitted_pending: Dict[str, int] = {}
+        self._admitted_ids: Set[int] = set()  # id() of admitted observations not yet released
+        self.coalescing_stats = {
+            'admitted': 0,
+            'coalesced': 0,
+            'coalesced_by_territory': {}
+        }
+
         # Thinking loop statistics
         self.thinking_stats = {
             'observations_since_last_action': 0,
@@ -95,6 +113,84 @@ class ObservationHandler:
             'confidence_overrides': 0
         }
 
+    def admit(self, observation: Dict[str, Any]) -> None:
+        """
+        Register an observation that has been received but not yet handled.
+
+        Called on read-ahead (pipelined connections). When a territory has
+        several admitted observations pending, all but the newest are
+        coalesced: they only advance the reward chain, and the NN and gate
+        run for the newest one.
+
+        Args:
+            observation: Observation data dict (the message's "data")
+        """
+        territory_id = observation.get("territoryId", "unknown")
+        self._latest_admitted[territory_id] = observation
+        self._admitted_pending[territory_id] = self._admitted_pending.get(territory_id, 0) + 1
+        self._admitted_ids.add(id(observation))
+        self.coalescing_stats['admitted'] += 1
+
+    def release(self, observation: Dict[str, Any]) -> bool:
+        """
+        Release an observation's admission (no-op if not admitted or already released).
+
+        Returns:
+            True if a newer observation for the same territory is still pending
+        """
+        if id(observation) not in self._admitted_ids:
+            return False  # Not admitted (sequential handling) or already released
+        self._admitted_ids.discard(id(observation))
+
+        territory_id = observation.get("territoryId", "unknown")
+        latest = self._latest_admitted.get(territory_id)
+        remaining = self._admitted_pending.get(territory_id, 1) - 1
+        if remaining <= 0:
+            self._latest_admitted.pop(territory_id, None)
+            self._admitted_pending.pop(territory_id, None)
+        else:
+            self._admitted_pending[territory_id] = remaining
+        return observation is not latest and remaining > 0
+
+    def _coalesce_observation(self, observation: Dict[str, Any], territory_id: str) -> Dict[str, Any]:
+        """
+        Handle a superseded observation without NN inference or gate evaluation.
+
+        The previous decision still gets its reward from this observation,
+        and this observation becomes the baseline for the next one (with no
+        decision of its own), so the reward chain is the same as if every
+        observation had been processed.
+        """
+        self._calculate_and_update_reward(territory_id, observation)
+        self.prev_observations[territory_id] = observation
+        self.prev_decisions.pop(territory_id, None)
+
+        self.coalescing_stats['coalesced'] += 1
+        by_territory = self.coalescing_stats['coalesced_by_territory']
+        by_territory[territory_id] = by_territory.get(territory_id, 0) + 1
+        logger.info(f"[Observation] Coalesced superseded observation for territory {territory_id}")
+
+        return {
+            "type": "spawn_decision",
+            "timestamp": asyncio.get_event_loop().time(),
+            "data": {
+                "spawnChunk": -1,
+                "spawnType": None,
+                "confidence": 0.0,
+                "skipped": True,
+                "skipReason": "superseded"
+            }
+        }
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Get stale-observation coalescing counters."""
+        return {
+            'admitted': self.coalescing_stats['admitted'],
+            'coalesced': self.coalescing_stats['coalesced'],
+            'coalesced_by_territory': dict(self.coalescing_stats['coalesced_by_territory']),
+            'pending': dict(self._admitted_pending)
+        }
+
     async def handle(self, message: ParsedMessage) -> Optional[Dict[str, Any]]:
         """
         Handle observation message using new ParsedMessage format.
@@ -134,6 +230,9 @@ class ObservationHandler:
                 logger.warning(f"[Observation] Missing observation data from client {client_id}")
                 raise InvalidObservationError("data", "Missing observation data")
 
+            if self.release(observation):
+                return self._coalesce_observation(observation, observation.get("territoryId", "unknown"))
+
             # Log raw observation data from frontend
             logger.info(f"[RAW] {json.dumps(observation)}")
 
@@ -142,6 +241,9 @@ class ObservationHandler:
                 logger.warning(f"[Observation] FeatureExtractor not available for client {client_id}")
                 raise ModelNotInitializedError("FeatureExtractor")
 
+            if not self.nn_model and self.model_pending is not None:
+                await self._wait_for_model()
+
             if not self.nn_model:
                 logger.warning(f"[Observation] NNModel not available for client {client_id}")
                 raise ModelNotInitializedError("NNModel")
@@ -180,7 +282,8 @@ class ObservationHandler:
         territory_id: str,
         client_id: str
     ) -> Dict[str, Any]:
-        """Process observation through the full pipeline."""
+        """Process observation through the full pipeline (each stage is timed)."""
+        timer = self.latency_metrics.stage_timer("observation_data")
         try:
             # Log raw observation data
             workers_mining = observation.get('miningWorkers', [])
@@ -199,21 +302,27 @@ class ObservationHandler:
             # === PREPROCESS GATE: Skip NN pipeline if no activity ===
             if self.preprocess_gate:
                 preprocess_result = self._check_preprocess_gate(observation, queen_energy)
+                timer.lap("preprocess_gate")
                 if preprocess_result is not None:
+                    timer.finish("total_skipped")
                     return preprocess_result
 
             # Update dashboard game state
             self._update_dashboard_game_state(observation, territory_id, queen_energy, workers_present, workers_mining, protectors)
+            timer.lap("dashboard_update")
 
             # Calculate reward from previous observation
             self._calculate_and_update_reward(territory_id, observation)
+            timer.lap("reward_calculation")
 
             # Extract features
             features = self.feature_extractor.extract(observation)
             logger.info(f"[FEATURES] {','.join(f'{f:.4f}' for f in features)}")
+            timer.lap("feature_extraction")
 
             # Run NN inference
             spawn_decision = await self._run_nn_inference(features)
+            timer.lap("nn_inference")
             nn_decision = spawn_decision['nnDecision']
             confidence = spawn_decision['confidence']
             spawn_chunk = spawn_decision['spawnChunk']
@@ -223,16 +332,19 @@ class ObservationHandler:
 
             # Record entropy for distribution health monitoring
             self._record_entropy(features)
+            timer.lap("entropy")
 
             # === SIMULATION-GATED INFERENCE ===
             gate_decision, should_skip = self._evaluate_gate(
                 observation, spawn_chunk, spawn_type, confidence, nn_decision, territory_id
             )
+            timer.lap("gate_evaluation")
 
             # Add experience to replay buffer
             self._add_experience_to_buffer(
                 features, spawn_chunk, spawn_type, confidence, gate_decision, territory_id
             )
+            timer.lap("buffer_add")
 
             # Store for next reward calculation
             self.prev_observations[territory_id] = observation
@@ -243,7 +355,10 @@ class ObservationHandler:
             }
 
             # Generate response
-            return self._generate_response(spawn_decision, gate_decision, nn_decision, confidence)
+            response = self._generate_response(spawn_decision, gate_decision, nn_decision, confidence)
+            timer.lap("response")
+            timer.finish()
+            return response
 
         except asyncio.TimeoutError:
             logger.warning(f"[Observation] Inference timeout for client {client_id}")
@@ -368,6 +483,17 @@ class ObservationHandler:
             if self.simulation_gate:
                 self.simulation_gate.record_actual_reward(reward_info['reward'])
 
+    async def _wait_for_model(self) -> None:
+        """Wait for a background model build to finish (bounded by MODEL_WAIT_TIMEOUT)."""
+        if self.model_pending.done():
+            return
+        try:
+            await asyncio.wait_for(asyncio.shield(self.model_pending), timeout=self.MODEL_WAIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("[Observation] Timed out waiting for the NN model to initialize")
+        except Exception as e:
+            logger.warning(f"[Observation] NN model initialization failed: {e}")
+
     async def _run_nn_inference(self, features) -> Dict[str, Any]:
         """Run NN inference with timeout."""
         return await asyncio.wait_for(
@@ -376,7 +502,7 @@ class ObservationHandler:
                 self.nn_model.get_spawn_decision,
                 features
             ),
-            timeout=2.0  # 2s timeout to allow TensorFlow warm-up
+            timeout=self.INFERENCE_TIMEOUT
         )
 
     def _record_entropy(self, features) -> None:
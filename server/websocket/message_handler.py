@@ -10,11 +10,11 @@ import json
 import logging
 import os
 import uuid
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 
 from websocket.schemas import (
-    MessageType, ParsedMessage, MESSAGE_SCHEMAS,
+    MessageType, ParsedMessage, MESSAGE_SCHEMAS, STRUCTURAL_CHECKS,
     validate_message, get_message_type
 )
 from websocket.message_router import MessageRouter
@@ -26,11 +26,12 @@ from websocket.handlers.game_state_handler import GameStateHandler
 from websocket.handlers.system_handler import SystemHandler
 
 from ai_engine.feature_extractor import FeatureExtractor
-from ai_engine.nn_model import NNModel
 from ai_engine.reward_calculator import RewardCalculator
 from ai_engine.config import get_config
 from ai_engine.decision_gate import SimulationGate, SimulationGateConfig, PreprocessGate
 from ai_engine.decision_gate.dashboard_metrics import get_dashboard_metrics
+from ai_engine.latency_metrics import get_latency_metrics
+from websocket.trace_recorder import TraceRecorder
 from ai_engine.training import (
     ExperienceReplayBuffer,
     ContinuousTrainingConfig,
@@ -46,18 +47,57 @@ class MessageHandler:
 
     Coordinates all message processing for the AI backend.
     Delegates to specialized handlers for each message type category.
+
+    With fast validation enabled, a client whose messages of a given type
+    have passed full schema validation VERIFIED_CLIENT_THRESHOLD times in a
+    row is switched to a structural check for that type. Any validation or
+    processing failure drops the client back to full validation.
     """
 
-    def __init__(self, ai_engine):
+    VERIFIED_CLIENT_THRESHOLD = 50  # Consecutive fully validated messages per type
+
+    def __init__(
+        self,
+        ai_engine,
+        fast_validation: Optional[bool] = None,
+        defer_model: bool = False,
+        trace_path: Optional[str] = None
+    ):
         """
         Initialize the message handler.
 
         Args:
             ai_engine: AIEngine instance
+            fast_validation: Enable structural validation for verified clients
+                (defaults to the WS_FAST_VALIDATION environment variable)
+            defer_model: Skip building the NN model and background trainer (which
+                import torch); call start_model_initialization() to build them
+                in the background
+            trace_path: Record incoming messages to this trace file (defaults to
+                the WS_TRACE_PATH environment variable; unset disables recording)
         """
         self.ai_engine = ai_engine
+        self.defer_model = defer_model
+        self.model_task: Optional[asyncio.Task] = None
         self.router = MessageRouter()
 
+        if fast_validation is None:
+            fast_validation = os.environ.get("WS_FAST_VALIDATION", "0").lower() in ("1", "true", "yes")
+        self.fast_validation = fast_validation
+        self._verified_counts: Dict[tuple, int] = {}  # (client_id, message_type) -> consecutive valid
+        self._admitted_validation: Dict[int, Tuple[bool, Optional[str]]] = {}  # id(message) -> result at read-ahead
+
+        # Optional capture of incoming traffic for replay load tests (benchmarks/replay.py)
+        if trace_path is None:
+            trace_path = os.environ.get("WS_TRACE_PATH") or None
+        self.trace_recorder = TraceRecorder(trace_path) if trace_path else None
+        if self.trace_recorder:
+            logger.info(f"Recording incoming messages to trace {trace_path}")
+
+        # Per-message-type latency (unknown types share one label to bound cardinality)
+        self.latency_metrics = get_latency_metrics()
+        self._timed_message_types = frozenset(self._get_all_handler_types())
+
         # Message processing statistics
         self.message_stats = {
             "total_processed": 0,
@@ -90,14 +130,6 @@ class MessageHandler:
         except Exception as e:
             logger.warning(f"Failed to initialize FeatureExtractor: {e}")
 
-        # Initialize NN model
-        self.nn_model = None
-        try:
-            self.nn_model = NNModel()
-            logger.info(f"NNModel initialized with {self.nn_model._count_parameters()} parameters")
-        except Exception as e:
-            logger.warning(f"Failed to initialize NNModel: {e}")
-
         # Initialize reward calculator
         self.reward_calculator = None
         try:
@@ -122,14 +154,80 @@ class MessageHandler:
         except Exception as e:
             logger.warning(f"Failed to initialize PreprocessGate: {e}")
 
-        # Initialize background training
-        self._init_background_training()
-
-    def _init_background_training(self) -> None:
-        """Initialize background training with experience replay buffer."""
+        # Initialize NN model and background training (or defer them)
+        self.nn_model = None
         self.replay_buffer = None
         self.background_trainer = None
+        if not self.defer_model:
+            self._init_nn_model()
+            self._init_background_training()
 
+    def _init_nn_model(self) -> None:
+        """Initialize the NN model (imports torch on first use)."""
+        try:
+            from ai_engine.nn_model import NNModel
+            self.nn_model = NNModel()
+            logger.info(f"NNModel initialized with {self.nn_model._count_parameters()} parameters")
+        except Exception as e:
+            logger.warning(f"Failed to initialize NNModel: {e}")
+
+    def start_model_initialization(self, report=None) -> asyncio.Task:
+        """
+        Build the deferred NN model and background trainer in the background.
+
+        The model is built and warmed up on a worker thread, then attached to
+        the handlers. Observations that arrive meanwhile wait for the task.
+
+        Args:
+            report: Optional StartupReport to record component timings in
+
+        Returns:
+            Task that completes when the model components are attached
+        """
+        if self.model_task is None:
+            self.model_task = asyncio.get_running_loop().create_task(self._initialize_model(report))
+            self.observation_handler.model_pending = self.model_task
+        return self.model_task
+
+    async def _initialize_model(self, report=None) -> None:
+        """Build, warm up and attach the NN model components."""
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._build_model_components, report)
+        self.attach_model_components()
+        if report is not None:
+            report.mark_complete()
+
+    def _build_model_components(self, report=None) -> None:
+        """Build the NN model and background trainer (runs on a worker thread)."""
+        def timed(component, func):
+            if report is None:
+                return func()
+            with report.time(component):
+                return func()
+
+        timed("nn_model", self._init_nn_model)
+        if self.nn_model is not None:
+            try:
+                timed("nn_warm_up", self.nn_model.warm_up)
+            except Exception as e:
+                logger.warning(f"NNModel warm-up failed: {e}")
+        timed("background_training", self._init_background_training)
+
+    def attach_model_components(self) -> None:
+        """
+        Hand the NN model components to the handlers that use them.
+
+        Call again after replacing nn_model, replay_buffer or
+        background_trainer (e.g. benchmarks and sweeps that build their own).
+        """
+        self.observation_handler.nn_model = self.nn_model
+        self.observation_handler.replay_buffer = self.replay_buffer
+        self.observation_handler.background_trainer = self.background_trainer
+        self.training_handler.background_trainer = self.background_trainer
+        self.gate_handler.replay_buffer = self.replay_buffer
+
+    def _init_background_training(self) -> None:
+        """Initialize background training with experience replay buffer."""
         try:
             config_name = os.environ.get("TRAINING_CONFIG", "continuous_training.yaml")
             config_path = Path(__file__).parent.parent / "ai_engine" / "configs" / config_name
@@ -251,6 +349,81 @@ class MessageHandler:
         self.router.register("difficulty_status_request", self.system_handler.handle_difficulty_status_request)
         self.router.register("learning_progress_request", self.system_handler.handle_learning_progress_request)
 
+    def admit_message(self, message: Dict[str, Any], client_id: str) -> None:
+        """
+        Note a message that has been read ahead but not yet handled.
+
+        Observations are validated here, once, exactly as handle_message
+        would (structural check for verified clients), and handle_message
+        reuses the result. Valid ones are admitted so that an older pending
+        observation for the same territory can be coalesced (see
+        ObservationHandler.admit); invalid ones are left for handle_message
+        to reject, so they never supersede valid ones.
+
+        Args:
+            message: Message data from client
+            client_id: ID of the client that sent the message
+        """
+        if not isinstance(message, dict) or message.get("type") != "observation_data":
+            return
+        result = self._validate(message, client_id)
+        self._admitted_validation[id(message)] = result
+        if result[0]:
+            self.observation_handler.admit(message["data"])
+
+    def _verification_key(self, message: Any, client_id: str) -> Optional[tuple]:
+        """Key for validation trust, or None if the message type has no structural fast path"""
+        if self.fast_validation and isinstance(message, dict) and message.get("type") in STRUCTURAL_CHECKS:
+            return (client_id, message["type"])
+        return None
+
+    def _validate(self, message: Any, client_id: str) -> Tuple[bool, Optional[str]]:
+        """
+        Validate a message (structural check only for verified clients) and update client trust.
+
+        Returns:
+            (is_valid, error message or None)
+        """
+        verification_key = self._verification_key(message, client_id)
+        structural_only = (
+            verification_key is not None and
+            self._verified_counts.get(verification_key, 0) >= self.VERIFIED_CLIENT_THRESHOLD
+        )
+
+        is_valid, error = validate_message(message, structural_only=structural_only)
+        if not is_valid:
+            self._verified_counts.pop(verification_key, None)
+        elif verification_key is not None and not structural_only:
+            self._verified_counts[verification_key] = self._verified_counts.get(verification_key, 0) + 1
+        return is_valid, error
+
+    def record_incoming(self, message: Any, client_id: str) -> None:
+        """
+        Append a message to the trace, if recording, as soon as it is received.
+
+        Called by the connection's receive loop before the message is handled
+        or submitted to a pipeline, so the trace keeps arrival order and
+        timing, and includes messages that are never handled.
+
+        Args:
+            message: Message data from client, as received
+            client_id: ID of the client that sent the message
+        """
+        if self.trace_recorder is not None:
+            self.trace_recorder.record(client_id, message)
+
+    def release_message(self, message: Dict[str, Any], client_id: str) -> None:
+        """
+        Drop a read-ahead message's admission once it is done (or abandoned).
+
+        Safe to call for any message, and more than once.
+        """
+        self._admitted_validation.pop(id(message), None)
+        if isinstance(message, dict) and message.get("type") == "observation_data":
+            data = message.get("data")
+            if isinstance(data, dict):
+                self.observation_handler.release(data)
+
     async def handle_message(
         self,
         message: Dict[str, Any],
@@ -267,10 +440,18 @@ class MessageHandler:
             Response message or None if no response needed
         """
         self.message_stats["total_processed"] += 1
+        verification_key = None
+        timed_type = message.get("type") if isinstance(message, dict) else None
+        timer = self.latency_metrics.stage_timer(
+            timed_type if timed_type in self._timed_message_types else "unknown"
+        )
 
         try:
-            # Validate message structure
-            is_valid, error = validate_message(message)
+            # Read-ahead messages were already validated when admitted
+            verification_key = self._verification_key(message, client_id)
+            admitted = self._admitted_validation.pop(id(message), None)
+            is_valid, error = admitted if admitted is not None else self._validate(message, client_id)
+            timer.lap("validation")
             if not is_valid:
                 self.message_stats["validation_errors"] += 1
                 self.message_stats["failed"] += 1
@@ -299,6 +480,7 @@ class MessageHandler:
 
         except Exception as e:
             logger.error(f"Error handling message from client {client_id}: {e}", exc_info=True)
+            self._verified_counts.pop(verification_key, None)
             self.message_stats["processing_errors"] += 1
             self.message_stats["failed"] += 1
             return create_error_response(
@@ -308,6 +490,19 @@ class MessageHandler:
                 supported_message_types=list(self._get_all_handler_types())
             )
 
+        finally:
+            timer.finish("handle")
+
+    async def close(self) -> None:
+        """Write out and stop the trace recorder, if recording (off the event loop)."""
+        if self.trace_recorder is not None:
+            await asyncio.to_thread(self.trace_recorder.close)
+
+    def forget_client(self, client_id: str) -> None:
+        """Drop validation trust for a disconnected client."""
+        for key in [key for key in self._verified_counts if key[0] == client_id]:
+            del self._verified_counts[key]
+
     def serialize_message(self, message: Dict[str, Any]) -> str:
         """Serialize message to JSON string."""
         try:
@@ -337,5 +532,27 @@ class MessageHandler:
             "success_rate": (
                 self.message_stats["successful"] / max(1, self.message_stats["total_processed"])
             ) * 100,
+            "observation_coalescing": self.observation_handler.get_coalescing_stats(),
+            "latency": self.latency_metrics.get_summary(),
+            "trace": self.trace_recorder.get_statistics() if self.trace_recorder else None,
             "supported_message_types": list(self._get_all_handler_types())
         }
+
+    def update_metric_gauges(self) -> None:
+        """Refresh the gauges and counters exported with the latency histograms."""
+        metrics = self.latency_metrics
+        metrics.set_counter("messages_processed", self.message_stats["total_processed"],
+                          "Messages handled since startup")
+        metrics.set_counter("messages_failed", self.message_stats["failed"],
+                          "Messages that failed validation or processing")
+        if self.replay_buffer is not None:
+            metrics.set_gauge("replay_buffer_depth", len(self.replay_buffer),
+                              "Experiences waiting in the replay buffer")
+        if self.background_trainer is not None:
+            training = self.background_trainer.get_metrics()["training"]
+            metrics.set_gauge("model_version", self.background_trainer.model_version,
+                              "Current NN model version")
+            metrics.set_counter("training_steps", training["total_steps"],
+                              "Training steps since startup")
+            metrics.set_gauge("training_step_time_ms_avg", training["average_step_time_ms"],
+                              "Mean of recent training step times in milliseconds")
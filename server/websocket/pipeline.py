@@ -0,0 +1,153 @@
+"""
+WebSocket Message Pipeline - Read-ahead, concurrent message handling per connection
+
+Opt-in alternative to handling one message at a time. Each message is
+assigned a lane; messages in the same lane are handled and answered in
+arrival order, while different lanes run concurrently. Lanes are per
+territory, so responses for a territory never overtake each other.
+
+Messages are admitted to the handler when read and released when done,
+which lets the handler coalesce superseded observations.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class MessagePipeline:
+    """
+    Bounded read-ahead pipeline for one WebSocket connection.
+
+    Lane assignment:
+    - Messages carrying data.territoryId use that territory's lane
+    - Messages without a territory (e.g. spawn_result) follow the lane of
+      the most recent territory message, so they stay ordered with it
+    - INDEPENDENT_TYPES get a lane of their own per type
+    - BARRIER_TYPES wait for everything in flight, and everything after
+      them waits for the barrier
+    """
+
+    BARRIER_TYPES = {"reset_nn"}  # Must not overlap any other message
+    INDEPENDENT_TYPES = {"learning_progress_request"}  # Read-only, no ordering needed
+    DEFAULT_LANE = "connection"
+
+    def __init__(self,
+                 handle_message: Callable[[Dict[str, Any], str], Awaitable[Optional[Dict[str, Any]]]],
+                 send_response: Callable[[Dict[str, Any]], Awaitable[None]],
+                 client_id: str,
+                 max_in_flight: int = 8,
+                 admit_message: Optional[Callable[[Dict[str, Any], str], None]] = None,
+                 release_message: Optional[Callable[[Dict[str, Any], str], None]] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            handle_message: Coroutine handling one message (MessageHandler.handle_message)
+            send_response: Coroutine sending one response to the client
+            client_id: Connection's client ID
+            max_in_flight: Messages read ahead before submit() waits
+            admit_message: Called when a message is read ahead
+                (MessageHandler.admit_message)
+            release_message: Called once a message is handled, failed or
+                cancelled (MessageHandler.release_message)
+        """
+        self._handle_message = handle_message
+        self._send_response = send_response
+        self.client_id = client_id
+        self.max_in_flight = max_in_flight
+        self._admit_message = admit_message
+        self._release_message = release_message
+
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._lanes: Dict[str, asyncio.Task] = {}  # Lane -> most recent task in that lane
+        self._tasks: Set[asyncio.Task] = set()
+        self._barrier: Optional[asyncio.Task] = None
+        self._last_territory_lane: Optional[str] = None
+
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "peak_in_flight": 0}
+
+    def lane_for(self, message: Dict[str, Any]) -> str:
+        """Get the ordering lane for a message"""
+        message_type = message.get("type") if isinstance(message, dict) else None
+        if message_type in self.INDEPENDENT_TYPES:
+            return f"type:{message_type}"
+
+        data = message.get("data") if isinstance(message, dict) else None
+        territory_id = data.get("territoryId") if isinstance(data, dict) else None
+        if isinstance(territory_id, str):
+            self._last_territory_lane = f"territory:{territory_id}"
+            return self._last_territory_lane
+
+        return self._last_territory_lane or self.DEFAULT_LANE
+
+    async def submit(self, message: Dict[str, Any]) -> None:
+        """
+        Start handling a message; waits only while max_in_flight messages are pending.
+        """
+        await self._slots.acquire()
+        if self._admit_message:
+            self._admit_message(message, self.client_id)
+
+        message_type = message.get("type") if isinstance(message, dict) else None
+        if message_type in self.BARRIER_TYPES:
+            lane = None
+            waits = list(self._tasks)
+        else:
+            lane = self.lane_for(message)
+            waits = [self._lanes.get(lane), self._barrier]
+
+        task = asyncio.create_task(self._process(message, [w for w in waits if w is not None]))
+        self._tasks.add(task)
+        if lane is None:
+            self._barrier = task
+        else:
+            self._lanes[lane] = task
+        task.add_done_callback(lambda t: self._on_done(t, lane, message))
+
+        self.stats["submitted"] += 1
+        self.stats["peak_in_flight"] = max(self.stats["peak_in_flight"], len(self._tasks))
+
+    async def _process(self, message: Dict[str, Any], waits: List[asyncio.Task]) -> None:
+        if waits:
+            # Predecessor outcomes do not matter, only their completion
+            await asyncio.wait(waits)
+
+        try:
+            response = await self._handle_message(message, self.client_id)
+            if response:
+                await self._send_response(response)
+            self.stats["completed"] += 1
+        except Exception as e:
+            self.stats["failed"] += 1
+            logger.error(f"Pipelined message from client {self.client_id} failed: {e}")
+
+    def _on_done(self, task: asyncio.Task, lane: Optional[str], message: Dict[str, Any]) -> None:
+        self._tasks.discard(task)
+        self._slots.release()
+        if self._release_message:
+            self._release_message(message, self.client_id)
+        if lane is None:
+            if self._barrier is task:
+                self._barrier = None
+        elif self._lanes.get(lane) is task:
+            del self._lanes[lane]
+
+    def in_flight(self) -> int:
+        """Get number of messages submitted but not yet answered"""
+        return len(self._tasks)
+
+    async def drain(self) -> None:
+        """Wait for every submitted message to be handled"""
+        while self._tasks:
+            await asyncio.wait(list(self._tasks))
+
+    async def close(self) -> None:
+        """Cancel pending messages (the connection is gone)"""
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -23,6 +23,9 @@ Usage:
     # Validate incoming message
     is_valid, error = validate_message(raw_message)
 
+    # Cheap structural check for messages from a verified client
+    is_valid, error = validate_message(raw_message, structural_only=True)
+
     # Parse into typed structure
     parsed = ParsedMessage(type=MessageType.OBSERVATION_DATA, data=data, ...)
 """
@@ -33,7 +36,9 @@ from typing import Dict, Any, Optional, List
 import time
 import logging
 
-from jsonschema import validate, ValidationError
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 logger = logging.getLogger(__name__)
 
@@ -326,12 +331,98 @@ MESSAGE_SCHEMAS: Dict[str, Dict] = {
 }
 
 
-def validate_message(message: Dict[str, Any]) -> tuple[bool, Optional[str]]:
+# Compiled validators by message type, built once per schema
+_COMPILED_VALIDATORS: Dict[str, Any] = {}
+
+
+def compile_schema(schema: Dict[str, Any]):
+    """
+    Check a schema once and build a reusable validator for it.
+
+    Args:
+        schema: JSON schema
+
+    Returns:
+        jsonschema validator instance for the schema's draft
+    """
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def get_validator(message_type: str):
+    """
+    Get the compiled validator for a message type.
+
+    Validators are recompiled if the schema in MESSAGE_SCHEMAS was replaced.
+
+    Args:
+        message_type: Message type string
+
+    Returns:
+        Validator instance or None if no schema is defined
+    """
+    schema = MESSAGE_SCHEMAS.get(message_type)
+    if not schema:
+        return None
+
+    validator = _COMPILED_VALIDATORS.get(message_type)
+    if validator is None or validator.schema is not schema:
+        validator = compile_schema(schema)
+        _COMPILED_VALIDATORS[message_type] = validator
+    return validator
+
+
+def compile_validators() -> int:
+    """
+    Compile validators for every registered message type.
+
+    Returns:
+        Number of compiled validators
+    """
+    for message_type in MESSAGE_SCHEMAS:
+        get_validator(message_type)
+    return len(_COMPILED_VALIDATORS)
+
+
+def _check_observation_structure(message: Dict[str, Any]) -> Optional[str]:
+    """
+    Structural check for observation_data from a verified client.
+
+    Checks required fields and container types only; optional field types
+    and array contents are not inspected.
+    """
+    data = message.get("data")
+    if not isinstance(data, dict):
+        return "'data' must be an object"
+
+    for field_name in OBSERVATION_DATA_SCHEMA["properties"]["data"]["required"]:
+        if field_name not in data:
+            return f"'{field_name}' is a required property"
+
+    if not isinstance(data["miningWorkers"], list) or not isinstance(data["protectors"], list):
+        return "'miningWorkers' and 'protectors' must be arrays"
+    if not isinstance(data["queenEnergy"], dict) or not isinstance(data["playerEnergy"], dict):
+        return "'queenEnergy' and 'playerEnergy' must be objects"
+    if not isinstance(data["territoryId"], str):
+        return "'territoryId' must be a string"
+    return None
+
+
+# Structural checks usable in place of full schema validation
+STRUCTURAL_CHECKS = {
+    "observation_data": _check_observation_structure,
+}
+
+
+def validate_message(message: Dict[str, Any], structural_only: bool = False) -> tuple[bool, Optional[str]]:
     """
     Validate a message against its JSON schema.
 
     Args:
         message: Message dictionary to validate
+        structural_only: Use the cheap structural check instead of full schema
+            validation for message types that have one (verified clients only)
 
     Returns:
         Tuple of (is_valid, error_message)
@@ -341,12 +432,19 @@ def validate_message(message: Dict[str, Any]) -> tuple[bool, Optional[str]]:
         if not message_type:
             return False, "Missing message type"
 
-        schema = MESSAGE_SCHEMAS.get(message_type)
-        if not schema:
+        if structural_only and message_type in STRUCTURAL_CHECKS:
+            error = STRUCTURAL_CHECKS[message_type](message)
+            if error:
+                return False, f"Structure validation error: {error}"
+            return True, None
+
+        validator = get_validator(message_type)
+        if validator is None:
             return False, f"No schema defined for message type: {message_type}"
 
-        # Validate against schema
-        validate(instance=message, schema=schema)
+        # Validate against schema, reporting the same error jsonschema.validate would
+        if not validator.is_valid(message):
+            raise best_match(validator.iter_errors(message))
         return True, None
 
     except ValidationError as e:
@@ -355,6 +453,9 @@ def validate_message(message: Dict[str, Any]) -> tuple[bool, Optional[str]]:
         return False, f"Validation error: {str(e)}"
 
 
+compile_validators()
+
+
 def get_message_type(type_string: str) -> Optional[MessageType]:
     """
     Convert message type string to MessageType enum.
@@ -0,0 +1,209 @@
+"""
+Trace Recorder - Append-only capture of incoming WebSocket messages
+
+MessageHandler can record every message it receives (before validation, so
+malformed traffic is captured too) together with the client id and the
+time since recording started. Traces are replayed against a running
+server by benchmarks/replay.py for repeatable load tests.
+
+Trace file format: gzip members of newline-delimited JSON, one member per
+written batch (gzip readers concatenate members). Each recording session
+starts with a header object; every following line is a compact
+[offset_seconds, client_id, message] array.
+"""
+
+import gzip
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TRACE_FORMAT_VERSION = 1
+
+
+@dataclass
+class TraceRecord:
+    """One recorded message"""
+    offset: float  # Seconds since the start of the trace
+    client_id: str
+    message: Any
+
+
+class TraceRecorder:
+    """
+    Asynchronous append-only trace writer.
+
+    record() serializes the message immediately (handlers may mutate it)
+    and queues it; a daemon thread started on first use appends batches to
+    the trace file. When the queue is full new records are dropped and
+    counted rather than blocking the event loop.
+    """
+
+    BATCH_SIZE = 256  # Max records written per batch
+    FLUSH_INTERVAL = 0.5  # Seconds to wait for more records before writing
+    MAX_QUEUE_SIZE = 8192  # Pending records before new ones are dropped
+
+    def __init__(self, path: str):
+        self.path = path
+        self._start = time.perf_counter()
+        self._queue: queue.Queue = queue.Queue(maxsize=self.MAX_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+
+        self.stats = {"recorded": 0, "written": 0, "dropped": 0, "batches": 0, "bytes": 0}
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        header = json.dumps({
+            "trace_version": TRACE_FORMAT_VERSION,
+            "started_at": time.time()
+        }, separators=(',', ':'))
+        self._queue.put_nowait(header)
+
+    def record(self, client_id: str, message: Any) -> bool:
+        """
+        Queue a received message.
+
+        Returns:
+            True if queued, False if dropped (queue full, closed or not serializable)
+        """
+        if self._closed:
+            return False
+        offset = round(time.perf_counter() - self._start, 6)
+        try:
+            line = json.dumps([offset, client_id, message], separators=(',', ':'), default=str)
+        except (TypeError, ValueError) as e:
+            logger.error(f"Trace serialization failed for client {client_id}: {e}")
+            self.stats["dropped"] += 1
+            return False
+
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self.stats["dropped"] += 1
+            return False
+
+        self.stats["recorded"] += 1
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="trace-recorder", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        """Writer thread: drain the queue in batches until a stop sentinel arrives"""
+        running = True
+        while running:
+            try:
+                first = self._queue.get(timeout=self.FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [line for line in batch if line is not None]
+            running = len(lines) == len(batch)
+            try:
+                if lines:
+                    self._write_batch(lines)
+            except Exception as e:
+                logger.error(f"Trace batch write failed: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, lines: List[str]):
+        payload = gzip.compress(("\n".join(lines) + "\n").encode(), compresslevel=6)
+        with open(self.path, 'ab') as f:
+            f.write(payload)
+        self.stats["bytes"] += len(payload)
+        self.stats["batches"] += 1
+        self.stats["written"] += sum(1 for line in lines if line.startswith('['))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued record has been written.
+
+        Returns:
+            True if the queue drained, False on timeout
+        """
+        if not self._closed:
+            self._ensure_thread()
+        if self._thread is None or not self._thread.is_alive():
+            return self._queue.unfinished_tasks == 0
+
+        if timeout is None:
+            self._queue.join()
+            return True
+
+        deadline = time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """Write pending records and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._ensure_thread()
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get recorder statistics"""
+        return {"path": self.path, **self.stats}
+
+
+def read_trace(path: str) -> Iterator[TraceRecord]:
+    """
+    Read the records of a trace file in recorded order.
+
+    Later recording sessions in the same file continue after the last
+    record of the previous one, so a multi-session file replays as one
+    continuous trace.
+
+    Raises:
+        ValueError: If the file is not a trace or has an unsupported version
+    """
+    base = 0.0  # Offset of the current session within the whole trace
+    last = 0.0
+    seen_header = False
+    with gzip.open(path, 'rt') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            if isinstance(entry, dict):
+                version = entry.get("trace_version")
+                if version != TRACE_FORMAT_VERSION:
+                    raise ValueError(f"{path}:{line_number}: unsupported trace version {version!r}")
+                base = last
+                seen_header = True
+                continue
+            if not seen_header:
+                raise ValueError(f"{path}: missing trace header")
+
+            offset, client_id, message = entry
+            last = base + offset
+            yield TraceRecord(offset=last, client_id=client_id, message=message)
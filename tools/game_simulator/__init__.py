@@ -6,7 +6,7 @@ The simulator models game entities and sends observations through the existing W
 """
 
 from .config import SimulationConfig
-from .entities import Entity, Worker, Protector, Parasite
+from .entities import ChunkIndex, Entity, Worker, Protector, Parasite
 from .state import SimulatedGameState
 from .simulator import Simulator
 from .observation import generate_observation
@@ -16,7 +16,7 @@ __version__ = "1.0.0"
 
 __all__ = [
     'SimulationConfig',
-    'Entity', 'Worker', 'Protector', 'Parasite',
+    'ChunkIndex', 'Entity', 'Worker', 'Protector', 'Parasite',
     'SimulatedGameState',
     'Simulator',
     'generate_observation',
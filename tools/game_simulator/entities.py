@@ -6,8 +6,9 @@ This module contains the base Entity class and all specific entity types
 """
 
 from dataclasses import dataclass
+from functools import lru_cache
 import math
-from typing import Optional, List, TYPE_CHECKING
+from typing import Dict, Iterable, Iterator, Optional, List, Tuple, TYPE_CHECKING
 from enum import Enum
 
 if TYPE_CHECKING:
@@ -16,6 +17,7 @@ if TYPE_CHECKING:
 
 # Grid size constant - must match config.grid_size (16x16 = 256 chunks)
 GRID_SIZE = 16
+GRID_CHUNKS = GRID_SIZE * GRID_SIZE
 
 
 @dataclass
@@ -138,6 +140,239 @@ class Entity:
         self.chunk = round(new_y) * GRID_SIZE + round(new_x)
 
 
+class ChunkIndex:
+    """
+    Chunk-bucket index of entities for neighbor queries.
+
+    Entities are bucketed by chunk (at most one bucket per chunk of the
+    16x16 grid), so nearest and within-radius queries only visit the chunks
+    around the query point instead of every entity. When fewer chunks are
+    occupied than a query would visit, the occupied buckets are scanned
+    instead. Results match a linear scan of the list the index was built
+    from: distances use the same arithmetic as Entity.distance_to, and ties
+    go to the entity that comes first in the list.
+
+    The index does not track movement; it is meant for entities that stay
+    in their chunk (parasites) and is rebuilt each tick.
+    """
+
+    # Queries scan the occupied chunks when fewer than this many are occupied
+    # (a nearest search visits about GRID_SIZE**2 / occupied chunks)
+    SCAN_LIMIT = GRID_SIZE
+
+    def __init__(self, entities: Iterable[Entity] = ()):
+        """
+        Build the index from entities in list order.
+
+        Args:
+            entities: Entities to index (order decides ties)
+        """
+        self._buckets: Dict[int, List[Tuple[int, Entity]]] = {}  # chunk -> [(order, entity)]
+        self._next_order = 0
+        self._count = 0
+        self._outside = 0  # Occupied chunks off the grid (only found by scanning)
+        for entity in entities:
+            self.add(entity)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add(self, entity: Entity) -> None:
+        """Add an entity after all entities already indexed."""
+        bucket = self._buckets.get(entity.chunk)
+        if bucket is None:
+            bucket = self._buckets[entity.chunk] = []
+            if not 0 <= entity.chunk < GRID_CHUNKS:
+                self._outside += 1
+        bucket.append((self._next_order, entity))
+        self._next_order += 1
+        self._count += 1
+
+    def remove(self, entity: Entity) -> bool:
+        """
+        Remove the first indexed entity equal to this one (like list.remove).
+
+        Returns:
+            True if an entity was removed
+        """
+        bucket = self._buckets.get(entity.chunk, ())
+        for i, (_, indexed) in enumerate(bucket):
+            if indexed == entity:
+                del bucket[i]
+                self._count -= 1
+                if not bucket:
+                    del self._buckets[entity.chunk]
+                    if not 0 <= entity.chunk < GRID_CHUNKS:
+                        self._outside -= 1
+                return True
+        return False
+
+    def __contains__(self, entity: Entity) -> bool:
+        return any(indexed == entity for _, indexed in self._buckets.get(entity.chunk, ()))
+
+    def nearest(self, chunk: int, max_distance: Optional[float] = None) -> Optional[Entity]:
+        """
+        Find the entity nearest to a chunk.
+
+        Args:
+            chunk: Query chunk (0-255)
+            max_distance: Only return an entity closer than this
+
+        Returns:
+            Nearest entity (first in list order on ties), or None
+        """
+        buckets = self._buckets
+        if not buckets:
+            return None
+        cx, cy = chunk % GRID_SIZE, chunk // GRID_SIZE
+
+        best: Optional[Tuple[int, int, Entity]]  # (squared distance, order, entity)
+        if len(buckets) < self.SCAN_LIMIT:
+            best = self._closest(cx, cy, buckets.items(), None)
+        else:
+            max_ring = GRID_SIZE if max_distance is None else min(GRID_SIZE, math.ceil(max_distance))
+            if self._scan(chunk, cx, cy, max_ring - 1 if max_distance is not None else None):
+                best = self._closest(cx, cy, buckets.items(), None)
+            else:
+                # Entities on ring r (Chebyshev distance r) are at least r away
+                best = None
+                for ring in range(max_ring):
+                    best = self._closest(cx, cy, self._ring(cx, cy, ring), best)
+                    if best is not None and best[0] < (ring + 1) ** 2:
+                        break
+
+        # Anything not searched is at least max_distance away
+        if best is None or (max_distance is not None and best[0] > _max_distance_sq(max_distance)):
+            return None
+        return best[2]
+
+    def within(self, chunk: int, radius: float) -> List[Entity]:
+        """
+        Entities closer than radius to a chunk, in list order.
+
+        Args:
+            chunk: Query chunk (0-255)
+            radius: Exclusive distance limit
+
+        Returns:
+            Matching entities
+        """
+        found = [item for bucket in self._buckets_within(chunk, radius) for item in bucket]
+        found.sort(key=lambda item: item[0])
+        return [entity for _, entity in found]
+
+    def first_within(self, chunk: int, radius: float) -> Optional[Entity]:
+        """
+        First entity in list order closer than radius to a chunk.
+
+        Args:
+            chunk: Query chunk (0-255)
+            radius: Exclusive distance limit
+
+        Returns:
+            Matching entity or None
+        """
+        if len(self._buckets) < self.SCAN_LIMIT:
+            # Few occupied chunks: check them directly
+            if not self._buckets or radius <= 0:
+                return None
+            cx, cy = chunk % GRID_SIZE, chunk // GRID_SIZE
+            limit_sq = _max_distance_sq(radius)
+            first = None
+            for other, bucket in self._buckets.items():
+                if first is None or bucket[0][0] < first[0]:
+                    dx = other % GRID_SIZE - cx
+                    dy = other // GRID_SIZE - cy
+                    if dx * dx + dy * dy <= limit_sq:
+                        first = bucket[0]
+            return first[1] if first is not None else None
+
+        first = None
+        for bucket in self._buckets_within(chunk, radius):
+            if first is None or bucket[0][0] < first[0]:
+                first = bucket[0]
+        return first[1] if first is not None else None
+
+    def _buckets_within(self, chunk: int, radius: float) -> List[List[Tuple[int, Entity]]]:
+        """Buckets of the chunks closer than radius to a chunk."""
+        if not self._buckets or radius <= 0:
+            return []
+        cx, cy = chunk % GRID_SIZE, chunk // GRID_SIZE
+        reach = min(GRID_SIZE, math.ceil(radius)) - 1
+        limit_sq = _max_distance_sq(radius)
+
+        if self._scan(chunk, cx, cy, reach):
+            candidates = self._buckets.items()
+        else:
+            candidates = (
+                (y * GRID_SIZE + x, self._buckets.get(y * GRID_SIZE + x))
+                for y in range(max(0, cy - reach), min(GRID_SIZE, cy + reach + 1))
+                for x in range(max(0, cx - reach), min(GRID_SIZE, cx + reach + 1))
+            )
+
+        found = []
+        for other, bucket in candidates:
+            if bucket:
+                dx = other % GRID_SIZE - cx
+                dy = other // GRID_SIZE - cy
+                if dx * dx + dy * dy <= limit_sq:
+                    found.append(bucket)
+        return found
+
+    def _scan(self, chunk: int, cx: int, cy: int, reach: Optional[int]) -> bool:
+        """
+        Whether to scan the occupied chunks rather than search around (cx, cy).
+
+        Scans when few chunks are occupied, when fewer are occupied than the
+        chunks within Chebyshev distance `reach` (None = unbounded) or when
+        the query or an entity is off the grid.
+        """
+        occupied = len(self._buckets)
+        if occupied < self.SCAN_LIMIT or self._outside or not 0 <= chunk < GRID_CHUNKS:
+            return True
+        if reach is None:
+            return False
+        width = min(GRID_SIZE, cx + reach + 1) - max(0, cx - reach)
+        height = min(GRID_SIZE, cy + reach + 1) - max(0, cy - reach)
+        return occupied < width * height
+
+    def _ring(self, cx: int, cy: int, ring: int) -> Iterator[Tuple[int, List[Tuple[int, Entity]]]]:
+        """Occupied buckets at Chebyshev distance `ring` from (cx, cy)."""
+        if ring == 0:
+            cells = [(cx, cy)]
+        else:
+            xs = range(max(0, cx - ring), min(GRID_SIZE, cx + ring + 1))
+            ys = range(max(0, cy - ring + 1), min(GRID_SIZE, cy + ring))
+            cells = [(x, y) for y in (cy - ring, cy + ring) if 0 <= y < GRID_SIZE for x in xs]
+            cells += [(x, y) for x in (cx - ring, cx + ring) if 0 <= x < GRID_SIZE for y in ys]
+        for x, y in cells:
+            bucket = self._buckets.get(y * GRID_SIZE + x)
+            if bucket:
+                yield y * GRID_SIZE + x, bucket
+
+    @staticmethod
+    def _closest(cx: int, cy: int, buckets, best: Optional[Tuple[int, int, Entity]]) -> Optional[Tuple[int, int, Entity]]:
+        """Closest (squared distance, order, entity) of the buckets and best so far."""
+        for other, bucket in buckets:
+            dx = other % GRID_SIZE - cx
+            dy = other // GRID_SIZE - cy
+            distance_sq = dx * dx + dy * dy
+            if best is None or distance_sq < best[0] or (distance_sq == best[0] and bucket[0][0] < best[1]):
+                best = (distance_sq, *bucket[0])  # Buckets are in list order
+        return best
+
+
+@lru_cache(maxsize=64)
+def _max_distance_sq(radius: float) -> int:
+    """Largest squared chunk distance d with math.sqrt(d) < radius (as Entity.distance_to compares)."""
+    limit = max(0, math.ceil(radius * radius))
+    while limit >= 0 and not math.sqrt(limit) < radius:
+        limit -= 1
+    while math.sqrt(limit + 1) < radius:
+        limit += 1
+    return limit
+
+
 class WorkerState(Enum):
     """Worker behavior states."""
     MOVING_TO_MINE = "moving_to_mine"  # Traveling from base to mining spot
@@ -173,21 +408,25 @@ class Worker(Entity):
     carried_resources: float = 0.0  # Resources being carried back to base
     pre_flee_state: Optional[WorkerState] = None  # State before fleeing (to resume)
 
-    def update(self, parasites: List['Parasite'], config: 'SimulationConfig') -> float:
+    def update(self, parasites: List['Parasite'], config: 'SimulationConfig',
+               parasite_index: Optional[ChunkIndex] = None) -> float:
         """
         Update worker state and position.
 
         Args:
             parasites: List of active parasites in the simulation
             config: Simulation configuration parameters
+            parasite_index: Index of `parasites` (built from the list if None)
 
         Returns:
             Resource deposit amount (only when reaching base with resources)
         """
         # Check for nearby parasites
-        nearest_parasite = self._find_nearest_parasite(parasites)
+        if parasite_index is None:
+            parasite_index = ChunkIndex(parasites)
+        nearest_parasite = parasite_index.nearest(self.chunk, max_distance=config.flee_radius)
 
-        if nearest_parasite and self.distance_to(nearest_parasite.chunk) < config.flee_radius:
+        if nearest_parasite:
             # Enter fleeing state
             if self.state != WorkerState.FLEEING:
                 self.pre_flee_state = self.state  # Remember what we were doing
@@ -245,29 +484,21 @@ class Worker(Entity):
 
         return 0.0
 
-    def _find_nearest_parasite(self, parasites: List['Parasite']) -> Optional['Parasite']:
+    def _find_nearest_parasite(self, parasites: List['Parasite'],
+                               parasite_index: Optional[ChunkIndex] = None) -> Optional['Parasite']:
         """
         Find the nearest parasite to this worker.
 
         Args:
             parasites: List of active parasites
+            parasite_index: Index of `parasites` (built from the list if None)
 
         Returns:
             Nearest parasite or None if no parasites exist
         """
-        if not parasites:
-            return None
-
-        nearest = None
-        min_distance = float('inf')
-
-        for parasite in parasites:
-            distance = self.distance_to(parasite.chunk)
-            if distance < min_distance:
-                min_distance = distance
-                nearest = parasite
-
-        return nearest
+        if parasite_index is None:
+            parasite_index = ChunkIndex(parasites)
+        return parasite_index.nearest(self.chunk)
 
 
 @dataclass
@@ -283,28 +514,31 @@ class Protector(Entity):
     state: ProtectorState = ProtectorState.PATROLLING
     chase_target: Optional['Parasite'] = None  # Parasite being chased
 
-    def update(self, parasites: List['Parasite'], config: 'SimulationConfig') -> Optional['Parasite']:
+    def update(self, parasites: List['Parasite'], config: 'SimulationConfig',
+               parasite_index: Optional[ChunkIndex] = None) -> Optional['Parasite']:
         """
         Update protector state and position.
         
         Args:
             parasites: List of active parasites in the simulation
             config: Simulation configuration parameters
+            parasite_index: Index of `parasites` (built from the list if None)
             
         Returns:
             Killed parasite if any, None otherwise
         """
-        # Look for parasites to chase (only when patrolling)
+        if parasite_index is None:
+            parasite_index = ChunkIndex(parasites)
+
+        # Look for parasites to chase (only when patrolling); the first in list order
         if self.state == ProtectorState.PATROLLING:
-            for parasite in parasites:
-                if self.distance_to(parasite.chunk) < config.detection_radius:
-                    self.state = ProtectorState.CHASING
-                    self.chase_target = parasite
-                    break
+            detected = parasite_index.first_within(self.chunk, config.detection_radius)
+            if detected is not None:
+                self.state = ProtectorState.CHASING
+                self.chase_target = detected
 
         if self.state == ProtectorState.CHASING:
-            # NOTE: O(n) list scan - could use set for larger simulations
-            if self.chase_target is None or self.chase_target not in parasites:
+            if self.chase_target is None or self.chase_target not in parasite_index:
                 # Target gone (killed by another protector or removed), return to patrol
                 self.state = ProtectorState.PATROLLING
                 self.chase_target = None
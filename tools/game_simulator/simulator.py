@@ -12,7 +12,7 @@ if TYPE_CHECKING:
     from .config import SimulationConfig
 
 from .state import SimulatedGameState
-from .entities import Parasite, Worker, Protector
+from .entities import ChunkIndex, Parasite, Worker, Protector
 from .curriculum import CurriculumManager, CurriculumPhase
 
 logger = logging.getLogger(__name__)
@@ -43,6 +43,7 @@ class Simulator:
         self.config = config
         self.state = SimulatedGameState.create_initial(config)
         self.curriculum_manager = curriculum_manager
+        self.parasite_index = ChunkIndex(self.state.parasites)  # Rebuilt each tick
         
         # Apply initial curriculum phase if available
         if self.curriculum_manager:
@@ -181,6 +182,10 @@ class Simulator:
         if self.state.tick % 1000 == 0:
             logger.debug(f"Starting tick {self.state.tick + 1}")
 
+        # Index parasites by chunk for worker and protector neighbor queries
+        # (rebuilt from the list, which callers may also modify directly)
+        self.parasite_index = ChunkIndex(self.state.parasites)
+
         # 1. Update workers
         total_deposited = 0.0
         workers_mining = 0
@@ -189,7 +194,7 @@ class Simulator:
         workers_returning = 0
 
         for worker in self.state.workers:
-            deposited = worker.update(self.state.parasites, self.config)
+            deposited = worker.update(self.state.parasites, self.config, self.parasite_index)
             total_deposited += deposited
 
             # Count worker states for logging
@@ -208,7 +213,7 @@ class Simulator:
         protectors_chasing = 0
         
         for protector in self.state.protectors:
-            killed = protector.update(self.state.parasites, self.config)
+            killed = protector.update(self.state.parasites, self.config, self.parasite_index)
             if killed:
                 killed_parasites.append(killed)
                 logger.info(f"Tick {self.state.tick + 1}: Protector killed {killed.type} parasite at chunk {killed.chunk}")
@@ -221,8 +226,9 @@ class Simulator:
 
         # 3. Remove killed parasites
         for parasite in killed_parasites:
-            if parasite in self.state.parasites:
+            if parasite in self.parasite_index:
                 self.state.parasites.remove(parasite)
+                self.parasite_index.remove(parasite)
 
         # 4. Update resources (workers deposit when returning to base)
         prev_energy = self.state.player_energy
@@ -317,6 +323,7 @@ class Simulator:
             spawn_time=self.state.tick
         )
         self.state.parasites.append(parasite)
+        self.parasite_index.add(parasite)
         
         # Log spawn event
         logger.info(f"Tick {self.state.tick}: Spawned {parasite_type} parasite at chunk {chunk} "
@@ -5,12 +5,13 @@ Task 8: Add unit tests for simulation
 
 import unittest
 import os
+import random
 import sys
 
 # Path setup handled by conftest.py
 
 from game_simulator.config import SimulationConfig
-from game_simulator.entities import Worker, Protector, Parasite, WorkerState, ProtectorState
+from game_simulator.entities import ChunkIndex, Worker, Protector, Parasite, WorkerState, ProtectorState
 from game_simulator.state import SimulatedGameState
 from game_simulator.simulator import Simulator
 from game_simulator.observation import generate_observation
@@ -537,6 +538,54 @@ class TestChunkCounting(unittest.TestCase):
         self.assertNotIn("200", chunks)  # Empty chunk should not be included
 
 
+
+class TestChunkIndex(unittest.TestCase):
+    """Test the parasite chunk index against linear scans"""
+
+    def _parasites(self, rng, count):
+        return [Parasite(chunk=rng.randrange(256), type=rng.choice(['energy', 'combat']), spawn_time=i)
+                for i in range(count)]
+
+    def test_queries_match_linear_scan(self):
+        """Test nearest and within-radius queries with few and many occupied chunks"""
+        rng = random.Random(7)
+        for count in (0, 3, 12, 60, 400):  # Scans the occupied chunks up to 12, searches around the query above
+            parasites = self._parasites(rng, count)
+            index = ChunkIndex(parasites)
+            self.assertEqual(len(index), count)
+            for _ in range(40):
+                probe = Worker(chunk=rng.randrange(256), target_chunk=0)
+                distances = [probe.distance_to(p.chunk) for p in parasites]
+                nearest = distances.index(min(distances)) if parasites else None
+                self.assertIs(index.nearest(probe.chunk), parasites[nearest] if parasites else None)
+
+                for radius in (1, 1.5, 3, 5, 30):
+                    inside = [p for p, d in zip(parasites, distances) if d < radius]
+                    self.assertEqual([id(p) for p in index.within(probe.chunk, radius)], [id(p) for p in inside])
+                    self.assertIs(index.first_within(probe.chunk, radius), inside[0] if inside else None)
+                    expected = parasites[nearest] if parasites and distances[nearest] < radius else None
+                    self.assertIs(index.nearest(probe.chunk, max_distance=radius), expected)
+
+    def test_simulator_keeps_index_in_sync(self):
+        """Test that spawns and kills update the index and each tick rebuilds it"""
+        config = SimulationConfig(num_workers=2, num_protectors=1, queen_start_energy=100)
+        simulator = Simulator(config)
+        self.assertTrue(simulator.spawn_parasite(50, 'energy'))
+        self.assertIn(simulator.state.parasites[0], simulator.parasite_index)
+
+        # A parasite next to the protector is chased and killed
+        protector = simulator.state.protectors[0]
+        simulator.spawn_parasite(protector.chunk, 'combat')
+        for _ in range(5):
+            simulator.tick()
+        self.assertEqual(len(simulator.parasite_index), len(simulator.state.parasites))
+        self.assertTrue(all(p in simulator.parasite_index for p in simulator.state.parasites))
+
+        simulator.state.parasites = [Parasite(chunk=10, type='energy', spawn_time=0)]
+        simulator.tick()
+        self.assertEqual(simulator.parasite_index.nearest(11).chunk, 10)
+
+
 if __name__ == '__main__':
     # Run tests
     unittest.main(verbosity=2)
\ No newline at end of file